@@ -1,7 +1,7 @@
 """分析论文状态（基于review rating）"""
 
-import json
 from pathlib import Path
+from src.data.reviews import load_review_file
 
 papers = ['paper_19076', 'paper_19094', 'paper_21497']
 
@@ -21,19 +21,16 @@ for paper_id in papers:
         print(f"{paper_id}: 未找到review文件")
         continue
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        reviews = json.load(f)
+    reviews = load_review_file(file_path)
     
     print(f"论文: {paper_id}")
     print("-" * 70)
     
     ratings = []
     for review in reviews:
-        rating = review.get('rating', None)
-        reviewer_id = review.get('reviewer_id', 'Unknown')
-        if rating is not None:
-            ratings.append(rating)
-            print(f"  {reviewer_id}: Rating = {rating}")
+        if review.rating is not None:
+            ratings.append(review.rating)
+            print(f"  {review.reviewer_id}: Rating = {review.rating:g}")
     
     if ratings:
         avg_rating = sum(ratings) / len(ratings)
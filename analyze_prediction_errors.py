@@ -5,10 +5,9 @@ All outputs in English
 
 import sys
 import io
-import json
-from pathlib import Path
-from typing import Dict, List, Tuple
-from collections import defaultdict
+import argparse
+from typing import Dict
+from src.data.feature_store import FeatureStore, weighted_verification_score
 
 # Set UTF-8 encoding for Windows
 if sys.platform == 'win32' and hasattr(sys.stdout, 'buffer'):
@@ -19,173 +18,49 @@ if sys.platform == 'win32' and hasattr(sys.stdout, 'buffer'):
         pass
 
 
-def get_ground_truth_status(paper_id: str) -> str:
-    """Get ground truth acceptance status"""
-    accepted_path = Path(f"data/raw/iclr2024/papers/accepted/{paper_id}.pdf")
-    rejected_path = Path(f"data/raw/iclr2024/papers/rejected/{paper_id}.pdf")
-    
-    if accepted_path.exists():
-        return "Accepted"
-    elif rejected_path.exists():
-        return "Rejected"
-    return "Unknown"
+def parse_args():
+    parser = argparse.ArgumentParser(description="Analyze prediction errors and explore correction methods")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Config file path")
+    parser.add_argument("--db-path", type=str, help="Feature database path (overrides features.db_path in the config)")
+    return parser.parse_args()
 
 
-def calculate_weighted_verification_score(verifications: Dict, weights: Dict) -> float:
-    """Calculate weighted verification score"""
-    if not verifications or not weights:
+def calculate_sentiment_weighted_score(paper: Dict) -> float:
+    """Weighted verification score with a sentiment multiplier (Positive x1.1, Negative x0.9) per claim"""
+    if not paper['num_claims'] or not paper['num_verified']:
         return 0.5
     
-    reviewer_scores = {}
-    reviewer_weights = {}
-    
-    for claim_id, verification in verifications.items():
-        reviewer_id = claim_id.split('-')[0] if '-' in claim_id else None
-        
-        if reviewer_id and reviewer_id in weights:
-            if reviewer_id not in reviewer_scores:
-                reviewer_scores[reviewer_id] = []
-                reviewer_weights[reviewer_id] = weights[reviewer_id].get('weight', 0.5)
-            
-            result = verification.get('verification_result', '')
-            if result == 'True':
-                reviewer_scores[reviewer_id].append(1.0)
-            elif result == 'Partially_True':
-                reviewer_scores[reviewer_id].append(0.5)
-            else:
-                reviewer_scores[reviewer_id].append(0.0)
-    
     total_weighted_score = 0.0
     total_weight = 0.0
     
-    for reviewer_id, scores in reviewer_scores.items():
-        if scores:
-            avg_score = sum(scores) / len(scores)
-            weight = reviewer_weights[reviewer_id]
-            total_weighted_score += avg_score * weight
-            total_weight += weight
-    
-    if total_weight > 0:
-        return total_weighted_score / total_weight
-    else:
-        return 0.5
-
-
-def analyze_paper_details(paper_id: str) -> Dict:
-    """Analyze detailed metrics for a paper"""
-    ground_truth = get_ground_truth_status(paper_id)
-    
-    # Load verifications
-    verifications_path = Path(f"data/results/verifications/{paper_id}_verified.json")
-    verifications = {}
-    if verifications_path.exists():
-        with open(verifications_path, 'r', encoding='utf-8') as f:
-            verifications_list = json.load(f)
-            if isinstance(verifications_list, list):
-                verifications = {v['id']: v for v in verifications_list}
-            else:
-                verifications = verifications_list
-    
-    # Load weights
-    weights_path = Path(f"data/results/weights/{paper_id}_weights.json")
-    weights = {}
-    if weights_path.exists():
-        with open(weights_path, 'r', encoding='utf-8') as f:
-            weights = json.load(f)
-    
-    # Load claims
-    claims_path = Path(f"data/processed/extracted/{paper_id}_claims.json")
-    claims = []
-    if claims_path.exists():
-        with open(claims_path, 'r', encoding='utf-8') as f:
-            claims = json.load(f)
-    
-    # Calculate metrics
-    weighted_score = calculate_weighted_verification_score(verifications, weights)
-    
-    # Count verification results
-    true_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'True')
-    false_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'False')
-    partial_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'Partially_True')
-    total_verified = len(verifications)
-    
-    # Calculate rates
-    true_rate = true_count / total_verified if total_verified > 0 else 0
-    false_rate = false_count / total_verified if total_verified > 0 else 0
-    partial_rate = partial_count / total_verified if total_verified > 0 else 0
-    
-    # Analyze sentiment distribution
-    positive_claims = sum(1 for c in claims if c.get('sentiment') == 'Positive')
-    negative_claims = sum(1 for c in claims if c.get('sentiment') == 'Negative')
-    neutral_claims = sum(1 for c in claims if c.get('sentiment') == 'Neutral')
-    total_claims = len(claims)
-    
-    # Calculate reviewer statistics
-    reviewer_stats = {}
-    for reviewer_id, weight_data in weights.items():
-        reviewer_claims = [c for c in claims if c.get('id', '').startswith(reviewer_id)]
-        reviewer_verifications = {k: v for k, v in verifications.items() if k.startswith(reviewer_id)}
+    for reviewer in paper['reviewers']:
+        if reviewer['weight'] is None or not reviewer['num_verified']:
+            continue
         
-        reviewer_true = sum(1 for v in reviewer_verifications.values() if v.get('verification_result') == 'True')
-        reviewer_false = sum(1 for v in reviewer_verifications.values() if v.get('verification_result') == 'False')
-        reviewer_partial = sum(1 for v in reviewer_verifications.values() if v.get('verification_result') == 'Partially_True')
-        reviewer_total = len(reviewer_verifications)
+        true_neutral = reviewer['true_count'] - reviewer['true_positive'] - reviewer['true_negative']
+        partial_neutral = reviewer['partial_count'] - reviewer['partial_positive'] - reviewer['partial_negative']
+        adjusted_sum = (
+            1.1 * reviewer['true_positive'] + 0.9 * reviewer['true_negative'] + true_neutral +
+            0.5 * (1.1 * reviewer['partial_positive'] + 0.9 * reviewer['partial_negative'] + partial_neutral)
+        )
         
-        reviewer_stats[reviewer_id] = {
-            'weight': weight_data.get('weight', 0),
-            'num_claims': len(reviewer_claims),
-            'num_verified': reviewer_total,
-            'true_count': reviewer_true,
-            'false_count': reviewer_false,
-            'partial_count': reviewer_partial,
-            'true_rate': reviewer_true / reviewer_total if reviewer_total > 0 else 0,
-            'positive_claims': sum(1 for c in reviewer_claims if c.get('sentiment') == 'Positive'),
-            'negative_claims': sum(1 for c in reviewer_claims if c.get('sentiment') == 'Negative')
-        }
+        # Every verified claim contributes with its reviewer's weight
+        total_weighted_score += adjusted_sum * reviewer['weight']
+        total_weight += reviewer['num_verified'] * reviewer['weight']
     
-    return {
-        'paper_id': paper_id,
-        'ground_truth': ground_truth,
-        'weighted_score': weighted_score,
-        'total_claims': total_claims,
-        'total_verified': total_verified,
-        'true_count': true_count,
-        'false_count': false_count,
-        'partial_count': partial_count,
-        'true_rate': true_rate,
-        'false_rate': false_rate,
-        'partial_rate': partial_rate,
-        'positive_claims': positive_claims,
-        'negative_claims': negative_claims,
-        'neutral_claims': neutral_claims,
-        'reviewer_stats': reviewer_stats,
-        'avg_reviewer_weight': sum(w.get('weight', 0) for w in weights.values()) / len(weights) if weights else 0
-    }
+    return total_weighted_score / total_weight if total_weight > 0 else 0.5
 
 
 def main():
     """Main function"""
+    args = parse_args()
     print("="*70)
     print("PREDICTION ERROR ANALYSIS")
     print("="*70)
     print()
     
-    # Find all ICLR papers
-    accepted_dir = Path("data/raw/iclr2024/papers/accepted")
-    rejected_dir = Path("data/raw/iclr2024/papers/rejected")
-    
-    paper_ids = []
-    if accepted_dir.exists():
-        paper_ids.extend([f.stem for f in accepted_dir.glob("*.pdf")])
-    if rejected_dir.exists():
-        paper_ids.extend([f.stem for f in rejected_dir.glob("*.pdf")])
-    
-    # Analyze all papers
-    all_papers_data = []
-    for paper_id in paper_ids:
-        data = analyze_paper_details(paper_id)
-        if data['ground_truth'] != "Unknown":
-            all_papers_data.append(data)
+    # Load per-paper features
+    all_papers_data = FeatureStore.from_config(args.config, args.db_path).papers(labeled_only=True)
     
     # Identify errors (Method 2: Weighted Verification Score)
     threshold = 0.5
@@ -193,6 +68,7 @@ def main():
     correct = []
     
     for paper_data in all_papers_data:
+        paper_data['reviewer_stats'] = [r for r in paper_data['reviewers'] if r['weight'] is not None]
         prediction = "Accepted" if paper_data['weighted_score'] >= threshold else "Rejected"
         is_correct = prediction == paper_data['ground_truth']
         
@@ -220,21 +96,22 @@ def main():
         print(f"  Score Difference: {error['weighted_score'] - threshold:.3f}")
         print()
         print(f"  Verification Stats:")
-        print(f"    Total Verified: {error['total_verified']}")
+        print(f"    Total Verified: {error['num_verified']}")
         print(f"    True: {error['true_count']} ({error['true_rate']*100:.1f}%)")
         print(f"    False: {error['false_count']} ({error['false_rate']*100:.1f}%)")
         print(f"    Partial: {error['partial_count']} ({error['partial_rate']*100:.1f}%)")
         print()
         print(f"  Claim Sentiment:")
-        print(f"    Positive: {error['positive_claims']} ({error['positive_claims']/error['total_claims']*100:.1f}%)")
-        print(f"    Negative: {error['negative_claims']} ({error['negative_claims']/error['total_claims']*100:.1f}%)")
-        print(f"    Neutral: {error['neutral_claims']} ({error['neutral_claims']/error['total_claims']*100:.1f}%)")
+        print(f"    Positive: {error['positive_claims']} ({error['positive_claims']/error['num_claims']*100:.1f}%)")
+        print(f"    Negative: {error['negative_claims']} ({error['negative_claims']/error['num_claims']*100:.1f}%)")
+        print(f"    Neutral: {error['neutral_claims']} ({error['neutral_claims']/error['num_claims']*100:.1f}%)")
         print()
         print(f"  Reviewer Stats:")
-        for reviewer_id, stats in error['reviewer_stats'].items():
-            print(f"    {reviewer_id}: Weight={stats['weight']:.3f}, "
+        for stats in error['reviewer_stats']:
+            true_rate = stats['true_count'] / stats['num_verified'] if stats['num_verified'] else 0
+            print(f"    {stats['reviewer_id']}: Weight={stats['weight']:.3f}, "
                   f"Claims={stats['num_claims']}, "
-                  f"True Rate={stats['true_rate']*100:.1f}%, "
+                  f"True Rate={true_rate*100:.1f}%, "
                   f"Pos={stats['positive_claims']}, Neg={stats['negative_claims']}")
         print()
         print("-"*70)
@@ -250,7 +127,7 @@ def main():
         error_avg_score = sum(e['weighted_score'] for e in errors) / len(errors)
         error_avg_true_rate = sum(e['true_rate'] for e in errors) / len(errors)
         error_avg_partial_rate = sum(e['partial_rate'] for e in errors) / len(errors)
-        error_avg_positive = sum(e['positive_claims']/e['total_claims'] for e in errors) / len(errors)
+        error_avg_positive = sum(e['positive_claims']/e['num_claims'] for e in errors) / len(errors)
         
         print("Error Papers (Average):")
         print(f"  Weighted Score: {error_avg_score:.3f}")
@@ -263,7 +140,7 @@ def main():
         correct_avg_score = sum(c['weighted_score'] for c in correct) / len(correct)
         correct_avg_true_rate = sum(c['true_rate'] for c in correct) / len(correct)
         correct_avg_partial_rate = sum(c['partial_rate'] for c in correct) / len(correct)
-        correct_avg_positive = sum(c['positive_claims']/c['total_claims'] for c in correct) / len(correct)
+        correct_avg_positive = sum(c['positive_claims']/c['num_claims'] for c in correct) / len(correct)
         
         print("Correct Papers (Average):")
         print(f"  Weighted Score: {correct_avg_score:.3f}")
@@ -307,63 +184,12 @@ def main():
     
     # Method A: Adjust for partial claims (treat partial as 0.6 instead of 0.5)
     print("Method A: Treat Partial as 0.6 (instead of 0.5)")
-    def calculate_adjusted_score(verifications, weights, partial_weight=0.6):
-        if not verifications or not weights:
-            return 0.5
-        
-        reviewer_scores = {}
-        reviewer_weights = {}
-        
-        for claim_id, verification in verifications.items():
-            reviewer_id = claim_id.split('-')[0] if '-' in claim_id else None
-            
-            if reviewer_id and reviewer_id in weights:
-                if reviewer_id not in reviewer_scores:
-                    reviewer_scores[reviewer_id] = []
-                    reviewer_weights[reviewer_id] = weights[reviewer_id].get('weight', 0.5)
-                
-                result = verification.get('verification_result', '')
-                if result == 'True':
-                    reviewer_scores[reviewer_id].append(1.0)
-                elif result == 'Partially_True':
-                    reviewer_scores[reviewer_id].append(partial_weight)
-                else:
-                    reviewer_scores[reviewer_id].append(0.0)
-        
-        total_weighted_score = 0.0
-        total_weight = 0.0
-        
-        for reviewer_id, scores in reviewer_scores.items():
-            if scores:
-                avg_score = sum(scores) / len(scores)
-                weight = reviewer_weights[reviewer_id]
-                total_weighted_score += avg_score * weight
-                total_weight += weight
-        
-        return total_weighted_score / total_weight if total_weight > 0 else 0.5
-    
     for partial_weight in [0.55, 0.60, 0.65]:
-        adjusted_scores = []
-        for paper_data in all_papers_data:
-            verifications_path = Path(f"data/results/verifications/{paper_data['paper_id']}_verified.json")
-            weights_path = Path(f"data/results/weights/{paper_data['paper_id']}_weights.json")
-            
-            verifications = {}
-            if verifications_path.exists():
-                with open(verifications_path, 'r', encoding='utf-8') as f:
-                    verifications_list = json.load(f)
-                    if isinstance(verifications_list, list):
-                        verifications = {v['id']: v for v in verifications_list}
-                    else:
-                        verifications = verifications_list
-            
-            weights = {}
-            if weights_path.exists():
-                with open(weights_path, 'r', encoding='utf-8') as f:
-                    weights = json.load(f)
-            
-            adjusted_score = calculate_adjusted_score(verifications, weights, partial_weight)
-            adjusted_scores.append((paper_data['paper_id'], paper_data['ground_truth'], adjusted_score))
+        adjusted_scores = [
+            (paper_data['paper_id'], paper_data['ground_truth'],
+             weighted_verification_score(paper_data['reviewers'], partial_weight=partial_weight))
+            for paper_data in all_papers_data
+        ]
         
         # Calculate accuracy with threshold 0.5
         tp = sum(1 for pid, gt, score in adjusted_scores if gt == "Accepted" and score >= 0.5)
@@ -376,81 +202,10 @@ def main():
     
     # Method B: Include sentiment in score calculation
     print("Method B: Include Sentiment Weight")
-    def calculate_sentiment_weighted_score(claims, verifications, weights):
-        if not claims or not verifications or not weights:
-            return 0.5
-        
-        reviewer_contributions = defaultdict(lambda: {'weighted_sum': 0.0, 'total_weight': 0.0})
-        
-        for claim in claims:
-            claim_id = claim.get('id', '')
-            reviewer_id = claim_id.split('-')[0] if '-' in claim_id else None
-            
-            if reviewer_id and reviewer_id in weights and claim_id in verifications:
-                verification = verifications[claim_id]
-                result = verification.get('verification_result', '')
-                
-                # Base score from verification
-                if result == 'True':
-                    base_score = 1.0
-                elif result == 'Partially_True':
-                    base_score = 0.5
-                else:
-                    base_score = 0.0
-                
-                # Sentiment multiplier (positive claims get bonus)
-                sentiment = claim.get('sentiment', 'Neutral')
-                if sentiment == 'Positive':
-                    sentiment_mult = 1.1
-                elif sentiment == 'Negative':
-                    sentiment_mult = 0.9
-                else:
-                    sentiment_mult = 1.0
-                
-                adjusted_score = base_score * sentiment_mult
-                weight = weights[reviewer_id].get('weight', 0.5)
-                
-                reviewer_contributions[reviewer_id]['weighted_sum'] += adjusted_score * weight
-                reviewer_contributions[reviewer_id]['total_weight'] += weight
-        
-        total_weighted_score = 0.0
-        total_weight = 0.0
-        
-        for reviewer_id, contrib in reviewer_contributions.items():
-            if contrib['total_weight'] > 0:
-                reviewer_avg = contrib['weighted_sum'] / contrib['total_weight']
-                total_weighted_score += reviewer_avg * contrib['total_weight']
-                total_weight += contrib['total_weight']
-        
-        return total_weighted_score / total_weight if total_weight > 0 else 0.5
-    
-    sentiment_scores = []
-    for paper_data in all_papers_data:
-        claims_path = Path(f"data/processed/extracted/{paper_data['paper_id']}_claims.json")
-        verifications_path = Path(f"data/results/verifications/{paper_data['paper_id']}_verified.json")
-        weights_path = Path(f"data/results/weights/{paper_data['paper_id']}_weights.json")
-        
-        claims = []
-        if claims_path.exists():
-            with open(claims_path, 'r', encoding='utf-8') as f:
-                claims = json.load(f)
-        
-        verifications = {}
-        if verifications_path.exists():
-            with open(verifications_path, 'r', encoding='utf-8') as f:
-                verifications_list = json.load(f)
-                if isinstance(verifications_list, list):
-                    verifications = {v['id']: v for v in verifications_list}
-                else:
-                    verifications = verifications_list
-        
-        weights = {}
-        if weights_path.exists():
-            with open(weights_path, 'r', encoding='utf-8') as f:
-                weights = json.load(f)
-        
-        sentiment_score = calculate_sentiment_weighted_score(claims, verifications, weights)
-        sentiment_scores.append((paper_data['paper_id'], paper_data['ground_truth'], sentiment_score))
+    sentiment_scores = [
+        (paper_data['paper_id'], paper_data['ground_truth'], calculate_sentiment_weighted_score(paper_data))
+        for paper_data in all_papers_data
+    ]
     
     tp = sum(1 for pid, gt, score in sentiment_scores if gt == "Accepted" and score >= 0.5)
     tn = sum(1 for pid, gt, score in sentiment_scores if gt == "Rejected" and score < 0.5)
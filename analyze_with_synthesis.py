@@ -10,6 +10,9 @@ import re
 from pathlib import Path
 from typing import Dict, Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+from src.agents.synthesis_report import SynthesisResult
+
 # Set UTF-8 encoding for Windows
 if sys.platform == 'win32' and hasattr(sys.stdout, 'buffer'):
     try:
@@ -31,6 +34,19 @@ def get_ground_truth_status(paper_id: str) -> str:
     return "Unknown"
 
 
+def load_synthesis_result(paper_id: str) -> Optional[Dict]:
+    """Load structured synthesis result, falling back to parsing the markdown report"""
+    result = SynthesisResult.load(Path(f"data/results/synthesis/{paper_id}_synthesis.json"))
+    if result is not None:
+        return {
+            'overall_decision': result.overall_decision,
+            'average_score_10': result.average_score,
+            'topic_scores': result.topic_scores()
+        }
+    # Reports generated before structured output was available
+    return parse_synthesis_report(Path(f"data/results/synthesis/{paper_id}_report.md"))
+
+
 def parse_synthesis_report(report_path: Path) -> Optional[Dict]:
     """Parse synthesis report to extract scores and decision"""
     if not report_path.exists():
@@ -91,8 +107,7 @@ def main():
         if ground_truth == "Unknown":
             continue
         
-        report_path = Path(f"data/results/synthesis/{paper_id}_report.md")
-        synthesis_data = parse_synthesis_report(report_path)
+        synthesis_data = load_synthesis_result(paper_id)
         
         if synthesis_data and synthesis_data['overall_decision']:
             papers_with_synthesis.append({
@@ -121,7 +136,8 @@ def main():
     total = len(papers_with_synthesis)
     
     for paper in papers_with_synthesis:
-        prediction = paper['synthesis']['overall_decision']
+        # ACCEPT / REJECT -> Accepted / Rejected
+        prediction = "Accepted" if paper['synthesis']['overall_decision'] == "ACCEPT" else "Rejected"
         ground_truth = paper['ground_truth']
         is_correct = prediction == ground_truth
         
@@ -129,7 +145,8 @@ def main():
             correct += 1
         
         status = "✓" if is_correct else "✗"
-        avg_score = paper['synthesis'].get('average_score_10', 'N/A')
+        avg_score = paper['synthesis'].get('average_score_10')
+        avg_score = f"{avg_score:.2f}" if avg_score is not None else 'N/A'
         print(f"{status} {paper['paper_id']}: {ground_truth} -> {prediction} (avg score: {avg_score})")
     
     accuracy = correct / total if total > 0 else 0
@@ -0,0 +1,37 @@
+"""
+编排开销基准：使用确定性 Mock LLM 测量 Step 1 提取和 Step 2 验证在 LLM 之外的开销
+（提示构建、JSON 解析、检索、分组）
+"""
+
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("anthropic")
+
+from src.agents.extraction_agent import ExtractionAgent
+from src.agents.verification_agent import VerificationAgent
+from src.utils.rag import SimpleRAG
+
+
+def test_extraction_process_reviews(benchmark, mock_llm, reviews):
+    agent = ExtractionAgent(mock_llm)
+    claims = benchmark(agent.process_reviews, reviews)
+    assert claims
+
+
+def test_verification_process_claims(benchmark, mock_llm, claims, paper_text, paper_sections):
+    agent = VerificationAgent(mock_llm, SimpleRAG())
+    verifications = benchmark(agent.process_claims, claims, paper_text, paper_sections)
+    assert verifications
+
+
+def test_verification_process_claims_grouped(benchmark, mock_llm, claims, paper_text, paper_sections):
+    agent = VerificationAgent(mock_llm, SimpleRAG())
+    verifications = benchmark(agent.process_claims, claims, paper_text, paper_sections, grouped=True)
+    assert verifications
+
+
+def test_verification_group_claims(benchmark, mock_llm, claims, paper_text, paper_sections):
+    agent = VerificationAgent(mock_llm, SimpleRAG())
+    claims_to_verify = [claim for claim in claims if claim['substantiation_type'] != 'None']
+    benchmark(agent.group_claims, claims_to_verify, paper_text, paper_sections)
@@ -0,0 +1,41 @@
+"""
+PDF 解析基准：文本清理和章节切分吞吐量；设置 BENCH_PDF_DIR（或存在 data/raw/papers）时测量真实 PDF 解析
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+pytest.importorskip("PyPDF2")
+
+from src.data.pdf_parser import PDFParser
+
+
+def _pdf_files(limit: int = 5):
+    pdf_dir = Path(os.environ.get("BENCH_PDF_DIR", "data/raw/papers"))
+    return sorted(pdf_dir.glob("*.pdf"))[:limit] if pdf_dir.exists() else []
+
+
+def test_clean_text(benchmark, paper_text):
+    parser = PDFParser()
+    raw_text = paper_text.replace("\n", "\n   \n")
+    benchmark.extra_info['chars'] = len(raw_text)
+    benchmark(parser.clean_text, raw_text)
+
+
+def test_extract_sections(benchmark, paper_text):
+    parser = PDFParser()
+    benchmark.extra_info['chars'] = len(paper_text)
+    benchmark(parser.extract_sections, paper_text)
+
+
+@pytest.mark.parametrize("method", ["pdfplumber", "pypdf2"])
+def test_parse_pdf(benchmark, method):
+    pdf_files = _pdf_files()
+    if not pdf_files:
+        pytest.skip("No PDFs found (set BENCH_PDF_DIR)")
+    parser = PDFParser(method=method)
+    benchmark.extra_info['num_pdfs'] = len(pdf_files)
+    benchmark.pedantic(lambda: [parser.parse_pdf(str(path)) for path in pdf_files], rounds=3, iterations=1)
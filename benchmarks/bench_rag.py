@@ -0,0 +1,87 @@
+"""
+检索基准：SimpleRAG / EmbeddingRAG / HybridRAG / HierarchicalRAG / RerankingRAG 的建索引和查询延迟
+"""
+
+import os
+import pytest
+
+
+def _query_all(retrieve, queries):
+    for query in queries:
+        retrieve(query)
+
+
+def test_simple_rag_query(benchmark, paper_text, queries):
+    from src.utils.rag import SimpleRAG
+    rag = SimpleRAG()
+    benchmark(_query_all, lambda q: rag.retrieve_relevant_chunks(paper_text, q, top_k=5), queries)
+
+
+def test_simple_rag_query_section(benchmark, paper_text, paper_sections, queries):
+    from src.utils.rag import SimpleRAG
+    rag = SimpleRAG()
+    benchmark(_query_all, lambda q: rag.retrieve_relevant_chunks(
+        paper_text, q, top_k=5, target_section="Experiments", paper_sections=paper_sections
+    ), queries)
+
+
+def test_embedding_rag_build(benchmark, embedding_rag, paper_text, paper_sections):
+    benchmark.pedantic(embedding_rag.build_index, args=(paper_text,),
+                       kwargs={'paper_sections': paper_sections}, rounds=3, iterations=1)
+
+
+def test_embedding_rag_query(benchmark, embedding_rag, queries):
+    benchmark(_query_all, lambda q: embedding_rag.retrieve_relevant_chunks(q, top_k=5), queries)
+
+
+def test_embedding_rag_save_load(benchmark, embedding_rag, tmp_path):
+    path = str(tmp_path / "bench_index")
+    embedding_rag.save_index(path)
+    benchmark(embedding_rag.load_index, path)
+
+
+@pytest.fixture(scope="module")
+def hybrid_rag(embedding_model_name, paper_text, paper_sections):
+    from src.utils.hybrid_rag import HybridRAG
+    try:
+        rag = HybridRAG(embedding_model=embedding_model_name)
+    except Exception as e:
+        pytest.skip(f"Embedding model unavailable: {e}")
+    rag.build_index(paper_text, paper_sections=paper_sections)
+    return rag
+
+
+def test_hybrid_rag_query(benchmark, hybrid_rag, paper_text, queries):
+    benchmark(_query_all, lambda q: hybrid_rag.retrieve_relevant_chunks(paper_text, q, top_k=5), queries)
+
+
+@pytest.fixture(scope="module")
+def hierarchical_rag(embedding_model_name, paper_text, paper_sections):
+    from src.utils.hierarchical_rag import HierarchicalRAG
+    try:
+        rag = HierarchicalRAG(embedding_model=embedding_model_name)
+    except Exception as e:
+        pytest.skip(f"Embedding model unavailable: {e}")
+    rag.build_index(paper_text, paper_sections=paper_sections)
+    return rag
+
+
+def test_hierarchical_rag_query(benchmark, hierarchical_rag, queries):
+    benchmark(_query_all, lambda q: hierarchical_rag.get_context(q, top_k=5, max_chars=3000), queries)
+
+
+@pytest.fixture(scope="module")
+def reranking_rag(embedding_rag):
+    from src.utils.reranking_rag import RerankingRAG
+    rag = RerankingRAG(
+        base_rag=embedding_rag,
+        reranker_model=os.environ.get("BENCH_RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"),
+        initial_top_k=20
+    )
+    if rag.reranker is None:
+        pytest.skip("Reranker model unavailable")
+    return rag
+
+
+def test_reranking_rag_query(benchmark, reranking_rag, queries):
+    benchmark(_query_all, lambda q: reranking_rag.retrieve_relevant_chunks(query=q, top_k=5), queries)
@@ -0,0 +1,79 @@
+"""
+Step 3 / Step 4 基准：逐篇和语料级加权、合成投票、报告渲染以及评分方法批量评估
+"""
+
+import pytest
+
+from src.agents.weighting_agent import WeightingAgent
+from src.agents.synthesis_agent import SynthesisAgent
+from src.data.claim_table import ClaimTable
+from src.data.claims import ClaimSet
+
+
+@pytest.fixture(scope="module")
+def corpus_weights(corpus):
+    claims_by_paper, verifications_by_paper = corpus
+    return WeightingAgent().process_corpus(ClaimTable.from_corpus(claims_by_paper, verifications_by_paper))
+
+
+def test_weighting_per_paper(benchmark, corpus):
+    claims_by_paper, verifications_by_paper = corpus
+    agent = WeightingAgent()
+    benchmark(lambda: [
+        agent.process_all_reviewers(claims, verifications_by_paper[paper_id])
+        for paper_id, claims in claims_by_paper.items()
+    ])
+
+
+def test_weighting_claim_sets(benchmark, corpus):
+    claims_by_paper, verifications_by_paper = corpus
+    claim_sets = {paper_id: ClaimSet.build(claims, verifications_by_paper[paper_id])
+                  for paper_id, claims in claims_by_paper.items()}
+    agent = WeightingAgent()
+    benchmark(lambda: [agent.process_all_reviewers(claim_set) for claim_set in claim_sets.values()])
+
+
+def test_claim_set_build(benchmark, corpus):
+    claims_by_paper, verifications_by_paper = corpus
+    benchmark(lambda: [
+        ClaimSet.build(claims, verifications_by_paper[paper_id])
+        for paper_id, claims in claims_by_paper.items()
+    ])
+
+
+def test_weighting_corpus(benchmark, corpus):
+    claims_by_paper, verifications_by_paper = corpus
+    agent = WeightingAgent()
+    benchmark(lambda: agent.process_corpus(ClaimTable.from_corpus(claims_by_paper, verifications_by_paper)))
+
+
+def test_synthesis_synthesize(benchmark, corpus, corpus_weights):
+    claims_by_paper, verifications_by_paper = corpus
+    agent = SynthesisAgent(overall_threshold=5.0)
+    benchmark(lambda: [
+        agent.synthesize(paper_id, claims, verifications_by_paper[paper_id], corpus_weights[paper_id])
+        for paper_id, claims in claims_by_paper.items()
+    ])
+
+
+def test_synthesis_render_report(benchmark, corpus, corpus_weights):
+    claims_by_paper, verifications_by_paper = corpus
+    agent = SynthesisAgent(overall_threshold=5.0)
+    results = [
+        agent.synthesize(paper_id, claims, verifications_by_paper[paper_id], corpus_weights[paper_id])
+        for paper_id, claims in claims_by_paper.items()
+    ]
+    benchmark(lambda: [agent.render_report(result) for result in results])
+
+
+def test_evaluate_scorers(benchmark, corpus, corpus_weights):
+    from src.scoring import CorpusFrame, evaluate_scorers
+    claims_by_paper, verifications_by_paper = corpus
+    paper_ids = list(claims_by_paper)
+    ground_truth = {paper_id: ("Accepted" if i % 3 == 0 else "Rejected") for i, paper_id in enumerate(paper_ids)}
+
+    def run():
+        frame = CorpusFrame.from_corpus(paper_ids, claims_by_paper, verifications_by_paper, corpus_weights)
+        return evaluate_scorers(frame, ground_truth)
+
+    benchmark(run)
@@ -0,0 +1,82 @@
+"""
+基准测试共用 fixtures
+
+运行：pytest benchmarks/（需要 pytest-benchmark），见 scripts/run_benchmarks.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fixtures import make_paper_text, make_reviews, make_claims, make_corpus
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    # 没有安装 pytest-benchmark 时不收集基准（benchmark fixture 不存在）
+    print("[WARNING] pytest-benchmark not installed, skipping benchmarks (pip install pytest-benchmark)")
+    collect_ignore_glob = ["bench_*.py"]
+
+
+@pytest.fixture(scope="session")
+def paper_text():
+    return make_paper_text(seed=0)
+
+
+@pytest.fixture(scope="session")
+def paper_sections(paper_text):
+    pytest.importorskip("pdfplumber")
+    from src.data.pdf_parser import PDFParser
+    return PDFParser().extract_sections(paper_text)
+
+
+@pytest.fixture(scope="session")
+def reviews():
+    return make_reviews(seed=0)
+
+
+@pytest.fixture(scope="session")
+def claims(reviews):
+    return make_claims(reviews, seed=0)
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    return make_corpus(num_papers=200, seed=0)
+
+
+@pytest.fixture(scope="session")
+def queries(claims):
+    return [f"{claim['statement']} {claim['substantiation_content'] or ''}" for claim in claims[:20]]
+
+
+@pytest.fixture
+def mock_llm():
+    from src.utils.mock_llm import MockLLMClient
+    return MockLLMClient(seed=0)
+
+
+@pytest.fixture(scope="session")
+def embedding_model_name():
+    """Embedding 模型（可用 BENCH_EMBEDDING_MODEL 覆盖），无法加载时跳过语义检索基准"""
+    pytest.importorskip("sentence_transformers")
+    pytest.importorskip("faiss")
+    return os.environ.get("BENCH_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+
+
+@pytest.fixture(scope="session")
+def embedding_rag(embedding_model_name, paper_text, paper_sections):
+    from src.utils.embedding_rag import EmbeddingRAG
+    try:
+        rag = EmbeddingRAG(model_name=embedding_model_name)
+    except Exception as e:
+        pytest.skip(f"Embedding model unavailable: {e}")
+    rag.build_index(paper_text, paper_sections=paper_sections)
+    return rag
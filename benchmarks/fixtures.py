@@ -0,0 +1,143 @@
+"""
+基准测试用的合成数据
+生成确定性的论文文本、评审文本以及语料级 claims / verifications，不依赖下载的数据集
+"""
+
+import random
+from typing import Dict, List, Tuple
+
+
+SECTION_TITLES = [
+    "Abstract", "1 Introduction", "2 Related Work", "3 Methodology", "4 Experiments",
+    "5 Results", "6 Discussion", "7 Conclusion", "References"
+]
+
+_VOCABULARY = (
+    "model training dataset baseline accuracy transformer attention layer benchmark ablation "
+    "generalization robustness optimization gradient loss convergence representation embedding "
+    "retrieval evaluation metric performance improvement theorem proof assumption bound variance "
+    "sample efficiency architecture parameter hyperparameter regularization augmentation inference "
+    "latency memory scalability reproducibility code implementation analysis experiment result"
+).split()
+
+_REVIEW_SENTENCES = [
+    "The proposed method is novel compared with prior work on {term}.",
+    "The experiments on {term} are not convincing because the baselines are weak.",
+    "Table 2 shows a clear improvement in {term} over the strongest baseline.",
+    "The writing is clear and the paper is well organized.",
+    "The contribution to {term} is significant for the community.",
+    "The authors do not release code, which hurts reproducibility of the {term} results.",
+    "The ablation in Section 4 does not isolate the effect of {term}.",
+    "Some hyperparameter choices for {term} are not justified.",
+    "The theoretical analysis of {term} relies on a strong assumption.",
+    "Figure 3 is hard to read and the presentation could be improved.",
+]
+
+
+def make_sentence(rng: random.Random, min_words: int = 8, max_words: int = 20) -> str:
+    words = rng.choices(_VOCABULARY, k=rng.randint(min_words, max_words))
+    return " ".join(words).capitalize() + "."
+
+
+def make_paper_text(paragraphs_per_section: int = 6, sentences_per_paragraph: int = 6, seed: int = 0) -> str:
+    """
+    生成带章节标题的论文文本（约 paragraphs_per_section * 9 段）
+
+    Args:
+        paragraphs_per_section: 每个章节的段落数
+        sentences_per_paragraph: 每段的句子数
+        seed: 随机种子
+
+    Returns:
+        论文文本
+    """
+    rng = random.Random(seed)
+    lines = []
+    for title in SECTION_TITLES:
+        lines.append(title)
+        for _ in range(paragraphs_per_section):
+            lines.append(" ".join(make_sentence(rng) for _ in range(sentences_per_paragraph)))
+            lines.append("")
+    return "\n".join(lines)
+
+
+def make_reviews(num_reviewers: int = 4, sentences_per_review: int = 10, seed: int = 0) -> List[Dict]:
+    """
+    生成评审列表（格式与 ExtractionAgent.process_reviews 的输入一致）
+
+    Args:
+        num_reviewers: reviewer 数
+        sentences_per_review: 每条评审的句子数
+        seed: 随机种子
+
+    Returns:
+        [{'reviewer_id': 'R1', 'content': ...}, ...]
+    """
+    rng = random.Random(seed)
+    reviews = []
+    for r in range(num_reviewers):
+        sentences = [
+            rng.choice(_REVIEW_SENTENCES).format(term=rng.choice(_VOCABULARY))
+            for _ in range(sentences_per_review)
+        ]
+        reviews.append({'reviewer_id': f"R{r + 1}", 'content': " ".join(sentences)})
+    return reviews
+
+
+def make_claims(reviews: List[Dict], seed: int = 0) -> List[Dict]:
+    """把合成评审的每个句子当作一个观点（用于不经过 Step 1 的验证基准）"""
+    rng = random.Random(seed)
+    claims = []
+    for review in reviews:
+        sentences = [s.strip() + "." for s in review['content'].split(".") if s.strip()]
+        for i, sentence in enumerate(sentences):
+            substantiation_type = rng.choice(["Specific_Citation", "Vague", "None"])
+            claims.append({
+                'id': f"{review['reviewer_id']}-C{i + 1}",
+                'topic': rng.choice(["Novelty", "Experiments", "Writing", "Significance", "Reproducibility"]),
+                'sentiment': rng.choice(["Positive", "Negative", "Neutral"]),
+                'statement': sentence,
+                'substantiation_type': substantiation_type,
+                'substantiation_content': sentence if substantiation_type != "None" else None
+            })
+    return claims
+
+
+def make_corpus(num_papers: int = 200, seed: int = 0) -> Tuple[Dict[str, List[Dict]], Dict[str, Dict[str, Dict]]]:
+    """
+    生成语料级 claims 和 verifications（用于 Step 3 / Step 4 基准）
+
+    Args:
+        num_papers: 论文数
+        seed: 随机种子
+
+    Returns:
+        (claims_by_paper, verifications_by_paper)
+    """
+    rng = random.Random(seed)
+    claims_by_paper, verifications_by_paper = {}, {}
+    for p in range(num_papers):
+        paper_id = f"paper_{p:05d}"
+        claims, verifications = [], {}
+        for r in range(rng.randint(2, 5)):
+            for c in range(rng.randint(3, 10)):
+                claim_id = f"R{r + 1}-C{c + 1}"
+                substantiation_type = rng.choice(["Specific_Citation", "Vague", "None"])
+                claims.append({
+                    'id': claim_id,
+                    'topic': rng.choice(["Novelty", "Experiments", "Writing", "Significance", "Reproducibility"]),
+                    'sentiment': rng.choice(["Positive", "Negative", "Neutral"]),
+                    'statement': make_sentence(rng),
+                    'substantiation_type': substantiation_type,
+                    'substantiation_content': None
+                })
+                if substantiation_type != "None":
+                    verifications[claim_id] = {
+                        'id': claim_id,
+                        'verification_result': rng.choice(["True", "False", "Partially_True"]),
+                        'verification_reason': "synthetic",
+                        'confidence': round(rng.uniform(0.3, 0.95), 2)
+                    }
+        claims_by_paper[paper_id] = claims
+        verifications_by_paper[paper_id] = verifications
+    return claims_by_paper, verifications_by_paper
@@ -1,75 +1,100 @@
 """检查所有步骤的处理结果"""
 
-import json
+import sys
 from pathlib import Path
 
-papers = ['paper_19076', 'paper_19094', 'paper_21497']
-
-print("=" * 70)
-print("Pipeline 处理结果总结")
-print("=" * 70)
-print()
-
-# Step 1: Claims
-print("Step 1: 观点提取 (Claims Extraction)")
-print("-" * 70)
-for paper_id in papers:
-    file_path = Path(f"data/processed/extracted/{paper_id}_claims.json")
-    if file_path.exists():
-        with open(file_path, 'r', encoding='utf-8') as f:
-            claims = json.load(f)
-        print(f"  {paper_id}: {len(claims)} claims")
-    else:
-        print(f"  {paper_id}: 未找到")
-print()
-
-# Step 2: Verifications
-print("Step 2: 事实验证 (Fact Verification)")
-print("-" * 70)
-total_verified = 0
-for paper_id in papers:
-    file_path = Path(f"data/results/verifications/{paper_id}_verified.json")
-    if file_path.exists():
-        with open(file_path, 'r', encoding='utf-8') as f:
-            verifications = json.load(f)
-        true_count = sum(1 for v in verifications if v['verification_result'] == 'True')
-        false_count = sum(1 for v in verifications if v['verification_result'] == 'False')
-        partial_count = sum(1 for v in verifications if v['verification_result'] == 'Partially_True')
-        print(f"  {paper_id}: {len(verifications)} verified (T:{true_count}, F:{false_count}, P:{partial_count})")
-        total_verified += len(verifications)
-    else:
-        print(f"  {paper_id}: 未找到")
-print(f"  总计: {total_verified} verified claims")
-print()
-
-# Step 3: Weights
-print("Step 3: 权重计算 (Weight Calculation)")
-print("-" * 70)
-for paper_id in papers:
-    file_path = Path(f"data/results/weights/{paper_id}_weights.json")
-    if file_path.exists():
-        with open(file_path, 'r', encoding='utf-8') as f:
-            weights = json.load(f)
-        print(f"  {paper_id}: {len(weights)} reviewers")
-        for reviewer_id, data in weights.items():
-            print(f"    - {reviewer_id}: weight={data['weight']:.3f}")
-    else:
-        print(f"  {paper_id}: 未找到")
-print()
-
-# Step 4: Reports
-print("Step 4: 合成报告 (Synthesis Report)")
-print("-" * 70)
-for paper_id in papers:
-    file_path = Path(f"data/results/synthesis/{paper_id}_report.md")
-    if file_path.exists():
-        file_size = file_path.stat().st_size
-        print(f"  {paper_id}: {file_size:,} bytes - {file_path}")
-    else:
-        print(f"  {paper_id}: 未找到")
-print()
-
-print("=" * 70)
-print("所有步骤处理完成！")
-print("=" * 70)
+from src.evaluation.runner import AnalysisRunner
 
+
+def report_path(paper_id):
+    return Path(f"data/results/synthesis/{paper_id}_report.md")
+
+
+def check_paper(paper_id, loader):
+    """单篇论文各步骤的输出摘要（由分析运行器并行计算并按输入哈希缓存）"""
+    result = {'claims': None, 'verifications': None, 'weights': None, 'report_size': None}
+    if loader.has_result(paper_id, 'claims'):
+        result['claims'] = len(loader.load_claims(paper_id))
+    if loader.has_result(paper_id, 'verifications'):
+        verifications = loader.load_verifications(paper_id).values()
+        result['verifications'] = {
+            'total': len(verifications),
+            'true': sum(1 for v in verifications if v['verification_result'] == 'True'),
+            'false': sum(1 for v in verifications if v['verification_result'] == 'False'),
+            'partial': sum(1 for v in verifications if v['verification_result'] == 'Partially_True')
+        }
+    if loader.has_result(paper_id, 'weights'):
+        result['weights'] = {reviewer_id: data['weight'] for reviewer_id, data in loader.load_weights(paper_id).items()}
+    if report_path(paper_id).exists():
+        result['report_size'] = report_path(paper_id).stat().st_size
+    return result
+
+
+def main():
+    runner = AnalysisRunner("check_all_results", check_paper, extra_inputs=lambda paper_id: [report_path(paper_id)])
+    # 命令行给出论文 ID 时只检查这些论文，否则检查所有已有 Step 1 输出的论文
+    papers = sys.argv[1:] or runner.paper_ids()
+    results = runner.map(papers)
+
+    print("=" * 70)
+    print("Pipeline 处理结果总结")
+    print("=" * 70)
+    print()
+
+    # Step 1: Claims
+    print("Step 1: 观点提取 (Claims Extraction)")
+    print("-" * 70)
+    for paper_id in papers:
+        num_claims = results.get(paper_id, {}).get('claims')
+        if num_claims is not None:
+            print(f"  {paper_id}: {num_claims} claims")
+        else:
+            print(f"  {paper_id}: 未找到")
+    print()
+
+    # Step 2: Verifications
+    print("Step 2: 事实验证 (Fact Verification)")
+    print("-" * 70)
+    total_verified = 0
+    for paper_id in papers:
+        counts = results.get(paper_id, {}).get('verifications')
+        if counts is not None:
+            print(f"  {paper_id}: {counts['total']} verified (T:{counts['true']}, F:{counts['false']}, P:{counts['partial']})")
+            total_verified += counts['total']
+        else:
+            print(f"  {paper_id}: 未找到")
+    print(f"  总计: {total_verified} verified claims")
+    print()
+
+    # Step 3: Weights
+    print("Step 3: 权重计算 (Weight Calculation)")
+    print("-" * 70)
+    for paper_id in papers:
+        weights = results.get(paper_id, {}).get('weights')
+        if weights is not None:
+            print(f"  {paper_id}: {len(weights)} reviewers")
+            for reviewer_id, weight in weights.items():
+                print(f"    - {reviewer_id}: weight={weight:.3f}")
+        else:
+            print(f"  {paper_id}: 未找到")
+    print()
+
+    # Step 4: Reports
+    print("Step 4: 合成报告 (Synthesis Report)")
+    print("-" * 70)
+    for paper_id in papers:
+        file_size = results.get(paper_id, {}).get('report_size')
+        if file_size is not None:
+            print(f"  {paper_id}: {file_size:,} bytes - {report_path(paper_id)}")
+        else:
+            print(f"  {paper_id}: 未找到")
+    print()
+
+    print("=" * 70)
+    print("所有步骤处理完成！")
+    print(f"[INFO] {runner.stats}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,8 @@ All outputs in English
 
 import sys
 import io
-import json
-from pathlib import Path
-from typing import Dict
+import argparse
+from src.data.feature_store import FeatureStore
 
 # Set UTF-8 encoding for Windows
 if sys.platform == 'win32' and hasattr(sys.stdout, 'buffer'):
@@ -18,131 +17,27 @@ if sys.platform == 'win32' and hasattr(sys.stdout, 'buffer'):
         pass
 
 
-def get_ground_truth_status(paper_id: str) -> str:
-    """Get ground truth acceptance status"""
-    accepted_path = Path(f"data/raw/iclr2024/papers/accepted/{paper_id}.pdf")
-    rejected_path = Path(f"data/raw/iclr2024/papers/rejected/{paper_id}.pdf")
-    
-    if accepted_path.exists():
-        return "Accepted"
-    elif rejected_path.exists():
-        return "Rejected"
-    return "Unknown"
-
-
-def calculate_weighted_verification_score(verifications: Dict, weights: Dict) -> float:
-    """Calculate weighted verification score"""
-    if not verifications or not weights:
-        return 0.5
-    
-    reviewer_scores = {}
-    reviewer_weights = {}
-    
-    for claim_id, verification in verifications.items():
-        reviewer_id = claim_id.split('-')[0] if '-' in claim_id else None
-        
-        if reviewer_id and reviewer_id in weights:
-            if reviewer_id not in reviewer_scores:
-                reviewer_scores[reviewer_id] = []
-                reviewer_weights[reviewer_id] = weights[reviewer_id].get('weight', 0.5)
-            
-            result = verification.get('verification_result', '')
-            if result == 'True':
-                reviewer_scores[reviewer_id].append(1.0)
-            elif result == 'Partially_True':
-                reviewer_scores[reviewer_id].append(0.5)
-            else:
-                reviewer_scores[reviewer_id].append(0.0)
-    
-    total_weighted_score = 0.0
-    total_weight = 0.0
-    
-    for reviewer_id, scores in reviewer_scores.items():
-        if scores:
-            avg_score = sum(scores) / len(scores)
-            weight = reviewer_weights[reviewer_id]
-            total_weighted_score += avg_score * weight
-            total_weight += weight
-    
-    if total_weight > 0:
-        return total_weighted_score / total_weight
-    else:
-        return 0.5
+def parse_args():
+    parser = argparse.ArgumentParser(description="Detailed prediction analysis with per-paper scores")
+    parser.add_argument("--config", type=str, default="config.yaml", help="Config file path")
+    parser.add_argument("--db-path", type=str, help="Feature database path (overrides features.db_path in the config)")
+    return parser.parse_args()
 
 
 def main():
     """Main function"""
+    args = parse_args()
     print("="*70)
     print("DETAILED PREDICTION ANALYSIS")
     print("="*70)
     print()
     
-    # Find all ICLR papers
-    accepted_dir = Path("data/raw/iclr2024/papers/accepted")
-    rejected_dir = Path("data/raw/iclr2024/papers/rejected")
-    
-    paper_ids = []
-    if accepted_dir.exists():
-        paper_ids.extend([f.stem for f in accepted_dir.glob("*.pdf")])
-    if rejected_dir.exists():
-        paper_ids.extend([f.stem for f in rejected_dir.glob("*.pdf")])
-    
-    # Load data for each paper
-    papers_data = []
-    for paper_id in paper_ids:
-        ground_truth = get_ground_truth_status(paper_id)
-        if ground_truth == "Unknown":
-            continue
-        
-        # Load verifications
-        verifications_path = Path(f"data/results/verifications/{paper_id}_verified.json")
-        verifications = {}
-        if verifications_path.exists():
-            with open(verifications_path, 'r', encoding='utf-8') as f:
-                verifications_list = json.load(f)
-                if isinstance(verifications_list, list):
-                    verifications = {v['id']: v for v in verifications_list}
-                else:
-                    verifications = verifications_list
-        
-        # Load weights
-        weights_path = Path(f"data/results/weights/{paper_id}_weights.json")
-        weights = {}
-        if weights_path.exists():
-            with open(weights_path, 'r', encoding='utf-8') as f:
-                weights = json.load(f)
-        
-        # Calculate scores
-        weighted_score = calculate_weighted_verification_score(verifications, weights)
-        
-        # Count verification results
-        true_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'True')
-        false_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'False')
-        partial_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'Partially_True')
-        total_verified = len(verifications)
-        
-        # Calculate true rate
-        true_rate = true_count / total_verified if total_verified > 0 else 0
-        false_rate = false_count / total_verified if total_verified > 0 else 0
-        
-        # Prediction
-        prediction = "Accepted" if weighted_score >= 0.5 else "Rejected"
-        correct = prediction == ground_truth
-        
-        papers_data.append({
-            'paper_id': paper_id,
-            'ground_truth': ground_truth,
-            'prediction': prediction,
-            'correct': correct,
-            'weighted_score': weighted_score,
-            'true_rate': true_rate,
-            'false_rate': false_rate,
-            'true_count': true_count,
-            'false_count': false_count,
-            'partial_count': partial_count,
-            'total_verified': total_verified,
-            'avg_reviewer_weight': sum(w.get('weight', 0) for w in weights.values()) / len(weights) if weights else 0
-        })
+    # Load per-paper features and predict with the weighted verification score
+    papers_data = FeatureStore.from_config(args.config, args.db_path).papers(labeled_only=True)
+    for paper in papers_data:
+        paper['prediction'] = "Accepted" if paper['weighted_score'] >= 0.5 else "Rejected"
+        paper['correct'] = paper['prediction'] == paper['ground_truth']
+        paper['avg_reviewer_weight'] = paper['avg_reviewer_weight'] or 0
     
     # Sort by ground truth, then by score
     papers_data.sort(key=lambda x: (x['ground_truth'], -x['weighted_score']))
@@ -161,7 +56,7 @@ def main():
         print(f"  Ground Truth: {paper['ground_truth']}")
         print(f"  Prediction: {paper['prediction']}")
         print(f"  Weighted Score: {paper['weighted_score']:.3f} (threshold: 0.5)")
-        print(f"  Verification: {paper['total_verified']} total | "
+        print(f"  Verification: {paper['num_verified']} total | "
               f"True: {paper['true_count']} ({paper['true_rate']*100:.1f}%) | "
               f"False: {paper['false_count']} ({paper['false_rate']*100:.1f}%) | "
               f"Partial: {paper['partial_count']}")
@@ -177,7 +72,7 @@ def main():
         print(f"  Ground Truth: {paper['ground_truth']}")
         print(f"  Prediction: {paper['prediction']}")
         print(f"  Weighted Score: {paper['weighted_score']:.3f} (threshold: 0.5)")
-        print(f"  Verification: {paper['total_verified']} total | "
+        print(f"  Verification: {paper['num_verified']} total | "
               f"True: {paper['true_count']} ({paper['true_rate']*100:.1f}%) | "
               f"False: {paper['false_count']} ({paper['false_rate']*100:.1f}%) | "
               f"Partial: {paper['partial_count']}")
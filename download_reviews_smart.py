@@ -1,8 +1,7 @@
-"""智能下载 reviews - 等待足够长时间避免 429"""
+"""智能下载 reviews - 通过共享限流器控制请求速率避免 429"""
 import sys
 sys.path.insert(0, '.')
-from src.data.downloader import NIPSDownloader
-import time
+from src.data.crawler import OpenReviewCrawler
 from datetime import datetime
 
 # 论文信息
@@ -12,48 +11,32 @@ papers = [
     ('paper_19076', 'gojL67CfS8', 'Visual Autoregressive Modeling'),
 ]
 
-downloader = NIPSDownloader()
+crawler = OpenReviewCrawler(domain="NeurIPS.cc/2024/Conference")
 
 print("=" * 70)
 print("智能下载 Reviews")
 print("=" * 70)
-print("\n策略：每次请求间隔 3 分钟，避免 429 错误")
+print("\n策略：请求速率由限流器控制，遇到 429 时按 Retry-After 暂停并自动降速")
 print(f"开始时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
 
-for i, (paper_id, forum_id, title) in enumerate(papers, 1):
+results = crawler.crawl(
+    [{'paper_id': paper_id, 'forum_id': forum_id} for paper_id, forum_id, _ in papers],
+    pdf=False
+)
+
+for (paper_id, forum_id, title), result in zip(papers, results):
     print(f"\n{'='*70}")
-    print(f"论文 {i}/{len(papers)}: {paper_id}")
+    print(f"论文: {paper_id}")
     print(f"标题: {title}")
     print(f"Forum ID: {forum_id}")
     print(f"{'='*70}")
-    
-    if i > 1:
-        wait_seconds = 180  # 3 分钟
-        print(f"\n等待 {wait_seconds} 秒（3分钟）以避免 API 频率限制...")
-        print(f"开始等待: {datetime.now().strftime('%H:%M:%S')}")
-        for remaining in range(wait_seconds, 0, -30):
-            print(f"  剩余 {remaining} 秒...", end='\r')
-            time.sleep(min(30, remaining))
-        print(f"\n等待完成: {datetime.now().strftime('%H:%M:%S')}\n")
-    
-    print(f"开始下载 reviews...")
-    reviews = downloader.download_reviews(paper_id, forum_id)
-    
-    print(f"\n结果: 获取到 {len(reviews)} 个 reviews")
-    
-    if reviews:
-        print("\nReviews 详情:")
-        for r in reviews:
-            content_len = len(r.get('content', ''))
-            print(f"  - {r['reviewer_id']}: {content_len} 字符, Rating: {r.get('rating', 'N/A')}")
-            if r.get('content'):
-                print(f"    预览: {r['content'][:150]}...")
+
+    reviews_path = crawler.download_path / "reviews" / f"{paper_id}_reviews.json"
+    if result['num_reviews']:
+        print(f"\n结果: 获取到 {result['num_reviews']} 个 reviews -> {reviews_path}")
     else:
         print("  [WARNING] 未获取到 reviews")
-    
-    print()
 
 print("=" * 70)
 print(f"完成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print("=" * 70)
-
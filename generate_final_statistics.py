@@ -17,88 +17,67 @@ if sys.platform == 'win32' and hasattr(sys.stdout, 'buffer'):
     except:
         pass
 
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent))
 
-def get_ground_truth_status(paper_id):
-    """Get ground truth acceptance status"""
-    accepted_path = Path(f"data/raw/iclr2024/papers/accepted/{paper_id}.pdf")
-    rejected_path = Path(f"data/raw/iclr2024/papers/rejected/{paper_id}.pdf")
-    
-    if accepted_path.exists():
-        return "Accepted"
-    elif rejected_path.exists():
-        return "Rejected"
-    return "Unknown"
+from src.evaluation.ground_truth import load_ground_truth
+from src.evaluation.runner import AnalysisRunner
 
 
-def load_all_results():
-    """Load all pipeline results"""
-    results = {}
-    
-    claims_dir = Path("data/processed/extracted")
-    verifications_dir = Path("data/results/verifications")
-    weights_dir = Path("data/results/weights")
+def analyze_paper(paper_id, loader):
+    """Per-paper aggregates of the pipeline results (cached by the analysis runner)"""
+    result = {
+        'paper_id': paper_id,
+        'ground_truth': None,
+        'step1': {},
+        'step2': {},
+        'step3': {}
+    }
     
-    paper_ids = set()
-    for claims_file in claims_dir.glob("*_claims.json"):
-        paper_id = claims_file.stem.replace("_claims", "")
-        paper_ids.add(paper_id)
+    # Step 1
+    claims = loader.load_claims(paper_id)
+    result['step1'] = {
+        'num_claims': len(claims)
+    }
     
-    for paper_id in paper_ids:
-        ground_truth = get_ground_truth_status(paper_id)
-        if ground_truth == "Unknown":
-            continue  # Skip non-ICLR papers
+    # Step 2
+    if loader.has_result(paper_id, 'verifications'):
+        verifications = loader.load_verifications(paper_id)
         
-        result = {
-            'paper_id': paper_id,
-            'ground_truth': ground_truth,
-            'step1': {},
-            'step2': {},
-            'step3': {}
-        }
+        true_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'True')
+        false_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'False')
+        partial_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'Partially_True')
         
-        # Step 1
-        claims_file = claims_dir / f"{paper_id}_claims.json"
-        if claims_file.exists():
-            with open(claims_file, 'r', encoding='utf-8') as f:
-                claims = json.load(f)
-                result['step1'] = {
-                    'num_claims': len(claims),
-                    'claims': claims
-                }
-        
-        # Step 2
-        verifications_file = verifications_dir / f"{paper_id}_verified.json"
-        if verifications_file.exists():
-            with open(verifications_file, 'r', encoding='utf-8') as f:
-                verifications = json.load(f)
-                if isinstance(verifications, list):
-                    verifications = {v['id']: v for v in verifications}
-                
-                true_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'True')
-                false_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'False')
-                partial_count = sum(1 for v in verifications.values() if v.get('verification_result') == 'Partially_True')
-                
-                result['step2'] = {
-                    'num_verified': len(verifications),
-                    'true_count': true_count,
-                    'false_count': false_count,
-                    'partial_count': partial_count,
-                    'verifications': verifications
-                }
-        
-        # Step 3
-        weights_file = weights_dir / f"{paper_id}_weights.json"
-        if weights_file.exists():
-            with open(weights_file, 'r', encoding='utf-8') as f:
-                weights = json.load(f)
-                result['step3'] = {
-                    'num_reviewers': len(weights),
-                    'weights': weights,
-                    'avg_weight': sum(v.get('weight', 0) for v in weights.values()) / len(weights) if weights else 0
-                }
-        
-        results[paper_id] = result
+        result['step2'] = {
+            'num_verified': len(verifications),
+            'true_count': true_count,
+            'false_count': false_count,
+            'partial_count': partial_count
+        }
+    
+    # Step 3
+    if loader.has_result(paper_id, 'weights'):
+        weights = loader.load_weights(paper_id)
+        result['step3'] = {
+            'num_reviewers': len(weights),
+            'avg_weight': sum(v.get('weight', 0) for v in weights.values()) / len(weights) if weights else 0
+        }
+    
+    return result
+
+
+def load_all_results():
+    """Load all pipeline results (per-paper results are computed in parallel and cached by input hash)"""
+    runner = AnalysisRunner("final_statistics", analyze_paper, version=2)
+    
+    # Skip non-ICLR papers
+    all_paper_ids = runner.paper_ids()
+    ground_truth = load_ground_truth(all_paper_ids)
+    results = runner.map([paper_id for paper_id in all_paper_ids if paper_id in ground_truth])
+    for paper_id, result in results.items():
+        result['ground_truth'] = ground_truth[paper_id]
     
+    print(f"[INFO] {runner.stats}")
     return results
 
 
@@ -23,58 +23,14 @@ sys.path.insert(0, str(project_root))
 from src.pipeline import EVWPipeline
 
 
-def get_iclr_papers():
-    """Get ICLR 2024 paper IDs"""
-    accepted_dir = Path("data/raw/iclr2024/papers/accepted")
-    rejected_dir = Path("data/raw/iclr2024/papers/rejected")
-    
-    accepted_papers = []
-    rejected_papers = []
-    
-    if accepted_dir.exists():
-        accepted_papers = [f.stem for f in accepted_dir.glob("*.pdf")]
-    
-    if rejected_dir.exists():
-        rejected_papers = [f.stem for f in rejected_dir.glob("*.pdf")]
-    
+def get_iclr_papers(pipeline):
+    """Get ICLR 2024 paper IDs (read in place through the corpus resolver, see `corpus` in config.yaml)"""
+    resolver = pipeline.data_loader.resolver
+    accepted_papers = resolver.papers(venue="ICLR2024", status="accepted", require_pdf=True)
+    rejected_papers = resolver.papers(venue="ICLR2024", status="rejected", require_pdf=True)
     return accepted_papers[:5], rejected_papers[:5]
 
 
-def setup_iclr_paper_paths(paper_id, paper_type):
-    """Setup symlinks or copy files to expected paths for ICLR papers"""
-    from pathlib import Path
-    import shutil
-    
-    base_path = Path("data")
-    
-    # Source paths
-    if paper_type == "Accepted":
-        src_pdf = Path(f"data/raw/iclr2024/papers/accepted/{paper_id}.pdf")
-    else:
-        src_pdf = Path(f"data/raw/iclr2024/papers/rejected/{paper_id}.pdf")
-    
-    src_reviews = Path(f"data/raw/iclr2024/reviews/{paper_id}_reviews.json")
-    
-    # Target paths (expected by DataLoader)
-    target_pdf = base_path / "raw" / "papers" / f"{paper_id}.pdf"
-    target_reviews = base_path / "raw" / "reviews" / f"{paper_id}_reviews.json"
-    
-    # Create symlinks or copy files
-    if src_pdf.exists() and not target_pdf.exists():
-        target_pdf.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            target_pdf.symlink_to(src_pdf.absolute())
-        except:
-            shutil.copy2(src_pdf, target_pdf)
-    
-    if src_reviews.exists() and not target_reviews.exists():
-        target_reviews.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            target_reviews.symlink_to(src_reviews.absolute())
-        except:
-            shutil.copy2(src_reviews, target_reviews)
-
-
 def run_steps_for_paper(pipeline, paper_id, paper_type):
     """Run steps 1, 2, 3 for a single paper"""
     print(f"\n{'='*70}")
@@ -226,7 +182,7 @@ def main():
         return
     
     # Get paper lists
-    accepted_papers, rejected_papers = get_iclr_papers()
+    accepted_papers, rejected_papers = get_iclr_papers(pipeline)
     
     print(f"[INFO] Found {len(accepted_papers)} accepted papers and {len(rejected_papers)} rejected papers")
     print(f"[INFO] Processing {min(5, len(accepted_papers))} accepted and {min(5, len(rejected_papers))} rejected papers\n")
@@ -235,7 +191,6 @@ def main():
     
     # Process accepted papers
     for paper_id in accepted_papers[:5]:
-        setup_iclr_paper_paths(paper_id, "Accepted")
         result = run_steps_for_paper(pipeline, paper_id, "Accepted")
         result['paper_type'] = 'Accepted'
         result['ground_truth'] = 'Accepted'
@@ -243,7 +198,6 @@ def main():
     
     # Process rejected papers
     for paper_id in rejected_papers[:5]:
-        setup_iclr_paper_paths(paper_id, "Rejected")
         result = run_steps_for_paper(pipeline, paper_id, "Rejected")
         result['paper_type'] = 'Rejected'
         result['ground_truth'] = 'Rejected'
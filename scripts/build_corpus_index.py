@@ -0,0 +1,59 @@
+"""
+构建语料索引
+扫描 config.yaml 中 corpus.roots 配置的各语料根目录，写入索引文件并按会议 / 状态统计论文数
+"""
+
+import sys
+import json
+import argparse
+from collections import Counter
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import yaml
+from src.data.corpus import CorpusResolver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="构建语料索引")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--venue", type=str, help="只列出该会议的论文")
+    parser.add_argument("--status", type=str, help="只列出该状态的论文（如 accepted）")
+    parser.add_argument("--list", action="store_true", help="打印论文 ID 列表")
+    parser.add_argument("--output", type=str, help="保存论文 ID 列表的 JSON 路径（可选）")
+
+    args = parser.parse_args()
+
+    with open(project_root / args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+
+    resolver = CorpusResolver.from_config(config.get('corpus'))
+    index = resolver.build_index()
+    print(f"[INFO] Indexed {len(index)} papers from {len(resolver.roots)} roots"
+          + (f" -> {resolver.index_path}" if resolver.index_path else ""))
+
+    counts = Counter((entry.get('venue') or "-", entry.get('status') or "-") for entry in index.values())
+    print(f"{'venue':<16} {'status':<12} {'papers':>7}")
+    for (venue, status), count in sorted(counts.items()):
+        print(f"{venue:<16} {status:<12} {count:>7}")
+    missing_pdf = sum(1 for entry in index.values() if not entry.get('pdf'))
+    missing_reviews = sum(1 for entry in index.values() if not entry.get('reviews'))
+    print(f"[INFO] {missing_pdf} papers without PDF, {missing_reviews} without reviews")
+
+    paper_ids = resolver.papers(venue=args.venue, status=args.status)
+    if args.list:
+        for paper_id in paper_ids:
+            print(f"  - {paper_id}")
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(paper_ids, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] Paper list saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+构建论文特征存储
+汇总 ICLR 论文（accepted/ 和 rejected/ 子目录）的 Step 1-3 输出和评审为逐篇、逐 reviewer 的特征行；
+输出未变化的论文跳过，只有重新运行过流水线的论文才会重新计算
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import yaml
+from src.data.data_loader import DataLoader
+from src.data.feature_store import FeatureStore, features_db_path
+from src.evaluation.ground_truth import load_ground_truth
+
+
+def main():
+    parser = argparse.ArgumentParser(description="构建论文特征存储")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--db-path", type=str, help="特征数据库路径（覆盖配置）")
+    parser.add_argument("--papers-root", type=str, help="ICLR 论文根目录（覆盖配置）")
+    parser.add_argument("--force", action="store_true", help="忽略输入签名，全部重新计算")
+
+    args = parser.parse_args()
+
+    with open(project_root / args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    features_config = config.get('features') or {}
+    data_loader = DataLoader.from_config(config)
+
+    papers_root = args.papers_root or features_config.get('papers_root') or "data/raw/iclr2024/papers"
+    root = Path(papers_root)
+    paper_ids = sorted({path.stem for path in (root / "accepted").glob("*.pdf")} |
+                       {path.stem for path in (root / "rejected").glob("*.pdf")})
+    ground_truth = load_ground_truth(paper_ids, papers_root)
+
+    store = FeatureStore(features_db_path(config, args.db_path))
+    stats = store.build(data_loader, paper_ids, ground_truth, force=args.force)
+    print(f"[INFO] {len(paper_ids)} papers: {stats} -> {store.db_path}")
+
+    papers = store.papers(paper_ids, labeled_only=True)
+    for label in ("Accepted", "Rejected"):
+        group = [paper for paper in papers if paper['ground_truth'] == label]
+        if group:
+            mean_score = sum(paper['weighted_score'] for paper in group) / len(group)
+            print(f"  {label:<9} {len(group):>5} papers, mean weighted score {mean_score:.3f}")
+
+
+if __name__ == "__main__":
+    main()
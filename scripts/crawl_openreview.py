@@ -0,0 +1,116 @@
+"""
+OpenReview 异步下载脚本
+并发下载论文 PDF 和 Official Review，总请求速率由共享限流器控制（遇到 429 自动暂停、降速）；
+下载清单记录每个条目的状态和校验值，重复运行时跳过已完成项、续传未完成的 PDF，--refresh 只获取有变化的内容
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import yaml
+from src.data.crawler import OpenReviewCrawler
+
+
+def load_papers(args):
+    """读取待下载论文：--papers-file（JSON 列表或每行 "paper_id forum_id"）和 --forum-id"""
+    papers = []
+    if args.papers_file:
+        path = Path(args.papers_file)
+        if path.suffix == ".json":
+            with open(path, 'r', encoding='utf-8') as f:
+                for item in json.load(f):
+                    forum_id = item.get('forum_id') or item.get('openreview_id') or item.get('id')
+                    papers.append({'paper_id': item.get('paper_id') or forum_id, 'forum_id': forum_id})
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.replace(",", " ").split()
+                    if not parts or parts[0].startswith("#"):
+                        continue
+                    papers.append({'paper_id': parts[0], 'forum_id': parts[-1]})
+    for forum_id in args.forum_id or []:
+        papers.append({'paper_id': forum_id, 'forum_id': forum_id})
+    return papers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="异步下载 OpenReview 论文和 reviews")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--papers-file", type=str,
+                       help="论文列表：JSON（[{paper_id, forum_id}]）或文本（每行 paper_id forum_id）")
+    parser.add_argument("--forum-id", type=str, nargs='+', help="直接指定 forum ID（同时作为 paper_id）")
+    parser.add_argument("--domain", type=str, help="会议 domain，如 NeurIPS.cc/2024/Conference")
+    parser.add_argument("--download-path", type=str, help="保存目录（覆盖配置）")
+    parser.add_argument("--rpm", type=float, help="每分钟请求上限（覆盖配置）")
+    parser.add_argument("--concurrency", type=int, help="最大并发连接数（覆盖配置）")
+    parser.add_argument("--no-pdf", action="store_true", help="不下载 PDF")
+    parser.add_argument("--no-reviews", action="store_true", help="不下载 reviews")
+    parser.add_argument("--overwrite", action="store_true", help="忽略已下载的文件全部重新下载")
+    parser.add_argument("--refresh", action="store_true",
+                       help="检查已完成的条目是否有更新（PDF 条件请求，reviews 按修改时间增量检查）")
+    parser.add_argument("--manifest", type=str, help="下载清单路径（覆盖配置）")
+    parser.add_argument("--status", action="store_true", help="只打印下载清单的统计")
+    parser.add_argument("--import-existing", action="store_true", help="把下载目录中已有的文件登记到清单")
+    parser.add_argument("--verify", action="store_true", help="重新校验清单中已完成条目的 SHA-256")
+    parser.add_argument("--output", type=str, help="保存下载结果的 JSON 路径（可选）")
+
+    args = parser.parse_args()
+
+    with open(project_root / args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    data_source = dict(config.get('data_source', {}))
+    crawler_config = dict(data_source.get('crawler') or {})
+    if args.download_path:
+        data_source['download_path'] = args.download_path
+    if args.rpm is not None:
+        crawler_config['requests_per_minute'] = args.rpm
+    if args.concurrency is not None:
+        crawler_config['max_concurrency'] = args.concurrency
+    if args.manifest:
+        data_source['manifest_path'] = args.manifest
+    data_source['crawler'] = crawler_config
+
+    papers = load_papers(args)
+    crawler = OpenReviewCrawler.from_config(data_source, domain=args.domain)
+    manifest = crawler.manifest
+    if (args.status or args.import_existing or args.verify) and manifest is None:
+        parser.error("未配置下载清单（data_source.manifest_path 或 --manifest）")
+
+    if args.import_existing:
+        forum_ids = {paper['paper_id']: paper['forum_id'] for paper in papers}
+        imported = manifest.import_existing(str(crawler.download_path), forum_ids)
+        print(f"[INFO] Imported {imported} existing files into {manifest.db_path}")
+    if args.verify:
+        mismatched = manifest.verify()
+        print(f"[INFO] Verified manifest, {len(mismatched)} items need re-download")
+        for record in mismatched:
+            print(f"  - {record['paper_id']} ({record['kind']}): {record['path']}")
+    if args.status or args.import_existing or args.verify:
+        for kind, statuses in sorted(manifest.summary().items()):
+            for status, bucket in sorted(statuses.items()):
+                print(f"  {kind:<8} {status:<9} {bucket['count']:>7} items {bucket['bytes'] / 1e6:>10.1f} MB")
+        return
+
+    if not papers:
+        parser.error("请通过 --papers-file 或 --forum-id 指定要下载的论文")
+    print(f"[INFO] Crawling {len(papers)} papers "
+          f"(<= {crawler_config.get('requests_per_minute', 60)} req/min, {crawler.max_concurrency} connections)")
+    results = crawler.crawl(papers, pdf=not args.no_pdf, reviews=not args.no_reviews,
+                            overwrite=args.overwrite, refresh=args.refresh)
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+评分方法批量评估脚本
+一次加载语料，在所有论文上评估 src/scoring 中注册的全部（或指定）评分方法，输出指标对比表
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+import yaml
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.evaluation.ground_truth import load_ground_truth
+from src.evaluation.sweep import parse_grid
+from src.scoring import CorpusFrame, SCORERS, evaluate_scorers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="评分方法批量评估")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--data-path", type=str, default="data", help="数据根目录")
+    parser.add_argument("--db-path", type=str, help="结果数据库路径（默认使用配置中的 output.results_store）")
+    parser.add_argument("--papers-root", type=str, default="data/raw/iclr2024/papers",
+                       help="ICLR 论文根目录（包含 accepted/ 和 rejected/）")
+    parser.add_argument("--reviews-cache", type=str,
+                       help="规范化评审缓存路径（覆盖配置中的 corpus.reviews_cache，留空则直接解析原始 JSON）")
+    parser.add_argument("--no-ratings", action="store_true", help="不加载评审（依赖评分的方法使用默认分）")
+    parser.add_argument("--methods", type=str, nargs='+', choices=list(SCORERS), help="要评估的方法（默认全部）")
+    parser.add_argument("--thresholds", type=str,
+                       help="阈值网格；给出时为每个方法选择准确率最高的阈值（默认使用方法自带阈值）")
+    parser.add_argument("--sort-by", type=str, default="accuracy", choices=["accuracy", "f1"], help="排序指标")
+    parser.add_argument("--output", type=str, help="保存结果（含每篇论文得分）的 JSON 路径（可选）")
+
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    db_path = args.db_path or (config.get('output') or {}).get('results_store')
+
+    root = Path(args.papers_root)
+    paper_ids = sorted({path.stem for path in (root / "accepted").glob("*.pdf")} |
+                       {path.stem for path in (root / "rejected").glob("*.pdf")})
+    ground_truth = load_ground_truth(paper_ids, args.papers_root)
+
+    if args.reviews_cache is not None:
+        config['corpus'] = {**(config.get('corpus') or {}), 'reviews_cache': args.reviews_cache or None}
+    frame = CorpusFrame.from_results(paper_ids, config, args.data_path, db_path, load_reviews=not args.no_ratings)
+    thresholds = parse_grid(args.thresholds) if args.thresholds else None
+    rows = evaluate_scorers(frame, ground_truth, args.methods, thresholds)
+    rows.sort(key=lambda row: (row[args.sort_by], row['accuracy']), reverse=True)
+
+    print(f"[INFO] Evaluated {len(rows)} methods on {len(ground_truth)} papers "
+          f"({len(frame.ver_paper)} verifications, {frame.num_groups} reviewers)")
+    print(f"{'method':<24} {'thresh':>7} {'n':>5} {'skip':>5} {'acc':>7} {'prec':>7} {'recall':>7} {'f1':>7}")
+    for row in rows:
+        print(f"{row['method']:<24} {row['threshold']:>7.2f} {row['num_papers']:>5} {row['abstained']:>5} "
+              f"{row['accuracy']:>7.3f} {row['precision']:>7.3f} {row['recall']:>7.3f} {row['f1']:>7.3f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
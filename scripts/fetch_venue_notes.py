@@ -0,0 +1,71 @@
+"""
+会议级批量抓取脚本
+分页获取一个会议的全部 submissions 以及 details.replies 中的所有回复（reviews、评论、decision），
+逐页写入 JSONL（中断后从检查点续传），再离线导出每篇论文的 review 文件；
+数千篇论文只需几十到几百次分页请求，而不是每篇论文一次或多次
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import yaml
+from src.data.crawler import OpenReviewCrawler
+from src.data.venue_store import VenueNoteStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="分页抓取整个会议的 submissions 和回复")
+    parser.add_argument("--domain", type=str, required=True, help="会议 domain，如 ICLR.cc/2024/Conference")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--invitation", type=str, help="submission invitation，默认 {domain}/-/Submission")
+    parser.add_argument("--page-size", type=int, help="每页条数（覆盖配置）")
+    parser.add_argument("--venues-path", type=str, help="JSONL 存储目录（覆盖配置）")
+    parser.add_argument("--restart", action="store_true", help="忽略检查点重新抓取")
+    parser.add_argument("--export-reviews", action="store_true",
+                       help="导出每篇论文的 reviews/{forum_id}_reviews.json（并登记到下载清单）")
+    parser.add_argument("--overwrite", action="store_true", help="导出时覆盖已存在的 review 文件")
+    parser.add_argument("--download-pdfs", action="store_true", help="抓取完成后并发下载所有论文的 PDF")
+    parser.add_argument("--papers-output", type=str, help="保存论文列表（paper_id, forum_id, title, venueid）的 JSON 路径")
+
+    args = parser.parse_args()
+
+    with open(project_root / args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    data_source = config.get('data_source', {})
+
+    store = VenueNoteStore(args.domain, root=args.venues_path or data_source.get('venues_path', "data/raw/venues"))
+    crawler = OpenReviewCrawler.from_config(data_source, domain=args.domain)
+
+    result = crawler.fetch_venue(
+        store,
+        page_size=args.page_size or data_source.get('venue_page_size', 200),
+        invitation=args.invitation,
+        restart=args.restart
+    )
+    print(f"[INFO] {args.domain}: {result['count']} submissions in {store.submissions_path} "
+          f"({result['pages']} page requests this run), governor: {crawler.governor.stats()}")
+
+    if args.export_reviews:
+        stats = store.export_reviews(str(crawler.download_path), manifest=crawler.manifest, overwrite=args.overwrite)
+        print(f"[INFO] Exported reviews: {stats}")
+
+    papers = store.papers()
+    if args.papers_output:
+        output_path = Path(args.papers_output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(papers, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] Paper list saved to: {output_path}")
+
+    if args.download_pdfs:
+        crawler.crawl(papers, pdf=True, reviews=False)
+
+
+if __name__ == "__main__":
+    main()
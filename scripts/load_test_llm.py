@@ -0,0 +1,192 @@
+"""
+LLM 调用压测脚本
+用 Mock LLM 服务器模拟大规模运行（默认 1000 篇论文）：每篇论文的每条 review 调用一次 Step 1 提取，
+每个观点调用一次 Step 2 验证，请求经过真实的 LLMClient（调度器、重试、连接池、JSON 解析和用量统计），
+最后打印吞吐量、延迟分位数、失败数和服务器统计
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(project_root / "benchmarks"))
+
+import yaml
+from fixtures import make_paper_text, make_reviews
+from src.utils.llm_client import LLMClient
+from src.utils.mock_server import MockLLMServer
+from src.utils.tracing import get_tracer
+from src.agents.extraction_agent import ExtractionAgent
+from src.agents.verification_agent import VerificationAgent
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run_paper(paper_index, extraction_agent, verification_agent, context, num_reviewers):
+    """处理一篇合成论文，返回 (调用耗时列表, 失败数, 观点数)"""
+    paper_id = f"mock-{paper_index:05d}"
+    latencies, failures, num_claims = [], 0, 0
+    with get_tracer().context(paper_id=paper_id):
+        for review in make_reviews(num_reviewers=num_reviewers, seed=paper_index):
+            start = time.perf_counter()
+            try:
+                claims = extraction_agent.extract_claims(review['content'], review['reviewer_id'])
+            except Exception as e:
+                failures += 1
+                print(f"[WARNING] {paper_id} {review['reviewer_id']} extraction failed: {e}")
+                continue
+            latencies.append(time.perf_counter() - start)
+            num_claims += len(claims)
+            for claim in claims:
+                start = time.perf_counter()
+                verification = verification_agent.verify_claim_with_context(claim, context)
+                latencies.append(time.perf_counter() - start)
+                # VerificationAgent 在调用失败时返回带 "Error during verification" 的兜底结果
+                if str(verification.get('verification_reason', '')).startswith("Error during verification"):
+                    failures += 1
+    return latencies, failures, num_claims
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 调用压测（Mock 服务器）")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--url", type=str, help="已启动的 Mock 服务器地址（如 http://127.0.0.1:8765），默认在进程内启动")
+    parser.add_argument("--provider", type=str, default="openai", choices=["openai", "anthropic", "deepseek"],
+                       help="LLMClient 提供商（决定使用的接口格式）")
+    parser.add_argument("--model", type=str, default="gpt-4o-mini", help="模型名（用于费用估算）")
+    parser.add_argument("--papers", type=int, default=1000, help="论文数")
+    parser.add_argument("--reviewers", type=int, default=4, help="每篇论文的 review 数")
+    parser.add_argument("--workers", type=int, default=16, help="并发处理的论文数")
+    parser.add_argument("--stream", action="store_true", help="使用流式响应")
+    parser.add_argument("--mean-ms", type=float, help="首 token 平均延迟（覆盖配置，仅进程内服务器）")
+    parser.add_argument("--tokens-per-second", type=float, help="输出速度（覆盖配置，仅进程内服务器）")
+    parser.add_argument("--error-rate", type=float, help="随机 5xx 概率（覆盖配置，仅进程内服务器）")
+    parser.add_argument("--rate-limit-rate", type=float, help="随机 429 概率（覆盖配置，仅进程内服务器）")
+    parser.add_argument("--rpm", type=float, help="客户端每分钟请求上限（覆盖 llm.rate_limit，0 表示不限制）")
+    parser.add_argument("--tpm", type=float, help="客户端每分钟 token 上限（覆盖 llm.rate_limit，0 表示不限制）")
+    parser.add_argument("--max-concurrency", type=int, help="客户端最大并发请求数（覆盖 llm.rate_limit）")
+    parser.add_argument("--output", type=str, help="保存压测结果的 JSON 路径（可选）")
+
+    args = parser.parse_args()
+
+    config_path = project_root / args.config
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    llm_config = config.get('llm', {})
+
+    server = None
+    if args.url:
+        base_url = args.url.rstrip('/')
+    else:
+        server_config = dict(config.get('mock_server') or {})
+        server_config['port'] = 0
+        latency = dict(server_config.get('latency') or {})
+        faults = dict(server_config.get('faults') or {})
+        if args.mean_ms is not None:
+            latency['mean_ms'] = args.mean_ms
+        if args.tokens_per_second is not None:
+            latency['tokens_per_second'] = args.tokens_per_second
+        if args.error_rate is not None:
+            faults['error_rate'] = args.error_rate
+        if args.rate_limit_rate is not None:
+            faults['rate_limit_rate'] = args.rate_limit_rate
+        server_config['latency'] = latency
+        server_config['faults'] = faults
+        server = MockLLMServer.from_config(server_config).start()
+        base_url = server.url
+        print(f"[INFO] Started mock LLM server at {base_url}")
+    if args.provider != "anthropic":
+        base_url = f"{base_url}/v1"
+
+    rate_limit = dict(llm_config.get('rate_limit') or {})
+    if args.rpm is not None:
+        rate_limit['requests_per_minute'] = args.rpm
+    if args.tpm is not None:
+        rate_limit['tokens_per_minute'] = args.tpm
+    if args.max_concurrency is not None:
+        rate_limit['max_concurrency'] = args.max_concurrency
+
+    llm_client = LLMClient(
+        provider=args.provider,
+        api_key="mock",
+        model=args.model,
+        base_url=base_url,
+        stream=args.stream,
+        rate_limit=rate_limit,
+        http_config=llm_config.get('http'),
+        pricing=llm_config.get('pricing')
+    )
+    extraction_agent = ExtractionAgent(llm_client)
+    verification_agent = VerificationAgent(llm_client)
+    context = make_paper_text(paragraphs_per_section=1, sentences_per_paragraph=4)[:verification_agent.max_context_length]
+
+    print(f"[INFO] Load testing {args.papers} papers x {args.reviewers} reviews "
+          f"({args.provider}, {args.workers} workers, stream={args.stream})")
+    latencies, failures, num_claims = [], 0, 0
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(run_paper, i, extraction_agent, verification_agent, context, args.reviewers)
+                for i in range(args.papers)
+            ]
+            for done, future in enumerate(as_completed(futures), 1):
+                paper_latencies, paper_failures, paper_claims = future.result()
+                latencies.extend(paper_latencies)
+                failures += paper_failures
+                num_claims += paper_claims
+                if done % max(1, args.papers // 10) == 0:
+                    print(f"[INFO] {done}/{args.papers} papers, {len(latencies)} calls, "
+                          f"{len(latencies) / (time.perf_counter() - start):.1f} calls/s")
+    finally:
+        elapsed = time.perf_counter() - start
+        server_stats = server.stats() if server is not None else None
+        if server is not None:
+            server.stop()
+
+    result = {
+        'papers': args.papers,
+        'calls': len(latencies),
+        'claims': num_claims,
+        'failures': failures,
+        'elapsed_s': round(elapsed, 2),
+        'calls_per_s': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'papers_per_min': round(args.papers / elapsed * 60, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.5) * 1000, 1),
+            'p95': round(percentile(latencies, 0.95) * 1000, 1),
+            'p99': round(percentile(latencies, 0.99) * 1000, 1),
+            'max': round(max(latencies, default=0.0) * 1000, 1)
+        },
+        'server': server_stats,
+        'usage': llm_client.usage.summary()['total']
+    }
+
+    print(f"\n[INFO] {result['calls']} calls in {result['elapsed_s']}s "
+          f"({result['calls_per_s']} calls/s, {result['papers_per_min']} papers/min), {failures} failures")
+    print(f"[INFO] Latency ms: {result['latency_ms']}")
+    if server_stats is not None:
+        print(f"[INFO] Server: {server_stats}")
+    llm_client.usage.print_summary(dimensions=('agent',))
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
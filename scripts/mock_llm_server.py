@@ -0,0 +1,66 @@
+"""
+启动本地 Mock LLM 服务器
+兼容 OpenAI / Anthropic 接口，返回确定性的提取 / 验证 JSON，用于离线压测
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import yaml
+from src.utils.mock_server import MockLLMServer, LATENCY_DISTRIBUTIONS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="启动 Mock LLM 服务器")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--host", type=str, help="监听地址（覆盖配置）")
+    parser.add_argument("--port", type=int, help="监听端口（覆盖配置）")
+    parser.add_argument("--seed", type=int, help="随机种子（覆盖配置）")
+    parser.add_argument("--latency", type=str, choices=LATENCY_DISTRIBUTIONS, help="延迟分布（覆盖配置）")
+    parser.add_argument("--mean-ms", type=float, help="首 token 平均延迟（覆盖配置）")
+    parser.add_argument("--tokens-per-second", type=float, help="输出速度（覆盖配置）")
+    parser.add_argument("--error-rate", type=float, help="随机 5xx 概率（覆盖配置）")
+    parser.add_argument("--rate-limit-rate", type=float, help="随机 429 概率（覆盖配置）")
+    parser.add_argument("--rpm", type=float, help="每分钟请求上限（覆盖配置）")
+
+    args = parser.parse_args()
+
+    config_path = project_root / args.config
+    config = {}
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config = yaml.safe_load(f).get('mock_server', {}) or {}
+    latency = dict(config.get('latency') or {})
+    faults = dict(config.get('faults') or {})
+
+    for key, value in (('host', args.host), ('port', args.port), ('seed', args.seed)):
+        if value is not None:
+            config[key] = value
+    for key, value in (('distribution', args.latency), ('mean_ms', args.mean_ms),
+                       ('tokens_per_second', args.tokens_per_second)):
+        if value is not None:
+            latency[key] = value
+    for key, value in (('error_rate', args.error_rate), ('rate_limit_rate', args.rate_limit_rate),
+                       ('requests_per_minute', args.rpm)):
+        if value is not None:
+            faults[key] = value
+    config['latency'] = latency
+    config['faults'] = faults
+
+    server = MockLLMServer.from_config(config)
+    print(f"[INFO] Mock LLM server listening on {server.url}")
+    print(f"[INFO] OpenAI/DeepSeek base_url: {server.openai_base_url}")
+    print(f"[INFO] Anthropic base_url: {server.anthropic_base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n[INFO] Stopping, stats: {server.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+评审规范化脚本
+把语料中所有 {paper_id}_reviews.json（各种原始形状）一次性转换为规范化的 Review 记录并写入缓存，
+之后 DataLoader、评分脚本等直接读取缓存；源文件变化的论文在下次运行（或读取）时自动更新
+"""
+
+import sys
+import argparse
+from collections import Counter
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+import yaml
+from src.data.corpus import CorpusResolver
+from src.data.reviews import ReviewStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description="规范化语料中的所有评审文件")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--cache", type=str, help="规范化评审缓存路径（覆盖配置）")
+    parser.add_argument("--venue", type=str, help="只处理该会议的论文")
+    parser.add_argument("--status", type=str, help="只处理该状态的论文（如 accepted）")
+    parser.add_argument("--show", type=str, help="打印某篇论文规范化后的评审")
+
+    args = parser.parse_args()
+
+    with open(project_root / args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    corpus_config = config.get('corpus') or {}
+
+    resolver = CorpusResolver.from_config(corpus_config)
+    store = ReviewStore(args.cache or corpus_config.get('reviews_cache') or "data/processed/reviews.db")
+
+    if args.show:
+        for review in store.load(args.show, resolver.reviews_path(args.show)):
+            print(f"{review.reviewer_id} ({review.review_id}): rating={review.rating} confidence={review.confidence}")
+            print(f"  {review.text[:200]!r}")
+        return
+
+    paper_ids = resolver.papers(venue=args.venue, status=args.status, require_reviews=True)
+    stats = store.build(resolver, paper_ids)
+    print(f"[INFO] {len(paper_ids)} papers: {stats} -> {store.db_path}")
+
+    ratings = store.ratings(paper_ids)
+    rated = [rating for values in ratings.values() for rating in values]
+    if rated:
+        print(f"[INFO] {len(rated)} ratings over {len(ratings)} papers, mean {sum(rated) / len(rated):.2f}")
+        for rating, count in sorted(Counter(rated).items()):
+            print(f"  {rating:>5g}: {count}")
+
+
+if __name__ == "__main__":
+    main()
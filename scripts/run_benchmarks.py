@@ -0,0 +1,53 @@
+"""
+运行基准测试并与之前的结果比较
+每次运行按 commit 保存到 benchmarks/.results（pytest-benchmark 自动记录 commit id 和机器信息），
+与最近一次保存的结果相比平均耗时变慢超过阈值时返回非零退出码
+"""
+
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="运行基准测试")
+    parser.add_argument("-k", type=str, help="只运行名称匹配的基准（pytest -k 表达式）")
+    parser.add_argument("--storage", type=str, default=str(project_root / "benchmarks" / ".results"),
+                       help="结果保存目录")
+    parser.add_argument("--compare", type=str, nargs='?', const="", default="",
+                       help="对比的历史结果编号（如 0003），默认最近一次")
+    parser.add_argument("--no-compare", action="store_true", help="不与历史结果比较")
+    parser.add_argument("--fail-threshold", type=float, default=20.0,
+                       help="平均耗时变慢超过该百分比时失败")
+    parser.add_argument("--no-save", action="store_true", help="不保存本次结果")
+    parser.add_argument("--json", type=str, help="额外导出本次结果的 JSON 路径（可选）")
+
+    args = parser.parse_args()
+
+    command = [
+        sys.executable, "-m", "pytest", str(project_root / "benchmarks"), "-q",
+        f"--benchmark-storage=file://{Path(args.storage).resolve()}",
+        "--benchmark-columns=min,mean,median,stddev,rounds",
+        "--benchmark-sort=fullname"
+    ]
+    if args.k:
+        command += ["-k", args.k]
+    if not args.no_save:
+        command.append("--benchmark-autosave")
+    if not args.no_compare and any(Path(args.storage).glob("*/*.json")):
+        command.append(f"--benchmark-compare={args.compare}" if args.compare else "--benchmark-compare")
+        command.append(f"--benchmark-compare-fail=mean:{args.fail_threshold:g}%")
+    if args.json:
+        command.append(f"--benchmark-json={args.json}")
+
+    print(f"[INFO] Running: {' '.join(command)}")
+    sys.exit(subprocess.call(command, cwd=str(project_root)))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,33 +11,81 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.pipeline import EVWPipeline
+from src.utils.usage import BudgetExceededError
 
 
 def main():
     parser = argparse.ArgumentParser(description="运行 E-V-W 评估流程")
-    parser.add_argument("--paper-id", type=str, required=True, help="论文 ID")
+    parser.add_argument("--paper-id", type=str, nargs='+', required=True, help="论文 ID（可指定多个）")
     parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
     parser.add_argument("--step", type=int, choices=[1, 2, 3, 4], 
                        help="只运行指定步骤（可选）")
+    parser.add_argument("--offline", action="store_true",
+                       help="离线批处理模式：Step 1/2 合并为提供商批处理任务提交（需配合 --step 1 或 2）")
+    parser.add_argument("--batch", action="store_true",
+                       help="Step 4 批量模式：只保存结构化 JSON 结果（需配合 --step 4）")
+    parser.add_argument("--render", action="store_true",
+                       help="Step 4 批量模式下同时渲染 markdown 报告")
+    parser.add_argument("--usage-output", type=str,
+                       help="保存 token 用量与费用汇总的 JSON 路径（可选）")
     
     args = parser.parse_args()
     
     # 初始化流程
     pipeline = EVWPipeline(config_path=args.config)
     
-    if args.step:
-        # 只运行指定步骤
+    try:
+        run(pipeline, args, parser)
+    except BudgetExceededError as e:
+        print(f"[ERROR] {e}")
+        sys.exit(1)
+    finally:
+        usage = pipeline.llm_client.usage
+        usage.print_summary()
+        if args.usage_output:
+            usage.save(args.usage_output)
+            print(f"[INFO] Usage saved to: {args.usage_output}")
+
+
+def run(pipeline: EVWPipeline, args, parser):
+    """按命令行参数运行流程；预算动作为 pause 时在论文之间检查并停止"""
+    usage = pipeline.llm_client.usage
+    
+    if args.offline:
+        # 离线批处理：整个语料一次提交
         if args.step == 1:
-            pipeline.step1_extraction(args.paper_id)
+            pipeline.batch_step1_extraction(args.paper_id)
         elif args.step == 2:
-            pipeline.step2_verification(args.paper_id)
-        elif args.step == 3:
-            pipeline.step3_weighting(args.paper_id)
-        elif args.step == 4:
-            pipeline.step4_synthesis(args.paper_id)
-    else:
-        # 运行完整流程
-        pipeline.run_pipeline(args.paper_id)
+            pipeline.batch_step2_verification(args.paper_id)
+        else:
+            parser.error("--offline 只支持 --step 1 或 --step 2")
+        return
+    
+    if args.batch:
+        if args.step != 4:
+            parser.error("--batch 只支持 --step 4")
+        pipeline.batch_step4_synthesis(args.paper_id, render=True if args.render else None)
+        return
+    
+    for index, paper_id in enumerate(args.paper_id):
+        if usage.should_pause():
+            remaining = args.paper_id[index:]
+            print(f"[WARNING] Budget exceeded ({usage.budget_exceeded()}), pausing before {len(remaining)} remaining papers")
+            print(f"[INFO] Resume with: --paper-id {' '.join(remaining)}")
+            break
+        if args.step:
+            # 只运行指定步骤
+            if args.step == 1:
+                pipeline.step1_extraction(paper_id)
+            elif args.step == 2:
+                pipeline.step2_verification(paper_id)
+            elif args.step == 3:
+                pipeline.step3_weighting(paper_id)
+            elif args.step == 4:
+                pipeline.step4_synthesis(paper_id)
+        else:
+            # 运行完整流程
+            pipeline.run_pipeline(paper_id)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,66 @@
+"""
+加权与合成参数扫描脚本
+一次加载所有 verified claims，评估 alpha/beta/决策阈值网格在 ICLR ground truth 上的准确率和 F1
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+import yaml
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.data.claim_table import ClaimTable
+from src.evaluation.ground_truth import load_ground_truth
+from src.evaluation.sweep import ParameterSweep, parse_grid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="加权与合成参数扫描")
+    parser.add_argument("--config", type=str, default="config.yaml", help="配置文件路径")
+    parser.add_argument("--data-path", type=str, default="data", help="数据根目录")
+    parser.add_argument("--db-path", type=str, help="结果数据库路径（默认使用配置中的 output.results_store）")
+    parser.add_argument("--papers-root", type=str, default="data/raw/iclr2024/papers",
+                       help="ICLR 论文根目录（包含 accepted/ 和 rejected/）")
+    parser.add_argument("--alphas", type=str, default="0:1:11", help="alpha 网格")
+    parser.add_argument("--betas", type=str, default="0:1:11", help="beta 网格")
+    parser.add_argument("--thresholds", type=str, default="4:6:21", help="总体决策阈值网格（10 分制）")
+    parser.add_argument("--sort-by", type=str, default="f1", choices=["f1", "accuracy"], help="排序指标")
+    parser.add_argument("--top", type=int, default=10, help="显示前 N 个参数组合")
+    parser.add_argument("--output", type=str, help="保存全部结果的 JSON 路径（可选）")
+
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    topics = config.get('synthesis', {}).get('topics')
+
+    db_path = args.db_path or (config.get('output') or {}).get('results_store')
+    table = ClaimTable.from_results(args.data_path, db_path)
+    ground_truth = load_ground_truth(table.paper_ids, args.papers_root)
+    sweep = ParameterSweep(table, ground_truth, topics)
+
+    rows = sweep.run(parse_grid(args.alphas), parse_grid(args.betas), parse_grid(args.thresholds))
+    rows.sort(key=lambda row: (row[args.sort_by], row['accuracy']), reverse=True)
+
+    print(f"[INFO] Evaluated {len(rows)} settings on {rows[0]['num_papers'] if rows else 0} papers "
+          f"({table.num_claims} claims, {table.num_groups} reviewers)")
+    print(f"{'alpha':>6} {'beta':>6} {'thresh':>7} {'acc':>7} {'prec':>7} {'recall':>7} {'f1':>7}")
+    for row in rows[:args.top]:
+        print(f"{row['alpha']:>6.2f} {row['beta']:>6.2f} {row['threshold']:>7.2f} "
+              f"{row['accuracy']:>7.3f} {row['precision']:>7.3f} {row['recall']:>7.3f} {row['f1']:>7.3f}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] Results saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+追踪汇总脚本
+读取流程运行时输出的 JSONL 追踪文件，打印各 span 耗时分布、token 用量和缓存命中率
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.utils.tracing import read_trace, summarize_trace
+
+
+def main():
+    parser = argparse.ArgumentParser(description="追踪汇总")
+    parser.add_argument("traces", type=str, nargs='+', help="JSONL 追踪文件（可多个）")
+    parser.add_argument("--stage", type=str, help="只统计某个阶段（如 step2）")
+    parser.add_argument("--paper-id", type=str, help="只统计某篇论文")
+    parser.add_argument("--sort-by", type=str, default="total_s",
+                       choices=["total_s", "count", "mean_ms", "p95_ms"], help="span 排序字段")
+    parser.add_argument("--output", type=str, help="保存汇总结果的 JSON 路径（可选）")
+
+    args = parser.parse_args()
+
+    records = read_trace(args.traces)
+    if args.stage or args.paper_id:
+        records = (
+            record for record in records
+            if (not args.stage or record.get('attributes', {}).get('stage') == args.stage)
+            and (not args.paper_id or record.get('attributes', {}).get('paper_id') == args.paper_id)
+        )
+    summary = summarize_trace(records)
+
+    spans = sorted(summary['spans'].items(), key=lambda item: item[1][args.sort_by], reverse=True)
+    print(f"{'span':<36} {'count':>7} {'errors':>6} {'total_s':>9} {'mean_ms':>9} {'p50_ms':>9} {'p95_ms':>9} {'max_ms':>9}")
+    for name, stats in spans:
+        print(f"{name:<36} {stats['count']:>7} {stats['errors']:>6} {stats['total_s']:>9.2f} {stats['mean_ms']:>9.1f} "
+              f"{stats['p50_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['max_ms']:>9.1f}")
+
+    tokens = summary['tokens']
+    print(f"\nTokens: prompt={tokens['prompt_tokens']}, completion={tokens['completion_tokens']}, "
+          f"cached={tokens['cached_tokens']}")
+
+    if summary['caches']:
+        print(f"\n{'cache':<36} {'hits':>7} {'misses':>7} {'hit_rate':>9}")
+        for name, cache in sorted(summary['caches'].items()):
+            hit_rate = f"{cache['hit_rate']:.1%}" if cache['hit_rate'] is not None else "-"
+            print(f"{name:<36} {cache['hits']:>7} {cache['misses']:>7} {hit_rate:>9}")
+
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] Summary saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,10 @@ Step 1: Structure Extraction Agent (结构化提取层)
 """
 
 import json
-from typing import List, Dict
+from typing import List, Dict, Iterable
+from ..data.reviews import Review, normalize_reviews
 from ..utils.llm_client import LLMClient
+from ..utils.tracing import traced
 
 
 class ExtractionAgent:
@@ -28,28 +30,26 @@ class ExtractionAgent:
 
 输出格式必须是有效的 JSON 数组。"""
     
-    def extract_claims(self, review_text: str, reviewer_id: str = "R1") -> List[Dict]:
+    def build_prompt(self, review_text: str, reviewer_id: str = "R1") -> str:
+        """构建提取观点的用户提示"""
+        return f"""请从以下评审文本中提取所有原子观点：
+
+评审文本：
+{review_text}
+
+请按照要求提取观点，并以 JSON 数组格式输出。每个观点的 id 格式为 {reviewer_id}-C{{序号}}。"""
+    
+    def parse_response(self, response: str, reviewer_id: str = "R1") -> List[Dict]:
         """
-        从 Review 文本中提取原子观点
+        解析 LLM 返回的观点 JSON
         
         Args:
-            review_text: Review 文本
+            response: LLM 响应文本
             reviewer_id: Reviewer ID
             
         Returns:
-            观点列表，每个包含 id, topic, sentiment, statement, 
-            substantiation_type, substantiation_content
+            观点列表，解析失败时返回空列表
         """
-        prompt = f"""请从以下评审文本中提取所有原子观点：
-
-评审文本：
-{review_text}
-
-请按照要求提取观点，并以 JSON 数组格式输出。每个观点的 id 格式为 {reviewer_id}-C{{序号}}。"""
-        
-        response = self.llm.call(prompt, self.system_prompt)
-        
-        # 解析 JSON 响应
         try:
             # 尝试提取 JSON（可能包含 markdown 代码块）
             if "```json" in response:
@@ -76,27 +76,50 @@ class ExtractionAgent:
             print(f"[DEBUG] LLM 响应: {response}")
             return []
     
-    def process_reviews(self, reviews: List[Dict]) -> List[Dict]:
+    @traced("agent.extract_claims", context={'agent': 'extraction'})
+    def extract_claims(self, review_text: str, reviewer_id: str = "R1") -> List[Dict]:
+        """
+        从 Review 文本中提取原子观点
+        
+        Args:
+            review_text: Review 文本
+            reviewer_id: Reviewer ID
+            
+        Returns:
+            观点列表，每个包含 id, topic, sentiment, statement, 
+            substantiation_type, substantiation_content
+        """
+        prompt = self.build_prompt(review_text, reviewer_id)
+        response = self.llm.call(prompt, self.system_prompt, expect_json='array')
+        return self.parse_response(response, reviewer_id)
+    
+    def iter_review_inputs(self, reviews: Iterable[Review]):
+        """
+        遍历需要提取的 review，生成 (reviewer_id, review_text)
+        
+        Args:
+            reviews: 规范化后的 Review 列表（原始字典会先经过 normalize_reviews）
+        """
+        for review in normalize_reviews(reviews):
+            if not review.text.strip():
+                print(f"[WARNING] Review {review.reviewer_id} 没有内容，跳过")
+                continue
+            
+            yield review.reviewer_id, review.text
+    
+    def process_reviews(self, reviews: Iterable[Review]) -> List[Dict]:
         """
         处理多个 reviews，提取所有观点
         
         Args:
-            reviews: Review 列表，每个包含 reviewer_id 和 content
+            reviews: Review 列表（或任意形状的原始 review 字典）
             
         Returns:
             所有观点的列表
         """
         all_claims = []
         
-        for idx, review in enumerate(reviews):
-            # 使用 review 索引生成 reviewer_id，而不是 all_claims 长度
-            reviewer_id = review.get('reviewer_id', f"R{idx+1}")
-            review_text = review.get('content', review.get('text', ''))
-            
-            if not review_text:
-                print(f"[WARNING] Review {reviewer_id} 没有内容，跳过")
-                continue
-            
+        for reviewer_id, review_text in self.iter_review_inputs(reviews):
             claims = self.extract_claims(review_text, reviewer_id)
             all_claims.extend(claims)
         
@@ -3,19 +3,24 @@ Step 4: Meta-Review Synthesis (合成决策层)
 基于加权后的观点生成最终报告
 """
 
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Optional
+from ..data.claims import ClaimSet, ClaimsInput
+from .synthesis_report import SynthesisResult, ReportTemplate
 
 
 class SynthesisAgent:
     """合成决策 Agent"""
     
-    def __init__(self, accept_threshold: float = 0.6, topics: List[str] = None, use_10_point_scale: bool = True):
+    def __init__(self, accept_threshold: float = 0.6, topics: List[str] = None, use_10_point_scale: bool = True,
+                 overall_threshold: Optional[float] = None, report_template: Optional[ReportTemplate] = None):
         """
         Args:
             accept_threshold: 接受阈值（原始范围 [-1, 1]，如果use_10_point_scale=True则自动转换为10分制）
             topics: 主题列表
             use_10_point_scale: 是否使用10分制（默认True）
+            overall_threshold: 总体建议的分界线（平均主题得分 >= 该值则 ACCEPT），
+                               默认10分制为 5.0，原始范围为 0.0
+            report_template: 报告模板，默认使用 ReportTemplate()
         """
         self.use_10_point_scale = use_10_point_scale
         if use_10_point_scale:
@@ -27,6 +32,12 @@ class SynthesisAgent:
         else:
             self.accept_threshold = accept_threshold
         self.topics = topics or ["Novelty", "Experiments", "Writing", "Significance", "Reproducibility"]
+        if overall_threshold is None:
+            overall_threshold = 5.0 if use_10_point_scale else 0.0
+        self.overall_threshold = overall_threshold
+        # 小写主题名 -> 主题下标
+        self._topic_index = {topic.lower(): i for i, topic in enumerate(self.topics)}
+        self.report_template = report_template or ReportTemplate()
     
     def score_to_10_point(self, score: float) -> float:
         """
@@ -58,124 +69,202 @@ class SynthesisAgent:
         else:
             return 0.0
     
-    def filter_false_claims(self, claims: List[Dict], verifications: Dict[str, Dict]) -> List[Dict]:
+    def filter_false_claims(self, claims: ClaimsInput, verifications: Dict[str, Dict]) -> ClaimSet:
         """
-        过滤掉验证结果为 False 的观点
+        过滤掉验证结果为 False 的观点（没有验证结果的观点保留）
         
         Args:
-            claims: 所有观点列表
+            claims: 所有观点列表（字典、Claim 记录或 ClaimSet）
             verifications: 验证结果字典
             
         Returns:
-            过滤后的观点列表
+            过滤后的观点集合
         """
-        filtered_claims = []
-        for claim in claims:
-            claim_id = claim.get('id')
-            # 如果没有验证结果，保留该观点
-            if claim_id not in verifications:
-                filtered_claims.append(claim)
-            else:
-                # 只保留验证结果不是 False 的观点
-                verification_result = verifications[claim_id].get('verification_result')
-                if verification_result != 'False':
-                    filtered_claims.append(claim)
-        
-        return filtered_claims
+        return ClaimSet.build(claims, verifications).without_false()
     
-    def weighted_voting(self, topic: str, claims: List[Dict], weights: Dict[str, Dict]) -> Dict:
+    def group_claims(self, claims: ClaimsInput, weights: Dict[str, Dict]) -> Dict:
         """
-        对某个主题进行加权投票
-        
-        公式：Score(Topic) = Σ (Reviewer_Sentiment × Weight(R))
-        
+        一次完成主题/reviewer 分组，同时累加每个主题的投票
+
+        观点先转换为 ClaimSet，主题、reviewer 和情感都是整数编码：每个观点的权重由 reviewer 下标
+        查表得到（每个 reviewer 只查一次权重字典），不再逐条解析 claim id、比较情感字符串。
+        不属于 self.topics 的观点被丢弃。
+
         Args:
-            topic: 主题名称
-            claims: 该主题的所有观点（已过滤错误观点）
+            claims: 观点列表（已过滤错误观点）
             weights: 权重字典
-            
+
         Returns:
-            包含分数和详细信息的字典
+            {'num_claims': 每个主题的观点数, 'weighted_sum': 每个主题的 Σ 情感 × 权重,
+             'total_weight': 每个主题的 Σ 权重, 'details': 按主题分组的观点明细列表}
         """
-        topic_claims = [c for c in claims if c.get('topic', '').lower() == topic.lower()]
-        
-        if not topic_claims:
-            return {
-                'topic': topic,
-                'score': 0.0,
-                'num_claims': 0,
-                'weighted_sum': 0.0,
-                'decision': 'Neutral'
-            }
-        
-        weighted_sum = 0.0
-        total_weight = 0.0
-        claim_details = []
-        
-        for claim in topic_claims:
-            # 获取 reviewer_id
-            claim_id = claim.get('id', '')
-            reviewer_id = claim_id.split('-')[0] if '-' in claim_id else 'Unknown'
-            
-            # 获取权重
-            reviewer_weight = weights.get(reviewer_id, {}).get('weight', 0.0)
-            
-            # 获取情感分数
-            sentiment = claim.get('sentiment', 'Neutral')
-            sentiment_score = self.sentiment_to_score(sentiment)
-            
-            # 计算加权贡献
+        claim_set = ClaimSet.build(claims)
+        num_topics = len(self.topics)
+        num_claims = [0] * num_topics
+        weighted_sum = [0.0] * num_topics
+        total_weight = [0.0] * num_topics
+        details: List[List[Dict]] = [[] for _ in range(num_topics)]
+
+        # reviewer 下标 -> 权重；claim id 不含 '-' 的观点（下标 -1）归入 'Unknown'，取表的最后一项
+        reviewer_names = claim_set.reviewer_ids + ['Unknown']
+        reviewer_weights = [weights.get(reviewer_id, {}).get('weight', 0.0) for reviewer_id in reviewer_names]
+
+        for claim, index, reviewer, sentiment in zip(claim_set.records, claim_set.topic_codes(self._topic_index),
+                                                     claim_set.reviewer, claim_set.sentiment):
+            if index < 0:
+                continue
+            reviewer_weight = reviewer_weights[reviewer]
+            sentiment_score = float(sentiment)
             contribution = sentiment_score * reviewer_weight
-            weighted_sum += contribution
-            total_weight += reviewer_weight
-            
-            claim_details.append({
-                'claim_id': claim_id,
-                'reviewer_id': reviewer_id,
-                'statement': claim.get('statement', ''),
-                'sentiment': sentiment,
+
+            num_claims[index] += 1
+            weighted_sum[index] += contribution
+            total_weight[index] += reviewer_weight
+            details[index].append({
+                'claim_id': claim.id,
+                'reviewer_id': reviewer_names[reviewer],
+                'statement': claim.statement,
+                'sentiment': claim.sentiment,
                 'sentiment_score': sentiment_score,
                 'reviewer_weight': reviewer_weight,
                 'contribution': contribution
             })
-        
-        # 计算最终分数（归一化）
-        if total_weight > 0:
-            score = weighted_sum / total_weight
-        else:
-            score = 0.0
-        
-        # 转换为10分制（如果需要）
-        if self.use_10_point_scale:
-            score_10 = self.score_to_10_point(score)
-            # 决策基于10分制
-            if score_10 >= self.accept_threshold_10:
-                decision = 'Accept'
-            elif score_10 <= self.reject_threshold_10:
-                decision = 'Reject'
-            else:
-                decision = 'Neutral'
-        else:
-            score_10 = score
-            # 决策基于原始范围
-            if score >= self.accept_threshold:
-                decision = 'Accept'
-            elif score <= -self.accept_threshold:
-                decision = 'Reject'
-            else:
-                decision = 'Neutral'
-        
+
         return {
-            'topic': topic,
-            'score': score,  # 保留原始分数用于内部计算
-            'score_10': score_10,  # 10分制分数
-            'num_claims': len(topic_claims),
+            'num_claims': num_claims,
             'weighted_sum': weighted_sum,
             'total_weight': total_weight,
-            'decision': decision,
-            'claims': claim_details
+            'details': details
         }
-    
+
+    def vote_topics(self, claims: ClaimsInput, weights: Dict[str, Dict]) -> List[Dict]:
+        """
+        对所有主题进行加权投票（一次分组得到所有主题的累加值，再统一计算得分和决策）
+
+        公式：Score(Topic) = Σ (Reviewer_Sentiment × Weight(R)) / Σ Weight(R)
+
+        Args:
+            claims: 观点列表（已过滤错误观点）
+            weights: 权重字典
+
+        Returns:
+            每个主题一个结果字典，顺序与 self.topics 一致
+        """
+        grouped = self.group_claims(claims, weights)
+
+        results = []
+        for i, topic in enumerate(self.topics):
+            num_claims = grouped['num_claims'][i]
+            weighted_sum = grouped['weighted_sum'][i]
+            total_weight = grouped['total_weight'][i]
+            score = weighted_sum / total_weight if total_weight > 0 else 0.0
+
+            if self.use_10_point_scale:
+                # 决策基于10分制
+                score_10 = self.score_to_10_point(score)
+                accept = score_10 >= self.accept_threshold_10
+                reject = score_10 <= self.reject_threshold_10
+            else:
+                # 决策基于原始范围
+                score_10 = score
+                accept = score >= self.accept_threshold
+                reject = score <= -self.accept_threshold
+
+            if num_claims == 0 or not (accept or reject):
+                decision = 'Neutral'
+            else:
+                decision = 'Accept' if accept else 'Reject'
+
+            results.append({
+                'topic': topic,
+                'score': score,  # 保留原始分数用于内部计算
+                'score_10': score_10,  # 10分制分数
+                'num_claims': num_claims,
+                'weighted_sum': weighted_sum,
+                'total_weight': total_weight,
+                'decision': decision,
+                'claims': grouped['details'][i]
+            })
+        return results
+
+    def weighted_voting(self, topic: str, claims: ClaimsInput, weights: Dict[str, Dict]) -> Dict:
+        """
+        对某个主题进行加权投票
+
+        Args:
+            topic: 主题名称
+            claims: 观点列表（已过滤错误观点）
+            weights: 权重字典
+
+        Returns:
+            包含分数和详细信息的字典
+        """
+        agent = self if topic.lower() in self._topic_index else SynthesisAgent(
+            self.accept_threshold, [topic], self.use_10_point_scale, self.overall_threshold, self.report_template
+        )
+        results = agent.vote_topics(claims, weights)
+        return results[agent._topic_index[topic.lower()]]
+
+    def synthesize(self, paper_id: str, claims: ClaimsInput,
+                   verifications: Dict[str, Dict], weights: Dict[str, Dict]) -> SynthesisResult:
+        """
+        计算结构化的合成结果
+
+        Args:
+            paper_id: 论文 ID
+            claims: 所有观点列表（字典、Claim 记录或 ClaimSet）
+            verifications: 验证结果字典
+            weights: 权重字典
+
+        Returns:
+            结构化结果（reviewer 权重、主题投票结果和总体建议），可序列化为 JSON
+        """
+        claims = ClaimSet.build(claims, verifications)
+        filtered_claims = claims.without_false()
+        topic_results = self.vote_topics(filtered_claims, weights)
+
+        valid_results = [r for r in topic_results if r['num_claims'] > 0]
+        score_key = 'score_10' if self.use_10_point_scale else 'score'
+        average_score = None
+        overall_decision = None
+        decision_counts = {'Accept': 0, 'Reject': 0, 'Neutral': 0}
+        if valid_results:
+            average_score = sum(r[score_key] for r in valid_results) / len(valid_results)
+            for r in valid_results:
+                decision_counts[r['decision']] += 1
+            # 总体建议（只有 Accept 或 Reject 两种）
+            overall_decision = "ACCEPT" if average_score >= self.overall_threshold else "REJECT"
+
+        reviewers = [
+            dict(data, reviewer_id=reviewer_id)
+            for reviewer_id, data in sorted(weights.items(), key=lambda x: x[1]['weight'], reverse=True)
+        ]
+
+        return SynthesisResult(
+            paper_id=paper_id,
+            use_10_point_scale=self.use_10_point_scale,
+            num_claims=len(claims),
+            num_filtered_claims=len(filtered_claims),
+            reviewers=reviewers,
+            topics=topic_results,
+            average_score=average_score,
+            decision_counts=decision_counts,
+            overall_threshold=self.overall_threshold,
+            overall_decision=overall_decision
+        )
+
+    def render_report(self, result: SynthesisResult) -> str:
+        """
+        将结构化合成结果渲染为 Meta-Review 报告
+
+        Args:
+            result: synthesize 返回的结果
+
+        Returns:
+            报告文本（英文）
+        """
+        return self.report_template.render(result)
+
     def generate_report(self, paper_id: str, claims: List[Dict], 
                        verifications: Dict[str, Dict], weights: Dict[str, Dict]) -> str:
         """
@@ -190,123 +279,4 @@ class SynthesisAgent:
         Returns:
             报告文本（英文）
         """
-        # 过滤错误观点
-        filtered_claims = self.filter_false_claims(claims, verifications)
-        
-        # 对每个主题进行加权投票
-        topic_results = []
-        for topic in self.topics:
-            result = self.weighted_voting(topic, filtered_claims, weights)
-            topic_results.append(result)
-        
-        # 生成报告
-        report_lines = []
-        report_lines.append("=" * 70)
-        report_lines.append(f"Meta-Review Report for Paper: {paper_id}")
-        report_lines.append("=" * 70)
-        report_lines.append("")
-        report_lines.append("This report is generated using the E-V-W Evaluation Stack.")
-        report_lines.append("The evaluation process includes:")
-        report_lines.append("  1. Structure Extraction: Claims extracted from reviews")
-        report_lines.append("  2. Fact Verification: Claims verified against paper content")
-        report_lines.append("  3. Bias Calculation: Reviewer credibility weights calculated")
-        report_lines.append("  4. Meta-Review Synthesis: Weighted voting on topics")
-        report_lines.append("")
-        report_lines.append("-" * 70)
-        report_lines.append("REVIEWER CREDIBILITY WEIGHTS")
-        report_lines.append("-" * 70)
-        report_lines.append("")
-        
-        # 显示权重
-        sorted_weights = sorted(weights.items(), key=lambda x: x[1]['weight'], reverse=True)
-        for reviewer_id, data in sorted_weights:
-            report_lines.append(f"{reviewer_id}:")
-            report_lines.append(f"  Weight: {data['weight']:.3f}")
-            report_lines.append(f"  Hollowness: {data['hollowness']:.3f} "
-                              f"({data['num_claims'] - data['num_claims_with_evidence']}/{data['num_claims']} claims without evidence)")
-            report_lines.append(f"  Hallucination: {data['hallucination']:.3f} "
-                              f"({data['num_false_claims']}/{data['num_claims_with_evidence']} false claims)")
-            report_lines.append("")
-        
-        report_lines.append("-" * 70)
-        report_lines.append("TOPIC-BASED EVALUATION")
-        report_lines.append("-" * 70)
-        report_lines.append("")
-        
-        # 显示每个主题的结果
-        for result in topic_results:
-            topic = result['topic']
-            if self.use_10_point_scale:
-                score = result['score_10']
-                score_label = "Score (10-point scale)"
-            else:
-                score = result['score']
-                score_label = "Score"
-            decision = result['decision']
-            num_claims = result['num_claims']
-            
-            report_lines.append(f"Topic: {topic}")
-            report_lines.append(f"  {score_label}: {score:.2f}")
-            report_lines.append(f"  Decision: {decision}")
-            report_lines.append(f"  Number of claims: {num_claims}")
-            
-            if result['claims']:
-                report_lines.append("  Key claims:")
-                for claim_detail in result['claims'][:3]:  # 只显示前3个
-                    sentiment = claim_detail['sentiment']
-                    contribution = claim_detail['contribution']
-                    report_lines.append(f"    - [{claim_detail['reviewer_id']}] {sentiment}: "
-                                      f"{claim_detail['statement'][:80]}... "
-                                      f"(contribution: {contribution:+.3f})")
-            
-            report_lines.append("")
-        
-        # 总体评估
-        report_lines.append("-" * 70)
-        report_lines.append("OVERALL ASSESSMENT")
-        report_lines.append("-" * 70)
-        report_lines.append("")
-        
-        # 计算平均分数
-        if self.use_10_point_scale:
-            valid_scores = [r['score_10'] for r in topic_results if r['num_claims'] > 0]
-            score_label = "Average Topic Score (10-point scale)"
-        else:
-            valid_scores = [r['score'] for r in topic_results if r['num_claims'] > 0]
-            score_label = "Average Topic Score"
-        
-        if valid_scores:
-            avg_score = sum(valid_scores) / len(valid_scores)
-            report_lines.append(f"{score_label}: {avg_score:.2f}")
-            
-            # 统计决策
-            decisions = [r['decision'] for r in topic_results if r['num_claims'] > 0]
-            accept_count = decisions.count('Accept')
-            reject_count = decisions.count('Reject')
-            neutral_count = decisions.count('Neutral')
-            
-            report_lines.append(f"Topic Decisions: Accept={accept_count}, Reject={reject_count}, Neutral={neutral_count}")
-            
-            # 总体建议（只有 Accept 或 Reject 两种）
-            # 使用5.0作为分界线（10分制的中位数）
-            if self.use_10_point_scale:
-                if avg_score >= 5.0:
-                    overall_decision = "ACCEPT"
-                else:
-                    overall_decision = "REJECT"
-            else:
-                # 原始范围 [-1, 1]，0.0 作为分界线
-                if avg_score >= 0.0:
-                    overall_decision = "ACCEPT"
-                else:
-                    overall_decision = "REJECT"
-            
-            report_lines.append(f"Overall Recommendation: {overall_decision}")
-        
-        report_lines.append("")
-        report_lines.append("=" * 70)
-        report_lines.append("End of Report")
-        report_lines.append("=" * 70)
-        
-        return "\n".join(report_lines)
-
+        return self.render_report(self.synthesize(paper_id, claims, verifications, weights))
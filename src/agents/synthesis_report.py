@@ -0,0 +1,324 @@
+"""
+Step 4 合成结果与报告模板
+SynthesisResult 是合成决策的结构化结果（可序列化为 JSON），
+ReportTemplate 在构造时预解析各段模板，把结构化结果渲染为 Meta-Review 报告
+"""
+
+import json
+import re
+import string
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+class SynthesisResult:
+    """合成决策的结构化结果"""
+
+    def __init__(self,
+                 paper_id: str,
+                 use_10_point_scale: bool,
+                 num_claims: int,
+                 num_filtered_claims: int,
+                 reviewers: List[Dict],
+                 topics: List[Dict],
+                 average_score: Optional[float],
+                 decision_counts: Dict[str, int],
+                 overall_threshold: float,
+                 overall_decision: Optional[str]):
+        """
+        Args:
+            paper_id: 论文 ID
+            use_10_point_scale: 分数是否为10分制
+            num_claims: 观点总数
+            num_filtered_claims: 过滤 False 观点后的观点数
+            reviewers: reviewer 权重列表（按权重降序，每项包含 reviewer_id）
+            topics: 主题投票结果列表（SynthesisAgent.vote_topics 的输出）
+            average_score: 有观点主题的平均得分，没有有效主题时为 None
+            decision_counts: 各主题决策计数（Accept / Reject / Neutral）
+            overall_threshold: 总体建议的分界线
+            overall_decision: "ACCEPT"、"REJECT"，没有有效主题时为 None
+        """
+        self.paper_id = paper_id
+        self.use_10_point_scale = use_10_point_scale
+        self.num_claims = num_claims
+        self.num_filtered_claims = num_filtered_claims
+        self.reviewers = reviewers
+        self.topics = topics
+        self.average_score = average_score
+        self.decision_counts = decision_counts
+        self.overall_threshold = overall_threshold
+        self.overall_decision = overall_decision
+
+    @property
+    def predicted_status(self) -> Optional[str]:
+        """与 ground truth 同一取值的预测结果："Accepted"、"Rejected" 或 None"""
+        if self.overall_decision == "ACCEPT":
+            return "Accepted"
+        elif self.overall_decision == "REJECT":
+            return "Rejected"
+        return None
+
+    def topic_scores(self) -> Dict[str, float]:
+        """有观点的主题得分（与报告使用同一分制）"""
+        key = 'score_10' if self.use_10_point_scale else 'score'
+        return {t['topic']: t[key] for t in self.topics if t['num_claims'] > 0}
+
+    def to_dict(self) -> Dict:
+        return {
+            'paper_id': self.paper_id,
+            'use_10_point_scale': self.use_10_point_scale,
+            'num_claims': self.num_claims,
+            'num_filtered_claims': self.num_filtered_claims,
+            'reviewers': self.reviewers,
+            'topics': self.topics,
+            'average_score': self.average_score,
+            'decision_counts': self.decision_counts,
+            'overall_threshold': self.overall_threshold,
+            'overall_decision': self.overall_decision
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SynthesisResult":
+        return cls(**{key: data[key] for key in (
+            'paper_id', 'use_10_point_scale', 'num_claims', 'num_filtered_claims', 'reviewers',
+            'topics', 'average_score', 'decision_counts', 'overall_threshold', 'overall_decision'
+        )})
+
+    def save(self, path: Path):
+        """保存为 JSON 文件"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["SynthesisResult"]:
+        """从 JSON 文件加载，文件不存在时返回 None"""
+        path = Path(path)
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+DOUBLE_RULE = "=" * 70
+SINGLE_RULE = "-" * 70
+
+# 每段模板的文本及允许使用的字段
+DEFAULT_SECTIONS = {
+    'header': (
+        DOUBLE_RULE + "\n"
+        "Meta-Review Report for Paper: {paper_id}\n"
+        + DOUBLE_RULE + "\n"
+        "\n"
+        "This report is generated using the E-V-W Evaluation Stack.\n"
+        "The evaluation process includes:\n"
+        "  1. Structure Extraction: Claims extracted from reviews\n"
+        "  2. Fact Verification: Claims verified against paper content\n"
+        "  3. Bias Calculation: Reviewer credibility weights calculated\n"
+        "  4. Meta-Review Synthesis: Weighted voting on topics\n"
+        "\n"
+        + SINGLE_RULE + "\n"
+        "REVIEWER CREDIBILITY WEIGHTS\n"
+        + SINGLE_RULE + "\n"
+        "\n"
+    ),
+    'reviewer': (
+        "{reviewer_id}:\n"
+        "  Weight: {weight:.3f}\n"
+        "  Hollowness: {hollowness:.3f} ({num_without_evidence}/{num_claims} claims without evidence)\n"
+        "  Hallucination: {hallucination:.3f} ({num_false_claims}/{num_claims_with_evidence} false claims)\n"
+        "\n"
+    ),
+    'topics_header': (
+        SINGLE_RULE + "\n"
+        "TOPIC-BASED EVALUATION\n"
+        + SINGLE_RULE + "\n"
+        "\n"
+    ),
+    'topic': (
+        "Topic: {topic}\n"
+        "  {score_label}: {score:.2f}\n"
+        "  Decision: {decision}\n"
+        "  Number of claims: {num_claims}\n"
+    ),
+    'claims_header': "  Key claims:\n",
+    'claim': "    - [{reviewer_id}] {sentiment}: {statement}... (contribution: {contribution:+.3f})\n",
+    'topic_footer': "\n",
+    'overall_header': (
+        SINGLE_RULE + "\n"
+        "OVERALL ASSESSMENT\n"
+        + SINGLE_RULE + "\n"
+        "\n"
+    ),
+    'overall': (
+        "{score_label}: {average_score:.2f}\n"
+        "Topic Decisions: Accept={accept}, Reject={reject}, Neutral={neutral}\n"
+        "Overall Recommendation: {overall_decision}\n"
+    ),
+    'footer': (
+        "\n"
+        + DOUBLE_RULE + "\n"
+        "End of Report\n"
+        + DOUBLE_RULE
+    ),
+}
+
+# 允许的格式说明（不允许嵌套字段）
+_FORMAT_SPEC = re.compile(r"[\w<>=^+\- #,.%]*")
+
+SECTION_FIELDS = {
+    'header': {'paper_id'},
+    'reviewer': {'reviewer_id', 'weight', 'hollowness', 'hallucination', 'num_claims',
+                 'num_claims_with_evidence', 'num_without_evidence', 'num_false_claims'},
+    'topics_header': set(),
+    'topic': {'topic', 'score_label', 'score', 'decision', 'num_claims'},
+    'claims_header': set(),
+    'claim': {'reviewer_id', 'sentiment', 'statement', 'contribution'},
+    'topic_footer': set(),
+    'overall_header': set(),
+    'overall': {'score_label', 'average_score', 'accept', 'reject', 'neutral', 'overall_decision'},
+    'footer': set(),
+}
+
+
+_FORMATTER = string.Formatter()
+
+
+class _CompiledSection:
+    """解析后的模板段落，以关键字参数调用得到渲染文本"""
+
+    __slots__ = ('pieces', 'constant')
+
+    def __init__(self, pieces: List[Tuple[str, Optional[str], str, Optional[str]]]):
+        self.pieces = pieces
+        self.constant = "".join(literal for literal, *_ in pieces) if all(
+            field is None for _, field, _, _ in pieces) else None
+
+    def __call__(self, **values) -> str:
+        if self.constant is not None:
+            return self.constant
+        parts = []
+        for literal, field, spec, conversion in self.pieces:
+            parts.append(literal)
+            if field is not None:
+                value = _FORMATTER.convert_field(values[field], conversion)
+                parts.append(_FORMATTER.format_field(value, spec))
+        return "".join(parts)
+
+
+class ReportTemplate:
+    """
+    预编译的报告模板
+
+    构造时解析、校验每段模板（只解析一次）；
+    渲染时每个 reviewer / 主题 / 观点只调用一次对应函数，最后一次 join。
+    """
+
+    def __init__(self, sections: Optional[Dict[str, str]] = None, max_claims: int = 3,
+                 statement_chars: int = 80):
+        """
+        Args:
+            sections: 覆盖默认模板的段落（key 见 DEFAULT_SECTIONS）
+            max_claims: 每个主题显示的观点数
+            statement_chars: 观点陈述截断长度
+        """
+        templates = dict(DEFAULT_SECTIONS)
+        for name, text in (sections or {}).items():
+            if name not in DEFAULT_SECTIONS:
+                raise ValueError(f"未知的模板段落: {name}。支持: {', '.join(DEFAULT_SECTIONS)}")
+            templates[name] = text
+
+        self.max_claims = max_claims
+        self.statement_chars = statement_chars
+        self._sections = {name: self._compile(name, text) for name, text in templates.items()}
+
+    @staticmethod
+    def _compile(name: str, text: str) -> "_CompiledSection":
+        """
+        解析并校验一段模板
+
+        模板按 str.format 语法只解析一次，得到 (文本, 字段, 格式说明, 转换) 片段，
+        渲染时直接按片段格式化；没有字段的段落预先拼好常量。
+        """
+        allowed = SECTION_FIELDS[name]
+        pieces = []
+        for literal, field, spec, conversion in _FORMATTER.parse(text):
+            if field is not None:
+                if field not in allowed:
+                    raise ValueError(f"模板段落 {name} 包含未知字段: {field}")
+                if conversion not in (None, 'r', 's', 'a') or not _FORMAT_SPEC.fullmatch(spec or ''):
+                    raise ValueError(f"模板段落 {name} 的字段 {field} 格式无效")
+            pieces.append((literal, field, spec or '', conversion))
+        return _CompiledSection(pieces)
+
+    def render(self, result: SynthesisResult) -> str:
+        """
+        渲染报告
+
+        Args:
+            result: 结构化合成结果
+
+        Returns:
+            报告文本
+        """
+        sections = self._sections
+        parts = [sections['header'](paper_id=result.paper_id)]
+
+        render_reviewer = sections['reviewer']
+        for data in result.reviewers:
+            parts.append(render_reviewer(
+                reviewer_id=data['reviewer_id'],
+                weight=data['weight'],
+                hollowness=data['hollowness'],
+                hallucination=data['hallucination'],
+                num_claims=data['num_claims'],
+                num_claims_with_evidence=data['num_claims_with_evidence'],
+                num_without_evidence=data['num_claims'] - data['num_claims_with_evidence'],
+                num_false_claims=data['num_false_claims']
+            ))
+
+        parts.append(sections['topics_header']())
+
+        if result.use_10_point_scale:
+            score_key, score_label = 'score_10', "Score (10-point scale)"
+        else:
+            score_key, score_label = 'score', "Score"
+        render_topic = sections['topic']
+        render_claim = sections['claim']
+        claims_header = sections['claims_header']()
+        topic_footer = sections['topic_footer']()
+        for topic_result in result.topics:
+            parts.append(render_topic(
+                topic=topic_result['topic'],
+                score_label=score_label,
+                score=topic_result[score_key],
+                decision=topic_result['decision'],
+                num_claims=topic_result['num_claims']
+            ))
+            if topic_result['claims']:
+                parts.append(claims_header)
+                for claim_detail in topic_result['claims'][:self.max_claims]:
+                    parts.append(render_claim(
+                        reviewer_id=claim_detail['reviewer_id'],
+                        sentiment=claim_detail['sentiment'],
+                        statement=claim_detail['statement'][:self.statement_chars],
+                        contribution=claim_detail['contribution']
+                    ))
+            parts.append(topic_footer)
+
+        parts.append(sections['overall_header']())
+        if result.average_score is not None:
+            counts = result.decision_counts
+            parts.append(sections['overall'](
+                score_label="Average Topic Score (10-point scale)" if result.use_10_point_scale
+                else "Average Topic Score",
+                average_score=result.average_score,
+                accept=counts.get('Accept', 0),
+                reject=counts.get('Reject', 0),
+                neutral=counts.get('Neutral', 0),
+                overall_decision=result.overall_decision
+            ))
+        parts.append(sections['footer']())
+
+        return "".join(parts)
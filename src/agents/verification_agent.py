@@ -10,6 +10,8 @@ import io
 from typing import List, Dict, Optional
 from ..utils.llm_client import LLMClient
 from ..utils.rag import SimpleRAG
+from ..utils.tracing import traced
+from ..utils.usage import BudgetExceededError
 
 # 设置UTF-8编码输出（Windows兼容）
 if sys.platform == 'win32' and hasattr(sys.stdout, 'buffer'):
@@ -31,6 +33,13 @@ class VerificationAgent:
         self.llm = llm_client
         self.rag = rag or SimpleRAG(chunk_size=500, chunk_overlap=50)
         
+        # 上下文长度上限（字符数），分组验证时多个观点共享一份更长的上下文
+        self.max_context_length = 3000
+        self.max_group_context_length = 6000
+        
+        # 当前论文的摘要（由 set_paper_digest 设置），作为同一论文所有验证请求共享的系统提示前缀
+        self.paper_digest: Optional[str] = None
+        
         self.system_prompt = """You are a fact-checking expert for academic papers. Your task is to verify whether a reviewer's claim about a paper is consistent with the actual content of the paper.
 
 For each claim, you need to determine:
@@ -118,6 +127,110 @@ You must base your judgment solely on the evidence provided from the paper. Be o
         
         return best_match if best_score > 0 else None
     
+    def set_paper_digest(self, digest: Optional[str]):
+        """
+        设置当前论文的摘要（None 或空字符串表示不使用摘要）
+        
+        Args:
+            digest: PaperDigester 生成的摘要文本
+        """
+        self.paper_digest = digest or None
+    
+    def get_system_prompt(self) -> str:
+        """
+        验证请求的系统提示：固定的指令在前，当前论文的摘要在后
+        
+        同一论文的所有验证请求共享这一前缀，观点和检索上下文只出现在用户提示中，
+        提供商的前缀缓存可以复用这部分输入 token。
+        """
+        if not self.paper_digest:
+            return self.system_prompt
+        return f"""{self.system_prompt}
+
+The following digest summarizes the paper under review. Use it together with the retrieved paper context; when they disagree, trust the retrieved context.
+
+Paper Digest:
+{self.paper_digest}"""
+    
+    def retrieve_context(self, query: str, paper_text: str = None, target_section: str = None,
+                         paper_sections: Dict[str, str] = None) -> str:
+        """
+        根据 RAG 类型检索与查询相关的上下文
+        
+        Args:
+            query: 查询文本
+            paper_text: 论文文本
+            target_section: 目标section名称
+            paper_sections: 论文的section字典
+            
+        Returns:
+            合并后的上下文文本
+        """
+        # 检查 RAG 类型以使用正确的接口
+        from ..utils.embedding_rag import EmbeddingRAG
+        from ..utils.hybrid_rag import HybridRAG
+        from ..utils.hierarchical_rag import HierarchicalRAG
+        from ..utils.reranking_rag import RerankingRAG
+        
+        # 如果使用RerankingRAG，需要检查其base_rag类型
+        if isinstance(self.rag, RerankingRAG):
+            # RerankingRAG: 根据base_rag类型决定参数
+            if isinstance(self.rag.base_rag, (EmbeddingRAG, HierarchicalRAG)):
+                return self.rag.get_context(None, query, top_k=5, target_section=target_section, paper_sections=paper_sections)
+            return self.rag.get_context(paper_text, query, top_k=5, target_section=target_section, paper_sections=paper_sections)
+        elif isinstance(self.rag, HybridRAG):
+            # Hybrid RAG: 需要传入 paper_text（内部会同时使用两种方法）
+            return self.rag.get_context(paper_text, query, top_k=5, target_section=target_section, paper_sections=paper_sections)
+        elif isinstance(self.rag, HierarchicalRAG):
+            # Hierarchical RAG: 按上下文长度上限放入完整的 section 摘要和文本块
+            return self.rag.get_context(query, top_k=5, target_section=target_section,
+                                        max_chars=self.max_context_length)
+        elif isinstance(self.rag, EmbeddingRAG):
+            # Embedding RAG: 不需要传入 paper_text（已构建索引）
+            return self.rag.get_context(query, top_k=5, target_section=target_section)
+        # Simple RAG: 需要传入 paper_text
+        return self.rag.get_context(paper_text, query, top_k=5, target_section=target_section, paper_sections=paper_sections)
+    
+    def build_query(self, claim: Dict) -> str:
+        """构建检索查询：结合 statement 和 substantiation"""
+        query = f"{claim.get('statement', '')}"
+        substantiation_content = claim.get('substantiation_content', '')
+        if substantiation_content:
+            query += f" {substantiation_content}"
+        return query
+    
+    def _extract_json_str(self, response: str) -> str:
+        """从 LLM 响应中提取 JSON 字符串（可能包含 markdown 代码块）"""
+        if "```json" in response:
+            return response.split("```json")[1].split("```")[0].strip()
+        elif "```" in response:
+            return response.split("```")[1].split("```")[0].strip()
+        return response.strip()
+    
+    def _normalize_result(self, claim_id: str, result: Dict) -> Dict:
+        """确保验证结果格式正确（结果不是 JSON 对象时返回 Partially_True，置信度不是数字时取 0.5）"""
+        if not isinstance(result, dict):
+            result = {
+                'verification_reason': f'Error parsing verification result: expected a JSON object, got {type(result).__name__}',
+                'confidence': 0.3
+            }
+        try:
+            confidence = float(result.get('confidence', 0.5))
+        except (TypeError, ValueError):
+            confidence = 0.5
+        verification_result = {
+            'id': claim_id,
+            'verification_result': result.get('verification_result', 'Partially_True'),
+            'verification_reason': result.get('verification_reason', 'Unable to determine'),
+            'confidence': confidence
+        }
+        
+        # 验证 verification_result 的值
+        if verification_result['verification_result'] not in ['True', 'False', 'Partially_True']:
+            verification_result['verification_result'] = 'Partially_True'
+        
+        return verification_result
+    
     def verify_claim(self, claim: Dict, paper_text: str = None, paper_sections: Dict[str, str] = None) -> Dict:
         """
         验证单个观点
@@ -130,14 +243,23 @@ You must base your judgment solely on the evidence provided from the paper. Be o
         Returns:
             验证结果字典，包含 id, verification_result, verification_reason, confidence
         """
-        claim_id = claim.get('id', '')
-        statement = claim.get('statement', '')
-        substantiation_content = claim.get('substantiation_content', '')
+        context = self.get_claim_context(claim, paper_text, paper_sections)
+        return self.verify_claim_with_context(claim, context)
+    
+    def get_claim_context(self, claim: Dict, paper_text: str = None, paper_sections: Dict[str, str] = None) -> str:
+        """
+        识别观点相关的section并检索上下文
         
-        # 构建查询：结合 statement 和 substantiation
-        query = f"{statement}"
-        if substantiation_content:
-            query += f" {substantiation_content}"
+        Args:
+            claim: 观点字典
+            paper_text: 论文文本
+            paper_sections: 论文的section字典
+            
+        Returns:
+            检索到的上下文文本
+        """
+        claim_id = claim.get('id', '')
+        query = self.build_query(claim)
         
         # 识别相关的section
         target_section = None
@@ -150,48 +272,28 @@ You must base your judgment solely on the evidence provided from the paper. Be o
                 print(f"    [Section Filter] Claim {claim_id} -> Section: {section_display}")
         
         # 使用 RAG 检索相关段落（支持section过滤）
-        # 检查 RAG 类型以使用正确的接口
-        from ..utils.embedding_rag import EmbeddingRAG
-        from ..utils.hybrid_rag import HybridRAG
-        from ..utils.reranking_rag import RerankingRAG
-        
-        # 如果使用RerankingRAG，需要检查其base_rag类型
-        if isinstance(self.rag, RerankingRAG):
-            # RerankingRAG: 根据base_rag类型决定参数
-            if isinstance(self.rag.base_rag, EmbeddingRAG):
-                context = self.rag.get_context(None, query, top_k=5, target_section=target_section, paper_sections=paper_sections)
-            else:
-                context = self.rag.get_context(paper_text, query, top_k=5, target_section=target_section, paper_sections=paper_sections)
-        elif isinstance(self.rag, HybridRAG):
-            # Hybrid RAG: 需要传入 paper_text（内部会同时使用两种方法）
-            context = self.rag.get_context(paper_text, query, top_k=5, target_section=target_section, paper_sections=paper_sections)
-        elif isinstance(self.rag, EmbeddingRAG):
-            # Embedding RAG: 不需要传入 paper_text（已构建索引）
-            context = self.rag.get_context(query, top_k=5, target_section=target_section)
-        else:
-            # Simple RAG: 需要传入 paper_text
-            context = self.rag.get_context(paper_text, query, top_k=5, target_section=target_section, paper_sections=paper_sections)
-        
-        if not context:
-            # 如果没有找到相关上下文，返回不确定的结果
-            return {
-                'id': claim_id,
-                'verification_result': 'Partially_True',
-                'verification_reason': 'No relevant context found in the paper to verify this claim.',
-                'confidence': 0.3
-            }
+        return self.retrieve_context(query, paper_text, target_section, paper_sections)
+    
+    def build_verification_prompt(self, claim: Dict, context: str) -> str:
+        """
+        构建单个观点的验证提示
         
+        Args:
+            claim: 观点字典
+            context: 检索到的论文上下文（会按 max_context_length 截断）
+            
+        Returns:
+            用户提示文本
+        """
         # 限制上下文长度以避免 token 限制
-        max_context_length = 3000
-        if len(context) > max_context_length:
-            context = context[:max_context_length] + "..."
+        if len(context) > self.max_context_length:
+            context = context[:self.max_context_length] + "..."
         
-        # 构建验证提示
-        prompt = f"""Please verify the following reviewer claim against the paper content.
+        return f"""Please verify the following reviewer claim against the paper content.
 
 Reviewer Claim:
-Statement: {statement}
-Substantiation: {substantiation_content}
+Statement: {claim.get('statement', '')}
+Substantiation: {claim.get('substantiation_content', '')}
 
 Relevant Paper Context:
 {context}
@@ -202,34 +304,30 @@ Please provide your verification result in the following JSON format:
     "verification_reason": "Your detailed explanation here, citing specific evidence from the paper context",
     "confidence": 0.0-1.0
 }}"""
+    
+    def no_context_result(self, claim_id: str) -> Dict:
+        """没有找到相关上下文时的不确定结果"""
+        return {
+            'id': claim_id,
+            'verification_result': 'Partially_True',
+            'verification_reason': 'No relevant context found in the paper to verify this claim.',
+            'confidence': 0.3
+        }
+    
+    def parse_verification_response(self, claim_id: str, response: str) -> Dict:
+        """
+        解析单个观点的验证响应
         
-        try:
-            response = self.llm.call(prompt, self.system_prompt, max_tokens=1000)
-            
-            # 解析 JSON 响应
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                json_str = response.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = response.strip()
-            
-            result = json.loads(json_str)
-            
-            # 确保结果格式正确
-            verification_result = {
-                'id': claim_id,
-                'verification_result': result.get('verification_result', 'Partially_True'),
-                'verification_reason': result.get('verification_reason', 'Unable to determine'),
-                'confidence': float(result.get('confidence', 0.5))
-            }
-            
-            # 验证 verification_result 的值
-            if verification_result['verification_result'] not in ['True', 'False', 'Partially_True']:
-                verification_result['verification_result'] = 'Partially_True'
-            
-            return verification_result
+        Args:
+            claim_id: 观点 ID
+            response: LLM 响应文本
             
+        Returns:
+            验证结果字典，解析失败时返回 Partially_True 兜底结果
+        """
+        try:
+            result = json.loads(self._extract_json_str(response))
+            return self._normalize_result(claim_id, result)
         except json.JSONDecodeError as e:
             print(f"[ERROR] JSON 解析失败 for claim {claim_id}: {e}")
             print(f"[DEBUG] LLM 响应: {response[:500]}")
@@ -239,6 +337,33 @@ Please provide your verification result in the following JSON format:
                 'verification_reason': f'Error parsing verification result: {str(e)}',
                 'confidence': 0.3
             }
+    
+    @traced("agent.verify_claim_with_context", context={'agent': 'verification'})
+    def verify_claim_with_context(self, claim: Dict, context: str) -> Dict:
+        """
+        基于已检索的上下文验证单个观点
+        
+        Args:
+            claim: 观点字典
+            context: 检索到的论文上下文
+            
+        Returns:
+            验证结果字典
+        """
+        claim_id = claim.get('id', '')
+        
+        if not context:
+            # 如果没有找到相关上下文，返回不确定的结果
+            return self.no_context_result(claim_id)
+        
+        # 构建验证提示
+        prompt = self.build_verification_prompt(claim, context)
+        
+        try:
+            response = self.llm.call(prompt, self.get_system_prompt(), max_tokens=1000, expect_json='object',
+                                     required_keys=['verification_result'])
+        except BudgetExceededError:
+            raise
         except Exception as e:
             print(f"[ERROR] Error verifying claim {claim_id}: {e}")
             return {
@@ -247,8 +372,178 @@ Please provide your verification result in the following JSON format:
                 'verification_reason': f'Error during verification: {str(e)}',
                 'confidence': 0.3
             }
+        
+        # 解析 JSON 响应
+        return self.parse_verification_response(claim_id, response)
+    
+    def group_claims(self, claims: List[Dict], paper_text: str, paper_sections: Dict[str, str] = None,
+                     max_group_size: int = 5, min_overlap: float = 0.5) -> List[Dict]:
+        """
+        按相关section和检索上下文的重叠度对观点分桶
+        
+        同一桶内的观点属于同一个section，且每个观点检索到的文本块中至少有
+        min_overlap 比例已出现在桶内，这样共享的上下文只需发送一次。
+        
+        Args:
+            claims: 需要验证的观点列表
+            paper_text: 论文文本
+            paper_sections: 论文的section字典
+            max_group_size: 每个桶最多包含的观点数
+            min_overlap: 加入已有桶所需的最小上下文重叠比例（0-1）
+            
+        Returns:
+            桶列表，每个桶包含 section, claims, chunks（按检索顺序去重的文本块）
+        """
+        available_sections = list(paper_sections.keys()) if paper_sections else None
+        groups = []
+        
+        for claim in claims:
+            target_section = None
+            if available_sections:
+                target_section = self.identify_relevant_section(claim, available_sections)
+            
+            context = self.retrieve_context(self.build_query(claim), paper_text, target_section, paper_sections)
+            chunks = [chunk for chunk in context.split("\n\n") if chunk.strip()] if context else []
+            
+            best_group = None
+            best_overlap = 0.0
+            if chunks:
+                chunk_set = set(chunks)
+                for group in groups:
+                    if group['section'] != target_section or len(group['claims']) >= max_group_size:
+                        continue
+                    if not group['chunk_set']:
+                        continue
+                    # 重叠度：该观点的文本块中已在桶内出现的比例
+                    overlap = len(chunk_set & group['chunk_set']) / len(chunk_set)
+                    if overlap >= min_overlap and overlap > best_overlap:
+                        best_group = group
+                        best_overlap = overlap
+            
+            if best_group is None:
+                best_group = {'section': target_section, 'claims': [], 'chunks': [], 'chunk_set': set()}
+                groups.append(best_group)
+            
+            best_group['claims'].append(claim)
+            for chunk in chunks:
+                if chunk not in best_group['chunk_set']:
+                    best_group['chunk_set'].add(chunk)
+                    best_group['chunks'].append(chunk)
+        
+        return [
+            {'section': group['section'], 'claims': group['claims'], 'chunks': group['chunks']}
+            for group in groups
+        ]
     
-    def process_claims(self, claims: List[Dict], paper_text: str, paper_sections: Dict[str, str] = None) -> List[Dict]:
+    def build_group_prompt(self, group_claims: List[Dict], context: str) -> str:
+        """
+        构建多个观点共享上下文的分组验证提示
+        
+        Args:
+            group_claims: 同一桶内的观点列表
+            context: 桶内共享的论文上下文（会按 max_group_context_length 截断）
+            
+        Returns:
+            用户提示文本
+        """
+        # 限制上下文长度以避免 token 限制
+        if len(context) > self.max_group_context_length:
+            context = context[:self.max_group_context_length] + "..."
+        
+        claim_lines = []
+        for claim in group_claims:
+            claim_lines.append(f"[{claim.get('id', '')}]")
+            claim_lines.append(f"Statement: {claim.get('statement', '')}")
+            claim_lines.append(f"Substantiation: {claim.get('substantiation_content', '')}")
+            claim_lines.append("")
+        claims_text = "\n".join(claim_lines)
+        
+        return f"""Please verify each of the following reviewer claims against the paper content. Judge every claim independently.
+
+Reviewer Claims:
+{claims_text}
+Relevant Paper Context:
+{context}
+
+Please provide your verification results as a JSON array with exactly one object per claim, in the following format:
+[
+    {{
+        "id": "the claim id shown in brackets",
+        "verification_result": "True" | "False" | "Partially_True",
+        "verification_reason": "Your detailed explanation here, citing specific evidence from the paper context",
+        "confidence": 0.0-1.0
+    }}
+]"""
+    
+    def group_max_tokens(self, num_claims: int) -> int:
+        """分组验证响应的最大 token 数"""
+        return min(4000, 600 * num_claims)
+    
+    def parse_group_response(self, response: str) -> Dict[str, Dict]:
+        """
+        解析分组验证响应
+        
+        Args:
+            response: LLM 响应文本
+            
+        Returns:
+            原始结果字典，key 为 claim_id
+            
+        Raises:
+            ValueError: 响应不是 JSON 数组
+        """
+        results = json.loads(self._extract_json_str(response))
+        if not isinstance(results, list):
+            raise ValueError("Expected a JSON array of verification results")
+        return {
+            str(item.get('id')): item for item in results if isinstance(item, dict)
+        }
+    
+    @traced("agent.verify_claim_group", context={'agent': 'verification'})
+    def verify_claim_group(self, group: Dict) -> List[Dict]:
+        """
+        在一次 LLM 调用中验证同一桶内的多个观点
+        
+        Args:
+            group: group_claims 返回的桶，包含 claims 和共享的 chunks
+            
+        Returns:
+            验证结果列表，顺序与 group['claims'] 一致
+        """
+        group_claims = group['claims']
+        context = "\n\n".join(group['chunks'])
+        
+        if len(group_claims) == 1 or not context:
+            return [self.verify_claim_with_context(claim, context) for claim in group_claims]
+        
+        prompt = self.build_group_prompt(group_claims, context)
+        
+        group_ids = ', '.join(claim.get('id', '') for claim in group_claims)
+        try:
+            response = self.llm.call(prompt, self.get_system_prompt(), max_tokens=self.group_max_tokens(len(group_claims)),
+                                     expect_json='array', required_keys=['id', 'verification_result'])
+            results_by_id = self.parse_group_response(response)
+        except BudgetExceededError:
+            raise
+        except Exception as e:
+            # 整组失败时退回逐条验证，避免批量错误降级所有结果
+            print(f"[WARNING] Grouped verification failed for claims {group_ids}: {e}, falling back to per-claim verification")
+            return [self.verify_claim_with_context(claim, context) for claim in group_claims]
+        
+        verifications = []
+        for claim in group_claims:
+            claim_id = claim.get('id', '')
+            if claim_id in results_by_id:
+                verifications.append(self._normalize_result(claim_id, results_by_id[claim_id]))
+            else:
+                # LLM 遗漏了该观点，单独验证
+                print(f"[WARNING] Claim {claim_id} missing from grouped response, verifying individually")
+                verifications.append(self.verify_claim_with_context(claim, context))
+        
+        return verifications
+    
+    def process_claims(self, claims: List[Dict], paper_text: str, paper_sections: Dict[str, str] = None,
+                       grouped: bool = False, max_group_size: int = 5, min_overlap: float = 0.5) -> List[Dict]:
         """
         处理多个观点，只验证有证据的观点
         
@@ -256,6 +551,9 @@ Please provide your verification result in the following JSON format:
             claims: 观点列表
             paper_text: 论文文本
             paper_sections: 论文的section字典，key为section名，value为section内容
+            grouped: 是否启用分组验证（同一section且上下文重叠的观点合并为一次 LLM 调用）
+            max_group_size: 分组验证时每组最多包含的观点数
+            min_overlap: 分组验证时加入已有组所需的最小上下文重叠比例
             
         Returns:
             验证结果列表
@@ -270,6 +568,21 @@ Please provide your verification result in the following JSON format:
         
         print(f"[INFO] Verifying {len(claims_to_verify)} claims (out of {len(claims)} total claims)")
         
+        if grouped:
+            groups = self.group_claims(claims_to_verify, paper_text, paper_sections, max_group_size, min_overlap)
+            print(f"[INFO] Grouped {len(claims_to_verify)} claims into {len(groups)} verification prompts")
+            
+            results_by_id = {}
+            for i, group in enumerate(groups, 1):
+                group_ids = [claim.get('id', 'unknown') for claim in group['claims']]
+                print(f"  - Verifying group {i}/{len(groups)}: {', '.join(group_ids)}")
+                for verification in self.verify_claim_group(group):
+                    results_by_id[verification['id']] = verification
+                    print(f"    {verification['id']}: {verification['verification_result']} (confidence: {verification['confidence']:.2f})")
+            
+            # 保持与原始观点顺序一致
+            return [results_by_id[claim.get('id', '')] for claim in claims_to_verify]
+        
         for i, claim in enumerate(claims_to_verify, 1):
             print(f"  - Verifying claim {i}/{len(claims_to_verify)}: {claim.get('id', 'unknown')}")
             verification = self.verify_claim(claim, paper_text, paper_sections)
@@ -277,4 +590,3 @@ Please provide your verification result in the following JSON format:
             print(f"    Result: {verification['verification_result']} (confidence: {verification['confidence']:.2f})")
         
         return verifications
-
@@ -3,8 +3,10 @@ Step 3: Bias Calculation & Weighting (偏差计算与加权层)
 计算 Reviewer 的可信度权重
 """
 
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Dict, Optional, Sequence
+import numpy as np
+from ..data.claim_table import ClaimTable
+from ..data.claims import ClaimSet, ClaimsInput, SUBSTANTIATION_NONE, VERDICT_FALSE
 
 
 class WeightingAgent:
@@ -100,49 +102,131 @@ class WeightingAgent:
         
         return weight
     
-    def process_all_reviewers(self, claims: List[Dict], 
-                             verifications: Dict[str, Dict]) -> Dict[str, Dict]:
+    def process_all_reviewers(self, claims: ClaimsInput,
+                             verifications: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
         """
         处理所有 Reviewers，计算每个的权重和详细指标
         
+        观点先转换为 ClaimSet（reviewer 下标、证据类型和验证结果均为整数编码），
+        一次遍历按 reviewer 下标累加所有统计量，结果与逐个 reviewer 调用 calculate_* 一致。
+        
         Args:
-            claims: 所有观点列表
-            verifications: 验证结果字典
+            claims: 所有观点列表（字典、Claim 记录或 ClaimSet）
+            verifications: 验证结果字典（claims 为已关联验证结果的 ClaimSet 时可省略）
             
         Returns:
             权重字典，包含每个 reviewer 的权重和详细指标
         """
-        # 按 reviewer 分组
-        reviewer_claims = defaultdict(list)
-        for claim in claims:
-            # 从 claim id 提取 reviewer_id（格式：R1-C1 -> R1）
-            claim_id = claim.get('id', '')
-            if '-' in claim_id:
-                reviewer_id = claim_id.split('-')[0]
-                reviewer_claims[reviewer_id].append(claim)
+        claim_set = ClaimSet.build(claims, verifications)
+        num_reviewers = len(claim_set.reviewer_ids)
+        num_claims = [0] * num_reviewers
+        num_evidence = [0] * num_reviewers
+        num_false = [0] * num_reviewers
+        num_false_evidence = [0] * num_reviewers  # 幻觉指数只统计有证据的观点
+        
+        for reviewer, substantiation, verdict in zip(claim_set.reviewer, claim_set.substantiation,
+                                                     claim_set.verdict):
+            if reviewer < 0:
+                continue
+            num_claims[reviewer] += 1
+            is_false = verdict == VERDICT_FALSE
+            if is_false:
+                num_false[reviewer] += 1
+            if substantiation != SUBSTANTIATION_NONE:
+                num_evidence[reviewer] += 1
+                if is_false:
+                    num_false_evidence[reviewer] += 1
         
         results = {}
-        
-        for reviewer_id, reviewer_claim_list in reviewer_claims.items():
-            hollowness = self.calculate_hollowness(reviewer_claim_list)
-            hallucination = self.calculate_hallucination(reviewer_claim_list, verifications)
-            weight = self.calculate_weight(reviewer_id, reviewer_claim_list, verifications)
+        for index, reviewer_id in enumerate(claim_set.reviewer_ids):
+            hollowness = (num_claims[index] - num_evidence[index]) / num_claims[index]
+            hallucination = num_false_evidence[index] / num_evidence[index] if num_evidence[index] else 0.0
+            weight = max(0.0, min(1.0, 1.0 - (self.alpha * hollowness + self.beta * hallucination)))
             
             results[reviewer_id] = {
                 'weight': weight,
                 'hollowness': hollowness,
                 'hallucination': hallucination,
-                'num_claims': len(reviewer_claim_list),
-                'num_claims_with_evidence': sum(
-                    1 for c in reviewer_claim_list
-                    if c.get('substantiation_type') and c.get('substantiation_type') != 'None'
-                ),
-                'num_false_claims': sum(
-                    1 for c in reviewer_claim_list
-                    if c.get('id') in verifications and 
-                    verifications[c.get('id')].get('verification_result') == 'False'
-                )
+                'num_claims': num_claims[index],
+                'num_claims_with_evidence': num_evidence[index],
+                'num_false_claims': num_false[index]
+            }
+        
+        return results
+    
+    def compute_group_metrics(self, table: ClaimTable) -> Dict[str, np.ndarray]:
+        """
+        向量化计算语料中每个 (paper, reviewer) 组的统计量
+        
+        Args:
+            table: 语料级观点表
+            
+        Returns:
+            以组为下标的数组：num_claims, num_claims_with_evidence, num_false_claims,
+            hollowness, hallucination
+        """
+        num_groups = table.num_groups
+        is_false = table.is_false
+        
+        num_claims = np.bincount(table.claim_group, minlength=num_groups)
+        num_evidence = np.bincount(table.claim_group, weights=table.has_evidence, minlength=num_groups)
+        num_false = np.bincount(table.claim_group, weights=is_false, minlength=num_groups)
+        # 幻觉指数只统计有证据的观点
+        num_false_evidence = np.bincount(
+            table.claim_group, weights=is_false & table.has_evidence, minlength=num_groups
+        )
+        
+        hollowness = np.where(num_claims > 0, (num_claims - num_evidence) / np.maximum(num_claims, 1), 1.0)
+        hallucination = np.where(num_evidence > 0, num_false_evidence / np.maximum(num_evidence, 1), 0.0)
+        
+        return {
+            'num_claims': num_claims,
+            'num_claims_with_evidence': num_evidence.astype(np.int64),
+            'num_false_claims': num_false.astype(np.int64),
+            'hollowness': hollowness,
+            'hallucination': hallucination
+        }
+    
+    def weight_grid(self, metrics: Dict[str, np.ndarray], alphas: Sequence[float],
+                    betas: Sequence[float]) -> np.ndarray:
+        """
+        一次性计算所有 alpha/beta 组合下每个组的权重
+        
+        Args:
+            metrics: compute_group_metrics 的返回值
+            alphas: Hollowness 惩罚系数候选
+            betas: Hallucination 惩罚系数候选
+            
+        Returns:
+            形状为 (len(alphas), len(betas), num_groups) 的权重数组
+        """
+        alphas = np.asarray(alphas, dtype=np.float64)[:, None, None]
+        betas = np.asarray(betas, dtype=np.float64)[None, :, None]
+        bias_index = alphas * metrics['hollowness'][None, None, :] + betas * metrics['hallucination'][None, None, :]
+        return np.clip(1.0 - bias_index, 0.0, 1.0)
+    
+    def process_corpus(self, table: ClaimTable) -> Dict[str, Dict[str, Dict]]:
+        """
+        向量化计算整个语料所有 reviewer 的权重，输出格式与 process_all_reviewers 一致
+        
+        Args:
+            table: 语料级观点表
+            
+        Returns:
+            权重字典，key 为 paper_id，value 为该论文的 process_all_reviewers 结果
+        """
+        metrics = self.compute_group_metrics(table)
+        weights = self.weight_grid(metrics, [self.alpha], [self.beta])[0, 0]
+        
+        results: Dict[str, Dict[str, Dict]] = {paper_id: {} for paper_id in table.paper_ids}
+        for group_idx, (paper_id, reviewer_id) in enumerate(table.group_keys):
+            results[paper_id][reviewer_id] = {
+                'weight': float(weights[group_idx]),
+                'hollowness': float(metrics['hollowness'][group_idx]),
+                'hallucination': float(metrics['hallucination'][group_idx]),
+                'num_claims': int(metrics['num_claims'][group_idx]),
+                'num_claims_with_evidence': int(metrics['num_claims_with_evidence'][group_idx]),
+                'num_false_claims': int(metrics['num_false_claims'][group_idx])
             }
         
         return results
-
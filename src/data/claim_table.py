@@ -0,0 +1,154 @@
+"""
+语料级观点表
+将所有论文的 claims 和 verifications 展平为 NumPy 数组，
+供加权、合成和参数扫描等语料级计算做向量化 group-by
+"""
+
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+# verification_result 编码
+VERDICT_CODES = {'True': 1, 'False': 2, 'Partially_True': 3}
+VERDICT_NONE = 0
+
+
+def sentiment_score(sentiment: str) -> float:
+    """与 SynthesisAgent.sentiment_to_score 一致：Positive -> 1.0, Negative -> -1.0, 其他 -> 0.0"""
+    sentiment_lower = (sentiment or '').lower()
+    if 'positive' in sentiment_lower:
+        return 1.0
+    elif 'negative' in sentiment_lower:
+        return -1.0
+    return 0.0
+
+
+class ClaimTable:
+    """
+    展平后的观点表
+
+    每行对应一个 claim，每个 (paper_id, reviewer_id) 组合对应一个 group。
+    只包含 id 形如 R1-C1 的 claim（与 WeightingAgent 的 reviewer 分组规则一致）。
+    """
+
+    def __init__(self,
+                 paper_ids: List[str],
+                 group_keys: List[Tuple[str, str]],
+                 group_paper: np.ndarray,
+                 claim_paper: np.ndarray,
+                 claim_group: np.ndarray,
+                 has_evidence: np.ndarray,
+                 verdict: np.ndarray,
+                 sentiment: np.ndarray,
+                 topic: np.ndarray,
+                 topics: List[str]):
+        """
+        Args:
+            paper_ids: 论文 ID 列表（claim_paper 的取值范围）
+            group_keys: (paper_id, reviewer_id) 列表（claim_group 的取值范围）
+            group_paper: 每个 reviewer 组所属论文的下标
+            claim_paper: 每个 claim 所属论文的下标
+            claim_group: 每个 claim 所属 reviewer 组的下标
+            has_evidence: 每个 claim 是否有证据（substantiation_type 非 None）
+            verdict: 每个 claim 的验证结果编码（见 VERDICT_CODES，未验证为 0）
+            sentiment: 每个 claim 的情感分数（-1/0/1）
+            topic: 每个 claim 的主题编码（topics 的下标）
+            topics: 小写主题名称列表
+        """
+        self.paper_ids = paper_ids
+        self.group_keys = group_keys
+        self.group_paper = group_paper
+        self.claim_paper = claim_paper
+        self.claim_group = claim_group
+        self.has_evidence = has_evidence
+        self.verdict = verdict
+        self.sentiment = sentiment
+        self.topic = topic
+        self.topics = topics
+
+    @property
+    def num_claims(self) -> int:
+        return len(self.claim_group)
+
+    @property
+    def num_groups(self) -> int:
+        return len(self.group_keys)
+
+    @property
+    def is_false(self) -> np.ndarray:
+        return self.verdict == VERDICT_CODES['False']
+
+    def topic_code(self, topic: str) -> Optional[int]:
+        """返回主题编码（大小写不敏感），不存在时返回 None"""
+        try:
+            return self.topics.index(topic.lower())
+        except ValueError:
+            return None
+
+    @classmethod
+    def from_corpus(cls, claims_by_paper: Dict[str, List[Dict]],
+                    verifications_by_paper: Optional[Dict[str, Dict[str, Dict]]] = None) -> "ClaimTable":
+        """
+        从每篇论文的 claims 和 verifications 构建观点表
+
+        Args:
+            claims_by_paper: 观点列表，key 为 paper_id
+            verifications_by_paper: 验证结果字典（key 为 claim_id），key 为 paper_id
+
+        Returns:
+            ClaimTable 实例
+        """
+        verifications_by_paper = verifications_by_paper or {}
+        paper_ids = list(claims_by_paper.keys())
+        group_index: Dict[Tuple[str, str], int] = {}
+        group_paper: List[int] = []
+        topic_index: Dict[str, int] = {}
+
+        claim_paper, claim_group, has_evidence, verdict, sentiment, topic = [], [], [], [], [], []
+
+        for paper_idx, paper_id in enumerate(paper_ids):
+            verifications = verifications_by_paper.get(paper_id, {})
+            for claim in claims_by_paper[paper_id]:
+                claim_id = claim.get('id', '')
+                if '-' not in claim_id:
+                    continue
+                key = (paper_id, claim_id.split('-')[0])
+                if key not in group_index:
+                    group_index[key] = len(group_index)
+                    group_paper.append(paper_idx)
+                topic_name = (claim.get('topic') or '').lower()
+                if topic_name not in topic_index:
+                    topic_index[topic_name] = len(topic_index)
+
+                substantiation_type = claim.get('substantiation_type')
+                verification = verifications.get(claim_id)
+
+                claim_paper.append(paper_idx)
+                claim_group.append(group_index[key])
+                has_evidence.append(bool(substantiation_type) and substantiation_type != 'None')
+                verdict.append(
+                    VERDICT_CODES.get(verification.get('verification_result'), VERDICT_NONE)
+                    if verification else VERDICT_NONE
+                )
+                sentiment.append(sentiment_score(claim.get('sentiment', 'Neutral')))
+                topic.append(topic_index[topic_name])
+
+        return cls(
+            paper_ids=paper_ids,
+            group_keys=list(group_index.keys()),
+            group_paper=np.asarray(group_paper, dtype=np.int64),
+            claim_paper=np.asarray(claim_paper, dtype=np.int64),
+            claim_group=np.asarray(claim_group, dtype=np.int64),
+            has_evidence=np.asarray(has_evidence, dtype=bool),
+            verdict=np.asarray(verdict, dtype=np.int8),
+            sentiment=np.asarray(sentiment, dtype=np.float64),
+            topic=np.asarray(topic, dtype=np.int64),
+            topics=list(topic_index.keys())
+        )
+
+    @classmethod
+    def from_results(cls, base_path: str = "data", db_path: Optional[str] = None) -> "ClaimTable":
+        """从结果存储（或逐篇 JSON 文件）加载整个语料"""
+        from .results_store import load_corpus_results
+        claims, verifications, _ = load_corpus_results(base_path, db_path)
+        return cls.from_corpus(claims, verifications)
@@ -0,0 +1,271 @@
+"""
+观点与验证结果的紧凑记录
+Claim / Verification 在构造时一次性解析 reviewer_id，并把情感、证据类型、验证结果编码为整数；
+ClaimSet 把一篇论文的观点展平为按列存放的定长数组，加权和合成的热循环只处理整数编码，
+不再逐条 split claim id、比较字符串
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Union
+from .claim_table import VERDICT_CODES, VERDICT_NONE, sentiment_score
+
+
+# 情感编码即情感分数（与 SynthesisAgent.sentiment_to_score 一致）
+SENTIMENT_POSITIVE = 1
+SENTIMENT_NEUTRAL = 0
+SENTIMENT_NEGATIVE = -1
+
+# substantiation_type 编码，0 表示没有证据（缺失或 'None'）
+SUBSTANTIATION_NONE = 0
+SUBSTANTIATION_CODES = {'Specific_Citation': 1, 'Vague': 2}
+SUBSTANTIATION_OTHER = 3
+
+VERDICT_FALSE = VERDICT_CODES['False']
+
+
+def reviewer_id_of(claim_id: str) -> Optional[str]:
+    """从 claim id 提取 reviewer_id（R1-C1 -> R1），不含 '-' 时返回 None"""
+    if claim_id and '-' in claim_id:
+        return claim_id.split('-')[0]
+    return None
+
+
+def _sentiment_code(sentiment: Optional[str]) -> int:
+    # 情感标签只有少数几种取值，缓存编码结果
+    code = _SENTIMENT_CACHE.get(sentiment)
+    if code is None:
+        code = _SENTIMENT_CACHE[sentiment] = int(sentiment_score(sentiment))
+    return code
+
+
+_SENTIMENT_CACHE: Dict[Optional[str], int] = {}
+
+
+def substantiation_code(substantiation_type: Optional[str]) -> int:
+    """substantiation_type 编码（缺失或 'None' 为 SUBSTANTIATION_NONE）"""
+    if not substantiation_type or substantiation_type == 'None':
+        return SUBSTANTIATION_NONE
+    return SUBSTANTIATION_CODES.get(substantiation_type, SUBSTANTIATION_OTHER)
+
+
+class Claim:
+    """
+    单个观点
+
+    保留原始字符串（topic、sentiment、substantiation_type）用于输出，同时保存预解析的 reviewer_id
+    和整数编码；to_dict() 返回与 Step 1 输出一致的字典。
+    """
+
+    __slots__ = ('id', 'reviewer_id', 'topic', 'sentiment', 'sentiment_code', 'substantiation_type',
+                 'substantiation_code', 'statement', 'substantiation_content', 'extra')
+
+    def __init__(self, id: str, topic: str = '', sentiment: str = 'Neutral',
+                 substantiation_type: Optional[str] = None, statement: str = '',
+                 substantiation_content: str = '', extra: Optional[Dict] = None):
+        self.id = id
+        self.reviewer_id = reviewer_id_of(id)
+        self.topic = topic
+        self.sentiment = sentiment
+        self.sentiment_code = _sentiment_code(sentiment)
+        self.substantiation_type = substantiation_type
+        self.substantiation_code = substantiation_code(substantiation_type)
+        self.statement = statement
+        self.substantiation_content = substantiation_content
+        self.extra = extra
+
+    @property
+    def has_evidence(self) -> bool:
+        return self.substantiation_code != SUBSTANTIATION_NONE
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Claim":
+        extra = None
+        if not data.keys() <= _CLAIM_FIELDS:
+            extra = {key: value for key, value in data.items() if key not in _CLAIM_FIELDS}
+        return cls(
+            id=data.get('id', ''),
+            topic=data.get('topic', ''),
+            sentiment=data.get('sentiment', 'Neutral'),
+            substantiation_type=data.get('substantiation_type'),
+            statement=data.get('statement', ''),
+            substantiation_content=data.get('substantiation_content', ''),
+            extra=extra
+        )
+
+    def to_dict(self) -> Dict:
+        data = {
+            'id': self.id,
+            'topic': self.topic,
+            'sentiment': self.sentiment,
+            'statement': self.statement,
+            'substantiation_type': self.substantiation_type,
+            'substantiation_content': self.substantiation_content
+        }
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __repr__(self) -> str:
+        return f"Claim({self.id!r}, topic={self.topic!r}, sentiment={self.sentiment_code:+d})"
+
+
+_CLAIM_FIELDS = frozenset(('id', 'topic', 'sentiment', 'substantiation_type', 'statement', 'substantiation_content'))
+
+
+def verification_confidence(verification: Dict) -> float:
+    """验证结果的置信度（缺失或不是数值时为 0.5）"""
+    try:
+        return float(verification.get('confidence', 0.5))
+    except (TypeError, ValueError):
+        return 0.5
+
+
+class Verification:
+    """
+    单个验证结果
+
+    verdict 为 VERDICT_CODES 编码（未知结果为 VERDICT_NONE），原始字典保存在 data 中用于输出。
+    """
+
+    __slots__ = ('claim_id', 'verdict', 'confidence', 'data')
+
+    def __init__(self, claim_id: str, verdict: int = VERDICT_NONE, confidence: float = 0.5,
+                 data: Optional[Dict] = None):
+        self.claim_id = claim_id
+        self.verdict = verdict
+        self.confidence = confidence
+        self.data = data
+
+    @classmethod
+    def from_dict(cls, data: Dict, claim_id: Optional[str] = None) -> "Verification":
+        return cls(
+            claim_id=claim_id or data.get('id', ''),
+            verdict=VERDICT_CODES.get(data.get('verification_result'), VERDICT_NONE),
+            confidence=verification_confidence(data),
+            data=data
+        )
+
+    @property
+    def is_false(self) -> bool:
+        return self.verdict == VERDICT_FALSE
+
+    def to_dict(self) -> Dict:
+        return self.data if self.data is not None else {'id': self.claim_id}
+
+
+ClaimsInput = Union["ClaimSet", Iterable[Union[Claim, Dict]]]
+
+
+class ClaimSet:
+    """
+    一篇论文的观点集合（按列存放）
+
+    records 保存 Claim 记录，以下定长类型数组（array 模块）与 records 一一对应：
+    - reviewer: reviewer_ids 的下标（claim id 不含 '-' 时为 -1）
+    - sentiment: 情感编码（-1/0/1）
+    - substantiation: 证据类型编码
+    - verdict: 验证结果编码（没有验证结果时为 VERDICT_NONE）
+    - confidence: 验证置信度（没有验证结果时为 0.5）
+
+    单篇论文通常只有几十个观点，逐篇加权 / 合成直接在这些整数列上循环；
+    语料级的向量化计算使用 ClaimTable。
+    """
+
+    def __init__(self, records: List[Claim],
+                 verifications: Optional[Dict[str, Union[Verification, Dict]]] = None):
+        """
+        Args:
+            records: Claim 记录列表
+            verifications: 验证结果（字典或 Verification），key 为 claim_id
+        """
+        self.records = records
+        self.reviewer_ids: List[str] = []
+        reviewer_index: Dict[str, int] = {}
+        self.reviewer = array('i')
+        self.sentiment = array('b')
+        self.substantiation = array('b')
+        for claim in records:
+            reviewer_id = claim.reviewer_id
+            if reviewer_id is None:
+                self.reviewer.append(-1)
+            else:
+                index = reviewer_index.get(reviewer_id)
+                if index is None:
+                    index = reviewer_index[reviewer_id] = len(self.reviewer_ids)
+                    self.reviewer_ids.append(reviewer_id)
+                self.reviewer.append(index)
+            self.sentiment.append(claim.sentiment_code)
+            self.substantiation.append(claim.substantiation_code)
+        self.attach(verifications or {})
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    @classmethod
+    def build(cls, claims: ClaimsInput,
+              verifications: Optional[Dict[str, Union[Verification, Dict]]] = None) -> "ClaimSet":
+        """
+        从观点字典列表（或 Claim 记录、已有的 ClaimSet）构建
+
+        Args:
+            claims: 观点列表；传入 ClaimSet 时直接复用（给出 verifications 时重新关联）
+            verifications: 验证结果字典（key 为 claim_id，value 为字典或 Verification）
+
+        Returns:
+            ClaimSet 实例
+        """
+        if isinstance(claims, ClaimSet):
+            if verifications is not None:
+                claims.attach(verifications)
+            return claims
+        records = [claim if isinstance(claim, Claim) else Claim.from_dict(claim) for claim in claims]
+        return cls(records, verifications)
+
+    def attach(self, verifications: Dict[str, Union[Verification, Dict]]):
+        """关联验证结果（字典或 Verification），刷新 verdict / confidence 列"""
+        self.verdict = array('b')
+        self.confidence = array('d')
+        for claim in self.records:
+            item = verifications.get(claim.id)
+            if item is None:
+                self.verdict.append(VERDICT_NONE)
+                self.confidence.append(0.5)
+            elif isinstance(item, Verification):
+                self.verdict.append(item.verdict)
+                self.confidence.append(item.confidence)
+            else:
+                self.verdict.append(VERDICT_CODES.get(item.get('verification_result'), VERDICT_NONE))
+                self.confidence.append(verification_confidence(item))
+
+    def subset(self, keep: Iterable[bool]) -> "ClaimSet":
+        """按布尔序列取子集（reviewer_ids 共用，reviewer 下标保持不变）"""
+        rows = [i for i, flag in enumerate(keep) if flag]
+        subset = ClaimSet.__new__(ClaimSet)
+        subset.records = [self.records[i] for i in rows]
+        subset.reviewer_ids = self.reviewer_ids
+        for name in ('reviewer', 'sentiment', 'substantiation', 'verdict', 'confidence'):
+            column = getattr(self, name)
+            setattr(subset, name, array(column.typecode, [column[i] for i in rows]))
+        return subset
+
+    def without_false(self) -> "ClaimSet":
+        """去掉验证结果为 False 的观点（没有验证结果的保留）"""
+        return self.subset(verdict != VERDICT_FALSE for verdict in self.verdict)
+
+    def topic_codes(self, topic_index: Dict[str, int]) -> array:
+        """按给定的小写主题 -> 下标映射编码主题，不在映射中的为 -1"""
+        return array('i', [topic_index.get((c.topic or '').lower(), -1) for c in self.records])
+
+    def to_dicts(self) -> List[Dict]:
+        return [claim.to_dict() for claim in self.records]
+
+
+def parse_verifications(verifications: Dict[str, Union[Verification, Dict]]) -> Dict[str, Verification]:
+    """验证结果字典（key 为 claim_id）转换为 Verification 记录"""
+    return {
+        claim_id: item if isinstance(item, Verification) else Verification.from_dict(item, claim_id)
+        for claim_id, item in verifications.items()
+    }
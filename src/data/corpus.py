@@ -0,0 +1,208 @@
+"""
+语料路径解析
+支持多个语料根目录和按会议 / 状态分区的目录结构（如 iclr2024/papers/accepted/{paper_id}.pdf），
+扫描结果写入索引文件；DataLoader 通过解析器原地读取 PDF 和 review，不再把文件复制或软链接到
+data/raw/papers、data/raw/reviews
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+DEFAULT_PAPERS_TEMPLATE = "papers/{paper_id}.pdf"
+DEFAULT_REVIEWS_TEMPLATE = "reviews/{paper_id}_reviews.json"
+INDEX_VERSION = 1
+
+_PLACEHOLDER = re.compile(r"\{(paper_id|venue|status)\}")
+
+
+def _template_glob(template: str) -> str:
+    return _PLACEHOLDER.sub("*", template)
+
+
+def _template_regex(template: str) -> re.Pattern:
+    """模板转换为正则：{paper_id} 不跨目录，{venue} / {status} 匹配一级目录名"""
+    pattern, position = "", 0
+    for match in _PLACEHOLDER.finditer(template):
+        pattern += re.escape(template[position:match.start()])
+        name = match.group(1)
+        pattern += f"(?P<{name}>[^/]+?)" if name == "paper_id" else f"(?P<{name}>[^/]+)"
+        position = match.end()
+    pattern += re.escape(template[position:])
+    return re.compile(pattern + "$")
+
+
+class CorpusRoot:
+    """一个语料根目录及其文件布局"""
+
+    def __init__(self, path: str, papers: str = DEFAULT_PAPERS_TEMPLATE,
+                 reviews: str = DEFAULT_REVIEWS_TEMPLATE, venue: Optional[str] = None,
+                 status: Optional[str] = None):
+        """
+        Args:
+            path: 根目录
+            papers: PDF 相对路径模板，可包含 {paper_id}、{venue}、{status}
+            reviews: review 文件相对路径模板（占位符同上）
+            venue: 该根目录下论文的会议名（模板中没有 {venue} 时使用）
+            status: 该根目录下论文的状态（模板中没有 {status} 时使用，如 "accepted"）
+        """
+        self.path = Path(path)
+        self.papers = papers
+        self.reviews = reviews
+        self.venue = venue
+        self.status = status
+
+    def signature(self) -> Dict:
+        return {'path': str(self.path), 'papers': self.papers, 'reviews': self.reviews,
+                'venue': self.venue, 'status': self.status}
+
+    def direct_path(self, template: str, paper_id: str) -> Optional[Path]:
+        """模板只含 {paper_id} 时可直接拼出路径（不需要扫描）"""
+        if set(_PLACEHOLDER.findall(template)) != {"paper_id"}:
+            return None
+        return self.path / template.format(paper_id=paper_id)
+
+    def scan(self) -> Dict[str, Dict]:
+        """
+        扫描根目录
+
+        Returns:
+            paper_id -> {'pdf', 'reviews', 'venue', 'status', 'root'}
+        """
+        entries: Dict[str, Dict] = {}
+        if not self.path.exists():
+            return entries
+        for kind, template in (('pdf', self.papers), ('reviews', self.reviews)):
+            regex = _template_regex(template)
+            for file_path in self.path.glob(_template_glob(template)):
+                match = regex.match(file_path.relative_to(self.path).as_posix())
+                if not match:
+                    continue
+                fields = match.groupdict()
+                entry = entries.setdefault(fields['paper_id'], {
+                    'pdf': None, 'reviews': None, 'venue': self.venue, 'status': self.status,
+                    'root': str(self.path)
+                })
+                entry[kind] = str(file_path)
+                for key in ('venue', 'status'):
+                    if fields.get(key):
+                        entry[key] = fields[key]
+        return entries
+
+
+class CorpusResolver:
+    """
+    论文文件解析器
+
+    按顺序查找各语料根目录（靠前的优先），结果缓存在索引文件中；
+    索引中找不到某篇论文时先尝试直接拼路径，仍找不到再重新扫描一次。
+    """
+
+    def __init__(self, roots: List[CorpusRoot], index_path: Optional[str] = None):
+        """
+        Args:
+            roots: 语料根目录列表
+            index_path: 索引文件路径（None 表示只在内存中索引）
+        """
+        self.roots = roots
+        self.index_path = Path(index_path) if index_path else None
+        self._index: Optional[Dict[str, Dict]] = None
+        self._rescanned = False
+
+    @classmethod
+    def from_config(cls, corpus_config: Optional[Dict], base_path: str = "data") -> "CorpusResolver":
+        """
+        根据 corpus 配置创建；没有配置时使用默认布局 {base_path}/raw/papers、{base_path}/raw/reviews
+        """
+        corpus_config = corpus_config or {}
+        roots = [CorpusRoot(**root) for root in corpus_config.get('roots') or []]
+        if not roots:
+            roots = [CorpusRoot(str(Path(base_path) / "raw"))]
+        return cls(roots, corpus_config.get('index_path'))
+
+    def _signature(self) -> List[Dict]:
+        return [root.signature() for root in self.roots]
+
+    def build_index(self, save: bool = True) -> Dict[str, Dict]:
+        """重新扫描所有根目录并（可选）写入索引文件"""
+        index: Dict[str, Dict] = {}
+        # 逆序合并，使靠前的根目录覆盖靠后的
+        for root in reversed(self.roots):
+            for paper_id, entry in root.scan().items():
+                merged = index.get(paper_id, {})
+                merged.update({key: value for key, value in entry.items() if value is not None})
+                index[paper_id] = merged
+        self._index = index
+        if save and self.index_path is not None:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_suffix(".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': INDEX_VERSION, 'roots': self._signature(), 'papers': index},
+                          f, ensure_ascii=False)
+            tmp_path.replace(self.index_path)
+        return index
+
+    @property
+    def index(self) -> Dict[str, Dict]:
+        """paper_id -> 条目；索引文件存在且根目录配置未变化时直接读取，否则扫描"""
+        if self._index is None:
+            if self.index_path is not None and self.index_path.exists():
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == INDEX_VERSION and data.get('roots') == self._signature():
+                    self._index = data['papers']
+            if self._index is None:
+                self.build_index()
+        return self._index
+
+    def _lookup(self, paper_id: str, kind: str) -> Optional[Path]:
+        entry = self.index.get(paper_id)
+        if entry and entry.get(kind) and Path(entry[kind]).exists():
+            return Path(entry[kind])
+
+        # 平铺布局可以直接拼出路径
+        for root in self.roots:
+            path = root.direct_path(root.papers if kind == 'pdf' else root.reviews, paper_id)
+            if path is not None and path.exists():
+                return path
+
+        # 索引可能已过期（之后新下载的文件），每个解析器最多重新扫描一次
+        if not self._rescanned:
+            self._rescanned = True
+            entry = self.build_index().get(paper_id)
+            if entry and entry.get(kind):
+                return Path(entry[kind])
+        return None
+
+    def pdf_path(self, paper_id: str) -> Optional[Path]:
+        """论文 PDF 路径，找不到返回 None"""
+        return self._lookup(paper_id, 'pdf')
+
+    def reviews_path(self, paper_id: str) -> Optional[Path]:
+        """Review 文件路径，找不到返回 None"""
+        return self._lookup(paper_id, 'reviews')
+
+    def metadata(self, paper_id: str) -> Dict:
+        """论文的 venue / status 等元数据"""
+        return dict(self.index.get(paper_id) or {})
+
+    def papers(self, venue: Optional[str] = None, status: Optional[str] = None,
+               require_pdf: bool = False, require_reviews: bool = False) -> List[str]:
+        """
+        按会议 / 状态列出论文 ID
+
+        Args:
+            venue: 只列出该会议的论文
+            status: 只列出该状态的论文（如 "accepted"）
+            require_pdf: 只列出有 PDF 的论文
+            require_reviews: 只列出有 review 文件的论文
+        """
+        return sorted(
+            paper_id for paper_id, entry in self.index.items()
+            if (venue is None or entry.get('venue') == venue)
+            and (status is None or entry.get('status') == status)
+            and (not require_pdf or entry.get('pdf'))
+            and (not require_reviews or entry.get('reviews'))
+        )
@@ -0,0 +1,516 @@
+"""
+OpenReview 异步爬虫
+PDF 和 review notes 并发下载，所有请求经过同一个按主机共享的令牌桶限流器（RateGovernor）：
+请求速率以 OpenReview 的实际限额为上限，遇到 429 时按 Retry-After 全局暂停并降低速率，
+连续成功后逐步恢复，不再依赖固定的 sleep。
+整个会议的 submissions 和回复可用 fetch_venue 分页批量抓取（每页一次请求，而不是每篇论文一次）
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from .downloader import is_official_review, parse_review_notes
+from .manifest import DownloadManifest
+from .venue_store import VenueNoteStore
+from ..utils.scheduler import parse_retry_after
+
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+
+class RateGovernor:
+    """
+    异步自适应令牌桶
+
+    速率上限为 requests_per_minute；遇到 429 时所有等待中的请求暂停到 Retry-After 之后，
+    速率减半（不低于 min_requests_per_minute），连续成功 increase_after 次后速率加一个步长
+    """
+
+    def __init__(self, requests_per_minute: float = 60.0, burst: float = 5.0,
+                 min_requests_per_minute: float = 6.0, increase_after: int = 20,
+                 default_retry_after: float = 30.0):
+        """
+        Args:
+            requests_per_minute: 速率上限（每分钟请求数）
+            burst: 桶容量（允许的突发请求数）
+            min_requests_per_minute: 自适应降速的下限
+            increase_after: 连续成功多少次后提高速率
+            default_retry_after: 429 响应没有 Retry-After 时的暂停秒数
+        """
+        self.max_rate = requests_per_minute / 60.0
+        self.min_rate = min(min_requests_per_minute, requests_per_minute) / 60.0
+        self.rate = self.max_rate
+        self.capacity = max(1.0, burst)
+        self.tokens = self.capacity
+        self.increase_after = increase_after
+        self.default_retry_after = default_retry_after
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.successes = 0
+        self.num_requests = 0
+        self.num_rate_limited = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self):
+        """获取一个令牌，不足或处于 429 暂停期时等待（只在同一个事件循环内使用，无需加锁）"""
+        while True:
+            now = time.monotonic()
+            if now < self.paused_until:
+                await asyncio.sleep(self.paused_until - now)
+                continue
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                self.num_requests += 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
+    def on_success(self):
+        self.successes += 1
+        if self.successes >= self.increase_after and self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+            self.successes = 0
+
+    def on_rate_limited(self, retry_after: Optional[float] = None):
+        """遇到 429：全局暂停并降低速率"""
+        self.num_rate_limited += 1
+        self.successes = 0
+        pause = retry_after if retry_after is not None else self.default_retry_after
+        now = time.monotonic()
+        # 同一次暂停期间内其他并发请求返回的 429 只延长暂停，不重复降速
+        already_paused = now < self.paused_until
+        self.paused_until = max(self.paused_until, now + pause)
+        self.tokens = 0.0
+        if already_paused:
+            return
+        new_rate = max(self.min_rate, self.rate / 2)
+        if new_rate < self.rate:
+            print(f"[Crawler] Rate limited, pausing {pause:.1f}s and reducing rate "
+                  f"{self.rate * 60:.1f} -> {new_rate * 60:.1f} req/min")
+        self.rate = new_rate
+
+    def stats(self) -> Dict:
+        return {
+            'requests': self.num_requests,
+            'rate_limited': self.num_rate_limited,
+            'requests_per_minute': round(self.rate * 60, 2)
+        }
+
+
+_governors: Dict[str, RateGovernor] = {}
+
+
+def get_governor(host: str, **kwargs) -> RateGovernor:
+    """
+    获取主机共享的限流器（同一进程内访问同一主机的爬虫共享限流状态）
+
+    Args:
+        host: 主机名（openreview.net 和 api2.openreview.net 视为同一限额，按注册域名共享）
+        **kwargs: 首次创建时传给 RateGovernor 的参数
+    """
+    key = ".".join(host.split(".")[-2:])
+    if key not in _governors:
+        _governors[key] = RateGovernor(**kwargs)
+    return _governors[key]
+
+
+class OpenReviewCrawler:
+    """OpenReview 异步爬虫（PDF + Official Review）"""
+
+    def __init__(self, base_url: str = "https://api2.openreview.net",
+                 download_path: str = "data/raw",
+                 domain: Optional[str] = None,
+                 requests_per_minute: float = 60.0,
+                 burst: float = 5.0,
+                 max_concurrency: int = 8,
+                 max_retries: int = 5,
+                 timeout: float = 60.0,
+                 pdf_url_template: str = "https://openreview.net/pdf?id={forum_id}",
+                 manifest: Optional[DownloadManifest] = None):
+        """
+        Args:
+            base_url: OpenReview API 地址（注意是 api2）
+            download_path: 保存目录（papers/ 和 reviews/ 子目录，与 NIPSDownloader 一致）
+            domain: 会议 domain（如 "NeurIPS.cc/2024/Conference"），查询 notes 时附带
+            requests_per_minute: 限流器速率上限
+            burst: 限流器桶容量
+            max_concurrency: 最大并发连接数
+            max_retries: 429 / 5xx / 网络错误的最大重试次数
+            timeout: 单次请求超时（秒）
+            pdf_url_template: PDF 下载地址模板
+            manifest: 下载清单（None 表示只按文件是否存在判断，不支持续传和增量刷新）
+        """
+        self.base_url = base_url.rstrip('/')
+        self.download_path = Path(download_path)
+        self.domain = domain
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.pdf_url_template = pdf_url_template
+        self.manifest = manifest
+        self.stats = {'downloaded': 0, 'resumed': 0, 'skipped': 0, 'unchanged': 0, 'bytes': 0}
+        self.governor = get_governor(
+            urlparse(self.base_url).hostname or "openreview.net",
+            requests_per_minute=requests_per_minute, burst=burst
+        )
+
+    @classmethod
+    def from_config(cls, data_source: Dict, domain: Optional[str] = None) -> "OpenReviewCrawler":
+        """根据 data_source 配置创建（配置了 manifest_path 时同时打开下载清单）"""
+        crawler_config = data_source.get('crawler') or {}
+        manifest_path = data_source.get('manifest_path')
+        return cls(
+            base_url=data_source.get('openreview_base_url', "https://api2.openreview.net"),
+            download_path=data_source.get('download_path', "data/raw"),
+            domain=domain,
+            manifest=DownloadManifest(manifest_path) if manifest_path else None,
+            **crawler_config
+        )
+
+    def create_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            timeout=self.timeout,
+            follow_redirects=True,
+            headers={'User-Agent': USER_AGENT},
+            limits=httpx.Limits(max_connections=self.max_concurrency,
+                                max_keepalive_connections=self.max_concurrency)
+        )
+
+    async def request(self, client: httpx.AsyncClient, method: str, url: str,
+                      stream: bool = False, **kwargs) -> httpx.Response:
+        """
+        在限流器下发送请求，429 / 5xx / 网络错误自动重试
+
+        Args:
+            stream: 是否流式读取响应体（调用方负责 aclose）
+
+        Returns:
+            成功的响应（2xx / 304；其他 4xx 直接抛出 httpx.HTTPStatusError）
+        """
+        attempt = 0
+        while True:
+            await self.governor.acquire()
+            try:
+                response = await client.send(client.build_request(method, url, **kwargs), stream=stream)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = random.uniform(0, min(60.0, 2.0 ** attempt))
+                print(f"[Crawler] {e.__class__.__name__} for {url}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            else:
+                if response.status_code < 400:
+                    self.governor.on_success()
+                    return response
+                if stream:
+                    await response.aclose()
+                if response.status_code == 429:
+                    self.governor.on_rate_limited(parse_retry_after(response.headers))
+                retryable = response.status_code == 429 or response.status_code >= 500
+                if not retryable or attempt >= self.max_retries:
+                    response.raise_for_status()
+                if response.status_code == 429:
+                    delay = 0.0
+                else:
+                    delay = random.uniform(0, min(60.0, 2.0 ** attempt))
+                    print(f"[Crawler] HTTP {response.status_code} for {url}, retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            attempt += 1
+            if delay:
+                await asyncio.sleep(delay)
+
+    async def fetch_notes(self, client: httpx.AsyncClient, **params) -> List[Dict]:
+        """查询 /notes"""
+        if self.domain and 'domain' not in params:
+            params['domain'] = self.domain
+        response = await self.request(client, "GET", f"{self.base_url}/notes", params=params)
+        return response.json().get('notes', [])
+
+    async def iter_notes(self, client: httpx.AsyncClient, page_size: int = 1000, offset: int = 0,
+                         **params) -> AsyncIterator[Tuple[List[Dict], int]]:
+        """
+        按 limit / offset 分页查询 /notes
+
+        Args:
+            page_size: 每页条数（API 上限 1000；带 details=replies 时响应较大，可适当调小）
+            offset: 起始 offset（用于续传）
+            **params: 其他查询参数
+
+        Yields:
+            (本页 notes, 下一页 offset)；最后一页的条数小于 page_size
+        """
+        while True:
+            notes = await self.fetch_notes(client, limit=page_size, offset=offset, **params)
+            offset += len(notes)
+            yield notes, offset
+            if len(notes) < page_size:
+                return
+
+    async def fetch_venue_async(self, store: VenueNoteStore, page_size: int = 200,
+                                invitation: Optional[str] = None, details: str = "replies",
+                                restart: bool = False) -> Dict:
+        """
+        分页抓取整个会议的 submissions（details=replies 时每条 submission 附带全部回复），逐页写入 store
+
+        Args:
+            store: 目标 VenueNoteStore
+            page_size: 每页条数
+            invitation: submission invitation，默认 "{domain}/-/Submission"
+            details: details 参数（"replies" 同时返回 reviews / 评论 / decision 等全部回复）
+            restart: 是否忽略检查点重新抓取
+
+        Returns:
+            检查点（offset, count, complete）以及本次请求的页数
+        """
+        if restart:
+            store.reset()
+        checkpoint = store.load_checkpoint()
+        if checkpoint['complete']:
+            print(f"[INFO] {store.domain}: already fetched {checkpoint['count']} submissions")
+            return {**checkpoint, 'pages': 0}
+
+        params = {
+            'domain': store.domain,
+            'invitation': invitation or f"{store.domain}/-/Submission",
+            'details': details,
+            'sort': "number:asc"
+        }
+        pages = 0
+        async with self.create_client() as client:
+            async for notes, offset in self.iter_notes(client, page_size, checkpoint['offset'], **params):
+                pages += 1
+                store.append_page(notes, offset, complete=len(notes) < page_size)
+                num_replies = sum(len((note.get('details') or {}).get('replies') or []) for note in notes)
+                print(f"[INFO] {store.domain}: page {pages}, {offset} submissions (+{num_replies} replies)")
+        return {**store.load_checkpoint(), 'pages': pages}
+
+    def fetch_venue(self, store: VenueNoteStore, **kwargs) -> Dict:
+        """fetch_venue_async 的同步入口"""
+        return asyncio.run(self.fetch_venue_async(store, **kwargs))
+
+    def _record(self, paper_id: str, kind: str, forum_id: str, **fields):
+        if self.manifest is not None:
+            self.manifest.update(paper_id, kind, forum_id, **fields)
+
+    def _is_complete(self, paper_id: str, kind: str, path: Path) -> bool:
+        """有清单时以清单为准（状态 + 文件大小），否则只检查文件是否存在"""
+        if self.manifest is not None:
+            return self.manifest.is_complete(paper_id, kind)
+        return path.exists()
+
+    async def download_pdf(self, client: httpx.AsyncClient, paper_id: str, forum_id: str,
+                           overwrite: bool = False, refresh: bool = False) -> Optional[str]:
+        """
+        下载论文 PDF
+
+        先写入 .part 文件，完成后重命名；已有 .part 文件且清单中有 ETag / Last-Modified 时用
+        Range + If-Range 续传。refresh=True 时对已完成的 PDF 发送条件请求（304 表示未变化）。
+
+        Returns:
+            保存的文件路径，失败返回 None
+        """
+        papers_dir = self.download_path / "papers"
+        papers_dir.mkdir(parents=True, exist_ok=True)
+        pdf_path = papers_dir / f"{paper_id}.pdf"
+        part_path = pdf_path.with_name(pdf_path.name + ".part")
+        record = (self.manifest.get(paper_id, "pdf") if self.manifest is not None else None) or {}
+
+        complete = not overwrite and self._is_complete(paper_id, "pdf", pdf_path)
+        if complete and not refresh:
+            self.stats['skipped'] += 1
+            return str(pdf_path)
+
+        headers = {}
+        validator = record.get('etag') or record.get('last_modified')
+        if complete:
+            if record.get('etag'):
+                headers['If-None-Match'] = record['etag']
+            if record.get('last_modified'):
+                headers['If-Modified-Since'] = record['last_modified']
+        offset = part_path.stat().st_size if part_path.exists() and not overwrite else 0
+        if offset and validator and record.get('status') == "partial":
+            headers['Range'] = f"bytes={offset}-"
+            headers['If-Range'] = validator
+        else:
+            offset = 0
+
+        try:
+            response = await self.request(client, "GET", self.pdf_url_template.format(forum_id=forum_id),
+                                          stream=True, headers=headers)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 416 and offset:
+                # .part 文件比服务器上的文件还大，丢弃后重新下载
+                part_path.unlink()
+                return await self.download_pdf(client, paper_id, forum_id, overwrite=True)
+            print(f"[ERROR] Failed to download PDF for {paper_id} ({forum_id}): {e}")
+            self._record(paper_id, "pdf", forum_id, status="failed", error=str(e))
+            return None
+        except Exception as e:
+            print(f"[ERROR] Failed to download PDF for {paper_id} ({forum_id}): {e}")
+            self._record(paper_id, "pdf", forum_id, status="failed", error=str(e))
+            return None
+
+        try:
+            if response.status_code == 304:
+                self.stats['unchanged'] += 1
+                return str(pdf_path)
+
+            digest = hashlib.sha256()
+            if response.status_code == 206:
+                self.stats['resumed'] += 1
+                with open(part_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(chunk)
+                mode = 'ab'
+            else:
+                offset, mode = 0, 'wb'
+            etag = response.headers.get('etag')
+            last_modified = response.headers.get('last-modified')
+            content_length = response.headers.get('content-length')
+            total_size = offset + int(content_length) if content_length else None
+            self._record(paper_id, "pdf", forum_id, status="partial", path=str(part_path),
+                         total_size=total_size, etag=etag, last_modified=last_modified)
+
+            with open(part_path, mode) as f:
+                async for chunk in response.aiter_bytes():
+                    f.write(chunk)
+                    digest.update(chunk)
+                    self.stats['bytes'] += len(chunk)
+        except Exception as e:
+            print(f"[ERROR] PDF download for {paper_id} ({forum_id}) interrupted: {e}")
+            size = part_path.stat().st_size if part_path.exists() else 0
+            self._record(paper_id, "pdf", forum_id, status="partial" if size else "failed",
+                         size=size, error=str(e))
+            return None
+        finally:
+            await response.aclose()
+
+        part_path.replace(pdf_path)
+        self.stats['downloaded'] += 1
+        self._record(paper_id, "pdf", forum_id, status="complete", path=str(pdf_path),
+                     size=pdf_path.stat().st_size, sha256=digest.hexdigest(), error=None)
+        return str(pdf_path)
+
+    async def download_reviews(self, client: httpx.AsyncClient, paper_id: str, forum_id: str,
+                               overwrite: bool = False, refresh: bool = False) -> Optional[List[Dict]]:
+        """
+        下载论文的 Official Review（一次查询 forum 下的所有 notes 再过滤）
+
+        notes 接口没有 ETag，清单中的 last_modified 记录 forum 内 notes 的最大 tmdate（毫秒时间戳）；
+        refresh=True 时先用 mintmdate 查询是否有更新的 note，没有则不重新下载
+
+        Returns:
+            Review 列表（格式与 NIPSDownloader.download_reviews 一致），失败返回 None
+        """
+        reviews_dir = self.download_path / "reviews"
+        reviews_dir.mkdir(parents=True, exist_ok=True)
+        reviews_path = reviews_dir / f"{paper_id}_reviews.json"
+        record = (self.manifest.get(paper_id, "reviews") if self.manifest is not None else None) or {}
+
+        complete = not overwrite and self._is_complete(paper_id, "reviews", reviews_path)
+        if complete:
+            with open(reviews_path, 'r', encoding='utf-8') as f:
+                reviews = json.load(f)
+            # 没有清单时空文件视为未完成（与旧脚本一致）
+            if self.manifest is None and not reviews:
+                complete = False
+        if complete and refresh and record.get('last_modified'):
+            try:
+                changed = await self.fetch_notes(client, forum=forum_id, trash="true", limit=1,
+                                                 mintmdate=int(record['last_modified']) + 1)
+            except Exception as e:
+                print(f"[ERROR] Failed to check reviews for {paper_id} ({forum_id}): {e}")
+                return reviews
+            if not changed:
+                self.stats['unchanged'] += 1
+                return reviews
+        elif complete:
+            self.stats['skipped'] += 1
+            return reviews
+
+        try:
+            notes = await self.fetch_notes(client, forum=forum_id, trash="true", limit=1000)
+        except Exception as e:
+            print(f"[ERROR] Failed to download reviews for {paper_id} ({forum_id}): {e}")
+            self._record(paper_id, "reviews", forum_id, status="failed", error=str(e))
+            return None
+
+        reviews = parse_review_notes([note for note in notes if is_official_review(note)])
+        data = json.dumps(reviews, ensure_ascii=False, indent=2).encode('utf-8')
+        with open(reviews_path, 'wb') as f:
+            f.write(data)
+        self.stats['downloaded'] += 1
+        self.stats['bytes'] += len(data)
+        modified = [note.get('tmdate') or note.get('mdate') or 0 for note in notes]
+        self._record(paper_id, "reviews", forum_id, status="complete", path=str(reviews_path),
+                     size=len(data), sha256=hashlib.sha256(data).hexdigest(),
+                     last_modified=str(max(modified)) if any(modified) else None, error=None)
+        return reviews
+
+    async def crawl_paper(self, client: httpx.AsyncClient, paper: Dict,
+                          pdf: bool = True, reviews: bool = True, overwrite: bool = False,
+                          refresh: bool = False) -> Dict:
+        """并发下载一篇论文的 PDF 和 reviews"""
+        paper_id, forum_id = paper['paper_id'], paper['forum_id']
+        tasks = [
+            self.download_pdf(client, paper_id, forum_id, overwrite, refresh) if pdf else _none(),
+            self.download_reviews(client, paper_id, forum_id, overwrite, refresh) if reviews else _none()
+        ]
+        pdf_path, paper_reviews = await asyncio.gather(*tasks)
+        print(f"[INFO] {paper_id}: pdf={'ok' if pdf_path else '-'}, "
+              f"reviews={len(paper_reviews) if paper_reviews is not None else '-'}")
+        return {
+            'paper_id': paper_id,
+            'forum_id': forum_id,
+            'pdf_path': pdf_path,
+            'num_reviews': len(paper_reviews) if paper_reviews is not None else None
+        }
+
+    async def crawl_async(self, papers: List[Dict], pdf: bool = True, reviews: bool = True,
+                          overwrite: bool = False, refresh: bool = False) -> List[Dict]:
+        """
+        并发下载多篇论文，总请求速率由限流器控制
+
+        Args:
+            papers: [{'paper_id': ..., 'forum_id': ...}, ...]
+            pdf: 是否下载 PDF
+            reviews: 是否下载 reviews
+            overwrite: 是否忽略已下载的文件全部重新下载
+            refresh: 是否检查已完成的条目是否有更新（PDF 条件请求，reviews 按 tmdate 增量检查）
+
+        Returns:
+            每篇论文的结果（pdf_path, num_reviews；失败项为 None）
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(client, paper):
+            async with semaphore:
+                return await self.crawl_paper(client, paper, pdf, reviews, overwrite, refresh)
+
+        async with self.create_client() as client:
+            return await asyncio.gather(*(bounded(client, paper) for paper in papers))
+
+    def crawl(self, papers: List[Dict], pdf: bool = True, reviews: bool = True,
+              overwrite: bool = False, refresh: bool = False) -> List[Dict]:
+        """crawl_async 的同步入口"""
+        start = time.time()
+        results = asyncio.run(self.crawl_async(papers, pdf, reviews, overwrite, refresh))
+        elapsed = time.time() - start
+        failed = sum(1 for r in results if (pdf and not r['pdf_path']) or (reviews and r['num_reviews'] is None))
+        print(f"[INFO] Crawled {len(results)} papers in {elapsed:.1f}s ({failed} with failures), "
+              f"transfers: {self.stats}, governor: {self.governor.stats()}")
+        return results
+
+
+async def _none():
+    return None
@@ -5,15 +5,62 @@
 import json
 from pathlib import Path
 from typing import Dict, List, Optional
+from .corpus import CorpusResolver
 from .pdf_parser import PDFParser
+from .results_store import ResultsStore
+from .reviews import Review, ReviewStore, load_review_file
+from ..utils.tracing import get_tracer
 
 
 class DataLoader:
     """数据加载器"""
     
-    def __init__(self, base_path: str = "data"):
+    def __init__(self, base_path: str = "data", results_store: Optional[ResultsStore] = None,
+                 write_json: bool = True, resolver: Optional[CorpusResolver] = None,
+                 review_store: Optional[ReviewStore] = None):
+        """
+        Args:
+            base_path: 数据根目录
+            results_store: 可选的列式结果存储，设置后 Step 1-3 的输出写入该存储并优先从中读取
+            write_json: 是否同时写出逐篇 JSON 文件（未设置 results_store 时始终写出）
+            resolver: 论文 PDF / review 文件的路径解析器，默认使用 {base_path}/raw/papers 和 {base_path}/raw/reviews
+            review_store: 可选的规范化评审缓存，设置后 load_reviews 优先从缓存读取
+        """
         self.base_path = Path(base_path)
+        self.resolver = resolver or CorpusResolver.from_config(None, base_path)
+        self.review_store = review_store
         self.pdf_parser = PDFParser()
+        self.results_store = results_store
+        self.write_json = write_json or results_store is None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict], base_path: str = "data") -> "DataLoader":
+        """
+        按配置创建数据加载器（结果存储、语料路径和评审缓存与 EVWPipeline 一致）
+
+        Args:
+            config: 完整的配置字典（读取 output 和 corpus 两节），None 表示全部使用默认值
+            base_path: 数据根目录
+
+        Returns:
+            DataLoader
+        """
+        config = config or {}
+        output_config = config.get('output') or {}
+        results_store = None
+        if output_config.get('results_store'):
+            results_store = ResultsStore(output_config['results_store'])
+        corpus_config = config.get('corpus') or {}
+        review_store = None
+        if corpus_config.get('reviews_cache'):
+            review_store = ReviewStore(corpus_config['reviews_cache'])
+        return cls(
+            base_path,
+            results_store=results_store,
+            write_json=output_config.get('write_json', True),
+            resolver=CorpusResolver.from_config(corpus_config, base_path),
+            review_store=review_store
+        )
     
     def load_paper_text(self, paper_id: str, use_cache: bool = True) -> str:
         """
@@ -28,17 +75,22 @@ class DataLoader:
         """
         # 先检查是否有缓存的文本
         cached_path = self.base_path / "processed" / "papers" / f"{paper_id}.txt"
+        tracer = get_tracer()
         if use_cache and cached_path.exists():
+            tracer.event("cache.paper_text", hit=True)
             with open(cached_path, 'r', encoding='utf-8') as f:
                 return f.read()
+        if use_cache:
+            tracer.event("cache.paper_text", hit=False)
         
-        # 解析 PDF
-        pdf_path = self.base_path / "raw" / "papers" / f"{paper_id}.pdf"
-        if not pdf_path.exists():
-            raise FileNotFoundError(f"论文 PDF 不存在: {pdf_path}")
+        # 解析 PDF（原地读取，路径由 resolver 决定）
+        pdf_path = self.resolver.pdf_path(paper_id)
+        if pdf_path is None:
+            raise FileNotFoundError(f"论文 PDF 不存在: {paper_id}（已查找: {', '.join(str(r.path) for r in self.resolver.roots)}）")
         
-        text = self.pdf_parser.parse_pdf(str(pdf_path))
-        text = self.pdf_parser.clean_text(text)
+        with tracer.span("data.parse_pdf"):
+            text = self.pdf_parser.parse_pdf(str(pdf_path))
+            text = self.pdf_parser.clean_text(text)
         
         # 缓存结果
         cached_path.parent.mkdir(parents=True, exist_ok=True)
@@ -47,9 +99,9 @@ class DataLoader:
         
         return text
     
-    def load_reviews(self, paper_id: str) -> List[Dict]:
+    def load_reviews(self, paper_id: str) -> List[Review]:
         """
-        加载 review 数据
+        加载规范化后的 review 数据（原始文件的各种形状统一为 Review 记录）
         
         Args:
             paper_id: 论文 ID
@@ -57,12 +109,49 @@ class DataLoader:
         Returns:
             Review 列表
         """
-        reviews_path = self.base_path / "raw" / "reviews" / f"{paper_id}_reviews.json"
-        if not reviews_path.exists():
+        reviews_path = self.resolver.reviews_path(paper_id)
+        if reviews_path is None:
             return []
         
-        with open(reviews_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        if self.review_store is not None:
+            return self.review_store.load(paper_id, reviews_path)
+        return load_review_file(reviews_path)
+    
+    def result_paths(self, paper_id: str) -> Dict[str, Path]:
+        """Step 1-3 逐篇 JSON 输出的路径（文件不一定存在）"""
+        return {
+            'claims': self.base_path / "processed" / "extracted" / f"{paper_id}_claims.json",
+            'verifications': self.base_path / "results" / "verifications" / f"{paper_id}_verified.json",
+            'weights': self.base_path / "results" / "weights" / f"{paper_id}_weights.json",
+        }
+    
+    def has_result(self, paper_id: str, stage: str) -> bool:
+        """某篇论文是否已有某个阶段（claims / verifications / weights）的输出"""
+        if self.results_store is not None and self.results_store.has_stage(paper_id, stage):
+            return True
+        return self.result_paths(paper_id)[stage].exists()
+    
+    def result_signature(self, paper_id: str) -> str:
+        """
+        Step 1-3 输出和 review 文件的版本签名（结果存储的 run_id 或文件大小 / 修改时间），
+        任一输入变化时签名随之变化，供特征存储等下游缓存判断是否需要重新计算
+        
+        Args:
+            paper_id: 论文 ID
+            
+        Returns:
+            签名字符串
+        """
+        parts = []
+        if self.results_store is not None:
+            runs = self.results_store.latest_runs(paper_id)
+            parts.extend(f"{stage}:run{runs[stage]}" for stage in sorted(runs))
+        paths = list(self.result_paths(paper_id).items()) + [('reviews', self.resolver.reviews_path(paper_id))]
+        for name, path in paths:
+            if path is not None and path.exists():
+                stat = path.stat()
+                parts.append(f"{name}:{stat.st_size}:{stat.st_mtime_ns}")
+        return "|".join(parts)
     
     def load_claims(self, paper_id: str) -> List[Dict]:
         """
@@ -74,7 +163,10 @@ class DataLoader:
         Returns:
             观点列表
         """
-        claims_path = self.base_path / "processed" / "extracted" / f"{paper_id}_claims.json"
+        if self.results_store is not None and self.results_store.has_stage(paper_id, "claims"):
+            return self.results_store.load_claims(paper_id)
+        
+        claims_path = self.result_paths(paper_id)['claims']
         if not claims_path.exists():
             return []
         
@@ -83,12 +175,43 @@ class DataLoader:
     
     def save_claims(self, paper_id: str, claims: List[Dict]):
         """保存提取的观点"""
-        claims_path = self.base_path / "processed" / "extracted" / f"{paper_id}_claims.json"
+        if self.results_store is not None:
+            self.results_store.append_claims(paper_id, claims)
+        if not self.write_json:
+            return
+        
+        claims_path = self.result_paths(paper_id)['claims']
         claims_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(claims_path, 'w', encoding='utf-8') as f:
             json.dump(claims, f, ensure_ascii=False, indent=2)
     
+    def save_verifications(self, paper_id: str, verifications: List[Dict]):
+        """保存验证结果（Step 2 的输出）"""
+        if self.results_store is not None:
+            self.results_store.append_verifications(paper_id, verifications)
+        if not self.write_json:
+            return
+        
+        verifications_path = self.result_paths(paper_id)['verifications']
+        verifications_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(verifications_path, 'w', encoding='utf-8') as f:
+            json.dump(verifications, f, ensure_ascii=False, indent=2)
+    
+    def save_weights(self, paper_id: str, weights: Dict[str, Dict]):
+        """保存权重结果（Step 3 的输出）"""
+        if self.results_store is not None:
+            self.results_store.append_weights(paper_id, weights)
+        if not self.write_json:
+            return
+        
+        weights_path = self.result_paths(paper_id)['weights']
+        weights_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        with open(weights_path, 'w', encoding='utf-8') as f:
+            json.dump(weights, f, ensure_ascii=False, indent=2)
+    
     def load_verifications(self, paper_id: str) -> Dict[str, Dict]:
         """
         加载验证结果（Step 2 的输出）
@@ -99,7 +222,10 @@ class DataLoader:
         Returns:
             验证结果字典，key 为 claim_id
         """
-        verifications_path = self.base_path / "results" / "verifications" / f"{paper_id}_verified.json"
+        if self.results_store is not None and self.results_store.has_stage(paper_id, "verifications"):
+            return self.results_store.load_verifications(paper_id)
+        
+        verifications_path = self.result_paths(paper_id)['verifications']
         if not verifications_path.exists():
             return {}
         
@@ -127,7 +253,10 @@ class DataLoader:
         Returns:
             权重字典，key 为 reviewer_id
         """
-        weights_path = self.base_path / "results" / "weights" / f"{paper_id}_weights.json"
+        if self.results_store is not None and self.results_store.has_stage(paper_id, "weights"):
+            return self.results_store.load_weights(paper_id)
+        
+        weights_path = self.result_paths(paper_id)['weights']
         if not weights_path.exists():
             return {}
         
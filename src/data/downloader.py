@@ -13,6 +13,83 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 
+def is_official_review(note: Dict) -> bool:
+    """
+    判断 note 是否为 Official Review
+
+    只选择 invitation 以 "/-/Official_Review" 结尾的（真正的 Official Review），
+    排除 Rebuttal（如 "Official_Review1/-/Rebuttal"）
+    """
+    # invitation 可能是字符串或数组
+    invitations = note.get('invitations', [])
+    if isinstance(invitations, str):
+        invitations = [invitations]
+    elif not isinstance(invitations, list):
+        invitations = []
+    return any(inv.endswith('/-/Official_Review') for inv in invitations)
+
+
+def parse_review_notes(notes: List[Dict]) -> List[Dict]:
+    """
+    将 Official Review notes 转换为 review 列表
+
+    Args:
+        notes: OpenReview API v2 返回的 review notes
+
+    Returns:
+        Review 列表，每个包含 reviewer_id, review_id, content 以及各评分字段
+    """
+    reviews = []
+    for idx, note in enumerate(notes):
+        content = note.get('content', {})
+
+        # 构建完整的 review 内容
+        parts = []
+
+        # Summary
+        if 'summary' in content and content['summary'].get('value'):
+            parts.append(f"Summary: {content['summary']['value']}")
+
+        # Strengths
+        if 'strengths' in content:
+            strengths = content['strengths'].get('value', '')
+            if isinstance(strengths, list):
+                strengths = '\n'.join([f"- {item}" if isinstance(item, dict) else str(item) for item in strengths])
+            if strengths:
+                parts.append(f"Strengths:\n{strengths}")
+
+        # Weaknesses
+        if 'weaknesses' in content:
+            weaknesses = content['weaknesses'].get('value', '')
+            if isinstance(weaknesses, list):
+                weaknesses = '\n'.join([f"- {item}" if isinstance(item, dict) else str(item) for item in weaknesses])
+            if weaknesses:
+                parts.append(f"Weaknesses:\n{weaknesses}")
+
+        # Questions
+        if 'questions' in content and content['questions'].get('value'):
+            parts.append(f"Questions: {content['questions']['value']}")
+
+        # Limitations
+        if 'limitations' in content and content['limitations'].get('value'):
+            parts.append(f"Limitations: {content['limitations']['value']}")
+
+        reviews.append({
+            'reviewer_id': f"R{idx+1}",
+            'review_id': note.get('id', ''),
+            'content': "\n\n".join(parts) if parts else "",
+            'summary': content.get('summary', {}).get('value', ''),
+            'strengths': content.get('strengths', {}).get('value', ''),
+            'weaknesses': content.get('weaknesses', {}).get('value', ''),
+            'rating': content.get('rating', {}).get('value', ''),
+            'confidence': content.get('confidence', {}).get('value', ''),
+            'soundness': content.get('soundness', {}).get('value', ''),
+            'presentation': content.get('presentation', {}).get('value', ''),
+            'contribution': content.get('contribution', {}).get('value', ''),
+        })
+    return reviews
+
+
 class NIPSDownloader:
     """NIPS 论文和 review 下载器"""
     
@@ -300,24 +377,7 @@ class NIPSDownloader:
                 all_notes = data.get('notes', [])
                 
                 # 过滤出 reviews（只选择真正的 Official Review，排除 Rebuttal）
-                for note in all_notes:
-                    # invitation 可能是字符串或数组
-                    invitations = note.get('invitations', [])
-                    if isinstance(invitations, str):
-                        invitations = [invitations]
-                    elif not isinstance(invitations, list):
-                        invitations = []
-                    
-                    # 只选择 invitation 以 "/-/Official_Review" 结尾的（真正的 Official Review）
-                    # 排除 Rebuttal（如 "Official_Review1/-/Rebuttal"）
-                    is_official_review = False
-                    for inv in invitations:
-                        if inv.endswith('/-/Official_Review') or inv.endswith('/-/Official_Review'):
-                            is_official_review = True
-                            break
-                    
-                    if is_official_review:
-                        notes.append(note)
+                notes = [note for note in all_notes if is_official_review(note)]
                 
                 if notes:
                     print(f"  - 从 {len(all_notes)} 个 notes 中过滤出 {len(notes)} 个 reviews")
@@ -354,56 +414,7 @@ class NIPSDownloader:
         
         try:
             # 解析 reviews
-            for idx, note in enumerate(notes):
-                content = note.get('content', {})
-                
-                # 构建完整的 review 内容
-                parts = []
-                
-                # Summary
-                if 'summary' in content and content['summary'].get('value'):
-                    parts.append(f"Summary: {content['summary']['value']}")
-                
-                # Strengths
-                if 'strengths' in content:
-                    strengths = content['strengths'].get('value', '')
-                    if isinstance(strengths, list):
-                        strengths = '\n'.join([f"- {item}" if isinstance(item, dict) else str(item) for item in strengths])
-                    if strengths:
-                        parts.append(f"Strengths:\n{strengths}")
-                
-                # Weaknesses
-                if 'weaknesses' in content:
-                    weaknesses = content['weaknesses'].get('value', '')
-                    if isinstance(weaknesses, list):
-                        weaknesses = '\n'.join([f"- {item}" if isinstance(item, dict) else str(item) for item in weaknesses])
-                    if weaknesses:
-                        parts.append(f"Weaknesses:\n{weaknesses}")
-                
-                # Questions
-                if 'questions' in content and content['questions'].get('value'):
-                    parts.append(f"Questions: {content['questions']['value']}")
-                
-                # Limitations
-                if 'limitations' in content and content['limitations'].get('value'):
-                    parts.append(f"Limitations: {content['limitations']['value']}")
-                
-                review_data = {
-                    'reviewer_id': f"R{idx+1}",
-                    'review_id': note.get('id', ''),
-                    'content': "\n\n".join(parts) if parts else "",
-                    'summary': content.get('summary', {}).get('value', ''),
-                    'strengths': content.get('strengths', {}).get('value', ''),
-                    'weaknesses': content.get('weaknesses', {}).get('value', ''),
-                    'rating': content.get('rating', {}).get('value', ''),
-                    'confidence': content.get('confidence', {}).get('value', ''),
-                    'soundness': content.get('soundness', {}).get('value', ''),
-                    'presentation': content.get('presentation', {}).get('value', ''),
-                    'contribution': content.get('contribution', {}).get('value', ''),
-                }
-                
-                reviews.append(review_data)
-            
+            reviews = parse_review_notes(notes)
             print(f"  - 成功获取 {len(reviews)} 个 reviews")
             
         except Exception as e:
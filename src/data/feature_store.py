@@ -0,0 +1,381 @@
+"""
+论文特征存储
+把每篇论文的 Step 1-3 输出（观点、验证结果、权重）和规范化评审汇总为逐篇、逐 reviewer 的特征行，
+写入单个 SQLite 文件；按输入签名增量更新，只有输出发生变化的论文才重新计算。
+录用预测实验直接读取特征行，不再各自重新读取 JSON 并重复计算评分、情感分布等特征
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import yaml
+from .claims import Claim, SENTIMENT_NEGATIVE, SENTIMENT_POSITIVE, verification_confidence
+
+# 配置中没有 features.db_path 时使用的默认路径
+DEFAULT_DB_PATH = "data/processed/features.db"
+
+# 论文级特征（列名, 类型）
+PAPER_FEATURES = (
+    ('num_reviews', 'INTEGER'),
+    ('rating_count', 'INTEGER'),
+    ('rating_mean', 'REAL'),
+    ('rating_min', 'REAL'),
+    ('rating_max', 'REAL'),
+    ('review_confidence_mean', 'REAL'),
+    ('num_claims', 'INTEGER'),
+    ('positive_claims', 'INTEGER'),
+    ('negative_claims', 'INTEGER'),
+    ('neutral_claims', 'INTEGER'),
+    ('sentiment_balance', 'REAL'),
+    ('num_verified', 'INTEGER'),
+    ('true_count', 'INTEGER'),
+    ('partial_count', 'INTEGER'),
+    ('false_count', 'INTEGER'),
+    ('true_rate', 'REAL'),
+    ('partial_rate', 'REAL'),
+    ('false_rate', 'REAL'),
+    ('num_reviewers', 'INTEGER'),
+    ('avg_reviewer_weight', 'REAL'),
+    ('weighted_score', 'REAL'),
+)
+
+# reviewer 级特征；verified_* 只统计有验证结果且不为 False 的观点，true_* / partial_* 按情感细分
+REVIEWER_FEATURES = (
+    ('weight', 'REAL'),
+    ('hollowness', 'REAL'),
+    ('hallucination', 'REAL'),
+    ('rating', 'REAL'),
+    ('confidence', 'REAL'),
+    ('num_claims', 'INTEGER'),
+    ('evidence_claims', 'INTEGER'),
+    ('positive_claims', 'INTEGER'),
+    ('negative_claims', 'INTEGER'),
+    ('neutral_claims', 'INTEGER'),
+    ('num_verified', 'INTEGER'),
+    ('true_count', 'INTEGER'),
+    ('partial_count', 'INTEGER'),
+    ('false_count', 'INTEGER'),
+    ('true_confidence', 'REAL'),
+    ('partial_confidence', 'REAL'),
+    ('verified_positive', 'INTEGER'),
+    ('verified_negative', 'INTEGER'),
+    ('true_positive', 'INTEGER'),
+    ('true_negative', 'INTEGER'),
+    ('partial_positive', 'INTEGER'),
+    ('partial_negative', 'INTEGER'),
+)
+
+_PAPER_COLUMNS = tuple(name for name, _ in PAPER_FEATURES)
+_REVIEWER_COLUMNS = tuple(name for name, _ in REVIEWER_FEATURES)
+
+
+def features_db_path(config: Optional[Dict] = None, db_path: Optional[str] = None) -> str:
+    """
+    特征数据库路径：显式给出的路径 > 配置中的 features.db_path > 默认路径
+
+    Args:
+        config: 解析后的 config.yaml（可选）
+        db_path: 命令行等显式给出的路径
+
+    Returns:
+        特征数据库路径
+    """
+    return db_path or ((config or {}).get('features') or {}).get('db_path') or DEFAULT_DB_PATH
+
+
+def _column_defs(features) -> str:
+    return ",\n".join(f"    {name} {kind}" for name, kind in features)
+
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS paper_features (
+    paper_id TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    ground_truth TEXT,
+{_column_defs(PAPER_FEATURES)}
+);
+
+CREATE TABLE IF NOT EXISTS reviewer_features (
+    paper_id TEXT NOT NULL,
+    reviewer_id TEXT NOT NULL,
+{_column_defs(REVIEWER_FEATURES)},
+    PRIMARY KEY (paper_id, reviewer_id)
+);
+"""
+
+
+def weighted_verification_score(reviewers: Iterable[Dict], partial_weight: float = 0.5,
+                                use_confidence: bool = False, default: float = 0.5) -> float:
+    """
+    加权验证得分：每个 reviewer 的平均验证得分（True 为 1，Partially_True 为 partial_weight，其他为 0）
+    按 reviewer 权重加权平均，只统计有权重且有验证结果的 reviewer
+
+    Args:
+        reviewers: reviewer 特征行
+        partial_weight: Partially_True 的得分
+        use_confidence: 是否再乘以验证置信度
+        default: 没有可用 reviewer 时的得分
+
+    Returns:
+        加权验证得分
+    """
+    total_score = 0.0
+    total_weight = 0.0
+    for reviewer in reviewers:
+        if reviewer['weight'] is None or not reviewer['num_verified']:
+            continue
+        if use_confidence:
+            score = reviewer['true_confidence'] + partial_weight * reviewer['partial_confidence']
+        else:
+            score = reviewer['true_count'] + partial_weight * reviewer['partial_count']
+        total_score += score / reviewer['num_verified'] * reviewer['weight']
+        total_weight += reviewer['weight']
+    return total_score / total_weight if total_weight > 0 else default
+
+
+def compute_features(claims: List[Dict], verifications: Dict[str, Dict], weights: Dict[str, Dict],
+                     reviews: List) -> Tuple[Dict, List[Dict]]:
+    """
+    计算一篇论文的特征
+
+    Args:
+        claims: 观点列表（Step 1 输出）
+        verifications: 验证结果字典，key 为 claim_id（Step 2 输出）
+        weights: 权重字典，key 为 reviewer_id（Step 3 输出）
+        reviews: 规范化评审（Review 列表）
+
+    Returns:
+        (论文特征字典, reviewer 特征字典列表)
+    """
+    reviewers: Dict[str, Dict] = {}
+
+    def reviewer_row(reviewer_id: str) -> Dict:
+        row = reviewers.get(reviewer_id)
+        if row is None:
+            row = reviewers[reviewer_id] = {name: 0 for name in _REVIEWER_COLUMNS}
+            row.update(reviewer_id=reviewer_id, weight=None, hollowness=None, hallucination=None,
+                       rating=None, confidence=None, true_confidence=0.0, partial_confidence=0.0)
+        return row
+
+    for reviewer_id, data in weights.items():
+        row = reviewer_row(reviewer_id)
+        row['weight'] = data.get('weight', 0.5)
+        row['hollowness'] = data.get('hollowness')
+        row['hallucination'] = data.get('hallucination')
+
+    for review in reviews:
+        row = reviewer_row(review.reviewer_id)
+        row['rating'] = review.rating
+        row['confidence'] = review.confidence
+
+    positive = negative = 0
+    for data in claims:
+        claim = data if isinstance(data, Claim) else Claim.from_dict(data)
+        sentiment = claim.sentiment_code
+        positive += sentiment == SENTIMENT_POSITIVE
+        negative += sentiment == SENTIMENT_NEGATIVE
+        if claim.reviewer_id is None:
+            continue
+        row = reviewer_row(claim.reviewer_id)
+        row['num_claims'] += 1
+        row['evidence_claims'] += claim.has_evidence
+        sentiment_key = ('positive' if sentiment == SENTIMENT_POSITIVE
+                         else 'negative' if sentiment == SENTIMENT_NEGATIVE else 'neutral')
+        row[f'{sentiment_key}_claims'] += 1
+
+        verification = verifications.get(claim.id)
+        if verification is None:
+            continue
+        row['num_verified'] += 1
+        result = verification.get('verification_result')
+        if result == 'False':
+            row['false_count'] += 1
+            continue
+        if sentiment_key != 'neutral':
+            row[f'verified_{sentiment_key}'] += 1
+        if result in ('True', 'Partially_True'):
+            prefix = 'true' if result == 'True' else 'partial'
+            row[f'{prefix}_count'] += 1
+            row[f'{prefix}_confidence'] += verification_confidence(verification)
+            if sentiment_key != 'neutral':
+                row[f'{prefix}_{sentiment_key}'] += 1
+
+    ratings = [review.rating for review in reviews if review.rating is not None]
+    confidences = [review.confidence for review in reviews if review.confidence is not None]
+    results = [verification.get('verification_result') for verification in verifications.values()]
+    num_claims = len(claims)
+    num_verified = len(results)
+    true_count = results.count('True')
+    partial_count = results.count('Partially_True')
+    false_count = results.count('False')
+    weighted = [row['weight'] for row in reviewers.values() if row['weight'] is not None]
+    reviewer_rows = list(reviewers.values())
+
+    paper = {
+        'num_reviews': len(reviews),
+        'rating_count': len(ratings),
+        'rating_mean': sum(ratings) / len(ratings) if ratings else None,
+        'rating_min': min(ratings) if ratings else None,
+        'rating_max': max(ratings) if ratings else None,
+        'review_confidence_mean': sum(confidences) / len(confidences) if confidences else None,
+        'num_claims': num_claims,
+        'positive_claims': positive,
+        'negative_claims': negative,
+        'neutral_claims': num_claims - positive - negative,
+        'sentiment_balance': (positive - negative) / num_claims if num_claims else 0.0,
+        'num_verified': num_verified,
+        'true_count': true_count,
+        'partial_count': partial_count,
+        'false_count': false_count,
+        'true_rate': true_count / num_verified if num_verified else 0.0,
+        'partial_rate': partial_count / num_verified if num_verified else 0.0,
+        'false_rate': false_count / num_verified if num_verified else 0.0,
+        'num_reviewers': len(weighted),
+        'avg_reviewer_weight': sum(weighted) / len(weighted) if weighted else None,
+        'weighted_score': weighted_verification_score(reviewer_rows),
+    }
+    return paper, reviewer_rows
+
+
+class FeatureStore:
+    """
+    论文特征的 SQLite 存储
+
+    每篇论文记录输入签名（DataLoader.result_signature 加上录用状态），签名不变的论文在 build 时跳过；
+    papers() 两次查询读出全部论文及其 reviewer 特征行。
+    """
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_config(cls, config_path: Optional[str] = "config.yaml", db_path: Optional[str] = None) -> "FeatureStore":
+        """
+        按配置打开特征存储（路径规则见 features_db_path）
+
+        Args:
+            config_path: 配置文件路径，None 或文件不存在时使用默认路径
+            db_path: 命令行等显式给出的路径
+
+        Returns:
+            FeatureStore
+        """
+        config = {}
+        if config_path and Path(config_path).exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+        path = features_db_path(config, db_path)
+        if not Path(path).exists():
+            print(f"[WARNING] 特征数据库不存在: {path}，请先运行 python scripts/build_features.py")
+        return cls(path)
+
+    def close(self):
+        self.conn.close()
+
+    def signature(self, paper_id: str) -> Optional[str]:
+        """已存储特征的输入签名，未存储返回 None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT signature FROM paper_features WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, paper_id: str, signature: str, ground_truth: Optional[str],
+            paper: Dict, reviewers: List[Dict]):
+        """写入（覆盖）一篇论文的特征"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO paper_features VALUES ({', '.join('?' * (len(_PAPER_COLUMNS) + 3))})",
+                (paper_id, signature, ground_truth) + tuple(paper[name] for name in _PAPER_COLUMNS)
+            )
+            self.conn.execute("DELETE FROM reviewer_features WHERE paper_id = ?", (paper_id,))
+            self.conn.executemany(
+                f"INSERT INTO reviewer_features VALUES ({', '.join('?' * (len(_REVIEWER_COLUMNS) + 2))})",
+                [(paper_id, row['reviewer_id']) + tuple(row[name] for name in _REVIEWER_COLUMNS)
+                 for row in reviewers]
+            )
+
+    def build(self, data_loader, paper_ids: List[str],
+              ground_truth: Optional[Dict[str, str]] = None, force: bool = False) -> Dict[str, int]:
+        """
+        计算并写入特征（输入签名未变化的论文跳过）
+
+        Args:
+            data_loader: DataLoader（读取观点、验证结果、权重和评审）
+            paper_ids: 论文 ID 列表
+            ground_truth: 录用状态字典（key 为 paper_id），一并写入特征行
+            force: 是否忽略签名全部重新计算
+
+        Returns:
+            {'computed': 重新计算数, 'cached': 已是最新数, 'failed': 失败数}
+        """
+        ground_truth = ground_truth or {}
+        stats = {'computed': 0, 'cached': 0, 'failed': 0}
+        for paper_id in paper_ids:
+            label = ground_truth.get(paper_id)
+            signature = f"{data_loader.result_signature(paper_id)}|gt:{label or ''}"
+            if not force and self.signature(paper_id) == signature:
+                stats['cached'] += 1
+                continue
+            try:
+                paper, reviewers = compute_features(
+                    data_loader.load_claims(paper_id),
+                    data_loader.load_verifications(paper_id),
+                    data_loader.load_weights(paper_id),
+                    data_loader.load_reviews(paper_id)
+                )
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[WARNING] 计算特征失败 {paper_id}: {e}")
+                stats['failed'] += 1
+                continue
+            self.put(paper_id, signature, label, paper, reviewers)
+            stats['computed'] += 1
+        return stats
+
+    def papers(self, paper_ids: Optional[Iterable[str]] = None, labeled_only: bool = False) -> List[Dict]:
+        """
+        读取论文特征
+
+        Args:
+            paper_ids: 只返回这些论文（默认全部）
+            labeled_only: 只返回有录用状态的论文
+
+        Returns:
+            论文特征字典列表（按 paper_id 排序），每项包含 paper_id、ground_truth、各论文级特征，
+            以及 'reviewers'：该论文的 reviewer 特征字典列表
+        """
+        with self.lock:
+            paper_rows = self.conn.execute(
+                f"SELECT paper_id, ground_truth, {', '.join(_PAPER_COLUMNS)} FROM paper_features ORDER BY paper_id"
+            ).fetchall()
+            reviewer_rows = self.conn.execute(
+                f"SELECT paper_id, reviewer_id, {', '.join(_REVIEWER_COLUMNS)} FROM reviewer_features "
+                "ORDER BY paper_id, reviewer_id"
+            ).fetchall()
+
+        wanted = set(paper_ids) if paper_ids is not None else None
+        reviewers: Dict[str, List[Dict]] = {}
+        for row in reviewer_rows:
+            reviewers.setdefault(row[0], []).append(dict(zip(('reviewer_id',) + _REVIEWER_COLUMNS, row[1:])))
+
+        papers = []
+        for row in paper_rows:
+            paper_id, label = row[0], row[1]
+            if (wanted is not None and paper_id not in wanted) or (labeled_only and not label):
+                continue
+            paper = {'paper_id': paper_id, 'ground_truth': label}
+            paper.update(zip(_PAPER_COLUMNS, row[2:]))
+            paper['reviewers'] = reviewers.get(paper_id, [])
+            papers.append(paper)
+        return papers
@@ -0,0 +1,193 @@
+"""
+下载清单
+用单个 SQLite 文件记录每篇论文 PDF / reviews 的下载状态、字节数、SHA-256 以及 ETag / Last-Modified，
+爬虫据此跳过已完成的条目、用 HTTP Range 续传未完成的 PDF，刷新语料时只重新获取有变化的内容
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    paper_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    forum_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    path TEXT,
+    size INTEGER,
+    total_size INTEGER,
+    sha256 TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (paper_id, kind)
+);
+CREATE INDEX IF NOT EXISTS idx_items_forum ON items (forum_id);
+CREATE INDEX IF NOT EXISTS idx_items_status ON items (kind, status);
+"""
+
+KINDS = ("pdf", "reviews")
+# pending: 未开始；partial: PDF 已下载一部分（.part 文件）；complete: 已完成；failed: 最近一次失败
+STATUSES = ("pending", "partial", "complete", "failed")
+
+_COLUMNS = ("paper_id", "kind", "forum_id", "status", "path", "size", "total_size",
+            "sha256", "etag", "last_modified", "error", "updated_at")
+
+
+def sha256_file(path: Path, chunk_size: int = 1 << 20) -> str:
+    """计算文件的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DownloadManifest:
+    """
+    基于 SQLite 的下载清单
+
+    每篇论文的 PDF 和 reviews 各一条记录（主键 paper_id + kind），写入即覆盖。
+    """
+
+    def __init__(self, db_path: str = "data/raw/manifest.db"):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def get(self, paper_id: str, kind: str) -> Optional[Dict]:
+        """读取一条记录，不存在返回 None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT * FROM items WHERE paper_id = ? AND kind = ?", (paper_id, kind)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def update(self, paper_id: str, kind: str, forum_id: str, **fields):
+        """
+        写入或更新一条记录（只覆盖给出的字段）
+
+        Args:
+            paper_id: 本地论文 ID
+            kind: "pdf" 或 "reviews"
+            forum_id: OpenReview forum ID
+            **fields: status, path, size, total_size, sha256, etag, last_modified, error
+        """
+        if kind not in KINDS:
+            raise ValueError(f"不支持的类型: {kind}。支持: {', '.join(KINDS)}")
+        if fields.get('status', 'pending') not in STATUSES:
+            raise ValueError(f"不支持的状态: {fields['status']}。支持: {', '.join(STATUSES)}")
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT * FROM items WHERE paper_id = ? AND kind = ?", (paper_id, kind)
+            ).fetchone()
+            record = dict(row) if row else {'status': "pending"}
+            record.update(fields)
+            record.update({'paper_id': paper_id, 'kind': kind, 'forum_id': forum_id, 'updated_at': time.time()})
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO items ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                [record.get(column) for column in _COLUMNS]
+            )
+
+    def is_complete(self, paper_id: str, kind: str, verify: bool = False) -> bool:
+        """
+        条目是否已完成：状态为 complete 且文件存在、大小一致（verify=True 时同时校验 SHA-256）
+        """
+        record = self.get(paper_id, kind)
+        if not record or record['status'] != "complete" or not record['path']:
+            return False
+        path = Path(record['path'])
+        if not path.exists() or path.stat().st_size != record['size']:
+            return False
+        if verify and record['sha256'] and sha256_file(path) != record['sha256']:
+            return False
+        return True
+
+    def items(self, kind: Optional[str] = None, status: Optional[str] = None) -> List[Dict]:
+        """按类型和状态筛选记录"""
+        query, params = "SELECT * FROM items WHERE 1 = 1", []
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(query + " ORDER BY paper_id, kind", params)]
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """各类型各状态的条目数和总字节数"""
+        result = {}
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT kind, status, COUNT(*), COALESCE(SUM(size), 0) FROM items GROUP BY kind, status"
+            ).fetchall()
+        for kind, status, count, size in rows:
+            result.setdefault(kind, {})[status] = {'count': count, 'bytes': size}
+        return result
+
+    def import_existing(self, download_path: str, forum_ids: Optional[Dict[str, str]] = None) -> int:
+        """
+        把已下载的文件登记为 complete（papers/{paper_id}.pdf 和 reviews/{paper_id}_reviews.json）
+
+        Args:
+            download_path: 下载目录
+            forum_ids: paper_id -> forum_id（没有时 forum_id 记为 paper_id）
+
+        Returns:
+            新登记的条目数
+        """
+        forum_ids = forum_ids or {}
+        download_path = Path(download_path)
+        candidates = [(path, path.stem, "pdf") for path in sorted((download_path / "papers").glob("*.pdf"))]
+        for path in sorted((download_path / "reviews").glob("*_reviews.json")):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    if not json.load(f):
+                        continue  # 空 review 文件视为未完成
+            except (OSError, json.JSONDecodeError):
+                continue
+            candidates.append((path, path.name[:-len("_reviews.json")], "reviews"))
+
+        imported = 0
+        for path, paper_id, kind in candidates:
+            if self.is_complete(paper_id, kind):
+                continue
+            self.update(paper_id, kind, forum_ids.get(paper_id, paper_id), status="complete",
+                        path=str(path), size=path.stat().st_size, sha256=sha256_file(path), error=None)
+            imported += 1
+        return imported
+
+    def verify(self, kind: Optional[str] = None) -> List[Dict]:
+        """
+        重新计算已完成条目的 SHA-256，文件缺失或内容不一致的条目改为 pending
+
+        Returns:
+            校验失败的记录
+        """
+        mismatched = []
+        for record in self.items(kind=kind, status="complete"):
+            if not self.is_complete(record['paper_id'], record['kind'], verify=True):
+                self.update(record['paper_id'], record['kind'], record['forum_id'],
+                            status="pending", error="checksum mismatch or missing file")
+                mismatched.append(record)
+        return mismatched
@@ -0,0 +1,325 @@
+"""
+列式结果存储
+将 Step 1-3 的输出（claims、verifications、reviewer weights）写入单个 SQLite 文件，
+替代每篇论文每个阶段一个 JSON 文件的方式，语料级分析只需一次扫描
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .claims import reviewer_id_of
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    paper_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_paper_stage ON runs (paper_id, stage, run_id);
+
+CREATE TABLE IF NOT EXISTS claims (
+    run_id INTEGER NOT NULL,
+    paper_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    claim_id TEXT,
+    reviewer_id TEXT,
+    topic TEXT,
+    sentiment TEXT,
+    substantiation_type TEXT,
+    statement TEXT,
+    substantiation_content TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_claims_run ON claims (run_id);
+CREATE INDEX IF NOT EXISTS idx_claims_paper ON claims (paper_id);
+
+CREATE TABLE IF NOT EXISTS verifications (
+    run_id INTEGER NOT NULL,
+    paper_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    claim_id TEXT,
+    verification_result TEXT,
+    confidence REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_verifications_run ON verifications (run_id);
+CREATE INDEX IF NOT EXISTS idx_verifications_paper ON verifications (paper_id);
+
+CREATE TABLE IF NOT EXISTS reviewer_weights (
+    run_id INTEGER NOT NULL,
+    paper_id TEXT NOT NULL,
+    reviewer_id TEXT NOT NULL,
+    weight REAL,
+    hollowness REAL,
+    hallucination REAL,
+    num_claims INTEGER,
+    num_claims_with_evidence INTEGER,
+    num_false_claims INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_weights_run ON reviewer_weights (run_id);
+CREATE INDEX IF NOT EXISTS idx_weights_paper ON reviewer_weights (paper_id);
+
+-- 每篇论文每个阶段的最新一次写入
+CREATE VIEW IF NOT EXISTS latest_runs AS
+    SELECT paper_id, stage, MAX(run_id) AS run_id FROM runs GROUP BY paper_id, stage;
+"""
+
+STAGES = ("claims", "verifications", "weights")
+
+
+class ResultsStore:
+    """
+    基于 SQLite 的追加写结果存储
+
+    每次写入都会新增一条 run 记录，读取时只取每篇论文每个阶段最新的 run，
+    因此重跑某个阶段不会修改历史数据。按 paper_id 的查询走索引，
+    语料级读取每张表只需一次扫描。
+    """
+
+    def __init__(self, db_path: str = "data/results/results.db"):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _new_run(self, paper_id: str, stage: str) -> int:
+        cursor = self.conn.execute(
+            "INSERT INTO runs (paper_id, stage, created_at) VALUES (?, ?, ?)",
+            (paper_id, stage, time.time())
+        )
+        return cursor.lastrowid
+
+    def _latest_run(self, paper_id: str, stage: str) -> Optional[int]:
+        row = self.conn.execute(
+            "SELECT MAX(run_id) FROM runs WHERE paper_id = ? AND stage = ?",
+            (paper_id, stage)
+        ).fetchone()
+        return row[0] if row else None
+
+    # ---------- 写入 ----------
+
+    def append_claims(self, paper_id: str, claims: List[Dict]):
+        """追加一篇论文的 Step 1 输出"""
+        with self.lock, self.conn:
+            run_id = self._new_run(paper_id, "claims")
+            self.conn.executemany(
+                "INSERT INTO claims VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id, paper_id, position, claim.get('id'),
+                        reviewer_id_of(claim.get('id', '')),
+                        claim.get('topic'), claim.get('sentiment'), claim.get('substantiation_type'),
+                        claim.get('statement'), claim.get('substantiation_content'),
+                        json.dumps(claim, ensure_ascii=False)
+                    )
+                    for position, claim in enumerate(claims)
+                ]
+            )
+
+    def append_verifications(self, paper_id: str, verifications: Iterable[Dict]):
+        """追加一篇论文的 Step 2 输出"""
+        with self.lock, self.conn:
+            run_id = self._new_run(paper_id, "verifications")
+            self.conn.executemany(
+                "INSERT INTO verifications VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id, paper_id, position, item.get('id'),
+                        item.get('verification_result'), item.get('confidence'),
+                        json.dumps(item, ensure_ascii=False)
+                    )
+                    for position, item in enumerate(verifications)
+                ]
+            )
+
+    def append_weights(self, paper_id: str, weights: Dict[str, Dict]):
+        """追加一篇论文的 Step 3 输出"""
+        with self.lock, self.conn:
+            run_id = self._new_run(paper_id, "weights")
+            self.conn.executemany(
+                "INSERT INTO reviewer_weights VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id, paper_id, reviewer_id, data.get('weight'), data.get('hollowness'),
+                        data.get('hallucination'), data.get('num_claims'),
+                        data.get('num_claims_with_evidence'), data.get('num_false_claims'),
+                        json.dumps(data, ensure_ascii=False)
+                    )
+                    for reviewer_id, data in weights.items()
+                ]
+            )
+
+    # ---------- 单篇读取 ----------
+
+    def latest_runs(self, paper_id: str) -> Dict[str, int]:
+        """某篇论文各阶段最新一次写入的 run_id（用于判断下游缓存是否过期）"""
+        rows = self.conn.execute(
+            "SELECT stage, MAX(run_id) FROM runs WHERE paper_id = ? GROUP BY stage", (paper_id,)
+        )
+        return {stage: run_id for stage, run_id in rows}
+
+    def has_stage(self, paper_id: str, stage: str) -> bool:
+        """检查某篇论文是否已有某个阶段的输出"""
+        return self._latest_run(paper_id, stage) is not None
+
+    def load_claims(self, paper_id: str) -> List[Dict]:
+        run_id = self._latest_run(paper_id, "claims")
+        if run_id is None:
+            return []
+        rows = self.conn.execute(
+            "SELECT data FROM claims WHERE run_id = ? ORDER BY position", (run_id,)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    def load_verifications(self, paper_id: str) -> Dict[str, Dict]:
+        run_id = self._latest_run(paper_id, "verifications")
+        if run_id is None:
+            return {}
+        rows = self.conn.execute(
+            "SELECT claim_id, data FROM verifications WHERE run_id = ? ORDER BY position", (run_id,)
+        )
+        return {claim_id: json.loads(data) for claim_id, data in rows}
+
+    def load_weights(self, paper_id: str) -> Dict[str, Dict]:
+        run_id = self._latest_run(paper_id, "weights")
+        if run_id is None:
+            return {}
+        rows = self.conn.execute(
+            "SELECT reviewer_id, data FROM reviewer_weights WHERE run_id = ?", (run_id,)
+        )
+        return {reviewer_id: json.loads(data) for reviewer_id, data in rows}
+
+    # ---------- 语料级扫描 ----------
+
+    def _scan(self, table: str, stage: str, columns: str, order: str,
+              paper_ids: Optional[List[str]] = None):
+        query = (
+            f"SELECT t.paper_id, {columns} FROM {table} t "
+            f"JOIN latest_runs l ON t.run_id = l.run_id AND l.stage = ?"
+        )
+        params: List = [stage]
+        if paper_ids is not None:
+            query += f" WHERE t.paper_id IN ({','.join('?' * len(paper_ids))})"
+            params.extend(paper_ids)
+        query += f" ORDER BY {order}"
+        return self.conn.execute(query, params)
+
+    def paper_ids(self, stage: str = "claims") -> List[str]:
+        """返回已有某个阶段输出的所有论文 ID"""
+        rows = self.conn.execute(
+            "SELECT DISTINCT paper_id FROM runs WHERE stage = ? ORDER BY paper_id", (stage,)
+        )
+        return [paper_id for (paper_id,) in rows]
+
+    def scan_claims(self, paper_ids: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """一次扫描读取所有（或指定）论文的最新 claims"""
+        results: Dict[str, List[Dict]] = {}
+        for paper_id, data in self._scan("claims", "claims", "t.data", "t.paper_id, t.position", paper_ids):
+            results.setdefault(paper_id, []).append(json.loads(data))
+        return results
+
+    def scan_verifications(self, paper_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict]]:
+        """一次扫描读取所有（或指定）论文的最新验证结果"""
+        results: Dict[str, Dict[str, Dict]] = {}
+        for paper_id, claim_id, data in self._scan(
+                "verifications", "verifications", "t.claim_id, t.data", "t.paper_id, t.position", paper_ids):
+            results.setdefault(paper_id, {})[claim_id] = json.loads(data)
+        return results
+
+    def scan_weights(self, paper_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Dict]]:
+        """一次扫描读取所有（或指定）论文的最新 reviewer 权重"""
+        results: Dict[str, Dict[str, Dict]] = {}
+        for paper_id, reviewer_id, data in self._scan(
+                "reviewer_weights", "weights", "t.reviewer_id, t.data", "t.paper_id, t.reviewer_id", paper_ids):
+            results.setdefault(paper_id, {})[reviewer_id] = json.loads(data)
+        return results
+
+    def import_json_results(self, base_path: str = "data") -> int:
+        """
+        将已有的逐篇 JSON 输出导入存储（只导入存储中还没有的阶段）
+
+        Args:
+            base_path: 数据根目录
+
+        Returns:
+            导入的文件数
+        """
+        base = Path(base_path)
+        sources = [
+            ("claims", base / "processed" / "extracted", "_claims.json", self.append_claims),
+            ("verifications", base / "results" / "verifications", "_verified.json", self.append_verifications),
+            ("weights", base / "results" / "weights", "_weights.json", self.append_weights),
+        ]
+        imported = 0
+        for stage, directory, suffix, append in sources:
+            for path in sorted(directory.glob(f"*{suffix}")):
+                paper_id = path.name[:-len(suffix)]
+                if self.has_stage(paper_id, stage):
+                    continue
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if stage == "verifications" and isinstance(data, dict):
+                    data = list(data.values())
+                append(paper_id, data)
+                imported += 1
+        return imported
+
+
+def load_corpus_results(base_path: str = "data",
+                        db_path: Optional[str] = None) -> Tuple[Dict, Dict, Dict]:
+    """
+    读取整个语料的 Step 1-3 输出
+
+    结果数据库存在时各表扫描一次；只有逐篇 JSON 文件的论文（如数据库启用前的输出）
+    从 JSON 文件补充，同一论文两处都有时以数据库为准。
+
+    Args:
+        base_path: 数据根目录
+        db_path: 结果数据库路径（通常为配置中的 output.results_store），默认 {base_path}/results/results.db
+
+    Returns:
+        (claims, verifications, weights)，均以 paper_id 为 key
+    """
+    claims, verifications, weights = {}, {}, {}
+    db_file = Path(db_path) if db_path else Path(base_path) / "results" / "results.db"
+    if db_file.exists():
+        store = ResultsStore(str(db_file))
+        try:
+            claims, verifications, weights = store.scan_claims(), store.scan_verifications(), store.scan_weights()
+        finally:
+            store.close()
+
+    def json_only(directory: Path, suffix: str, loaded: Dict):
+        for path in directory.glob(f"*{suffix}"):
+            paper_id = path.name[:-len(suffix)]
+            if paper_id not in loaded:
+                with open(path, 'r', encoding='utf-8') as f:
+                    yield paper_id, json.load(f)
+
+    base = Path(base_path)
+    for paper_id, data in json_only(base / "processed" / "extracted", "_claims.json", claims):
+        claims[paper_id] = data
+    for paper_id, data in json_only(base / "results" / "verifications", "_verified.json", verifications):
+        if isinstance(data, list):
+            data = {item['id']: item for item in data}
+        verifications[paper_id] = data
+    for paper_id, data in json_only(base / "results" / "weights", "_weights.json", weights):
+        weights[paper_id] = data
+    return claims, verifications, weights
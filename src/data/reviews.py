@@ -0,0 +1,356 @@
+"""
+评审规范化
+原始 review 文件有多种形状：NIPSDownloader / 爬虫输出（content 为拼好的字符串，评分在顶层）、
+API v2 原始 note（content.{field}.value）、API v1 原始 note（content.review / content.rating 为字符串）。
+这里统一转换为带 __slots__ 的 Review 记录，并缓存到单个 SQLite 文件（评分为 REAL 列），
+各 agent 和分析脚本读取该表示，不再各自重新解析原始 JSON
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+SECTIONS = ("summary", "strengths", "weaknesses", "questions", "limitations")
+SCORES = ("rating", "confidence", "soundness", "presentation", "contribution")
+
+# 拼接全文时各段的标题（与 parse_review_notes 的格式一致）
+_SECTION_TITLES = {
+    'summary': "Summary: {}",
+    'strengths': "Strengths:\n{}",
+    'weaknesses': "Weaknesses:\n{}",
+    'questions': "Questions: {}",
+    'limitations': "Limitations: {}",
+}
+
+# API v1 等没有分段的 note 中存放正文的字段
+_BODY_FIELDS = ("review", "main_review", "comment")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS review_files (
+    paper_id TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reviews (
+    paper_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    reviewer_id TEXT NOT NULL,
+    review_id TEXT,
+    rating REAL,
+    confidence REAL,
+    soundness REAL,
+    presentation REAL,
+    contribution REAL,
+    summary TEXT,
+    strengths TEXT,
+    weaknesses TEXT,
+    questions TEXT,
+    limitations TEXT,
+    body TEXT,
+    PRIMARY KEY (paper_id, position)
+);
+"""
+
+_COLUMNS = ("reviewer_id", "review_id") + SCORES + SECTIONS + ("body",)
+
+# 规范化规则版本（PRAGMA user_version），规则变化时递增使已缓存的评审全部重新规范化
+REVIEWS_VERSION = 2
+
+
+def _value(field):
+    """OpenReview API v2 的 content 字段形如 {'value': ...}，API v1 直接是值"""
+    if isinstance(field, dict):
+        return field.get('value')
+    return field
+
+
+def _section_text(field) -> str:
+    value = _value(field)
+    if isinstance(value, list):
+        value = '\n'.join(f"- {item}" if isinstance(item, dict) else str(item) for item in value)
+    return str(value).strip() if value is not None else ''
+
+
+def parse_score(value) -> Optional[float]:
+    """
+    解析评分字段
+
+    Args:
+        value: 如 8、"8"、"8: accept, good paper"、{'value': "8: accept, good paper"}
+
+    Returns:
+        数值评分，无法解析时返回 None
+    """
+    value = _value(value)
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    head = str(value).split(':')[0].strip()
+    if not head:
+        return None
+    try:
+        return float(head)
+    except ValueError:
+        return None
+
+
+class Review:
+    """
+    规范化后的单条评审
+
+    各段文本分字段存放；只有当原始正文无法由各段拼出时（API v1 的 review 字段、手写的 content）
+    才保存在 body 中，避免同一段文本存两份。
+    """
+
+    __slots__ = _COLUMNS
+
+    def __init__(self, reviewer_id: str, review_id: str = '',
+                 rating: Optional[float] = None, confidence: Optional[float] = None,
+                 soundness: Optional[float] = None, presentation: Optional[float] = None,
+                 contribution: Optional[float] = None,
+                 summary: str = '', strengths: str = '', weaknesses: str = '',
+                 questions: str = '', limitations: str = '', body: str = ''):
+        self.reviewer_id = reviewer_id
+        self.review_id = review_id
+        self.rating = rating
+        self.confidence = confidence
+        self.soundness = soundness
+        self.presentation = presentation
+        self.contribution = contribution
+        self.summary = summary
+        self.strengths = strengths
+        self.weaknesses = weaknesses
+        self.questions = questions
+        self.limitations = limitations
+        self.body = body
+
+    def sections_text(self) -> str:
+        parts = [_SECTION_TITLES[name].format(getattr(self, name)) for name in SECTIONS if getattr(self, name)]
+        return "\n\n".join(parts)
+
+    @property
+    def text(self) -> str:
+        """评审全文（提取观点时输入给 LLM 的文本）"""
+        return self.body or self.sections_text()
+
+    def row(self) -> tuple:
+        return tuple(getattr(self, name) for name in _COLUMNS)
+
+    def to_dict(self) -> Dict:
+        """转换为 NIPSDownloader 输出的 review 字典格式（content 为全文）"""
+        data = {'reviewer_id': self.reviewer_id, 'review_id': self.review_id, 'content': self.text}
+        data.update({name: getattr(self, name) for name in SECTIONS + SCORES})
+        return data
+
+    def __repr__(self) -> str:
+        return f"Review({self.reviewer_id!r}, rating={self.rating}, chars={len(self.text)})"
+
+
+def normalize_review(raw: Dict, reviewer_id: str) -> Review:
+    """
+    将一条任意形状的原始评审转换为 Review
+
+    Args:
+        raw: 原始评审（review 字典或 OpenReview note）
+        reviewer_id: 原始数据中没有 reviewer_id 时使用的 ID
+
+    Returns:
+        Review 记录
+    """
+    if isinstance(raw, Review):
+        return raw
+    content = raw.get('content')
+    if isinstance(content, dict):
+        # 原始 note：各字段都在 content 中
+        fields = content
+        body = next((_section_text(content[name]) for name in _BODY_FIELDS if _section_text(content.get(name))), '')
+    else:
+        # 已解析的 review：content 为全文（或缺失时用 text），各字段在顶层
+        fields = raw
+        body = str(content if content is not None else raw.get('text') or '').strip()
+
+    review = Review(
+        reviewer_id=raw.get('reviewer_id') or reviewer_id,
+        review_id=raw.get('review_id') or raw.get('id') or '',
+        **{name: parse_score(fields.get(name)) for name in SCORES},
+        **{name: _section_text(fields.get(name)) for name in SECTIONS}
+    )
+    # 全文能由各段拼出时不再单独保存
+    if body and body != review.sections_text():
+        review.body = body
+    return review
+
+
+def normalize_reviews(raw_reviews: Iterable[Dict]) -> List[Review]:
+    """
+    规范化一篇论文的评审列表
+
+    没有正文也没有评分的条目（空 Rebuttal、撤稿说明等）会被丢弃。
+    原始数据带 reviewer_id 时保留，否则按原始列表中的位置编号 R1、R2...（先编号再丢弃空条目，
+    与已提取观点的 ID 一致）
+
+    Args:
+        raw_reviews: 原始评审列表，元素可以是任意形状的字典或已规范化的 Review
+
+    Returns:
+        Review 列表
+    """
+    reviews = []
+    for idx, raw in enumerate(raw_reviews or []):
+        review = normalize_review(raw, f"R{idx + 1}")
+        if review.text.strip() or review.rating is not None:
+            reviews.append(review)
+    return reviews
+
+
+def load_review_file(path: Path) -> List[Review]:
+    """读取并规范化一个 {paper_id}_reviews.json 文件"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        # 少数下载脚本保存为 {'reviews': [...]} 或 {'notes': [...]}
+        data = data.get('reviews') or data.get('notes') or []
+    return normalize_reviews(data)
+
+
+class ReviewStore:
+    """
+    规范化评审的 SQLite 缓存
+
+    每篇论文记录源文件的路径、大小和修改时间，源文件变化时自动重新规范化；
+    评分是 REAL 列，语料级统计（ratings）只需一次查询，不需要读取任何 JSON。
+    """
+
+    def __init__(self, db_path: str = "data/processed/reviews.db"):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != REVIEWS_VERSION:
+            with self.conn:
+                self.conn.execute("DELETE FROM review_files")
+                self.conn.execute("DELETE FROM reviews")
+            self.conn.execute(f"PRAGMA user_version = {REVIEWS_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def put(self, paper_id: str, reviews: List[Review], source_path: Optional[Path] = None):
+        """写入（覆盖）一篇论文的规范化评审"""
+        stat = os.stat(source_path) if source_path is not None else None
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM reviews WHERE paper_id = ?", (paper_id,))
+            self.conn.executemany(
+                f"INSERT INTO reviews VALUES ({', '.join('?' * (len(_COLUMNS) + 2))})",
+                [(paper_id, position) + review.row() for position, review in enumerate(reviews)]
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO review_files VALUES (?, ?, ?, ?)",
+                (paper_id, str(source_path or ''), stat.st_size if stat else 0, stat.st_mtime_ns if stat else 0)
+            )
+
+    def is_fresh(self, paper_id: str, source_path: Path) -> bool:
+        """缓存是否对应当前的源文件"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT path, size, mtime_ns FROM review_files WHERE paper_id = ?", (paper_id,)
+            ).fetchone()
+        if row is None:
+            return False
+        stat = os.stat(source_path)
+        return row == (str(source_path), stat.st_size, stat.st_mtime_ns)
+
+    def get(self, paper_id: str) -> Optional[List[Review]]:
+        """读取缓存中的评审，未缓存返回 None"""
+        with self.lock:
+            if self.conn.execute("SELECT 1 FROM review_files WHERE paper_id = ?", (paper_id,)).fetchone() is None:
+                return None
+            rows = self.conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM reviews WHERE paper_id = ? ORDER BY position", (paper_id,)
+            ).fetchall()
+        return [Review(*row) for row in rows]
+
+    def load(self, paper_id: str, source_path: Optional[Path]) -> List[Review]:
+        """
+        读取一篇论文的规范化评审，缓存缺失或源文件已变化时重新规范化并写回
+
+        Args:
+            paper_id: 论文 ID
+            source_path: 原始 review 文件路径（None 表示不存在）
+
+        Returns:
+            Review 列表
+        """
+        if source_path is None:
+            return []
+        if self.is_fresh(paper_id, source_path):
+            return self.get(paper_id)
+        reviews = load_review_file(source_path)
+        self.put(paper_id, reviews, source_path)
+        return reviews
+
+    def build(self, resolver, paper_ids: Optional[List[str]] = None) -> Dict[str, int]:
+        """
+        规范化整个语料（已是最新的论文跳过）
+
+        Args:
+            resolver: CorpusResolver
+            paper_ids: 只处理这些论文（默认所有有 review 文件的论文）
+
+        Returns:
+            {'normalized': 重新规范化数, 'cached': 已是最新数, 'reviews': 评审总数, 'failed': 失败数}
+        """
+        paper_ids = paper_ids if paper_ids is not None else resolver.papers(require_reviews=True)
+        stats = {'normalized': 0, 'cached': 0, 'reviews': 0, 'failed': 0}
+        for paper_id in paper_ids:
+            source_path = resolver.reviews_path(paper_id)
+            if source_path is None:
+                continue
+            try:
+                if self.is_fresh(paper_id, source_path):
+                    stats['cached'] += 1
+                    continue
+                reviews = load_review_file(source_path)
+            except (OSError, ValueError) as e:
+                print(f"[WARNING] 规范化评审失败 {paper_id}: {e}")
+                stats['failed'] += 1
+                continue
+            self.put(paper_id, reviews, source_path)
+            stats['normalized'] += 1
+            stats['reviews'] += len(reviews)
+        return stats
+
+    def ratings(self, paper_ids: Optional[List[str]] = None) -> Dict[str, List[float]]:
+        """
+        各论文的数值评分（只读 rating 列）
+
+        Args:
+            paper_ids: 只返回这些论文（默认全部已缓存的论文）
+
+        Returns:
+            paper_id -> 评分列表
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT paper_id, rating FROM reviews WHERE rating IS NOT NULL ORDER BY paper_id, position"
+            ).fetchall()
+        wanted = set(paper_ids) if paper_ids is not None else None
+        ratings: Dict[str, List[float]] = {}
+        for paper_id, rating in rows:
+            if wanted is None or paper_id in wanted:
+                ratings.setdefault(paper_id, []).append(rating)
+        return ratings
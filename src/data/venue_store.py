@@ -0,0 +1,158 @@
+"""
+会议级 notes 存储
+把整个会议的 submissions（连同 details.replies 中的全部回复）逐页追加写入 JSONL，
+配合检查点文件支持中断后续传；之后可离线导出每篇论文的 review 文件，不再逐篇请求 API
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from .downloader import is_official_review, parse_review_notes
+
+
+def _value(field) -> str:
+    """OpenReview API v2 的 content 字段形如 {'value': ...}"""
+    if isinstance(field, dict):
+        return field.get('value', '')
+    return field if field is not None else ''
+
+
+def venue_slug(domain: str) -> str:
+    """会议 domain 转换为目录名（如 ICLR.cc/2024/Conference -> ICLR.cc_2024_Conference）"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", domain).strip("_")
+
+
+class VenueNoteStore:
+    """
+    单个会议的 JSONL notes 存储
+
+    目录结构：
+        {root}/{venue_slug}/submissions.jsonl   每行一个 submission note（details.replies 包含所有回复）
+        {root}/{venue_slug}/checkpoint.json     已写入的 offset 和条数，用于续传
+    """
+
+    def __init__(self, domain: str, root: str = "data/raw/venues"):
+        """
+        Args:
+            domain: 会议 domain（如 "ICLR.cc/2024/Conference"）
+            root: 存储根目录
+        """
+        self.domain = domain
+        self.path = Path(root) / venue_slug(domain)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.submissions_path = self.path / "submissions.jsonl"
+        self.checkpoint_path = self.path / "checkpoint.json"
+
+    def load_checkpoint(self) -> Dict:
+        """读取检查点，不存在时返回初始状态"""
+        if self.checkpoint_path.exists():
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'offset': 0, 'count': 0, 'complete': False}
+
+    def save_checkpoint(self, checkpoint: Dict):
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        tmp_path.replace(self.checkpoint_path)
+
+    def reset(self):
+        """清空已保存的 notes 和检查点（重新抓取整个会议）"""
+        for path in (self.submissions_path, self.checkpoint_path):
+            if path.exists():
+                path.unlink()
+
+    def append_page(self, notes: List[Dict], offset: int, complete: bool = False):
+        """
+        追加一页 submissions 并更新检查点（先写数据再写检查点，中断后最多重复一页）
+
+        Args:
+            notes: 本页的 submission notes
+            offset: 本页之后的 offset
+            complete: 是否已是最后一页
+        """
+        checkpoint = self.load_checkpoint()
+        # 检查点之后写入的残留行（上次写数据后、写检查点前中断）先截掉
+        self._truncate(checkpoint['count'])
+        with open(self.submissions_path, 'a', encoding='utf-8') as f:
+            for note in notes:
+                f.write(json.dumps(note, ensure_ascii=False) + "\n")
+        self.save_checkpoint({'offset': offset, 'count': checkpoint['count'] + len(notes), 'complete': complete})
+
+    def _truncate(self, count: int):
+        if not self.submissions_path.exists():
+            return
+        with open(self.submissions_path, 'rb+') as f:
+            for _ in range(count):
+                if not f.readline():
+                    return
+            position = f.tell()
+            if f.readline():
+                f.truncate(position)
+
+    def iter_submissions(self) -> Iterator[Dict]:
+        """逐行读取已保存的 submissions"""
+        if not self.submissions_path.exists():
+            return
+        with open(self.submissions_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def export_reviews(self, download_path: str = "data/raw", manifest=None,
+                       overwrite: bool = False) -> Dict[str, int]:
+        """
+        导出每篇论文的 reviews/{paper_id}_reviews.json（paper_id 为 forum ID，格式与 NIPSDownloader 一致）
+
+        Args:
+            download_path: 下载目录
+            manifest: DownloadManifest（可选），导出的文件登记为 complete，last_modified 记为回复的最大 tmdate，
+                      之后可用爬虫的 refresh 增量检查
+            overwrite: 是否覆盖已存在的 review 文件
+
+        Returns:
+            {'exported': 导出数, 'skipped': 跳过数, 'without_reviews': 没有 review 的论文数}
+        """
+        reviews_dir = Path(download_path) / "reviews"
+        reviews_dir.mkdir(parents=True, exist_ok=True)
+        stats = {'exported': 0, 'skipped': 0, 'without_reviews': 0}
+        for submission in self.iter_submissions():
+            forum_id = submission.get('forum') or submission.get('id')
+            replies = (submission.get('details') or {}).get('replies') or []
+            review_notes = [note for note in replies if is_official_review(note)]
+            if not review_notes:
+                stats['without_reviews'] += 1
+                continue
+            reviews_path = reviews_dir / f"{forum_id}_reviews.json"
+            if reviews_path.exists() and not overwrite:
+                stats['skipped'] += 1
+                continue
+
+            data = json.dumps(parse_review_notes(review_notes), ensure_ascii=False, indent=2).encode('utf-8')
+            with open(reviews_path, 'wb') as f:
+                f.write(data)
+            stats['exported'] += 1
+            if manifest is not None:
+                modified = [note.get('tmdate') or note.get('mdate') or 0 for note in [submission] + replies]
+                manifest.update(forum_id, "reviews", forum_id, status="complete", path=str(reviews_path),
+                                size=len(data), sha256=hashlib.sha256(data).hexdigest(),
+                                last_modified=str(max(modified)) if any(modified) else None, error=None)
+        return stats
+
+    def papers(self) -> List[Dict]:
+        """已保存 submissions 的论文列表（可直接传给 OpenReviewCrawler.crawl 下载 PDF）"""
+        papers = []
+        for submission in self.iter_submissions():
+            forum_id = submission.get('forum') or submission.get('id')
+            content = submission.get('content') or {}
+            papers.append({
+                'paper_id': forum_id,
+                'forum_id': forum_id,
+                'number': submission.get('number'),
+                'title': _value(content.get('title')),
+                'venueid': _value(content.get('venueid'))
+            })
+        return papers
@@ -0,0 +1 @@
+"""评估与参数扫描模块"""
@@ -0,0 +1,51 @@
+"""
+ICLR 录用结果（ground truth）
+根据 PDF 所在目录（accepted / rejected）判断论文的真实录用状态
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable
+
+
+def get_ground_truth_status(paper_id: str, papers_root: str = "data/raw/iclr2024/papers") -> str:
+    """
+    获取论文的真实录用状态
+
+    Args:
+        paper_id: 论文 ID
+        papers_root: ICLR 论文根目录（包含 accepted/ 和 rejected/）
+
+    Returns:
+        "Accepted"、"Rejected" 或 "Unknown"
+    """
+    root = Path(papers_root)
+    if (root / "accepted" / f"{paper_id}.pdf").exists():
+        return "Accepted"
+    elif (root / "rejected" / f"{paper_id}.pdf").exists():
+        return "Rejected"
+    return "Unknown"
+
+
+def load_ground_truth(paper_ids: Iterable[str],
+                      papers_root: str = "data/raw/iclr2024/papers") -> Dict[str, str]:
+    """
+    批量获取录用状态（每个目录只列一次，不对每篇论文做文件检查）
+
+    Args:
+        paper_ids: 论文 ID 列表
+        papers_root: ICLR 论文根目录
+
+    Returns:
+        录用状态字典，key 为 paper_id；未知的论文不包含在内
+    """
+    root = Path(papers_root)
+    accepted = {path.stem for path in (root / "accepted").glob("*.pdf")}
+    rejected = {path.stem for path in (root / "rejected").glob("*.pdf")}
+
+    ground_truth = {}
+    for paper_id in paper_ids:
+        if paper_id in accepted:
+            ground_truth[paper_id] = "Accepted"
+        elif paper_id in rejected:
+            ground_truth[paper_id] = "Rejected"
+    return ground_truth
@@ -0,0 +1,47 @@
+"""
+分类指标
+与 calculate_prediction_accuracy.calculate_metrics 的定义一致（Accepted 为正类），
+但支持在任意前置维度上批量计算
+"""
+
+from typing import Dict
+import numpy as np
+
+
+def classification_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    批量计算 accuracy / precision / recall / F1
+
+    Args:
+        y_true: 形状为 (P,) 的布尔数组，True 表示真实录用
+        y_pred: 形状为 (..., P) 的布尔数组，True 表示预测录用
+
+    Returns:
+        指标字典，每个值的形状为 y_pred 去掉最后一维
+    """
+    y_true = np.asarray(y_true, dtype=bool)
+    y_pred = np.asarray(y_pred, dtype=bool)
+
+    tp = (y_pred & y_true).sum(axis=-1)
+    tn = (~y_pred & ~y_true).sum(axis=-1)
+    fp = (y_pred & ~y_true).sum(axis=-1)
+    fn = (~y_pred & y_true).sum(axis=-1)
+    total = y_true.shape[-1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        accuracy = np.where(total > 0, (tp + tn) / max(total, 1), 0.0)
+        precision = np.where(tp + fp > 0, tp / np.maximum(tp + fp, 1), 0.0)
+        recall = np.where(tp + fn > 0, tp / np.maximum(tp + fn, 1), 0.0)
+        f1 = np.where(precision + recall > 0,
+                      2 * precision * recall / np.where(precision + recall > 0, precision + recall, 1), 0.0)
+
+    return {
+        'accuracy': accuracy,
+        'precision': precision,
+        'recall': recall,
+        'f1': f1,
+        'tp': tp,
+        'tn': tn,
+        'fp': fp,
+        'fn': fn
+    }
@@ -0,0 +1,282 @@
+"""
+语料级分析运行器
+把逐篇分析函数映射到整个语料（进程池并行），用归约函数合并结果；
+逐篇结果按输入文件的 SHA-256（以及结果存储的 run_id）缓存在单个 SQLite 文件中，
+只有输入变化的论文才重新分析，小改动后统计报告可在数秒内重新生成
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from ..data.data_loader import DataLoader
+from ..data.manifest import sha256_file
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS paper_results (
+    analysis TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (analysis, paper_id)
+);
+"""
+
+# 逐篇分析函数：(paper_id, DataLoader) -> 可 JSON 序列化的结果
+AnalyzeFn = Callable[[str, DataLoader], Any]
+
+# 工作进程中的 DataLoader（由 _init_worker 创建）
+_worker_loader: Optional[DataLoader] = None
+
+
+def _make_loader(base_path: str, config: Dict) -> DataLoader:
+    return DataLoader.from_config(config, base_path)
+
+
+def _init_worker(base_path: str, config: Dict):
+    global _worker_loader
+    _worker_loader = _make_loader(base_path, config)
+
+
+def _analyze_chunk(analyze: AnalyzeFn, paper_ids: List[str]) -> List[Tuple[str, Any, Optional[str]]]:
+    """在工作进程中分析一批论文，返回 (paper_id, 结果, 错误信息)"""
+    outputs = []
+    for paper_id in paper_ids:
+        try:
+            outputs.append((paper_id, analyze(paper_id, _worker_loader), None))
+        except Exception as e:
+            outputs.append((paper_id, None, f"{type(e).__name__}: {e}"))
+    return outputs
+
+
+class AnalysisCache:
+    """
+    逐篇分析结果缓存
+
+    file_hashes 记录输入文件的大小、修改时间和 SHA-256，文件未变化时不重新读取内容；
+    paper_results 按 (分析名, paper_id) 保存输入哈希和 JSON 结果。
+    """
+
+    def __init__(self, db_path: str = "data/processed/analysis_cache.db"):
+        """
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._file_hashes = {
+            path: (size, mtime_ns, digest)
+            for path, size, mtime_ns, digest in self.conn.execute("SELECT * FROM file_hashes")
+        }
+        self._new_hashes: List[Tuple[str, int, int, str]] = []
+
+    def close(self):
+        self.conn.close()
+
+    def file_hash(self, path: Path) -> str:
+        """文件的 SHA-256（大小和修改时间未变化时直接使用记录的值），文件不存在返回 '-'"""
+        try:
+            stat = path.stat()
+        except OSError:
+            return "-"
+        key = str(path)
+        cached = self._file_hashes.get(key)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = sha256_file(path)
+        self._file_hashes[key] = (stat.st_size, stat.st_mtime_ns, digest)
+        self._new_hashes.append((key, stat.st_size, stat.st_mtime_ns, digest))
+        return digest
+
+    def load(self, analysis: str) -> Dict[str, Tuple[str, str]]:
+        """某个分析的全部缓存结果：paper_id -> (输入哈希, JSON 结果)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT paper_id, input_hash, result FROM paper_results WHERE analysis = ?", (analysis,)
+            ).fetchall()
+        return {paper_id: (input_hash, result) for paper_id, input_hash, result in rows}
+
+    def save(self, analysis: str, results: Iterable[Tuple[str, str, Any]]):
+        """写入逐篇结果 (paper_id, 输入哈希, 结果)，同时写入新计算的文件哈希"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO paper_results VALUES (?, ?, ?, ?)",
+                [(analysis, paper_id, input_hash, json.dumps(result, ensure_ascii=False))
+                 for paper_id, input_hash, result in results]
+            )
+            self.conn.executemany("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?)", self._new_hashes)
+        self._new_hashes = []
+
+
+class AnalysisRunner:
+    """
+    语料级分析运行器
+
+    输入哈希由分析名、版本号、Step 1-3 的逐篇 JSON 文件（以及 extra_inputs 给出的文件）的 SHA-256
+    和结果存储中各阶段的最新 run_id 组成；分析函数逻辑变化时递增 version 使旧缓存失效。
+    未命中缓存的论文分块交给进程池（论文很少或 workers <= 1 时在当前进程中顺序执行）。
+    """
+
+    def __init__(self, name: str, analyze: AnalyzeFn, version: int = 1, base_path: str = "data",
+                 db_path: Optional[str] = None, cache_path: Optional[str] = "data/processed/analysis_cache.db",
+                 workers: Optional[int] = None, config_path: Optional[str] = "config.yaml",
+                 extra_inputs: Optional[Callable[[str], List[Path]]] = None):
+        """
+        Args:
+            name: 分析名（缓存的命名空间）
+            analyze: 逐篇分析函数 (paper_id, DataLoader) -> 可 JSON 序列化的结果；
+                     使用进程池时必须是模块级函数
+            version: 分析逻辑版本号
+            base_path: 数据根目录
+            db_path: 结果数据库路径，默认为配置的 output.results_store（null 表示不使用结果存储），
+                     配置中没有该项时为 {base_path}/results/results.db；文件存在时才使用
+            cache_path: 缓存数据库路径，None 表示不缓存
+            workers: 工作进程数，默认 CPU 核数
+            extra_inputs: 返回某篇论文其他输入文件（如合成报告）的函数，这些文件的哈希也计入输入哈希
+            config_path: 配置文件路径（语料路径和评审缓存与 EVWPipeline 一致），None 或文件不存在时使用默认值
+        """
+        self.name = name
+        self.analyze = analyze
+        self.version = version
+        self.base_path = base_path
+        config = {}
+        if config_path and Path(config_path).exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f) or {}
+        output_config = dict(config.get('output') or {})
+        if db_path is None:
+            # 配置中显式写了 output.results_store（包括 null）时以配置为准
+            if 'results_store' in output_config:
+                db_path = output_config['results_store']
+            else:
+                db_path = str(Path(base_path) / "results" / "results.db")
+        self.db_path = db_path if db_path and Path(db_path).exists() else None
+        output_config['results_store'] = self.db_path
+        # 传给工作进程的配置（只含可 pickle 的普通字典）
+        self.config = {**config, 'output': output_config}
+        self.cache = AnalysisCache(cache_path) if cache_path else None
+        self.workers = workers or os.cpu_count() or 1
+        self.extra_inputs = extra_inputs
+        self.loader = _make_loader(base_path, self.config)
+        self.stats: Dict[str, Any] = {}
+
+    def paper_ids(self, stage: str = "claims") -> List[str]:
+        """已有某个阶段输出的所有论文（结果存储与逐篇 JSON 文件的并集）"""
+        paper_ids = set()
+        if self.loader.results_store is not None:
+            paper_ids.update(self.loader.results_store.paper_ids(stage))
+        pattern = self.loader.result_paths("*")[stage]
+        suffix = pattern.name[1:]
+        paper_ids.update(path.name[:-len(suffix)] for path in pattern.parent.glob(pattern.name))
+        return sorted(paper_ids)
+
+    def input_hash(self, paper_id: str) -> str:
+        """论文的输入哈希"""
+        parts = [self.name, str(self.version)]
+        if self.loader.results_store is not None:
+            runs = self.loader.results_store.latest_runs(paper_id)
+            parts.extend(f"{stage}:run{runs[stage]}" for stage in sorted(runs))
+        paths = list(self.loader.result_paths(paper_id).values())
+        if self.extra_inputs is not None:
+            paths.extend(self.extra_inputs(paper_id))
+        parts.extend(self.cache.file_hash(path) for path in paths)
+        return hashlib.sha256("|".join(parts).encode('utf-8')).hexdigest()
+
+    def _compute(self, paper_ids: List[str]) -> List[Tuple[str, Any, Optional[str]]]:
+        if self.workers <= 1 or len(paper_ids) < 2 * self.workers:
+            outputs = []
+            for paper_id in paper_ids:
+                try:
+                    outputs.append((paper_id, self.analyze(paper_id, self.loader), None))
+                except Exception as e:
+                    outputs.append((paper_id, None, f"{type(e).__name__}: {e}"))
+            return outputs
+
+        # 分块提交，减少进程间通信次数
+        chunk_size = max(1, len(paper_ids) // (self.workers * 4))
+        chunks = [paper_ids[i:i + chunk_size] for i in range(0, len(paper_ids), chunk_size)]
+        outputs = []
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(self.base_path, self.config)) as executor:
+            for chunk_outputs in executor.map(partial(_analyze_chunk, self.analyze), chunks):
+                outputs.extend(chunk_outputs)
+        return outputs
+
+    def map(self, paper_ids: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        分析所有论文（命中缓存的直接读取）
+
+        Args:
+            paper_ids: 论文 ID 列表（默认所有已有 Step 1 输出的论文）
+
+        Returns:
+            paper_id -> 分析结果（按 paper_ids 顺序；分析失败的论文不包含在内）
+        """
+        start = time.time()
+        paper_ids = paper_ids if paper_ids is not None else self.paper_ids()
+
+        results: Dict[str, Any] = {}
+        pending: List[str] = []
+        hashes: Dict[str, str] = {}
+        if self.cache is not None:
+            cached = self.cache.load(self.name)
+            for paper_id in paper_ids:
+                hashes[paper_id] = self.input_hash(paper_id)
+                entry = cached.get(paper_id)
+                if entry is not None and entry[0] == hashes[paper_id]:
+                    results[paper_id] = json.loads(entry[1])
+                else:
+                    pending.append(paper_id)
+        else:
+            pending = list(paper_ids)
+
+        computed = []
+        failed = 0
+        for paper_id, result, error in self._compute(pending):
+            if error is not None:
+                print(f"[WARNING] 分析失败 {paper_id}: {error}")
+                failed += 1
+                continue
+            # 经过一次 JSON 往返，使新计算的结果与缓存读出的结果形状一致（如 defaultdict -> dict）
+            results[paper_id] = json.loads(json.dumps(result, ensure_ascii=False))
+            computed.append((paper_id, hashes.get(paper_id, ''), results[paper_id]))
+        if self.cache is not None:
+            self.cache.save(self.name, computed)
+
+        self.stats = {'papers': len(paper_ids), 'computed': len(computed),
+                      'cached': len(paper_ids) - len(pending), 'failed': failed,
+                      'seconds': round(time.time() - start, 2)}
+        return {paper_id: results[paper_id] for paper_id in paper_ids if paper_id in results}
+
+    def run(self, reducer: Callable[[Dict[str, Any]], Any], paper_ids: Optional[List[str]] = None) -> Any:
+        """
+        分析所有论文并用归约函数合并结果
+
+        Args:
+            reducer: 归约函数，输入 paper_id -> 分析结果 字典
+            paper_ids: 论文 ID 列表（默认所有已有 Step 1 输出的论文）
+
+        Returns:
+            归约函数的返回值
+        """
+        return reducer(self.map(paper_ids))
@@ -0,0 +1,128 @@
+"""
+加权与合成参数扫描
+一次性加载所有论文的 verified claims，在内存中向量化评估
+weighting.alpha / weighting.beta / 合成决策阈值的全部组合，不读写磁盘、不调用 LLM
+"""
+
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from ..agents.weighting_agent import WeightingAgent
+from ..data.claim_table import ClaimTable, VERDICT_CODES
+from .metrics import classification_metrics
+
+
+DEFAULT_TOPICS = ["Novelty", "Experiments", "Writing", "Significance", "Reproducibility"]
+
+
+def parse_grid(value: str) -> List[float]:
+    """解析网格参数：逗号分隔的列表（0.1,0.5）或 start:stop:num（0:1:11）"""
+    if ':' in value:
+        start, stop, num = value.split(':')
+        return [float(x) for x in np.linspace(float(start), float(stop), int(num))]
+    return [float(x) for x in value.split(',')]
+
+
+class ParameterSweep:
+    """
+    参数扫描引擎
+
+    复现 Step 3 + Step 4 的决策逻辑：
+    Weight(R) = clip(1 - (α × Hollowness + β × Hallucination), 0, 1)；
+    过滤 False 观点后按主题加权投票，得分映射到 10 分制，
+    有观点的主题取平均，平均分 >= 阈值则预测 Accept。
+    """
+
+    def __init__(self, table: ClaimTable, ground_truth: Dict[str, str],
+                 topics: Optional[List[str]] = None):
+        """
+        Args:
+            table: 语料级观点表
+            ground_truth: 真实录用状态，key 为 paper_id，value 为 "Accepted"/"Rejected"
+            topics: 参与投票的主题列表
+        """
+        self.table = table
+        self.topics = topics or DEFAULT_TOPICS
+        self.weighting_agent = WeightingAgent()
+        self.metrics = self.weighting_agent.compute_group_metrics(table)
+
+        # 主题编码 -> 配置中的主题下标（不在配置中的主题为 -1）
+        topic_map = np.full(len(table.topics), -1, dtype=np.int64)
+        for i, topic in enumerate(self.topics):
+            code = table.topic_code(topic)
+            if code is not None:
+                topic_map[code] = i
+        claim_topic = topic_map[table.topic] if table.num_claims else np.zeros(0, dtype=np.int64)
+
+        # 过滤 False 观点和不在配置中的主题
+        keep = (table.verdict != VERDICT_CODES['False']) & (claim_topic >= 0)
+        num_topics = len(self.topics)
+        self.cell = table.claim_paper[keep] * num_topics + claim_topic[keep]
+        self.cell_group = table.claim_group[keep]
+        self.cell_sentiment = table.sentiment[keep]
+        self.num_cells = len(table.paper_ids) * num_topics
+
+        topic_counts = np.bincount(self.cell, minlength=self.num_cells).reshape(len(table.paper_ids), num_topics)
+        self.valid_topics = topic_counts > 0
+        self.num_valid_topics = self.valid_topics.sum(axis=1)
+
+        # 只评估有真实标签且至少有一个有效主题的论文
+        labels = np.array([ground_truth.get(paper_id, "Unknown") for paper_id in table.paper_ids])
+        self.eval_mask = (labels != "Unknown") & (self.num_valid_topics > 0)
+        self.y_true = labels[self.eval_mask] == "Accepted"
+
+    def average_scores(self, alphas: Sequence[float], betas: Sequence[float]) -> np.ndarray:
+        """
+        计算所有 alpha/beta 组合下每篇论文的平均主题得分（10 分制）
+
+        Returns:
+            形状为 (len(alphas), len(betas), num_papers) 的数组
+        """
+        num_settings = len(alphas) * len(betas)
+        num_papers = len(self.table.paper_ids)
+        num_topics = len(self.topics)
+
+        weights = self.weighting_agent.weight_grid(self.metrics, alphas, betas).reshape(num_settings, -1)
+        claim_weights = weights[:, self.cell_group]  # (settings, claims)
+
+        # 每个参数组合的单元格下标错开，一次 bincount 完成所有 group-by
+        offsets = (np.arange(num_settings)[:, None] * self.num_cells + self.cell[None, :]).ravel()
+        size = num_settings * self.num_cells
+        weighted_sum = np.bincount(offsets, weights=(claim_weights * self.cell_sentiment).ravel(), minlength=size)
+        total_weight = np.bincount(offsets, weights=claim_weights.ravel(), minlength=size)
+        weighted_sum = weighted_sum.reshape(num_settings, num_papers, num_topics)
+        total_weight = total_weight.reshape(num_settings, num_papers, num_topics)
+
+        score = np.where(total_weight > 0, weighted_sum / np.where(total_weight > 0, total_weight, 1), 0.0)
+        score_10 = (score + 1) * 5
+        average = (score_10 * self.valid_topics).sum(axis=-1) / np.maximum(self.num_valid_topics, 1)
+        return average.reshape(len(alphas), len(betas), num_papers)
+
+    def run(self, alphas: Sequence[float], betas: Sequence[float],
+            thresholds: Sequence[float]) -> List[Dict]:
+        """
+        评估参数网格
+
+        Args:
+            alphas: Hollowness 惩罚系数候选
+            betas: Hallucination 惩罚系数候选
+            thresholds: 总体决策阈值候选（10 分制平均主题得分，默认合成阈值为 5.0）
+
+        Returns:
+            每个参数组合一行的结果列表，包含 alpha, beta, threshold 以及各项指标
+        """
+        average = self.average_scores(alphas, betas)[..., self.eval_mask]
+        thresholds_arr = np.asarray(thresholds, dtype=np.float64)
+        y_pred = average[:, :, None, :] >= thresholds_arr[None, None, :, None]
+        metrics = classification_metrics(self.y_true, y_pred)
+
+        rows = []
+        for i, alpha in enumerate(alphas):
+            for j, beta in enumerate(betas):
+                for k, threshold in enumerate(thresholds):
+                    row = {'alpha': float(alpha), 'beta': float(beta), 'threshold': float(threshold),
+                           'num_papers': int(self.eval_mask.sum())}
+                    for name, values in metrics.items():
+                        value = values[i, j, k]
+                        row[name] = float(value) if name in ('accuracy', 'precision', 'recall', 'f1') else int(value)
+                    rows.append(row)
+        return rows
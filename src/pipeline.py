@@ -4,17 +4,23 @@ E-V-W Evaluation Stack 主流程编排
 
 import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from .data.data_loader import DataLoader
+from .data.claim_table import ClaimTable
+from .data.claims import ClaimSet
 from .agents.extraction_agent import ExtractionAgent
 from .agents.verification_agent import VerificationAgent
 from .agents.weighting_agent import WeightingAgent
 from .agents.synthesis_agent import SynthesisAgent
+from .agents.synthesis_report import SynthesisResult
 from .utils.llm_client import LLMClient
 from .utils.rag import SimpleRAG
 from .utils.embedding_rag import EmbeddingRAG
 from .utils.hybrid_rag import HybridRAG
+from .utils.hierarchical_rag import HierarchicalRAG, llm_section_digest
+from .utils.paper_digest import PaperDigester, text_hash
 from .utils.reranking_rag import RerankingRAG
+from .utils.tracing import configure_tracing, trace_stage
 import yaml
 
 
@@ -36,8 +42,11 @@ class EVWPipeline:
         if not self.config:
             raise ValueError("配置文件为空")
         
+        # 追踪（默认关闭）
+        self.tracer = configure_tracing(self.config.get('tracing'))
+        
         # 初始化组件
-        self.data_loader = DataLoader()
+        self.data_loader = DataLoader.from_config(self.config)
         
         # 从 config 读取 API key（如果存在）
         llm_config = self.config.get('llm', {})
@@ -50,13 +59,19 @@ class EVWPipeline:
             api_key=api_key,
             model=llm_config.get('model', 'gpt-4'),
             temperature=llm_config.get('temperature', 0.3),
-            base_url=llm_config.get('base_url')  # 支持自定义 base_url（如 DeepSeek）
+            base_url=llm_config.get('base_url'),  # 支持自定义 base_url（如 DeepSeek）
+            rate_limit=llm_config.get('rate_limit'),
+            http_config=llm_config.get('http'),
+            stream=llm_config.get('stream', False),
+            pricing=llm_config.get('pricing'),
+            budget=llm_config.get('budget'),
+            prompt_cache=llm_config.get('prompt_cache', False)
         )
         self.extraction_agent = ExtractionAgent(self.llm_client)
         
         # 初始化 RAG 和 Verification Agent
         rag_config = self.config.get('rag', {})
-        rag_method = rag_config.get('method', 'simple')  # 'simple', 'embedding', 或 'hybrid'
+        rag_method = rag_config.get('method', 'simple')  # 'simple', 'embedding', 'hybrid' 或 'hierarchical'
         use_reranking = rag_config.get('use_reranking', False)  # 是否启用重排序
         
         if rag_method == 'hybrid':
@@ -72,6 +87,19 @@ class EVWPipeline:
                 chunk_overlap=rag_config.get('chunk_overlap', 50)
             )
             print(f"[INFO] Using Hybrid RAG (keyword: {keyword_weight}, semantic: {semantic_weight})")
+        elif rag_method == 'hierarchical':
+            # 使用分层 RAG（先检索 section，再检索 section 内的文本块）
+            embedding_model = rag_config.get('embedding_model', 'sentence-transformers/all-MiniLM-L6-v2')
+            top_sections = rag_config.get('top_sections', 2)
+            digest_fn = llm_section_digest(self.llm_client) if rag_config.get('section_digests', False) else None
+            base_rag = HierarchicalRAG(
+                embedding_model=embedding_model,
+                chunk_size=rag_config.get('chunk_size', 500),
+                chunk_overlap=rag_config.get('chunk_overlap', 50),
+                top_sections=top_sections,
+                digest_fn=digest_fn
+            )
+            print(f"[INFO] Using Hierarchical RAG (top sections: {top_sections}, digests: {digest_fn is not None})")
         elif rag_method == 'embedding':
             # 使用基于 Embedding 的 RAG
             embedding_model = rag_config.get('embedding_model', 'sentence-transformers/all-MiniLM-L6-v2')
@@ -104,8 +132,16 @@ class EVWPipeline:
             rag = base_rag
         
         self.rag = rag  # 保存引用以便后续使用
+        # 内存索引（不使用索引缓存时）对应的论文文本哈希；RAG 对象在论文之间共享
+        self._rag_text_hash: Optional[str] = None
         self.verification_agent = VerificationAgent(self.llm_client, rag)
         
+        # 论文摘要（可选）：每篇论文生成一次，保存在 RAG 索引旁，作为验证请求共享的系统提示前缀
+        self.paper_digester = None
+        if self.config.get('verification', {}).get('paper_digest', False):
+            digest_dir = rag_config.get('index_path') if rag_config.get('use_cache', True) else None
+            self.paper_digester = PaperDigester(self.llm_client, cache_dir=digest_dir)
+        
         # 初始化 Weighting Agent
         weighting_config = self.config.get('weighting', {})
         self.weighting_agent = WeightingAgent(
@@ -118,9 +154,13 @@ class EVWPipeline:
         self.synthesis_agent = SynthesisAgent(
             accept_threshold=synthesis_config.get('accept_threshold', 0.6),
             topics=synthesis_config.get('topics', ["Novelty", "Experiments", "Writing", "Significance", "Reproducibility"]),
-            use_10_point_scale=synthesis_config.get('use_10_point_scale', True)  # 默认使用10分制
+            use_10_point_scale=synthesis_config.get('use_10_point_scale', True),  # 默认使用10分制
+            overall_threshold=synthesis_config.get('overall_threshold')
         )
+        # 批量合成时是否渲染 markdown 报告（结构化 JSON 总是保存）
+        self.render_batch_reports = synthesis_config.get('render_batch_reports', False)
     
+    @trace_stage("step1")
     def step1_extraction(self, paper_id: str) -> List[Dict]:
         """
         Step 1: 结构化提取
@@ -148,30 +188,28 @@ class EVWPipeline:
         print(f"[Step 1] Completed: Extracted {len(claims)} claims")
         return claims
     
-    def step2_verification(self, paper_id: str) -> Dict[str, Dict]:
+    def _prepare_verification_inputs(self, paper_id: str):
         """
-        Step 2: 事实验证
+        加载 Step 2 所需的 claims、论文文本和 sections，并构建或加载 RAG 索引
         
         Args:
             paper_id: 论文 ID
             
         Returns:
-            验证结果字典，key 为 claim_id
+            (claims, paper_text, paper_sections)，缺少输入时返回 None
         """
-        print(f"[Step 2] Starting verification for paper {paper_id}...")
-        
         # 1. 加载 claims
         claims = self.data_loader.load_claims(paper_id)
         if not claims:
             print(f"[WARNING] No claims found for paper {paper_id}. Please run Step 1 first.")
-            return {}
+            return None
         
         # 2. 加载论文文本
         try:
             paper_text = self.data_loader.load_paper_text(paper_id)
         except Exception as e:
             print(f"[ERROR] Failed to load paper text: {e}")
-            return {}
+            return None
         
         # 2.3. 提取论文sections（用于section过滤）
         from .data.pdf_parser import PDFParser
@@ -182,8 +220,8 @@ class EVWPipeline:
             section_names = [name[:50] for name in list(paper_sections.keys())[:10]]  # 只显示前10个，截断长名称
             print(f"[INFO] Extracted {len(paper_sections)} sections")
         
-        # 2.5. 如果是 Embedding RAG 或 Hybrid RAG，构建或加载索引
-        if isinstance(self.rag, EmbeddingRAG) or isinstance(self.rag, HybridRAG):
+        # 2.5. 如果是 Embedding RAG、Hybrid RAG 或 Hierarchical RAG，构建或加载索引
+        if isinstance(self.rag, (EmbeddingRAG, HybridRAG, HierarchicalRAG)):
             rag_config = self.config.get('rag', {})
             index_path = rag_config.get('index_path')
             use_cache = rag_config.get('use_cache', True)
@@ -197,9 +235,20 @@ class EVWPipeline:
                 # 尝试加载已保存的索引
                 paper_index_path = f"{index_path}/{paper_id}"
                 try:
-                    if Path(f"{paper_index_path}.index").exists():
+                    cached = Path(f"{paper_index_path}.index").exists()
+                    self.tracer.event("cache.rag_index", hit=cached)
+                    if cached:
                         print(f"[RAG] Loading cached index for {paper_id}...")
                         semantic_rag.load_index(paper_index_path)
+                        if isinstance(semantic_rag, HierarchicalRAG):
+                            if semantic_rag.text_hash != text_hash(paper_text):
+                                # 论文文本已变化（或旧缓存没有记录文本哈希），重建索引
+                                print(f"[RAG] Paper text changed, rebuilding index for {paper_id}...")
+                                semantic_rag.build_index(paper_text, save_path=paper_index_path,
+                                                         paper_sections=paper_sections)
+                            else:
+                                # 新开启摘要时补齐缺少的 section 摘要
+                                semantic_rag.build_digests(paper_sections, save_path=paper_index_path)
                     else:
                         print(f"[RAG] Building new index for {paper_id}...")
                         semantic_rag.build_index(paper_text, save_path=paper_index_path, paper_sections=paper_sections)
@@ -207,20 +256,33 @@ class EVWPipeline:
                     print(f"[WARNING] Failed to load/save index: {e}, building in memory...")
                     semantic_rag.build_index(paper_text, paper_sections=paper_sections)
             else:
-                # 在内存中构建索引（不保存）
-                if not semantic_rag.is_built():
+                # 在内存中构建索引（不保存），上一篇论文的索引不能复用
+                paper_hash = text_hash(paper_text)
+                if not semantic_rag.is_built() or self._rag_text_hash != paper_hash:
                     print(f"[RAG] Building index for {paper_id}...")
                     semantic_rag.build_index(paper_text, paper_sections=paper_sections)
+                    self._rag_text_hash = paper_hash
         
-        # 3. 对每个有证据的 claim 进行验证（传递sections用于section过滤）
-        verifications = self.verification_agent.process_claims(claims, paper_text, paper_sections)
+        # 2.6. 论文摘要（命中缓存时不调用 LLM），作为该论文所有验证请求共享的前缀
+        if self.paper_digester is not None:
+            self.verification_agent.set_paper_digest(
+                self.paper_digester.get(paper_id, paper_text, paper_sections)
+            )
         
-        # 4. 保存验证结果
-        verifications_path = self.data_loader.base_path / "results" / "verifications" / f"{paper_id}_verified.json"
-        verifications_path.parent.mkdir(parents=True, exist_ok=True)
+        return claims, paper_text, paper_sections
+    
+    def _save_verifications(self, paper_id: str, verifications: List[Dict]) -> Dict[str, Dict]:
+        """
+        保存 Step 2 验证结果并打印统计信息
         
-        with open(verifications_path, 'w', encoding='utf-8') as f:
-            json.dump(verifications, f, ensure_ascii=False, indent=2)
+        Args:
+            paper_id: 论文 ID
+            verifications: 验证结果列表
+            
+        Returns:
+            验证结果字典，key 为 claim_id
+        """
+        self.data_loader.save_verifications(paper_id, verifications)
         
         # 转换为字典格式
         verification_dict = {v['id']: v for v in verifications}
@@ -236,6 +298,212 @@ class EVWPipeline:
         
         return verification_dict
     
+    @trace_stage("step2")
+    def step2_verification(self, paper_id: str) -> Dict[str, Dict]:
+        """
+        Step 2: 事实验证
+        
+        Args:
+            paper_id: 论文 ID
+            
+        Returns:
+            验证结果字典，key 为 claim_id
+        """
+        print(f"[Step 2] Starting verification for paper {paper_id}...")
+        
+        inputs = self._prepare_verification_inputs(paper_id)
+        if inputs is None:
+            return {}
+        claims, paper_text, paper_sections = inputs
+        
+        # 3. 对每个有证据的 claim 进行验证（传递sections用于section过滤）
+        verification_config = self.config.get('verification', {})
+        verifications = self.verification_agent.process_claims(
+            claims, paper_text, paper_sections,
+            grouped=verification_config.get('grouped', False),
+            max_group_size=verification_config.get('max_group_size', 5),
+            min_overlap=verification_config.get('min_context_overlap', 0.5)
+        )
+        
+        # 4. 保存验证结果
+        return self._save_verifications(paper_id, verifications)
+    
+    def _run_offline_batch(self, requests: List[Dict], agent: str) -> Dict[str, str]:
+        """使用配置中的批处理参数提交离线任务并等待结果"""
+        batch_config = self.config.get('llm', {}).get('batch', {})
+        with self.tracer.context(agent=agent):
+            return self.llm_client.run_batch(
+                requests,
+                poll_interval=batch_config.get('poll_interval', 60),
+                timeout=batch_config.get('timeout'),
+                completion_window=batch_config.get('completion_window', '24h')
+            )
+    
+    @trace_stage("step1")
+    def batch_step1_extraction(self, paper_ids: List[str]) -> Dict[str, List[Dict]]:
+        """
+        Step 1 离线模式：将整个语料的提取提示合并为一个提供商批处理任务
+        
+        Args:
+            paper_ids: 论文 ID 列表
+            
+        Returns:
+            每篇论文的观点列表，key 为 paper_id（只包含至少收到一个批处理结果的论文）
+        """
+        print(f"[Step 1][Batch] Collecting extraction prompts for {len(paper_ids)} papers...")
+        
+        requests = []
+        request_owners = {}
+        for paper_id in paper_ids:
+            reviews = self.data_loader.load_reviews(paper_id)
+            if not reviews:
+                print(f"[WARNING] No reviews found for paper {paper_id}")
+                continue
+            for reviewer_id, review_text in self.extraction_agent.iter_review_inputs(reviews):
+                custom_id = f"extract-{len(requests)}"
+                requests.append({
+                    'custom_id': custom_id,
+                    'prompt': self.extraction_agent.build_prompt(review_text, reviewer_id),
+                    'system_prompt': self.extraction_agent.system_prompt,
+                    'max_tokens': 2000,
+                    'paper_id': paper_id
+                })
+                request_owners[custom_id] = (paper_id, reviewer_id)
+        
+        responses = self._run_offline_batch(requests, 'extraction')
+        
+        # 按原始顺序回填结果；没有任何批处理结果的论文不保存，保留其已有的观点
+        all_claims = {}
+        for request in requests:
+            paper_id, reviewer_id = request_owners[request['custom_id']]
+            response = responses.get(request['custom_id'])
+            if response is None:
+                print(f"[WARNING] No batch result for {paper_id} / {reviewer_id}")
+                continue
+            all_claims.setdefault(paper_id, []).extend(self.extraction_agent.parse_response(response, reviewer_id))
+        
+        for paper_id, claims in all_claims.items():
+            self.data_loader.save_claims(paper_id, claims)
+            print(f"[Step 1][Batch] {paper_id}: Extracted {len(claims)} claims")
+        
+        return all_claims
+    
+    @trace_stage("step2")
+    def batch_step2_verification(self, paper_ids: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """
+        Step 2 离线模式：检索所有论文的上下文后，将验证提示合并为一个提供商批处理任务
+        
+        Args:
+            paper_ids: 论文 ID 列表
+            
+        Returns:
+            每篇论文的验证结果字典，key 为 paper_id
+        """
+        print(f"[Step 2][Batch] Collecting verification prompts for {len(paper_ids)} papers...")
+        
+        verification_config = self.config.get('verification', {})
+        grouped = verification_config.get('grouped', False)
+        agent = self.verification_agent
+        
+        requests = []
+        request_claims = {}
+        paper_claims = {}
+        fixed_results = {}
+        
+        for paper_id in paper_ids:
+            inputs = self._prepare_verification_inputs(paper_id)
+            if inputs is None:
+                continue
+            claims, paper_text, paper_sections = inputs
+            
+            # 只验证有证据的观点（substantiation_type != None）
+            claims_to_verify = [
+                claim for claim in claims
+                if claim.get('substantiation_type') and claim.get('substantiation_type') != 'None'
+            ]
+            paper_claims[paper_id] = claims_to_verify
+            
+            # 当前论文的索引已加载或重建（下一篇论文会替换它），立即检索上下文
+            if grouped:
+                groups = agent.group_claims(
+                    claims_to_verify, paper_text, paper_sections,
+                    verification_config.get('max_group_size', 5),
+                    verification_config.get('min_context_overlap', 0.5)
+                )
+                units = [(group['claims'], "\n\n".join(group['chunks'])) for group in groups]
+            else:
+                units = [
+                    ([claim], agent.get_claim_context(claim, paper_text, paper_sections))
+                    for claim in claims_to_verify
+                ]
+            
+            for unit_claims, context in units:
+                if not context:
+                    for claim in unit_claims:
+                        fixed_results[(paper_id, claim.get('id', ''))] = agent.no_context_result(claim.get('id', ''))
+                    continue
+                custom_id = f"verify-{len(requests)}"
+                if len(unit_claims) == 1:
+                    prompt = agent.build_verification_prompt(unit_claims[0], context)
+                    max_tokens = 1000
+                else:
+                    prompt = agent.build_group_prompt(unit_claims, context)
+                    max_tokens = agent.group_max_tokens(len(unit_claims))
+                requests.append({
+                    'custom_id': custom_id,
+                    'prompt': prompt,
+                    'system_prompt': agent.get_system_prompt(),
+                    'max_tokens': max_tokens,
+                    'paper_id': paper_id
+                })
+                request_claims[custom_id] = (paper_id, unit_claims)
+        
+        responses = self._run_offline_batch(requests, 'verification')
+        
+        for custom_id, (paper_id, unit_claims) in request_claims.items():
+            response = responses.get(custom_id)
+            if response is None:
+                for claim in unit_claims:
+                    claim_id = claim.get('id', '')
+                    fixed_results[(paper_id, claim_id)] = {
+                        'id': claim_id,
+                        'verification_result': 'Partially_True',
+                        'verification_reason': 'Error during verification: batch request failed',
+                        'confidence': 0.3
+                    }
+                continue
+            
+            if len(unit_claims) == 1:
+                claim_id = unit_claims[0].get('id', '')
+                fixed_results[(paper_id, claim_id)] = agent.parse_verification_response(claim_id, response)
+                continue
+            
+            try:
+                results_by_id = agent.parse_group_response(response)
+            except Exception as e:
+                print(f"[WARNING] Failed to parse grouped batch result {custom_id}: {e}")
+                results_by_id = {}
+            for claim in unit_claims:
+                claim_id = claim.get('id', '')
+                if claim_id in results_by_id:
+                    fixed_results[(paper_id, claim_id)] = agent._normalize_result(claim_id, results_by_id[claim_id])
+                else:
+                    fixed_results[(paper_id, claim_id)] = {
+                        'id': claim_id,
+                        'verification_result': 'Partially_True',
+                        'verification_reason': 'Error parsing verification result: claim missing from grouped batch response',
+                        'confidence': 0.3
+                    }
+        
+        all_verifications = {}
+        for paper_id, claims_to_verify in paper_claims.items():
+            verifications = [fixed_results[(paper_id, claim.get('id', ''))] for claim in claims_to_verify]
+            print(f"[Step 2][Batch] {paper_id}:")
+            all_verifications[paper_id] = self._save_verifications(paper_id, verifications)
+        
+        return all_verifications
+    
+    @trace_stage("step3")
     def step3_weighting(self, paper_id: str) -> Dict[str, Dict]:
         """
         Step 3: Bias Calculation & Weighting
@@ -259,15 +527,11 @@ class EVWPipeline:
             print(f"[WARNING] No verifications found for paper {paper_id}. Please run Step 2 first.")
             return {}
         
-        # 2. 计算每个 reviewer 的权重
-        weights = self.weighting_agent.process_all_reviewers(claims, verifications)
+        # 2. 计算每个 reviewer 的权重（观点只转换一次为整数编码的 ClaimSet）
+        weights = self.weighting_agent.process_all_reviewers(ClaimSet.build(claims, verifications))
         
         # 3. 保存权重结果
-        weights_path = self.data_loader.base_path / "results" / "weights" / f"{paper_id}_weights.json"
-        weights_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        with open(weights_path, 'w', encoding='utf-8') as f:
-            json.dump(weights, f, ensure_ascii=False, indent=2)
+        self.data_loader.save_weights(paper_id, weights)
         
         print(f"[Step 3] Completed. Calculated weights for {len(weights)} reviewers.")
         
@@ -283,6 +547,82 @@ class EVWPipeline:
         
         return weights
     
+    @trace_stage("step3")
+    def batch_step3_weighting(self, paper_ids: List[str]) -> Dict[str, Dict[str, Dict]]:
+        """
+        Step 3 语料模式：将所有论文的 claims/verifications 展平为一张表后向量化计算权重
+        
+        Args:
+            paper_ids: 论文 ID 列表
+            
+        Returns:
+            每篇论文的权重字典，key 为 paper_id
+        """
+        claims_by_paper = {}
+        verifications_by_paper = {}
+        for paper_id in paper_ids:
+            claims = self.data_loader.load_claims(paper_id)
+            verifications = self.data_loader.load_verifications(paper_id)
+            if not claims or not verifications:
+                print(f"[WARNING] Missing claims or verifications for paper {paper_id}, skipping")
+                continue
+            claims_by_paper[paper_id] = claims
+            verifications_by_paper[paper_id] = verifications
+        
+        table = ClaimTable.from_corpus(claims_by_paper, verifications_by_paper)
+        all_weights = self.weighting_agent.process_corpus(table)
+        
+        for paper_id, weights in all_weights.items():
+            self.data_loader.save_weights(paper_id, weights)
+        
+        print(f"[Step 3][Batch] Completed. Calculated weights for {table.num_groups} reviewers "
+              f"across {len(all_weights)} papers.")
+        return all_weights
+    
+    def _synthesis_dir(self) -> Path:
+        return self.data_loader.base_path / "results" / "synthesis"
+    
+    @trace_stage("step4")
+    def batch_step4_synthesis(self, paper_ids: List[str],
+                              render: Optional[bool] = None) -> Dict[str, SynthesisResult]:
+        """
+        Step 4 批量模式：为多篇论文计算并保存结构化合成结果
+        
+        Args:
+            paper_ids: 论文 ID 列表
+            render: 是否同时渲染 markdown 报告，默认使用 synthesis.render_batch_reports
+            
+        Returns:
+            每篇论文的合成结果，key 为 paper_id
+        """
+        if render is None:
+            render = self.render_batch_reports
+        synthesis_dir = self._synthesis_dir()
+        synthesis_dir.mkdir(parents=True, exist_ok=True)
+        
+        results = {}
+        for paper_id in paper_ids:
+            claims = self.data_loader.load_claims(paper_id)
+            verifications = self.data_loader.load_verifications(paper_id)
+            weights = self.data_loader.load_weights(paper_id)
+            if not claims or not verifications or not weights:
+                print(f"[WARNING] Missing Step 1-3 results for paper {paper_id}, skipping")
+                continue
+            
+            result = self.synthesis_agent.synthesize(paper_id, claims, verifications, weights)
+            result.save(synthesis_dir / f"{paper_id}_synthesis.json")
+            if render:
+                with open(synthesis_dir / f"{paper_id}_report.md", 'w', encoding='utf-8') as f:
+                    f.write(self.synthesis_agent.render_report(result))
+            results[paper_id] = result
+        
+        decisions = [r.overall_decision for r in results.values()]
+        print(f"[Step 4][Batch] Completed. Synthesized {len(results)} papers "
+              f"(ACCEPT={decisions.count('ACCEPT')}, REJECT={decisions.count('REJECT')}, "
+              f"reports {'rendered' if render else 'skipped'}).")
+        return results
+    
+    @trace_stage("step4")
     def step4_synthesis(self, paper_id: str) -> str:
         """
         Step 4: Meta-Review Synthesis
@@ -311,15 +651,17 @@ class EVWPipeline:
             print(f"[WARNING] No weights found for paper {paper_id}. Please run Step 3 first.")
             return ""
         
-        # 2. 生成报告
-        report = self.synthesis_agent.generate_report(paper_id, claims, verifications, weights)
+        # 2. 计算结构化结果并生成报告
+        result = self.synthesis_agent.synthesize(paper_id, claims, verifications, weights)
+        report = self.synthesis_agent.render_report(result)
         
-        # 3. 保存报告
-        report_path = self.data_loader.base_path / "results" / "synthesis" / f"{paper_id}_report.md"
+        # 3. 保存报告和结构化结果
+        report_path = self._synthesis_dir() / f"{paper_id}_report.md"
         report_path.parent.mkdir(parents=True, exist_ok=True)
         
         with open(report_path, 'w', encoding='utf-8') as f:
             f.write(report)
+        result.save(self._synthesis_dir() / f"{paper_id}_synthesis.json")
         
         print(f"[Step 4] Completed. Report saved to: {report_path}")
         
@@ -0,0 +1,7 @@
+"""论文录用预测评分方法注册表"""
+
+from .frame import CorpusFrame
+from .registry import SCORERS, ScoringMethod, register_scorer, get_scorers, evaluate_scorers
+from . import methods  # noqa: F401  注册内置评分方法
+
+__all__ = ["CorpusFrame", "SCORERS", "ScoringMethod", "register_scorer", "get_scorers", "evaluate_scorers"]
@@ -0,0 +1,330 @@
+"""
+评分方法共用的语料帧
+一次加载所有论文的 claims / verifications / weights / reviews，展平为 NumPy 数组，
+各评分方法在同一份数据上做向量化 group-by，不再各自逐篇读文件、逐 reviewer 循环
+"""
+
+from typing import Dict, List, Optional
+import numpy as np
+from ..data.claim_table import VERDICT_CODES, VERDICT_NONE
+from ..data.claims import verification_confidence
+from ..data.reviews import Review, normalize_reviews
+
+
+# claim 不在 verifications 中时的验证编码
+VERDICT_MISSING = -1
+
+TRUE = VERDICT_CODES['True']
+FALSE = VERDICT_CODES['False']
+PARTIAL = VERDICT_CODES['Partially_True']
+
+
+def extract_ratings(reviews: List[Review]) -> List[float]:
+    """评审的数值评分（原始字典会先经过 normalize_reviews，"8: accept, good paper" -> 8.0）"""
+    return [review.rating for review in normalize_reviews(reviews) if review.rating is not None]
+
+
+class CorpusFrame:
+    """
+    语料帧
+
+    三张行表共用论文下标：
+    - verification 行：verifications 字典中的每一项
+    - claim 行：claims 列表中的每一项
+    - reviewer 组：weights 字典中的每个 (paper_id, reviewer_id)
+
+    *_group 为 reviewer 组下标，reviewer 不在 weights 中（或 claim id 不含 '-'）时为 -1，
+    与原脚本中 `reviewer_id in weights` 的判断一致。
+    """
+
+    def __init__(self, paper_ids: List[str]):
+        self.paper_ids = paper_ids
+        self.num_papers = len(paper_ids)
+
+        # reviewer 组
+        self.group_keys = []
+        self.group_paper = np.zeros(0, dtype=np.int64)
+        self.group_weight = np.zeros(0, dtype=np.float64)        # weight 缺失时为 0.5
+        self.group_weight_raw = np.zeros(0, dtype=np.float64)    # weight 缺失时为 0
+
+        # verification 行
+        self.ver_paper = np.zeros(0, dtype=np.int64)
+        self.ver_group = np.zeros(0, dtype=np.int64)
+        self.ver_verdict = np.zeros(0, dtype=np.int8)
+        self.ver_confidence = np.zeros(0, dtype=np.float64)
+
+        # claim 行
+        self.claim_paper = np.zeros(0, dtype=np.int64)
+        self.claim_group = np.zeros(0, dtype=np.int64)
+        self.claim_verdict = np.zeros(0, dtype=np.int8)
+        self.claim_confidence = np.zeros(0, dtype=np.float64)
+        self.claim_sentiment = np.zeros(0, dtype=np.float64)
+
+        # 论文级评分统计
+        self.rating_count = np.zeros(self.num_papers, dtype=np.int64)
+        self.rating_mean = np.zeros(self.num_papers, dtype=np.float64)
+        self.rating_min = np.zeros(self.num_papers, dtype=np.float64)
+        self.rating_max = np.zeros(self.num_papers, dtype=np.float64)
+
+    @property
+    def num_groups(self) -> int:
+        return len(self.group_keys)
+
+    def paper_count(self, rows_paper: np.ndarray, mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """统计每篇论文满足 mask 的行数"""
+        if mask is not None:
+            rows_paper = rows_paper[mask]
+        return np.bincount(rows_paper, minlength=self.num_papers)
+
+    def paper_sum(self, rows_paper: np.ndarray, values: np.ndarray,
+                  mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """按论文对行值求和"""
+        if mask is not None:
+            rows_paper, values = rows_paper[mask], values[mask]
+        return np.bincount(rows_paper, weights=values, minlength=self.num_papers)
+
+    def reviewer_weighted_mean(self, rows_group: np.ndarray, values: np.ndarray,
+                               mask: Optional[np.ndarray] = None):
+        """
+        先按 reviewer 求平均，再按 reviewer 权重对论文加权平均
+
+        Args:
+            rows_group: 每行的 reviewer 组下标（-1 的行被忽略）
+            values: 每行的分值
+            mask: 额外的行过滤条件
+
+        Returns:
+            (weighted_sum, total_weight)，形状均为 (num_papers,)
+        """
+        keep = rows_group >= 0
+        if mask is not None:
+            keep &= mask
+        groups = rows_group[keep]
+        counts = np.bincount(groups, minlength=self.num_groups)
+        sums = np.bincount(groups, weights=values[keep], minlength=self.num_groups)
+        weight = self.group_weight * (counts > 0)
+        mean = sums / np.maximum(counts, 1)
+        weighted_sum = np.bincount(self.group_paper, weights=mean * weight, minlength=self.num_papers)
+        total_weight = np.bincount(self.group_paper, weights=weight, minlength=self.num_papers)
+        return weighted_sum, total_weight
+
+    @classmethod
+    def from_corpus(cls, paper_ids: List[str],
+                    claims_by_paper: Dict[str, List[Dict]],
+                    verifications_by_paper: Dict[str, Dict[str, Dict]],
+                    weights_by_paper: Dict[str, Dict[str, Dict]],
+                    reviews_by_paper: Optional[Dict[str, List[Review]]] = None) -> "CorpusFrame":
+        """
+        从内存中的语料构建语料帧
+
+        Args:
+            paper_ids: 参与评估的论文 ID（没有结果的论文也保留，由各方法给出默认分）
+            claims_by_paper: 观点列表，key 为 paper_id
+            verifications_by_paper: 验证结果字典（key 为 claim_id），key 为 paper_id
+            weights_by_paper: reviewer 权重字典，key 为 paper_id
+            reviews_by_paper: 规范化评审列表（用于提取评分），key 为 paper_id
+
+        Returns:
+            CorpusFrame 实例
+        """
+        reviews_by_paper = reviews_by_paper or {}
+        frame = cls(list(paper_ids))
+
+        group_index: Dict[tuple, int] = {}
+        group_paper, group_weight, group_weight_raw = [], [], []
+        ver_rows = ([], [], [], [])
+        claim_rows = ([], [], [], [], [])
+
+        for paper_idx, paper_id in enumerate(frame.paper_ids):
+            weights = weights_by_paper.get(paper_id) or {}
+            for reviewer_id, info in weights.items():
+                group_index[(paper_id, reviewer_id)] = len(group_index)
+                group_paper.append(paper_idx)
+                group_weight.append(float(info.get('weight', 0.5)))
+                group_weight_raw.append(float(info.get('weight', 0)))
+
+            def group_of(claim_id: str) -> int:
+                if '-' not in claim_id:
+                    return -1
+                return group_index.get((paper_id, claim_id.split('-')[0]), -1)
+
+            verifications = verifications_by_paper.get(paper_id) or {}
+            for claim_id, verification in verifications.items():
+                ver_rows[0].append(paper_idx)
+                ver_rows[1].append(group_of(claim_id))
+                ver_rows[2].append(VERDICT_CODES.get(verification.get('verification_result'), VERDICT_NONE))
+                ver_rows[3].append(verification_confidence(verification))
+
+            for claim in claims_by_paper.get(paper_id) or []:
+                claim_id = claim.get('id', '')
+                verification = verifications.get(claim_id)
+                sentiment = claim.get('sentiment', 'Neutral')
+                claim_rows[0].append(paper_idx)
+                claim_rows[1].append(group_of(claim_id))
+                claim_rows[2].append(
+                    VERDICT_CODES.get(verification.get('verification_result'), VERDICT_NONE)
+                    if verification is not None else VERDICT_MISSING
+                )
+                claim_rows[3].append(verification_confidence(verification) if verification is not None else 0.5)
+                claim_rows[4].append(1.0 if sentiment == 'Positive' else -1.0 if sentiment == 'Negative' else 0.0)
+
+            ratings = extract_ratings(reviews_by_paper.get(paper_id) or [])
+            if ratings:
+                frame.rating_count[paper_idx] = len(ratings)
+                frame.rating_mean[paper_idx] = sum(ratings) / len(ratings)
+                frame.rating_min[paper_idx] = min(ratings)
+                frame.rating_max[paper_idx] = max(ratings)
+
+        frame.group_keys = list(group_index.keys())
+        frame.group_paper = np.asarray(group_paper, dtype=np.int64)
+        frame.group_weight = np.asarray(group_weight, dtype=np.float64)
+        frame.group_weight_raw = np.asarray(group_weight_raw, dtype=np.float64)
+
+        frame.ver_paper = np.asarray(ver_rows[0], dtype=np.int64)
+        frame.ver_group = np.asarray(ver_rows[1], dtype=np.int64)
+        frame.ver_verdict = np.asarray(ver_rows[2], dtype=np.int8)
+        frame.ver_confidence = np.asarray(ver_rows[3], dtype=np.float64)
+
+        frame.claim_paper = np.asarray(claim_rows[0], dtype=np.int64)
+        frame.claim_group = np.asarray(claim_rows[1], dtype=np.int64)
+        frame.claim_verdict = np.asarray(claim_rows[2], dtype=np.int8)
+        frame.claim_confidence = np.asarray(claim_rows[3], dtype=np.float64)
+        frame.claim_sentiment = np.asarray(claim_rows[4], dtype=np.float64)
+        return frame
+
+    @classmethod
+    def from_features(cls, papers: List[Dict]) -> "CorpusFrame":
+        """
+        从特征存储的论文特征行构建语料帧（不再读取 Step 1-3 输出）
+
+        特征行只保存逐 reviewer 的计数和置信度之和，这里按计数展开为等价的 verification / claim 行：
+        reviewer 组内的行数、验证结果、非 False 观点的情感以及置信度之和与原始数据一致，
+        论文级的观点数、情感计数和验证结果计数由不属于任何 reviewer 组的补齐行凑齐，
+        因此各评分方法的得分与 from_corpus 相同（输入一致时）。
+
+        Args:
+            papers: FeatureStore.papers() 返回的论文特征字典列表
+
+        Returns:
+            CorpusFrame 实例
+        """
+        frame = cls([paper['paper_id'] for paper in papers])
+
+        group_keys, group_paper, group_weight = [], [], []
+        ver_rows = ([], [], [])
+        claim_rows = ([], [], [], [], [])
+
+        def add_ver(paper_idx: int, group: int, verdict: int, count: int):
+            for _ in range(max(count, 0)):
+                ver_rows[0].append(paper_idx)
+                ver_rows[1].append(group)
+                ver_rows[2].append(verdict)
+
+        def add_claims(paper_idx: int, group: int, verdict: int, count: int, positive: int = 0,
+                       negative: int = 0, confidence_sum: Optional[float] = None):
+            count = max(count, 0)
+            confidence = confidence_sum / count if count and confidence_sum is not None else 0.5
+            for i in range(count):
+                claim_rows[0].append(paper_idx)
+                claim_rows[1].append(group)
+                claim_rows[2].append(verdict)
+                claim_rows[3].append(confidence)
+                claim_rows[4].append(1.0 if i < positive else -1.0 if i < positive + negative else 0.0)
+
+        for paper_idx, paper in enumerate(papers):
+            first_claim = len(claim_rows[0])
+            ver_counts = {TRUE: 0, PARTIAL: 0, FALSE: 0, VERDICT_NONE: 0}
+            claimed = positive = negative = 0
+            for reviewer in paper['reviewers']:
+                group = -1
+                if reviewer['weight'] is not None:
+                    group = len(group_keys)
+                    group_keys.append((paper['paper_id'], reviewer['reviewer_id']))
+                    group_paper.append(paper_idx)
+                    group_weight.append(float(reviewer['weight']))
+
+                other = (reviewer['num_verified'] - reviewer['true_count']
+                         - reviewer['partial_count'] - reviewer['false_count'])
+                for verdict, count in ((TRUE, reviewer['true_count']), (PARTIAL, reviewer['partial_count']),
+                                       (FALSE, reviewer['false_count']), (VERDICT_NONE, other)):
+                    add_ver(paper_idx, group, verdict, count)
+                    ver_counts[verdict] += count
+
+                other_positive = (reviewer['verified_positive'] - reviewer['true_positive']
+                                  - reviewer['partial_positive'])
+                other_negative = (reviewer['verified_negative'] - reviewer['true_negative']
+                                  - reviewer['partial_negative'])
+                add_claims(paper_idx, group, TRUE, reviewer['true_count'], reviewer['true_positive'],
+                           reviewer['true_negative'], reviewer['true_confidence'])
+                add_claims(paper_idx, group, PARTIAL, reviewer['partial_count'], reviewer['partial_positive'],
+                           reviewer['partial_negative'], reviewer['partial_confidence'])
+                add_claims(paper_idx, group, VERDICT_NONE, other, other_positive, other_negative)
+                add_claims(paper_idx, group, FALSE, reviewer['false_count'])
+                claimed += reviewer['num_verified']
+                positive += reviewer['verified_positive']
+                negative += reviewer['verified_negative']
+
+            # 补齐行：没有 reviewer 的验证结果和未验证的观点
+            residual = {verdict: max(paper[column] - ver_counts[verdict], 0) for verdict, column in
+                        ((TRUE, 'true_count'), (PARTIAL, 'partial_count'), (FALSE, 'false_count'))}
+            residual[VERDICT_NONE] = paper['num_verified'] - sum(ver_counts.values()) - sum(residual.values())
+            for verdict, count in residual.items():
+                add_ver(paper_idx, -1, verdict, count)
+            add_claims(paper_idx, -1, VERDICT_MISSING, paper['num_claims'] - claimed)
+            # 未验证和被判为 False 的观点的情感只有论文级计数（各评分方法也只在论文级使用），放在这些行上
+            free = [k for k in range(first_claim, len(claim_rows[0]))
+                    if claim_rows[2][k] in (FALSE, VERDICT_MISSING)]
+            remaining_positive = paper['positive_claims'] - positive
+            remaining_negative = paper['negative_claims'] - negative
+            for i, k in enumerate(free[:remaining_positive + remaining_negative]):
+                claim_rows[4][k] = 1.0 if i < remaining_positive else -1.0
+
+            if paper['rating_count']:
+                frame.rating_count[paper_idx] = paper['rating_count']
+                frame.rating_mean[paper_idx] = paper['rating_mean']
+                frame.rating_min[paper_idx] = paper['rating_min']
+                frame.rating_max[paper_idx] = paper['rating_max']
+
+        frame.group_keys = group_keys
+        frame.group_paper = np.asarray(group_paper, dtype=np.int64)
+        frame.group_weight = np.asarray(group_weight, dtype=np.float64)
+        frame.group_weight_raw = frame.group_weight.copy()
+
+        frame.ver_paper = np.asarray(ver_rows[0], dtype=np.int64)
+        frame.ver_group = np.asarray(ver_rows[1], dtype=np.int64)
+        frame.ver_verdict = np.asarray(ver_rows[2], dtype=np.int8)
+        frame.ver_confidence = np.full(len(ver_rows[0]), 0.5, dtype=np.float64)
+
+        frame.claim_paper = np.asarray(claim_rows[0], dtype=np.int64)
+        frame.claim_group = np.asarray(claim_rows[1], dtype=np.int64)
+        frame.claim_verdict = np.asarray(claim_rows[2], dtype=np.int8)
+        frame.claim_confidence = np.asarray(claim_rows[3], dtype=np.float64)
+        frame.claim_sentiment = np.asarray(claim_rows[4], dtype=np.float64)
+        return frame
+
+    @classmethod
+    def from_results(cls, paper_ids: List[str], config: Optional[Dict] = None, base_path: str = "data",
+                     db_path: Optional[str] = None, load_reviews: bool = True) -> "CorpusFrame":
+        """
+        从结果存储（或逐篇 JSON 文件）加载语料
+
+        Args:
+            paper_ids: 参与评估的论文 ID
+            config: 完整的配置字典，评审文件按 corpus 的语料路径和评审缓存查找（与 EVWPipeline 一致）
+            base_path: 数据根目录
+            db_path: 结果数据库路径
+            load_reviews: 是否加载评审（用于提取评分）
+
+        Returns:
+            CorpusFrame 实例
+        """
+        from ..data.data_loader import DataLoader
+        from ..data.results_store import load_corpus_results
+        claims, verifications, weights = load_corpus_results(base_path, db_path)
+
+        reviews = {}
+        if load_reviews:
+            data_loader = DataLoader.from_config(config, base_path)
+            reviews = {paper_id: data_loader.load_reviews(paper_id) for paper_id in paper_ids}
+
+        return cls.from_corpus(paper_ids, claims, verifications, weights, reviews)
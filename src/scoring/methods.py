@@ -0,0 +1,166 @@
+"""
+内置评分方法
+向量化复现各分析脚本中的打分逻辑：
+- improved_prediction_method.py: method_original / method_adaptive_threshold /
+  method_enhanced_partial / method_combined
+- calculate_prediction_accuracy.py: calculate_weighted_verification_score
+- design_improved_prediction.py: calculate_advanced_score / calculate_hybrid_score_v2 /
+  calculate_ensemble_score
+"""
+
+import numpy as np
+from .frame import CorpusFrame, FALSE, PARTIAL, TRUE, VERDICT_MISSING
+from .registry import register_scorer
+
+
+def verdict_values(verdict: np.ndarray, partial: float = 0.5) -> np.ndarray:
+    """验证结果映射为分值：True -> 1.0, Partially_True -> partial, 其他 -> 0.0"""
+    return np.where(verdict == TRUE, 1.0, np.where(verdict == PARTIAL, partial, 0.0))
+
+
+def _paper_flags(frame: CorpusFrame):
+    """每篇论文是否有 claims / verifications / weights"""
+    has_claims = frame.paper_count(frame.claim_paper) > 0
+    has_verifications = frame.paper_count(frame.ver_paper) > 0
+    has_weights = frame.paper_count(frame.group_paper) > 0
+    return has_claims, has_verifications, has_weights
+
+
+def _unweighted_verification_score(frame: CorpusFrame) -> np.ndarray:
+    """calculate_verification_score：不加权的验证得分，没有验证结果时为 0.5"""
+    total = frame.paper_count(frame.ver_paper)
+    score = frame.paper_sum(frame.ver_paper, verdict_values(frame.ver_verdict))
+    return np.where(total > 0, score / np.maximum(total, 1), 0.5)
+
+
+def _reviewer_verification_score(frame: CorpusFrame, partial: float = 0.5) -> np.ndarray:
+    """按 reviewer 加权的验证得分（基于 verification 行），无有效权重时为 NaN"""
+    weighted_sum, total_weight = frame.reviewer_weighted_mean(
+        frame.ver_group, verdict_values(frame.ver_verdict, partial)
+    )
+    return np.where(total_weight > 0, weighted_sum / np.where(total_weight > 0, total_weight, 1), np.nan)
+
+
+@register_scorer("adaptive_threshold", threshold=0.45,
+                 description="Weighted verification score with lower 0.45 threshold")
+@register_scorer("original", description="Weighted verification score (partial = 0.5)")
+def score_original(frame: CorpusFrame) -> np.ndarray:
+    """method_original：reviewer 加权验证得分；没有 verifications 或 weights 时无法预测"""
+    _, has_verifications, has_weights = _paper_flags(frame)
+    score = np.nan_to_num(_reviewer_verification_score(frame), nan=0.5)
+    return np.where(has_verifications & has_weights, score, np.nan)
+
+
+@register_scorer("enhanced_partial", description="Weighted verification score (partial = 0.7)")
+def score_enhanced_partial(frame: CorpusFrame) -> np.ndarray:
+    """method_enhanced_partial：Partially_True 计 0.7"""
+    _, has_verifications, has_weights = _paper_flags(frame)
+    score = np.nan_to_num(_reviewer_verification_score(frame, partial=0.7), nan=0.5)
+    return np.where(has_verifications & has_weights, score, np.nan)
+
+
+@register_scorer("weighted_verification", description="Weighted verification score, unweighted fallback")
+def score_weighted_verification(frame: CorpusFrame) -> np.ndarray:
+    """calculate_weighted_verification_score：无权重时回退到不加权得分"""
+    weighted = _reviewer_verification_score(frame)
+    return np.where(np.isnan(weighted), _unweighted_verification_score(frame), weighted)
+
+
+@register_scorer("combined", description="70% weighted verification + 30% weighted sentiment")
+def score_combined(frame: CorpusFrame) -> np.ndarray:
+    """method_combined：验证得分与（非 False 观点的）加权情感平衡按 7:3 组合"""
+    has_claims, has_verifications, has_weights = _paper_flags(frame)
+    verif_score = np.nan_to_num(_reviewer_verification_score(frame), nan=0.5)
+
+    keep = (frame.claim_group >= 0) & (frame.claim_verdict != VERDICT_MISSING) & (frame.claim_verdict != FALSE)
+    # 下标 -1 落在补上的 0 权重上
+    claim_weight = np.append(frame.group_weight, 0.0)[frame.claim_group]
+    sentiment_sum = frame.paper_sum(frame.claim_paper, frame.claim_sentiment * claim_weight, keep)
+    sentiment_weight = frame.paper_sum(frame.claim_paper, claim_weight, keep)
+    sentiment_score = np.where(
+        sentiment_weight > 0,
+        (sentiment_sum / np.where(sentiment_weight > 0, sentiment_weight, 1) + 1) / 2,
+        0.5
+    )
+
+    combined = 0.7 * verif_score + 0.3 * sentiment_score
+    return np.where(has_claims & has_verifications & has_weights, combined, np.nan)
+
+
+def _rating_score(frame: CorpusFrame) -> np.ndarray:
+    """平均评分归一化到 [0, 1]（1 -> 0, 10 -> 1），没有评分时为 0.5"""
+    return np.where(frame.rating_count > 0, (frame.rating_mean - 1) / 9.0, 0.5)
+
+
+@register_scorer("advanced", description="Adaptive blend of verification, ratings, sentiment and credibility")
+def score_advanced(frame: CorpusFrame) -> np.ndarray:
+    """calculate_advanced_score：置信度加权验证、评分、情感、reviewer 可信度和验证覆盖率的自适应组合"""
+    has_claims, has_verifications, _ = _paper_flags(frame)
+
+    # 因子 1：置信度加权的 reviewer 验证得分（基于 claim 行）
+    values = verdict_values(frame.claim_verdict, partial=0.7) * frame.claim_confidence
+    weighted_sum, total_weight = frame.reviewer_weighted_mean(
+        frame.claim_group, values, frame.claim_verdict != VERDICT_MISSING
+    )
+    base_score = np.where(total_weight > 0, weighted_sum / np.where(total_weight > 0, total_weight, 1), 0.5)
+
+    # 因子 2：评分
+    rating_score = _rating_score(frame)
+
+    # 因子 3：全部观点的情感平衡
+    total_claims = frame.paper_count(frame.claim_paper)
+    balance = frame.paper_sum(frame.claim_paper, frame.claim_sentiment) / np.maximum(total_claims, 1)
+    sentiment_score = np.where(total_claims > 0, (balance + 1) / 2.0, 0.5)
+
+    # 因子 4：reviewer 平均权重
+    num_reviewers = frame.paper_count(frame.group_paper)
+    weight_sum = frame.paper_sum(frame.group_paper, frame.group_weight_raw)
+    avg_reviewer_weight = np.where(num_reviewers > 0, weight_sum / np.maximum(num_reviewers, 1), 0.5)
+
+    # 因子 5：验证覆盖率
+    verified_count = frame.paper_count(frame.ver_paper)
+    coverage_sum = frame.paper_sum(frame.ver_paper, verdict_values(frame.ver_verdict, partial=0.7))
+    verification_coverage = np.where(verified_count > 0, coverage_sum / np.maximum(verified_count, 1), 0.5)
+
+    likely_accepted = base_score >= 0.5
+    final_score = np.where(
+        likely_accepted,
+        0.35 * base_score + 0.30 * rating_score + 0.20 * sentiment_score
+        + 0.10 * avg_reviewer_weight + 0.05 * verification_coverage,
+        0.40 * base_score + 0.25 * rating_score + 0.15 * sentiment_score
+        + 0.15 * avg_reviewer_weight + 0.05 * verification_coverage
+    )
+    return np.where(has_claims & has_verifications, final_score, 0.5)
+
+
+@register_scorer("hybrid_v2", description="Ratings adjusted by verification quality and consensus")
+def score_hybrid_v2(frame: CorpusFrame) -> np.ndarray:
+    """calculate_hybrid_score_v2：以评分为主信号，按验证质量和评分一致性调整；没有评分时回退到验证得分"""
+    has_claims, has_verifications, _ = _paper_flags(frame)
+
+    total_verified = frame.paper_count(frame.ver_paper)
+    true_count = frame.paper_count(frame.ver_paper, frame.ver_verdict == TRUE)
+    false_count = frame.paper_count(frame.ver_paper, frame.ver_verdict == FALSE)
+    verification_quality = np.where(total_verified > 0, (true_count - false_count) / np.maximum(total_verified, 1), 0.0)
+
+    consensus_factor = np.where(
+        frame.rating_count > 1,
+        1.0 - ((frame.rating_max - frame.rating_min) / 9.0) * 0.1,
+        1.0
+    )
+    rating_based = np.clip((_rating_score(frame) + verification_quality * 0.2) * consensus_factor, 0.0, 1.0)
+
+    values = verdict_values(frame.claim_verdict, partial=0.7)
+    weighted_sum, total_weight = frame.reviewer_weighted_mean(
+        frame.claim_group, values, frame.claim_verdict != VERDICT_MISSING
+    )
+    fallback = np.where(total_weight > 0, weighted_sum / np.where(total_weight > 0, total_weight, 1), 0.5)
+
+    final_score = np.where(frame.rating_count > 0, rating_based, fallback)
+    return np.where(has_claims & has_verifications, final_score, 0.5)
+
+
+@register_scorer("ensemble", description="0.6 * advanced + 0.4 * hybrid_v2")
+def score_ensemble(frame: CorpusFrame) -> np.ndarray:
+    """calculate_ensemble_score"""
+    return 0.6 * score_advanced(frame) + 0.4 * score_hybrid_v2(frame)
@@ -0,0 +1,120 @@
+"""
+评分方法注册表
+每个评分方法是 CorpusFrame -> 每篇论文得分数组 的向量化函数；
+得分为 NaN 表示该方法无法给出预测（对应原脚本中的 "Unknown"）
+"""
+
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+from ..evaluation.metrics import classification_metrics
+from .frame import CorpusFrame
+
+
+ScoreFunction = Callable[[CorpusFrame], np.ndarray]
+
+
+class ScoringMethod:
+    """已注册的评分方法"""
+
+    def __init__(self, name: str, func: ScoreFunction, threshold: float = 0.5, description: str = ""):
+        """
+        Args:
+            name: 方法名称（注册表 key）
+            func: 评分函数
+            threshold: 默认决策阈值，得分 >= 阈值预测 Accepted
+            description: 方法说明
+        """
+        self.name = name
+        self.func = func
+        self.threshold = threshold
+        self.description = description
+
+    def score(self, frame: CorpusFrame) -> np.ndarray:
+        return np.asarray(self.func(frame), dtype=np.float64)
+
+
+SCORERS: Dict[str, ScoringMethod] = {}
+
+
+def register_scorer(name: str, threshold: float = 0.5, description: str = ""):
+    """
+    注册评分方法的装饰器
+
+    同一个函数可以用不同名称和阈值注册多次：
+
+        @register_scorer("original", description="...")
+        @register_scorer("adaptive_threshold", threshold=0.45)
+        def score_original(frame): ...
+    """
+    def decorator(func: ScoreFunction) -> ScoreFunction:
+        if name in SCORERS:
+            raise ValueError(f"评分方法已注册: {name}")
+        SCORERS[name] = ScoringMethod(name, func, threshold, description or (func.__doc__ or "").strip().split("\n")[0])
+        return func
+    return decorator
+
+
+def get_scorers(names: Optional[Sequence[str]] = None) -> List[ScoringMethod]:
+    """
+    获取评分方法
+
+    Args:
+        names: 方法名称列表，为 None 时返回全部（按注册顺序）
+
+    Returns:
+        ScoringMethod 列表
+    """
+    if names is None:
+        return list(SCORERS.values())
+    unknown = [name for name in names if name not in SCORERS]
+    if unknown:
+        raise ValueError(f"未知的评分方法: {', '.join(unknown)}。可用: {', '.join(SCORERS)}")
+    return [SCORERS[name] for name in names]
+
+
+def evaluate_scorers(frame: CorpusFrame, ground_truth: Dict[str, str],
+                     names: Optional[Sequence[str]] = None,
+                     thresholds: Optional[Sequence[float]] = None) -> List[Dict]:
+    """
+    在同一个语料帧上评估多个评分方法
+
+    无法预测（NaN）的论文与 calculate_prediction_accuracy.calculate_metrics 一样不计入指标，
+    另以 abstained 字段报告数量。
+
+    Args:
+        frame: 语料帧
+        ground_truth: 真实录用状态，key 为 paper_id
+        names: 要评估的方法，为 None 时评估全部
+        thresholds: 阈值网格；给出时为每个方法选出准确率最高的阈值，否则使用方法默认阈值
+
+    Returns:
+        每个方法一行的结果列表，包含 method, threshold, 各项指标以及 scores（paper_id -> 得分）
+    """
+    labels = np.array([ground_truth.get(paper_id, "Unknown") for paper_id in frame.paper_ids])
+    labeled = labels != "Unknown"
+
+    rows = []
+    for method in get_scorers(names):
+        scores = method.score(frame)
+        mask = labeled & ~np.isnan(scores)
+        y_true = labels[mask] == "Accepted"
+        candidates = np.asarray(thresholds if thresholds else [method.threshold], dtype=np.float64)
+        y_pred = scores[mask][None, :] >= candidates[:, None]
+        metrics = classification_metrics(y_true, y_pred)
+
+        best = int(np.argmax(metrics['accuracy']))
+        row = {
+            'method': method.name,
+            'threshold': float(candidates[best]),
+            'num_papers': int(mask.sum()),
+            'abstained': int((labeled & np.isnan(scores)).sum())
+        }
+        for name, values in metrics.items():
+            value = values[best]
+            row[name] = float(value) if name in ('accuracy', 'precision', 'recall', 'f1') else int(value)
+        row['scores'] = {
+            paper_id: (None if np.isnan(score) else float(score))
+            for paper_id, score, is_labeled in zip(frame.paper_ids, scores, labeled) if is_labeled
+        }
+        rows.append(row)
+    return rows
@@ -10,6 +10,7 @@ from typing import List, Tuple, Optional, Dict
 import pickle
 from pathlib import Path
 import os
+from .tracing import get_tracer, traced
 
 
 class EmbeddingRAG:
@@ -26,7 +27,8 @@ class EmbeddingRAG:
             chunk_overlap: 文本块重叠大小
         """
         print(f"[RAG] Loading embedding model: {model_name}")
-        self.model = SentenceTransformer(model_name)
+        with get_tracer().span("rag.embedding.load_model", model=model_name):
+            self.model = SentenceTransformer(model_name)
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.index = None
@@ -98,6 +100,7 @@ class EmbeddingRAG:
         
         return chunks
     
+    @traced("rag.embedding.build_index")
     def build_index(self, paper_text: str, save_path: Optional[str] = None, paper_sections: Dict[str, str] = None):
         """
         构建向量索引
@@ -161,12 +164,13 @@ class EmbeddingRAG:
         
         # 生成 embeddings
         print(f"[RAG] Generating embeddings...")
-        embeddings = self.model.encode(
-            self.chunks, 
-            show_progress_bar=True,
-            batch_size=32,
-            convert_to_numpy=True
-        )
+        with get_tracer().span("rag.embedding.encode", num_texts=len(self.chunks)):
+            embeddings = self.model.encode(
+                self.chunks, 
+                show_progress_bar=True,
+                batch_size=32,
+                convert_to_numpy=True
+            )
         
         print(f"[RAG] Embeddings shape: {embeddings.shape}")
         
@@ -185,6 +189,7 @@ class EmbeddingRAG:
         if save_path:
             self.save_index(save_path)
     
+    @traced("rag.embedding.save_index")
     def save_index(self, save_path: str):
         """
         保存索引到磁盘
@@ -223,6 +228,7 @@ class EmbeddingRAG:
         
         print(f"[RAG] Index saved to {save_path}")
     
+    @traced("rag.embedding.load_index")
     def load_index(self, load_path: str):
         """
         从磁盘加载索引
@@ -261,6 +267,7 @@ class EmbeddingRAG:
         self._is_built = True
         print(f"[RAG] Index loaded: {self.index.ntotal} vectors, {len(self.chunks)} chunks")
     
+    @traced("rag.embedding.retrieve")
     def retrieve_relevant_chunks(self, query: str, top_k: int = 5, target_section: str = None) -> List[Tuple[str, float]]:
         """
         语义检索相关文本块
@@ -277,7 +284,8 @@ class EmbeddingRAG:
             raise ValueError("Index not built. Call build_index() or load_index() first.")
         
         # 查询向量化
-        query_embedding = self.model.encode([query], convert_to_numpy=True)
+        with get_tracer().span("rag.embedding.encode", num_texts=1):
+            query_embedding = self.model.encode([query], convert_to_numpy=True)
         
         # 归一化查询向量
         faiss.normalize_L2(query_embedding)
@@ -0,0 +1,304 @@
+"""
+分层 RAG 实现
+每篇论文构建一次两级索引：section 级向量（该 section 文本块向量的均值，可选叠加 LLM 生成的 section 摘要）
+和文本块级向量。检索时先把查询路由到最相关的几个 section，再只在这些 section 的文本块中打分；
+拼接上下文时按字符预算放入 section 摘要和完整的文本块，不再在文本块中间截断
+"""
+
+import pickle
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from .embedding_rag import EmbeddingRAG
+from .paper_digest import text_hash
+from .tracing import get_tracer, traced
+
+
+# 不属于任何 section 的文本块归入该组
+OTHER_SECTION = "(other)"
+
+# .hier 文件格式版本，格式变化时递增使旧文件失效
+HIER_VERSION = 1
+
+# section 摘要生成函数：(section 名, section 文本) -> 摘要
+DigestFn = Callable[[str, str], str]
+
+DIGEST_SYSTEM_PROMPT = "You summarize sections of academic papers for a fact-checking assistant. Be concise and factual."
+
+
+def llm_section_digest(llm_client, max_input_chars: int = 6000, max_tokens: int = 300) -> DigestFn:
+    """
+    使用 LLM 生成 section 摘要的函数
+
+    Args:
+        llm_client: LLM 客户端
+        max_input_chars: 送入 LLM 的 section 文本最大字符数
+        max_tokens: 摘要的最大 token 数
+
+    Returns:
+        (section 名, section 文本) -> 摘要 的函数
+    """
+    def digest(section_name: str, section_text: str) -> str:
+        prompt = f"""Summarize the following section of an academic paper in at most 120 words.
+Keep concrete facts that a reviewer might refer to: datasets, baselines, metrics, numbers, and the claims made. Do not add opinions.
+
+Section: {section_name}
+
+{section_text[:max_input_chars]}"""
+        return llm_client.call(prompt, DIGEST_SYSTEM_PROMPT, max_tokens=max_tokens).strip()
+    return digest
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class HierarchicalRAG:
+    """分层检索 RAG：先检索 section，再在选中的 section 内检索文本块"""
+
+    def __init__(self,
+                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 chunk_size: int = 500,
+                 chunk_overlap: int = 50,
+                 top_sections: int = 2,
+                 digest_fn: Optional[DigestFn] = None):
+        """
+        Args:
+            embedding_model: Embedding 模型名称
+            chunk_size: 文本块大小
+            chunk_overlap: 文本块重叠大小
+            top_sections: 每次查询路由到的 section 数
+            digest_fn: section 摘要生成函数（None 表示不生成摘要，只用文本块向量均值表示 section）
+        """
+        self.chunk_rag = EmbeddingRAG(
+            model_name=embedding_model,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap
+        )
+        self.top_sections = top_sections
+        self.digest_fn = digest_fn
+        self.chunk_vectors: Optional[np.ndarray] = None
+        self.section_names: List[str] = []
+        self.section_chunks: List[np.ndarray] = []
+        self.section_vectors: Optional[np.ndarray] = None
+        self.digests: Dict[str, str] = {}
+        self.text_hash: Optional[str] = None
+
+    @property
+    def chunks(self) -> Optional[List[str]]:
+        return self.chunk_rag.chunks
+
+    def _group_sections(self):
+        """按 chunk_sections 把文本块分组（section 按首次出现的顺序排列）"""
+        groups: Dict[str, List[int]] = {}
+        for i, section in enumerate(self.chunk_rag.chunk_sections or [None] * len(self.chunk_rag.chunks)):
+            groups.setdefault(section or OTHER_SECTION, []).append(i)
+        self.section_names = list(groups)
+        self.section_chunks = [np.array(indices, dtype=np.int64) for indices in groups.values()]
+
+    def _build_section_vectors(self):
+        """section 向量 = 文本块向量均值（有摘要时叠加摘要向量），L2 归一化"""
+        centroids = np.stack([self.chunk_vectors[indices].mean(axis=0) for indices in self.section_chunks])
+        centroids = _normalize(centroids)
+        with_digest = [i for i, name in enumerate(self.section_names) if self.digests.get(name)]
+        if with_digest:
+            with get_tracer().span("rag.embedding.encode", num_texts=len(with_digest)):
+                digest_vectors = self.chunk_rag.model.encode(
+                    [self.digests[self.section_names[i]] for i in with_digest], convert_to_numpy=True
+                )
+            centroids[with_digest] = _normalize(centroids[with_digest] + _normalize(digest_vectors.astype('float32')))
+        self.section_vectors = centroids.astype('float32')
+
+    @traced("rag.hierarchical.digests")
+    def build_digests(self, paper_sections: Optional[Dict[str, str]], save_path: Optional[str] = None):
+        """
+        为尚无摘要的 section 生成摘要并更新 section 向量（已有摘要的 section 不重复调用 LLM）
+
+        Args:
+            paper_sections: 论文的section字典
+            save_path: 索引保存路径（给出时写回 .hier 文件）
+        """
+        if self.digest_fn is None or not paper_sections:
+            return
+        missing = [name for name in self.section_names
+                   if name in paper_sections and name not in self.digests and paper_sections[name].strip()]
+        if not missing:
+            return
+        print(f"[RAG] Generating digests for {len(missing)} sections...")
+        for name in missing:
+            try:
+                self.digests[name] = self.digest_fn(name, paper_sections[name])
+            except Exception as e:
+                print(f"[WARNING] Failed to summarize section '{name[:50]}': {e}")
+        self._build_section_vectors()
+        if save_path:
+            self.save_index(save_path)
+
+    @traced("rag.hierarchical.build_index")
+    def build_index(self, paper_text: str, save_path: Optional[str] = None, paper_sections: Dict[str, str] = None):
+        """
+        构建两级索引
+
+        Args:
+            paper_text: 论文文本
+            save_path: 索引保存路径（不含扩展名）
+            paper_sections: 论文的section字典，用于标记chunk所属的section
+        """
+        self.chunk_rag.build_index(paper_text, paper_sections=paper_sections)
+        self.chunk_vectors = self.chunk_rag.index.reconstruct_n(0, self.chunk_rag.index.ntotal)
+        self.text_hash = text_hash(paper_text)
+        self._group_sections()
+        self.digests = {}
+        self._build_section_vectors()
+        self.build_digests(paper_sections)
+        print(f"[RAG] Hierarchical index: {len(self.section_names)} sections, {len(self.chunks)} chunks")
+        if save_path:
+            self.save_index(save_path)
+
+    def save_index(self, save_path: str):
+        """
+        保存索引：文本块级索引沿用 EmbeddingRAG 的文件，section 级信息写入 .hier
+
+        Args:
+            save_path: 保存路径（不含扩展名）
+        """
+        self.chunk_rag.save_index(save_path)
+        data = {
+            'version': HIER_VERSION,
+            'text_hash': self.text_hash,
+            'section_names': self.section_names,
+            'section_chunks': self.section_chunks,
+            'section_vectors': self.section_vectors,
+            'digests': self.digests
+        }
+        with open(str(save_path) + ".hier", 'wb') as f:
+            pickle.dump(data, f)
+
+    @traced("rag.hierarchical.load_index")
+    def load_index(self, load_path: str):
+        """
+        从磁盘加载索引（没有 .hier 文件时由文本块的 section 标记重新计算 section 向量，
+        兼容只有 EmbeddingRAG 索引的旧缓存）
+
+        Args:
+            load_path: 加载路径（不含扩展名）
+        """
+        self.chunk_rag.load_index(load_path)
+        self.chunk_vectors = self.chunk_rag.index.reconstruct_n(0, self.chunk_rag.index.ntotal)
+        hier_path = Path(str(load_path) + ".hier")
+        data = None
+        if hier_path.exists():
+            with open(hier_path, 'rb') as f:
+                data = pickle.load(f)
+            if data.get('version') != HIER_VERSION:
+                data = None
+        if data is not None:
+            self.text_hash = data['text_hash']
+            self.section_names = data['section_names']
+            self.section_chunks = data['section_chunks']
+            self.section_vectors = data['section_vectors']
+            self.digests = data['digests']
+        else:
+            self.text_hash = None
+            self._group_sections()
+            self.digests = {}
+            self._build_section_vectors()
+
+    def is_built(self) -> bool:
+        """检查索引是否已构建"""
+        return self.chunk_rag.is_built() and self.section_vectors is not None
+
+    def _match_section(self, target_section: Optional[str]) -> Optional[int]:
+        """模糊匹配 target_section（与 EmbeddingRAG 的 section 过滤规则一致）"""
+        if not target_section:
+            return None
+        target = target_section.lower()
+        for i, name in enumerate(self.section_names):
+            if name != OTHER_SECTION and (target in name.lower() or name.lower() in target):
+                return i
+        return None
+
+    def _encode_query(self, query: str) -> np.ndarray:
+        with get_tracer().span("rag.embedding.encode", num_texts=1):
+            embedding = self.chunk_rag.model.encode([query], convert_to_numpy=True)
+        return _normalize(embedding.astype('float32'))[0]
+
+    def _route(self, query_vector: np.ndarray, target_section: Optional[str]) -> List[int]:
+        """选出查询路由到的 section 下标（target_section 匹配的 section 排在最前）"""
+        order = [int(i) for i in np.argsort(-(self.section_vectors @ query_vector))]
+        target = self._match_section(target_section)
+        if target is not None:
+            order.remove(target)
+            order.insert(0, target)
+        return order[:max(1, self.top_sections)]
+
+    def _retrieve(self, query: str, top_k: int,
+                  target_section: Optional[str]) -> Tuple[List[int], List[Tuple[int, float]]]:
+        if not self.is_built():
+            raise ValueError("Index not built. Call build_index() or load_index() first.")
+        query_vector = self._encode_query(query)
+        sections = self._route(query_vector, target_section)
+        candidates = np.concatenate([self.section_chunks[i] for i in sections])
+        if len(candidates) < top_k:
+            # 选中的 section 文本块不足时，从其余文本块中补齐
+            rest = np.setdiff1d(np.arange(len(self.chunk_vectors)), candidates)
+            candidates = np.concatenate([candidates, rest])
+        # 向量已归一化，余弦相似度即 EmbeddingRAG 的 1 - L2距离²/2
+        scores = np.clip(self.chunk_vectors[candidates] @ query_vector, 0.0, 1.0)
+        top = np.argsort(-scores, kind='stable')[:top_k]
+        return sections, [(int(candidates[i]), float(scores[i])) for i in top]
+
+    @traced("rag.hierarchical.retrieve")
+    def retrieve_relevant_chunks(self, query: str, top_k: int = 5, target_section: str = None) -> List[Tuple[str, float]]:
+        """
+        分层检索相关文本块
+
+        Args:
+            query: 查询文本
+            top_k: 返回前 k 个最相关的块
+            target_section: 目标section名称（如果指定，该section总是被选中）
+
+        Returns:
+            (文本块, 相似度分数) 的列表，按分数降序排列
+        """
+        _, results = self._retrieve(query, top_k, target_section)
+        return [(self.chunks[i], score) for i, score in results]
+
+    def retrieve_sections(self, query: str, target_section: str = None) -> List[str]:
+        """查询路由到的 section 名称列表"""
+        return [self.section_names[i] for i in self._route(self._encode_query(query), target_section)]
+
+    def get_context(self, query: str, top_k: int = 5, target_section: str = None,
+                    max_chars: Optional[int] = None) -> str:
+        """
+        获取与查询相关的上下文：选中 section 的摘要在前，随后是按相关度排列的文本块
+
+        Args:
+            query: 查询文本
+            top_k: 返回前 k 个最相关的块
+            target_section: 目标section名称
+            max_chars: 上下文字符预算（只放入完整的摘要和文本块，None 表示不限制）
+
+        Returns:
+            合并后的上下文文本
+        """
+        sections, results = self._retrieve(query, top_k, target_section)
+        parts = [f"[Section summary: {self.section_names[i]}]\n{self.digests[self.section_names[i]]}"
+                 for i in sections if self.digests.get(self.section_names[i])]
+        parts.extend(self.chunks[i] for i, _ in results)
+
+        if max_chars is None:
+            return "\n\n".join(parts)
+        context_parts = []
+        used = 0
+        for part in parts:
+            cost = len(part) + (2 if context_parts else 0)
+            if used + cost > max_chars:
+                continue
+            context_parts.append(part)
+            used += cost
+        if not context_parts and parts:
+            # 单个文本块就超出预算时仍返回最相关的文本块（由调用方截断）
+            context_parts.append(self.chunks[results[0][0]] if results else parts[0])
+        return "\n\n".join(context_parts)
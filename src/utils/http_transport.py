@@ -0,0 +1,78 @@
+"""
+LLM 提供商共享的 HTTP 传输层
+基于 httpx 连接池，所有 LLMClient（以及同一进程内的多个 EVWPipeline）复用同一组 TLS 连接
+"""
+
+import threading
+from typing import Dict, Optional, Tuple
+import httpx
+
+
+DEFAULT_HTTP_CONFIG = {
+    'max_connections': 32,  # 连接池最大连接数
+    'max_keepalive_connections': 16,  # 保持空闲的长连接数
+    'keepalive_expiry': 60.0,  # 空闲长连接的保留时间（秒）
+    'connect_timeout': 10.0,
+    'read_timeout': 120.0,
+    'write_timeout': 30.0,
+    'pool_timeout': 30.0,  # 等待连接池空闲连接的时间
+    'http2': False,  # 需要安装 h2（pip install httpx[http2]）
+}
+
+_clients: Dict[Tuple, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_http_client(http_config: Optional[Dict] = None) -> httpx.Client:
+    """
+    获取共享的 httpx 客户端（相同配置返回同一个实例）
+
+    Args:
+        http_config: 传输配置，未提供的字段使用 DEFAULT_HTTP_CONFIG
+
+    Returns:
+        httpx.Client 实例
+    """
+    config = dict(DEFAULT_HTTP_CONFIG)
+    config.update(http_config or {})
+
+    if config['http2'] and not _http2_available():
+        print("[WARNING] HTTP/2 requested but 'h2' is not installed, falling back to HTTP/1.1")
+        config['http2'] = False
+
+    key = tuple(sorted(config.items()))
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                limits=httpx.Limits(
+                    max_connections=config['max_connections'],
+                    max_keepalive_connections=config['max_keepalive_connections'],
+                    keepalive_expiry=config['keepalive_expiry'],
+                ),
+                timeout=httpx.Timeout(
+                    connect=config['connect_timeout'],
+                    read=config['read_timeout'],
+                    write=config['write_timeout'],
+                    pool=config['pool_timeout'],
+                ),
+                http2=config['http2'],
+            )
+            _clients[key] = client
+        return client
+
+
+def close_http_clients():
+    """关闭所有共享的 httpx 客户端（进程退出前调用）"""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -7,6 +7,7 @@ from typing import List, Tuple, Optional, Dict
 from collections import defaultdict
 from .rag import SimpleRAG
 from .embedding_rag import EmbeddingRAG
+from .tracing import traced
 
 
 class HybridRAG:
@@ -62,6 +63,7 @@ class HybridRAG:
         """检查语义索引是否已构建"""
         return self.semantic_rag.is_built()
     
+    @traced("rag.hybrid.retrieve")
     def retrieve_relevant_chunks(self, paper_text: str, query: str, top_k: int = 5,
                                   target_section: str = None, paper_sections: Dict[str, str] = None) -> List[Tuple[str, float]]:
         """
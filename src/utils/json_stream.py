@@ -0,0 +1,97 @@
+"""
+流式 JSON 增量解析
+在流式响应中检测第一个完整的 JSON 对象/数组，以便提前关闭流
+"""
+
+import json
+from typing import List, Optional
+
+
+class IncrementalJSONScanner:
+    """
+    增量扫描流式文本，找到第一个完整且符合预期结构的顶层 JSON 值
+
+    只跟踪括号深度和字符串状态，每个字符只扫描一次；
+    markdown 代码块标记和前后的说明文字会被忽略。
+    """
+
+    def __init__(self, expect: str = "object", required_keys: Optional[List[str]] = None):
+        """
+        Args:
+            expect: 期望的顶层类型，"object" 或 "array"
+            required_keys: 顶层对象（或数组中每个对象）必须包含的字段
+        """
+        if expect not in ("object", "array"):
+            raise ValueError(f"不支持的 JSON 类型: {expect}。支持: object, array")
+        self.open_char = "{" if expect == "object" else "["
+        self.close_char = "}" if expect == "object" else "]"
+        self.required_keys = required_keys or []
+        self.buffer = ""
+        self.pos = 0
+        self.start = None
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.result = None
+
+    def _matches_schema(self, value) -> bool:
+        if not self.required_keys:
+            return True
+        items = value if isinstance(value, list) else [value]
+        return all(
+            isinstance(item, dict) and all(key in item for key in self.required_keys)
+            for item in items
+        )
+
+    def feed(self, text: str) -> Optional[str]:
+        """
+        追加一段流式文本
+
+        Args:
+            text: 新收到的文本片段
+
+        Returns:
+            如果已收到完整的 JSON 值则返回其文本，否则返回 None
+        """
+        if self.result is not None:
+            return self.result
+        self.buffer += text
+
+        while self.pos < len(self.buffer):
+            char = self.buffer[self.pos]
+            self.pos += 1
+
+            if self.start is None:
+                if char == self.open_char:
+                    self.start = self.pos - 1
+                    self.depth = 1
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == "\\":
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in "{[":
+                self.depth += 1
+            elif char in "}]":
+                self.depth -= 1
+                if self.depth == 0:
+                    candidate = self.buffer[self.start:self.pos]
+                    try:
+                        value = json.loads(candidate)
+                    except json.JSONDecodeError:
+                        value = None
+                    if value is not None and self._matches_schema(value):
+                        self.result = candidate
+                        return self.result
+                    # 不符合预期，继续寻找下一个候选
+                    self.start = None
+
+        return None
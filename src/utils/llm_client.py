@@ -3,17 +3,81 @@ LLM API 客户端封装
 支持 OpenAI 和 Anthropic
 """
 
+import contextvars
+import json
 import os
-from typing import Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import openai
 from openai import OpenAI
 import anthropic
+from .scheduler import get_scheduler, parse_retry_after
+from .http_transport import get_http_client
+from .json_stream import IncrementalJSONScanner
+from .tracing import get_tracer
+from .usage import UsageTracker
+
+
+# 可重试的 HTTP 状态码（529 为 Anthropic 的过载状态）
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504, 529}
+
+# OpenAI 兼容批处理任务的终止状态
+OPENAI_BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _field(obj, name: str):
+    """同时支持 SDK 对象和 dict（批处理结果文件中的 usage 为 dict）"""
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def extract_usage(usage) -> Dict[str, int]:
+    """
+    统一 OpenAI 兼容接口和 Anthropic 的 token 用量字段
+
+    Args:
+        usage: 响应中的 usage 对象或 dict（可为 None）
+
+    Returns:
+        {'prompt_tokens', 'completion_tokens', 'cached_tokens'}，prompt_tokens 包含缓存命中的部分；
+        没有用量信息时返回空字典
+    """
+    if usage is None:
+        return {}
+    prompt_tokens = _field(usage, 'prompt_tokens')
+    if prompt_tokens is not None:
+        cached_tokens = _field(_field(usage, 'prompt_tokens_details'), 'cached_tokens')
+        if cached_tokens is None:
+            # DeepSeek 的上下文缓存字段
+            cached_tokens = _field(usage, 'prompt_cache_hit_tokens')
+        return {
+            'prompt_tokens': prompt_tokens or 0,
+            'completion_tokens': _field(usage, 'completion_tokens') or 0,
+            'cached_tokens': cached_tokens or 0
+        }
+    # Anthropic：input_tokens 不含缓存读取/写入的部分
+    cache_read = _field(usage, 'cache_read_input_tokens') or 0
+    cache_creation = _field(usage, 'cache_creation_input_tokens') or 0
+    return {
+        'prompt_tokens': (_field(usage, 'input_tokens') or 0) + cache_read + cache_creation,
+        'completion_tokens': _field(usage, 'output_tokens') or 0,
+        'cached_tokens': cache_read
+    }
 
 
 class LLMClient:
     """统一的 LLM 客户端接口"""
     
     def __init__(self, provider: str = "openai", api_key: Optional[str] = None, 
-                 model: str = "gpt-4", temperature: float = 0.3, base_url: Optional[str] = None):
+                 model: str = "gpt-4", temperature: float = 0.3, base_url: Optional[str] = None,
+                 rate_limit: Optional[Dict] = None, http_config: Optional[Dict] = None,
+                 stream: bool = False, pricing: Optional[Dict] = None, budget: Optional[Dict] = None,
+                 prompt_cache: bool = False):
         """
         Args:
             provider: LLM 提供商，"openai", "anthropic", 或 "deepseek"
@@ -21,10 +85,26 @@ class LLMClient:
             model: 模型名称
             temperature: 温度参数
             base_url: API 基础 URL（用于 DeepSeek 等自定义端点）
+            rate_limit: 调度器配置（requests_per_minute, tokens_per_minute, max_concurrency,
+                        min_concurrency, max_retries, base_delay, max_delay），提供商和配置相同的客户端共享
+            http_config: HTTP 传输配置（连接池、keep-alive、超时、HTTP/2），相同配置的客户端共享连接池
+            stream: 是否对期望 JSON 输出的调用使用流式响应（收到完整 JSON 后提前关闭流）
+            pricing: 模型价格表配置（models, batch_discount），用于费用统计
+            budget: 预算配置（max_cost, max_tokens, on_exceed）
+            prompt_cache: 是否把系统提示标记为可缓存前缀（Anthropic 需要显式的 cache_control；
+                          OpenAI / DeepSeek 自动缓存相同前缀，不受此参数影响）
         """
         self.provider = provider
         self.model = model
         self.temperature = temperature
+        self.stream = stream
+        self.prompt_cache = prompt_cache
+        # 流式调用的延迟指标（time-to-first-token 等）
+        self.stream_metrics: List[Dict] = []
+        self._metrics_lock = threading.Lock()
+        # token 用量与费用（按 agent / 论文 / 阶段汇总）
+        self.usage = UsageTracker.from_config(pricing, budget)
+        self.scheduler = get_scheduler(provider, **(rate_limit or {}))
         
         if api_key is None or api_key == "":
             # 尝试从环境变量读取
@@ -38,30 +118,116 @@ class LLMClient:
                 f"或在配置文件中提供 api_key。"
             )
         
+        # 重试由调度器统一处理，关闭 SDK 自带的重试以免重复退避
+        # 所有提供商客户端共享同一个 httpx 连接池，复用 TLS 连接
+        http_client = get_http_client(http_config)
         if provider == "openai":
-            self.client = OpenAI(api_key=api_key, base_url=base_url)
+            self.client = OpenAI(api_key=api_key, base_url=base_url, max_retries=0,
+                                 http_client=http_client)
         elif provider == "deepseek":
             # DeepSeek 使用 OpenAI 兼容的 API
             deepseek_base_url = base_url or "https://api.deepseek.com"
-            self.client = OpenAI(api_key=api_key, base_url=deepseek_base_url)
+            self.client = OpenAI(api_key=api_key, base_url=deepseek_base_url, max_retries=0,
+                                 http_client=http_client)
         elif provider == "anthropic":
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self.client = anthropic.Anthropic(api_key=api_key, base_url=base_url, max_retries=0,
+                                              http_client=http_client)
         else:
             raise ValueError(f"不支持的提供商: {provider}。支持: openai, anthropic, deepseek")
     
+    @staticmethod
+    def classify_error(error: Exception) -> Tuple[bool, bool, Optional[float]]:
+        """
+        判断 API 错误是否可重试
+        
+        Args:
+            error: 调用过程中抛出的异常
+            
+        Returns:
+            (是否可重试, 是否为限流错误, Retry-After 秒数)
+        """
+        if isinstance(error, (openai.APIConnectionError, anthropic.APIConnectionError)):
+            # 包含超时（APITimeoutError 是 APIConnectionError 的子类）
+            return True, False, None
+        if isinstance(error, (openai.APIStatusError, anthropic.APIStatusError)):
+            status_code = error.status_code
+            retry_after = parse_retry_after(error.response.headers)
+            return status_code in RETRYABLE_STATUS_CODES, status_code == 429, retry_after
+        return False, False, None
+    
+    def estimate_tokens(self, prompt: str, system_prompt: Optional[str], max_tokens: int) -> int:
+        """粗略估计一次请求消耗的 token 数（按 4 个字符约 1 个 token 计算）"""
+        prompt_chars = len(prompt) + len(system_prompt or "")
+        return prompt_chars // 4 + max_tokens
+    
     def call(self, prompt: str, system_prompt: Optional[str] = None, 
-             max_tokens: int = 2000) -> str:
+             max_tokens: int = 2000, expect_json: Optional[str] = None,
+             required_keys: Optional[List[str]] = None) -> str:
         """
-        调用 LLM
+        调用 LLM（经过调度器限流，可重试错误会自动退避重试）
         
         Args:
             prompt: 用户提示
             system_prompt: 系统提示
             max_tokens: 最大 token 数
+            expect_json: 期望的 JSON 顶层类型（"object" 或 "array"）。启用流式模式时，
+                         收到符合预期的完整 JSON 后立即关闭流，只返回该 JSON 文本
+            required_keys: 期望 JSON 对象必须包含的字段
             
         Returns:
             LLM 响应文本
         """
+        self.usage.check_request()
+        tracer = get_tracer()
+        streaming = bool(self.stream and expect_json)
+        if streaming:
+            request = lambda: self._stream_json_once(prompt, system_prompt, max_tokens,
+                                                     expect_json, required_keys)
+        else:
+            request = lambda: self._call_once(prompt, system_prompt, max_tokens)
+        
+        with tracer.span("llm.call", provider=self.provider, model=self.model,
+                         max_tokens=max_tokens, stream=streaming) as call_span:
+            def attempt():
+                call_span.add('attempts', 1)
+                with tracer.span("llm.request", provider=self.provider, model=self.model):
+                    return request()
+            
+            return self.scheduler.run(
+                attempt,
+                estimated_tokens=self.estimate_tokens(prompt, system_prompt, max_tokens),
+                classify_error=self.classify_error
+            )
+    
+    def _record_usage(self, usage: Dict[str, int], prompt: str, system_prompt: Optional[str], text: str):
+        """
+        把 token 用量记录到当前请求 span 和用量统计
+
+        响应没有返回用量时（如提前关闭的流）按字符数估算缺失的部分。
+        """
+        estimated = 'prompt_tokens' not in usage or 'completion_tokens' not in usage
+        if estimated:
+            usage = {
+                'prompt_tokens': (len(prompt) + len(system_prompt or "")) // 4,
+                'completion_tokens': len(text or "") // 4,
+                'cached_tokens': 0,
+                **usage
+            }
+        span = get_tracer().current_span()
+        for key, value in usage.items():
+            span.set(key, value)
+        span.set('usage_estimated', estimated)
+        self.usage.record(self.model, usage, estimated=estimated)
+    
+    def _anthropic_system(self, system_prompt: Optional[str]):
+        """Anthropic 的 system 参数：启用前缀缓存时以带 cache_control 的文本块传入"""
+        if self.prompt_cache and system_prompt:
+            return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        return system_prompt or ""
+    
+    def _call_once(self, prompt: str, system_prompt: Optional[str] = None,
+                   max_tokens: int = 2000) -> str:
+        """发起一次 API 请求（不含限流和重试）"""
         if self.provider in ["openai", "deepseek"]:
             messages = []
             if system_prompt:
@@ -75,6 +241,7 @@ class LLMClient:
                 max_tokens=max_tokens
             )
             content = response.choices[0].message.content
+            self._record_usage(extract_usage(getattr(response, 'usage', None)), prompt, system_prompt, content)
             if not content:
                 raise ValueError("LLM 返回了空响应")
             return content
@@ -84,23 +251,352 @@ class LLMClient:
                 model=self.model,
                 max_tokens=max_tokens,
                 temperature=self.temperature,
-                system=system_prompt or "",
+                system=self._anthropic_system(system_prompt),
                 messages=[{"role": "user", "content": prompt}]
             )
+            text = response.content[0].text if response.content else ""
+            self._record_usage(extract_usage(getattr(response, 'usage', None)), prompt, system_prompt, text)
             if not response.content or len(response.content) == 0:
                 raise ValueError("LLM 返回了空响应")
             return response.content[0].text
     
+    def _iter_stream_text(self, prompt: str, system_prompt: Optional[str], max_tokens: int,
+                          usage: Optional[Dict] = None):
+        """
+        发起流式请求
+        
+        Args:
+            usage: 收集流中 token 用量的字典（可选，流提前关闭时可能不完整）
+        
+        Returns:
+            (流对象, 文本片段迭代器)
+        """
+        usage = usage if usage is not None else {}
+        if self.provider in ["openai", "deepseek"]:
+            messages = []
+            if system_prompt:
+                messages.append({"role": "system", "content": system_prompt})
+            messages.append({"role": "user", "content": prompt})
+            
+            stream = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                temperature=self.temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                # 最后一个 chunk 返回 usage（提前关闭流时收不到，按字符数估算）
+                stream_options={"include_usage": True}
+            )
+            
+            def openai_texts():
+                for chunk in stream:
+                    if getattr(chunk, 'usage', None):
+                        usage.update(extract_usage(chunk.usage))
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            return stream, openai_texts()
+        
+        stream = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=self.temperature,
+            system=self._anthropic_system(system_prompt),
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
+        )
+        
+        def anthropic_texts():
+            for event in stream:
+                if event.type == "message_start":
+                    # message_start 中的 output_tokens 只是初始值，以 message_delta 为准
+                    start_usage = extract_usage(event.message.usage)
+                    start_usage.pop('completion_tokens', None)
+                    usage.update(start_usage)
+                elif event.type == "message_delta" and getattr(event, 'usage', None):
+                    usage['completion_tokens'] = event.usage.output_tokens
+                elif event.type == "content_block_delta" and getattr(event.delta, "text", None):
+                    yield event.delta.text
+        return stream, anthropic_texts()
+    
+    def _stream_json_once(self, prompt: str, system_prompt: Optional[str], max_tokens: int,
+                          expect_json: str, required_keys: Optional[List[str]] = None) -> str:
+        """流式请求并在收到完整 JSON 后提前关闭（不含限流和重试）"""
+        scanner = IncrementalJSONScanner(expect_json, required_keys)
+        start_time = time.perf_counter()
+        first_token_time = None
+        parts = []
+        result = None
+        
+        usage = {}
+        stream, texts = self._iter_stream_text(prompt, system_prompt, max_tokens, usage)
+        try:
+            for text in texts:
+                if first_token_time is None:
+                    first_token_time = time.perf_counter()
+                parts.append(text)
+                result = scanner.feed(text)
+                if result is not None:
+                    break
+        finally:
+            # 提前结束时关闭流，服务端停止生成后续 token
+            stream.close()
+        
+        end_time = time.perf_counter()
+        self._record_usage(usage, prompt, system_prompt, "".join(parts))
+        span = get_tracer().current_span()
+        span.set('ttft_ms', (first_token_time - start_time) * 1000 if first_token_time else None)
+        span.set('early_stop', result is not None)
+        with self._metrics_lock:
+            self.stream_metrics.append({
+                'ttft': (first_token_time - start_time) if first_token_time else None,
+                'latency': end_time - start_time,
+                'early_stop': result is not None,
+                'output_chars': sum(len(p) for p in parts)
+            })
+        
+        if result is not None:
+            return result
+        content = "".join(parts)
+        if not content:
+            raise ValueError("LLM 返回了空响应")
+        return content
+    
+    def get_stream_stats(self) -> Dict:
+        """
+        汇总流式调用的延迟指标
+        
+        Returns:
+            包含调用次数、平均/P50/P95 首 token 时间、平均总延迟和提前终止比例的字典
+        """
+        with self._metrics_lock:
+            metrics = list(self.stream_metrics)
+        if not metrics:
+            return {'num_calls': 0}
+        
+        ttfts = sorted(m['ttft'] for m in metrics if m['ttft'] is not None)
+        latencies = [m['latency'] for m in metrics]
+        
+        def percentile(values, q):
+            if not values:
+                return None
+            return values[min(len(values) - 1, int(q * len(values)))]
+        
+        return {
+            'num_calls': len(metrics),
+            'ttft_mean': sum(ttfts) / len(ttfts) if ttfts else None,
+            'ttft_p50': percentile(ttfts, 0.5),
+            'ttft_p95': percentile(ttfts, 0.95),
+            'latency_mean': sum(latencies) / len(latencies),
+            'early_stop_rate': sum(1 for m in metrics if m['early_stop']) / len(metrics)
+        }
+    
     def batch_call(self, prompts: List[str], system_prompt: Optional[str] = None) -> List[str]:
         """
-        批量调用 LLM
+        批量调用 LLM（并发执行，并发度由调度器自适应控制）
         
         Args:
             prompts: 提示列表
             system_prompt: 系统提示
             
         Returns:
-            响应列表
+            响应列表，顺序与 prompts 一致
         """
-        return [self.call(p, system_prompt) for p in prompts]
+        max_workers = max(1, min(len(prompts), self.scheduler.concurrency.max_concurrency))
+        # 每个任务复制一份调用方的上下文，工作线程中的追踪 span 继承 paper_id / stage 等属性
+        contexts = [contextvars.copy_context() for _ in prompts]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda ctx, p: ctx.run(self.call, p, system_prompt), contexts, prompts))
 
+    def _build_openai_body(self, request: Dict) -> Dict:
+        messages = []
+        if request.get('system_prompt'):
+            messages.append({"role": "system", "content": request['system_prompt']})
+        messages.append({"role": "user", "content": request['prompt']})
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+            "max_tokens": request.get('max_tokens', 2000)
+        }
+    
+    def _build_anthropic_params(self, request: Dict) -> Dict:
+        return {
+            "model": self.model,
+            "max_tokens": request.get('max_tokens', 2000),
+            "temperature": self.temperature,
+            "system": self._anthropic_system(request.get('system_prompt')),
+            "messages": [{"role": "user", "content": request['prompt']}]
+        }
+    
+    def submit_batch(self, requests: List[Dict], completion_window: str = "24h") -> str:
+        """
+        提交离线批处理任务（OpenAI 兼容 JSONL 批处理或 Anthropic Message Batches）
+        
+        Args:
+            requests: 请求列表，每个包含 custom_id, prompt, system_prompt（可选）, max_tokens（可选）
+            completion_window: OpenAI 批处理完成窗口
+            
+        Returns:
+            批处理任务 ID
+        """
+        if self.provider in ["openai", "deepseek"]:
+            lines = [
+                json.dumps({
+                    "custom_id": request['custom_id'],
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._build_openai_body(request)
+                }, ensure_ascii=False)
+                for request in requests
+            ]
+            batch_file = ("batch_requests.jsonl", "\n".join(lines).encode('utf-8'), "application/jsonl")
+            uploaded = self.scheduler.run(
+                lambda: self.client.files.create(file=batch_file, purpose="batch"),
+                classify_error=self.classify_error
+            )
+            batch = self.scheduler.run(
+                lambda: self.client.batches.create(
+                    input_file_id=uploaded.id,
+                    endpoint="/v1/chat/completions",
+                    completion_window=completion_window
+                ),
+                classify_error=self.classify_error
+            )
+        else:
+            batch_requests = [
+                {"custom_id": request['custom_id'], "params": self._build_anthropic_params(request)}
+                for request in requests
+            ]
+            batch = self.scheduler.run(
+                lambda: self.client.messages.batches.create(requests=batch_requests),
+                classify_error=self.classify_error
+            )
+        
+        print(f"[Batch] Submitted {len(requests)} requests as batch {batch.id}")
+        return batch.id
+    
+    def wait_for_batch(self, batch_id: str, poll_interval: float = 60.0,
+                       timeout: Optional[float] = None):
+        """
+        轮询等待批处理任务结束
+        
+        Args:
+            batch_id: 批处理任务 ID
+            poll_interval: 轮询间隔（秒）
+            timeout: 最长等待时间（秒），None 表示一直等待
+            
+        Returns:
+            提供商返回的批处理任务对象
+        """
+        start_time = time.monotonic()
+        while True:
+            if self.provider in ["openai", "deepseek"]:
+                batch = self.scheduler.run(
+                    lambda: self.client.batches.retrieve(batch_id),
+                    classify_error=self.classify_error
+                )
+                status = batch.status
+                finished = status in OPENAI_BATCH_TERMINAL_STATUSES
+            else:
+                batch = self.scheduler.run(
+                    lambda: self.client.messages.batches.retrieve(batch_id),
+                    classify_error=self.classify_error
+                )
+                status = batch.processing_status
+                finished = status == "ended"
+            
+            if finished:
+                print(f"[Batch] Batch {batch_id} finished with status: {status}")
+                return batch
+            
+            if timeout is not None and time.monotonic() - start_time > timeout:
+                raise TimeoutError(f"批处理任务 {batch_id} 在 {timeout} 秒内未完成（当前状态: {status}）")
+            
+            print(f"[Batch] Batch {batch_id} status: {status}, checking again in {poll_interval:.0f}s")
+            time.sleep(poll_interval)
+    
+    def fetch_batch_results(self, batch, attributes: Optional[Dict[str, Dict]] = None) -> Dict[str, Optional[str]]:
+        """
+        下载批处理结果，并按批处理价格记录每个请求的 token 用量
+        
+        Args:
+            batch: wait_for_batch 返回的批处理任务对象
+            attributes: 每个请求的用量分组属性（如 paper_id），key 为 custom_id
+            
+        Returns:
+            结果字典，key 为 custom_id，value 为响应文本（失败的请求为 None）
+        """
+        results = {}
+        attributes = attributes or {}
+        context = get_tracer().current_context()
+        
+        def record(custom_id: str, usage):
+            usage = extract_usage(usage)
+            if usage:
+                self.usage.record(self.model, usage, batch=True,
+                                  attributes={**context, **attributes.get(custom_id, {})})
+        
+        if self.provider in ["openai", "deepseek"]:
+            if not batch.output_file_id:
+                print(f"[WARNING] Batch {batch.id} has no output file (status: {batch.status})")
+                return results
+            content = self.scheduler.run(
+                lambda: self.client.files.content(batch.output_file_id),
+                classify_error=self.classify_error
+            )
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                response = item.get('response') or {}
+                body = response.get('body') or {}
+                choices = body.get('choices') or []
+                record(item.get('custom_id'), body.get('usage'))
+                if response.get('status_code') == 200 and choices:
+                    results[item['custom_id']] = choices[0].get('message', {}).get('content')
+                else:
+                    print(f"[WARNING] Batch request {item.get('custom_id')} failed: {item.get('error')}")
+                    results[item['custom_id']] = None
+        else:
+            entries = self.scheduler.run(
+                lambda: list(self.client.messages.batches.results(batch.id)),
+                classify_error=self.classify_error
+            )
+            for entry in entries:
+                if entry.result.type == "succeeded":
+                    record(entry.custom_id, entry.result.message.usage)
+                if entry.result.type == "succeeded" and entry.result.message.content:
+                    results[entry.custom_id] = entry.result.message.content[0].text
+                else:
+                    print(f"[WARNING] Batch request {entry.custom_id} failed: {entry.result.type}")
+                    results[entry.custom_id] = None
+        
+        return results
+    
+    def run_batch(self, requests: List[Dict], poll_interval: float = 60.0,
+                  timeout: Optional[float] = None, completion_window: str = "24h") -> Dict[str, Optional[str]]:
+        """
+        离线模式：提交批处理任务、轮询直到完成并返回结果
+        
+        Args:
+            requests: 请求列表（格式见 submit_batch），可带 paper_id 用于用量分组
+            poll_interval: 轮询间隔（秒）
+            timeout: 最长等待时间（秒）
+            completion_window: OpenAI 批处理完成窗口
+            
+        Returns:
+            结果字典，key 为 custom_id
+        """
+        if not requests:
+            return {}
+        self.usage.check_request()
+        attributes = {request['custom_id']: {'paper_id': request['paper_id']}
+                      for request in requests if request.get('paper_id')}
+        with get_tracer().span("llm.batch", provider=self.provider, model=self.model,
+                               num_requests=len(requests)) as span:
+            batch_id = self.submit_batch(requests, completion_window)
+            span.set('batch_id', batch_id)
+            batch = self.wait_for_batch(batch_id, poll_interval, timeout)
+            results = self.fetch_batch_results(batch, attributes)
+            span.set('num_failed', sum(1 for text in results.values() if text is None))
+            return results
@@ -0,0 +1,165 @@
+"""
+确定性 Mock LLM
+根据提示内容生成符合 Step 1 提取 / Step 2 验证格式的 JSON 响应，同一提示（和 seed）总是得到相同结果，
+用于基准测试和无网络的端到端运行，不需要 API key
+"""
+
+import hashlib
+import json
+import random
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from .usage import PriceTable, UsageTracker
+
+
+MOCK_TOPICS = ["Novelty", "Experiments", "Writing", "Significance", "Reproducibility"]
+
+# 按关键词推断观点主题
+_TOPIC_KEYWORDS = [
+    ("Novelty", ("novel", "new", "original", "incremental", "prior work")),
+    ("Experiments", ("experiment", "baseline", "result", "ablation", "dataset", "benchmark")),
+    ("Writing", ("writing", "clear", "clarity", "presentation", "typo", "organized")),
+    ("Significance", ("significan", "impact", "important", "contribution")),
+    ("Reproducibility", ("reproduc", "code", "hyperparameter", "implementation detail")),
+]
+
+_REVIEWER_ID = re.compile(r"id 格式为 (\S+?)-C\{序号\}")
+_REVIEW_TEXT = re.compile(r"评审文本：\n(.*?)\n\n请按照要求", re.S)
+_GROUP_CLAIM_ID = re.compile(r"^\[(.+?)\]$", re.M)
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?。！？])\s+|\n+")
+
+
+def _rng(prompt: str, seed: int) -> random.Random:
+    digest = hashlib.sha256(f"{seed}:{prompt}".encode('utf-8')).digest()
+    return random.Random(int.from_bytes(digest[:8], 'big'))
+
+
+def _topic_of(sentence: str, rng: random.Random) -> str:
+    lowered = sentence.lower()
+    for topic, keywords in _TOPIC_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return topic
+    return rng.choice(MOCK_TOPICS)
+
+
+def _mock_extraction(prompt: str, rng: random.Random, max_claims: int) -> List[Dict]:
+    match = _REVIEWER_ID.search(prompt)
+    reviewer_id = match.group(1) if match else "R1"
+    match = _REVIEW_TEXT.search(prompt)
+    review_text = match.group(1) if match else prompt
+    sentences = [s.strip() for s in _SENTENCE_SPLIT.split(review_text) if len(s.strip()) > 20]
+    if not sentences:
+        sentences = [review_text.strip()[:200] or "The paper is reasonable."]
+
+    claims = []
+    for i, sentence in enumerate(sentences[:max_claims]):
+        substantiation_type = rng.choices(["Specific_Citation", "Vague", "None"], weights=[0.45, 0.35, 0.2])[0]
+        claims.append({
+            'id': f"{reviewer_id}-C{i + 1}",
+            'topic': _topic_of(sentence, rng),
+            'sentiment': rng.choices(["Positive", "Negative", "Neutral"], weights=[0.4, 0.45, 0.15])[0],
+            'statement': sentence[:300],
+            'substantiation_type': substantiation_type,
+            'substantiation_content': sentence[:200] if substantiation_type != "None" else None
+        })
+    return claims
+
+
+def _mock_verification(claim_id: Optional[str], rng: random.Random) -> Dict:
+    result = rng.choices(["True", "Partially_True", "False"], weights=[0.5, 0.3, 0.2])[0]
+    verification = {
+        'verification_result': result,
+        'verification_reason': f"Mock verification: the paper context is judged {result} for this claim.",
+        'confidence': round(rng.uniform(0.5, 0.95), 2)
+    }
+    if claim_id is not None:
+        verification = {'id': claim_id, **verification}
+    return verification
+
+
+def _mock_digest(rng: random.Random) -> Dict:
+    return {
+        'contributions': ["Mock contribution: a new method for the studied task."],
+        'datasets': [f"Mock dataset {i + 1}" for i in range(rng.randint(1, 3))],
+        'baselines': [f"Mock baseline {i + 1}" for i in range(rng.randint(1, 3))],
+        'metrics': ["Accuracy"],
+        'tables': [f"Mock dataset 1: method vs. Mock baseline 1 = {rng.uniform(70, 90):.1f} vs. {rng.uniform(60, 80):.1f}"]
+    }
+
+
+def mock_completion(prompt: str, system_prompt: Optional[str] = None, seed: int = 0,
+                    max_claims: int = 8) -> str:
+    """
+    生成确定性的 mock 响应
+
+    Args:
+        prompt: 用户提示（按 ExtractionAgent / VerificationAgent 的提示格式识别请求类型）
+        system_prompt: 系统提示（不影响结果）
+        seed: 随机种子
+        max_claims: 每条 review 最多提取的观点数
+
+    Returns:
+        响应文本：提取请求返回观点 JSON 数组，单条验证返回 JSON 对象，分组验证返回 JSON 数组，
+        论文摘要请求返回 JSON 对象
+    """
+    rng = _rng(prompt, seed)
+    if "Reviewer Claims:" in prompt:
+        payload = [_mock_verification(claim_id, rng) for claim_id in _GROUP_CLAIM_ID.findall(prompt)]
+    elif "Reviewer Claim:" in prompt:
+        payload = _mock_verification(None, rng)
+    elif "Paper digest request" in prompt:
+        payload = _mock_digest(rng)
+    elif "评审文本" in prompt:
+        payload = _mock_extraction(prompt, rng, max_claims)
+    else:
+        return "Mock response."
+    return json.dumps(payload, ensure_ascii=False)
+
+
+class MockLLMClient:
+    """
+    与 LLMClient 接口一致的确定性客户端（不发起网络请求）
+
+    可作为 ExtractionAgent / VerificationAgent 的 llm_client 使用。
+    """
+
+    def __init__(self, model: str = "mock-llm", latency: float = 0.0, seed: int = 0,
+                 max_claims: int = 8):
+        """
+        Args:
+            model: 模型名（只用于用量统计）
+            latency: 每次调用的固定延迟（秒），用于模拟网络等待
+            seed: 随机种子
+            max_claims: 每条 review 最多提取的观点数
+        """
+        self.provider = "mock"
+        self.model = model
+        self.latency = latency
+        self.seed = seed
+        self.max_claims = max_claims
+        self.stream = False
+        self.usage = UsageTracker(PriceTable({model: {'input': 0.0, 'output': 0.0}}))
+        self.num_calls = 0
+
+    def call(self, prompt: str, system_prompt: Optional[str] = None,
+             max_tokens: int = 2000, expect_json: Optional[str] = None,
+             required_keys: Optional[List[str]] = None) -> str:
+        """返回 mock_completion 的结果（参数与 LLMClient.call 一致）"""
+        if self.latency:
+            time.sleep(self.latency)
+        response = mock_completion(prompt, system_prompt, self.seed, self.max_claims)
+        self.num_calls += 1
+        self.usage.record(self.model, {
+            'prompt_tokens': (len(prompt) + len(system_prompt or "")) // 4,
+            'completion_tokens': len(response) // 4,
+            'cached_tokens': 0
+        })
+        return response
+
+    def batch_call(self, prompts: List[str], system_prompt: Optional[str] = None,
+                   max_workers: int = 8) -> List[str]:
+        """并发调用，顺序与 prompts 一致"""
+        with ThreadPoolExecutor(max_workers=max(1, min(len(prompts), max_workers))) as executor:
+            return list(executor.map(lambda p: self.call(p, system_prompt), prompts))
@@ -0,0 +1,666 @@
+"""
+本地 Mock LLM 服务器
+兼容 OpenAI Chat Completions / Files / Batches 和 Anthropic Messages / Message Batches 接口，
+响应内容由 mock_completion 确定性生成；可配置延迟分布、错误率、429 限流（随机、按分钟速率或周期性突发）
+以及连接断开，用于在无网络环境下对 LLMClient 的并发、重试、缓存和批处理做压测。
+
+LLMClient 通过 base_url 指向该服务器：
+- OpenAI / DeepSeek: base_url = "http://127.0.0.1:{port}/v1"
+- Anthropic:         base_url = "http://127.0.0.1:{port}"
+"""
+
+import itertools
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from .mock_llm import mock_completion
+from .scheduler import TokenBucket
+
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'lognormal', 'exponential')
+
+
+class LatencyModel:
+    """响应延迟分布"""
+
+    def __init__(self, distribution: str = 'fixed', mean_ms: float = 0.0, jitter_ms: float = 0.0,
+                 sigma: float = 0.5, max_ms: Optional[float] = None, tokens_per_second: Optional[float] = None):
+        """
+        Args:
+            distribution: "fixed"、"uniform"（mean_ms ± jitter_ms）、"lognormal"（均值 mean_ms，形状 sigma）
+                          或 "exponential"（均值 mean_ms）
+            mean_ms: 首 token 前的平均延迟（毫秒）
+            jitter_ms: uniform 分布的半宽
+            sigma: lognormal 分布的形状参数
+            max_ms: 延迟上限（None 表示不截断）
+            tokens_per_second: 输出速度，流式响应按该速度逐块发送，非流式响应在首 token 延迟上再加生成时间
+                               （None 表示立即返回全部内容）
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"不支持的延迟分布: {distribution}。支持: {', '.join(LATENCY_DISTRIBUTIONS)}")
+        self.distribution = distribution
+        self.mean_ms = mean_ms
+        self.jitter_ms = jitter_ms
+        self.sigma = sigma
+        self.max_ms = max_ms
+        self.tokens_per_second = tokens_per_second
+
+    def sample(self, rng: random.Random) -> float:
+        """采样首 token 延迟（秒）"""
+        if self.mean_ms <= 0:
+            return 0.0
+        if self.distribution == 'uniform':
+            delay = rng.uniform(max(0.0, self.mean_ms - self.jitter_ms), self.mean_ms + self.jitter_ms)
+        elif self.distribution == 'lognormal':
+            delay = rng.lognormvariate(math.log(self.mean_ms) - self.sigma ** 2 / 2, self.sigma)
+        elif self.distribution == 'exponential':
+            delay = rng.expovariate(1.0 / self.mean_ms)
+        else:
+            delay = self.mean_ms
+        if self.max_ms is not None:
+            delay = min(delay, self.max_ms)
+        return delay / 1000.0
+
+    def generation_time(self, completion_tokens: int) -> float:
+        """按输出速度计算生成全部 token 的时间（秒）"""
+        if not self.tokens_per_second:
+            return 0.0
+        return completion_tokens / self.tokens_per_second
+
+
+class FaultInjector:
+    """
+    故障注入
+
+    每个请求按以下顺序判定：周期性 429 突发 -> 每分钟请求数限流 -> 随机 429 -> 随机 5xx -> 随机断开连接。
+    """
+
+    def __init__(self, error_rate: float = 0.0, error_statuses: Optional[List[int]] = None,
+                 rate_limit_rate: float = 0.0, retry_after: Optional[float] = 1.0,
+                 requests_per_minute: Optional[float] = None,
+                 burst_every: Optional[float] = None, burst_duration: float = 0.0,
+                 disconnect_rate: float = 0.0):
+        """
+        Args:
+            error_rate: 返回 5xx 的概率
+            error_statuses: 随机选用的错误状态码
+            rate_limit_rate: 随机返回 429 的概率
+            retry_after: 随机 429 的 Retry-After（秒），None 表示不返回该响应头
+            requests_per_minute: 每分钟请求数上限，超出时返回 429（Retry-After 为需要等待的时间）
+            burst_every: 每隔多少秒进入一次 429 突发期（None 表示不模拟突发）
+            burst_duration: 每次突发持续的秒数，期间所有请求返回 429
+            disconnect_rate: 不返回响应直接断开连接的概率
+        """
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses or [500, 503]
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.burst_every = burst_every
+        self.burst_duration = burst_duration
+        self.disconnect_rate = disconnect_rate
+        self.started_at = time.monotonic()
+
+    def decide(self, rng: random.Random) -> Tuple[Optional[int], Optional[float]]:
+        """
+        判定本次请求的故障
+
+        Returns:
+            (状态码, Retry-After 秒数)；正常响应时状态码为 None，断开连接时为 0
+        """
+        if self.burst_every:
+            phase = (time.monotonic() - self.started_at) % self.burst_every
+            if phase < self.burst_duration:
+                return 429, self.burst_duration - phase
+        if self.request_bucket is not None:
+            wait_time = self.request_bucket.try_acquire(1)
+            if wait_time is not None:
+                return 429, wait_time
+        if self.rate_limit_rate and rng.random() < self.rate_limit_rate:
+            return 429, self.retry_after
+        if self.error_rate and rng.random() < self.error_rate:
+            return rng.choice(self.error_statuses), None
+        if self.disconnect_rate and rng.random() < self.disconnect_rate:
+            return 0, None
+        return None, None
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _split_chunks(text: str, size: int = 16) -> List[str]:
+    return [text[i:i + size] for i in range(0, len(text), size)] or [""]
+
+
+class MockLLMServer:
+    """
+    Mock LLM 服务器
+
+    用法：
+        with MockLLMServer(latency={'mean_ms': 200}, faults={'rate_limit_rate': 0.05}) as server:
+            client = LLMClient(provider="openai", api_key="mock", base_url=server.openai_base_url)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, seed: int = 0,
+                 latency: Optional[Dict] = None, faults: Optional[Dict] = None,
+                 batch_delay: float = 0.0, prompt_cache: bool = True, max_claims: int = 8):
+        """
+        Args:
+            host: 监听地址
+            port: 监听端口（0 表示随机可用端口）
+            seed: 随机种子（响应内容只取决于提示和 seed；延迟和故障在并发下按到达顺序采样）
+            latency: LatencyModel 参数
+            faults: FaultInjector 参数
+            batch_delay: 批处理任务从提交到完成的秒数
+            prompt_cache: 是否模拟提示前缀缓存（相同 system prompt 再次出现时计为缓存命中）
+            max_claims: 每条 review 最多提取的观点数
+        """
+        self.seed = seed
+        self.latency = LatencyModel(**(latency or {}))
+        self.faults = FaultInjector(**(faults or {}))
+        self.batch_delay = batch_delay
+        self.prompt_cache = prompt_cache
+        self.max_claims = max_claims
+
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._cached_prefixes = set()
+        self._files: Dict[str, bytes] = {}
+        self._batches: Dict[str, Dict] = {}
+        self._state_lock = threading.Lock()
+        self._stats = {'requests': 0, 'by_status': {}, 'by_endpoint': {}, 'in_flight': 0, 'max_in_flight': 0}
+
+        self._httpd = ThreadingHTTPServer((host, port), _MockHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict]) -> "MockLLMServer":
+        """根据 mock_server 配置创建"""
+        config = dict(config or {})
+        return cls(**{key: value for key, value in config.items() if key != 'enabled'})
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.url}/v1"
+
+    @property
+    def anthropic_base_url(self) -> str:
+        return self.url
+
+    def start(self) -> "MockLLMServer":
+        """在后台线程中启动"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def stats(self) -> Dict:
+        """请求统计（总数、各状态码、各接口、最大并发）"""
+        with self._state_lock:
+            return json.loads(json.dumps(self._stats))
+
+    # ---- 内部工具 ----
+
+    def _next_id(self, prefix: str) -> str:
+        return f"{prefix}{next(self._ids)}"
+
+    def _sample(self, func):
+        with self._rng_lock:
+            return func(self._rng)
+
+    def _track(self, endpoint: str, delta: int):
+        with self._state_lock:
+            if delta > 0:
+                self._stats['requests'] += 1
+                self._stats['by_endpoint'][endpoint] = self._stats['by_endpoint'].get(endpoint, 0) + 1
+            self._stats['in_flight'] += delta
+            self._stats['max_in_flight'] = max(self._stats['max_in_flight'], self._stats['in_flight'])
+
+    def _count_status(self, status: int):
+        with self._state_lock:
+            key = str(status)
+            self._stats['by_status'][key] = self._stats['by_status'].get(key, 0) + 1
+
+    def _cached_tokens(self, system_prompt: Optional[str]) -> int:
+        """模拟前缀缓存：同一 system prompt 第二次出现起计为缓存命中"""
+        if not self.prompt_cache or not system_prompt:
+            return 0
+        with self._state_lock:
+            if system_prompt in self._cached_prefixes:
+                return _estimate_tokens(system_prompt)
+            self._cached_prefixes.add(system_prompt)
+        return 0
+
+    def complete(self, prompt: str, system_prompt: Optional[str]) -> Tuple[str, Dict[str, int]]:
+        """生成响应文本和 token 用量"""
+        text = mock_completion(prompt, system_prompt, self.seed, self.max_claims)
+        usage = {
+            'prompt_tokens': _estimate_tokens((system_prompt or "") + prompt),
+            'completion_tokens': _estimate_tokens(text),
+            'cached_tokens': self._cached_tokens(system_prompt)
+        }
+        return text, usage
+
+    # ---- 响应体 ----
+
+    def openai_completion(self, model: str, text: str, usage: Dict[str, int]) -> Dict:
+        return {
+            'id': self._next_id("chatcmpl-mock-"),
+            'object': "chat.completion",
+            'created': int(time.time()),
+            'model': model,
+            'choices': [{'index': 0, 'message': {'role': "assistant", 'content': text}, 'finish_reason': "stop"}],
+            'usage': self.openai_usage(usage)
+        }
+
+    @staticmethod
+    def openai_usage(usage: Dict[str, int]) -> Dict:
+        return {
+            'prompt_tokens': usage['prompt_tokens'],
+            'completion_tokens': usage['completion_tokens'],
+            'total_tokens': usage['prompt_tokens'] + usage['completion_tokens'],
+            'prompt_tokens_details': {'cached_tokens': usage['cached_tokens']}
+        }
+
+    def anthropic_message(self, model: str, text: str, usage: Dict[str, int]) -> Dict:
+        return {
+            'id': self._next_id("msg_mock_"),
+            'type': "message",
+            'role': "assistant",
+            'model': model,
+            'content': [{'type': "text", 'text': text}],
+            'stop_reason': "end_turn",
+            'stop_sequence': None,
+            'usage': self.anthropic_usage(usage)
+        }
+
+    @staticmethod
+    def anthropic_usage(usage: Dict[str, int]) -> Dict:
+        return {
+            'input_tokens': usage['prompt_tokens'] - usage['cached_tokens'],
+            'output_tokens': usage['completion_tokens'],
+            'cache_read_input_tokens': usage['cached_tokens'],
+            'cache_creation_input_tokens': 0
+        }
+
+    # ---- 批处理 ----
+
+    def create_openai_batch(self, input_file_id: str, endpoint: str, completion_window: str) -> Optional[Dict]:
+        content = self._files.get(input_file_id)
+        if content is None:
+            return None
+        output_lines, completed, failed = [], 0, 0
+        for line in content.decode('utf-8').splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            body = item.get('body') or {}
+            prompt, system_prompt = _openai_prompts(body.get('messages') or [])
+            status, _ = self._sample(self.faults.decide)
+            if status:
+                failed += 1
+                response = {'status_code': status, 'request_id': self._next_id("req_mock_"),
+                            'body': {'error': {'message': "Mock batch request failed", 'type': "server_error"}}}
+            else:
+                completed += 1
+                text, usage = self.complete(prompt, system_prompt)
+                response = {'status_code': 200, 'request_id': self._next_id("req_mock_"),
+                            'body': self.openai_completion(body.get('model', "mock"), text, usage)}
+            output_lines.append(json.dumps({
+                'id': self._next_id("batch_req_mock_"), 'custom_id': item.get('custom_id'),
+                'response': response, 'error': None
+            }, ensure_ascii=False))
+
+        output_file_id = self._next_id("file-mock-")
+        self._files[output_file_id] = "\n".join(output_lines).encode('utf-8')
+        now = time.time()
+        batch = {
+            'id': self._next_id("batch_mock_"), 'object': "batch", 'endpoint': endpoint, 'errors': None,
+            'input_file_id': input_file_id, 'completion_window': completion_window,
+            'created_at': int(now), 'in_progress_at': int(now), 'expires_at': int(now + 86400),
+            'request_counts': {'total': completed + failed, 'completed': completed, 'failed': failed},
+            'metadata': None, '_ready_at': now + self.batch_delay, '_output_file_id': output_file_id
+        }
+        with self._state_lock:
+            self._batches[batch['id']] = batch
+        return self.openai_batch_view(batch)
+
+    def openai_batch_view(self, batch: Dict) -> Dict:
+        done = time.time() >= batch['_ready_at']
+        view = {key: value for key, value in batch.items() if not key.startswith('_')}
+        view.update({
+            'status': "completed" if done else "in_progress",
+            'output_file_id': batch['_output_file_id'] if done else None,
+            'error_file_id': None,
+            'completed_at': int(batch['_ready_at']) if done else None
+        })
+        return view
+
+    def create_anthropic_batch(self, requests: List[Dict]) -> Dict:
+        results, succeeded, errored = [], 0, 0
+        for request in requests:
+            params = request.get('params') or {}
+            prompt = _anthropic_prompt(params.get('messages') or [])
+            status, _ = self._sample(self.faults.decide)
+            if status:
+                errored += 1
+                result = {'type': "errored", 'error': {'type': "error", 'error': {
+                    'type': "api_error", 'message': "Mock batch request failed"}}}
+            else:
+                succeeded += 1
+                text, usage = self.complete(prompt, _anthropic_system(params.get('system')))
+                result = {'type': "succeeded", 'message': self.anthropic_message(params.get('model', "mock"), text, usage)}
+            results.append(json.dumps({'custom_id': request.get('custom_id'), 'result': result}, ensure_ascii=False))
+
+        now = time.time()
+        batch = {
+            'id': self._next_id("msgbatch_mock_"), 'type': "message_batch",
+            'created_at': _iso(now), 'expires_at': _iso(now + 86400),
+            'archived_at': None, 'cancel_initiated_at': None,
+            '_counts': {'succeeded': succeeded, 'errored': errored},
+            '_ready_at': now + self.batch_delay, '_results': "\n".join(results).encode('utf-8')
+        }
+        with self._state_lock:
+            self._batches[batch['id']] = batch
+        return batch
+
+    def anthropic_batch_view(self, batch: Dict, host: str) -> Dict:
+        done = time.time() >= batch['_ready_at']
+        counts = batch['_counts']
+        view = {key: value for key, value in batch.items() if not key.startswith('_')}
+        view.update({
+            'processing_status': "ended" if done else "in_progress",
+            'request_counts': {
+                'processing': 0 if done else counts['succeeded'] + counts['errored'],
+                'succeeded': counts['succeeded'] if done else 0,
+                'errored': counts['errored'] if done else 0,
+                'canceled': 0, 'expired': 0
+            },
+            'ended_at': _iso(batch['_ready_at']) if done else None,
+            'results_url': f"http://{host}/v1/messages/batches/{batch['id']}/results" if done else None
+        })
+        return view
+
+
+def _openai_prompts(messages: List[Dict]) -> Tuple[str, Optional[str]]:
+    """从 OpenAI messages 中取出 system prompt 和最后一条用户消息"""
+    system_prompt = "\n".join(m.get('content', '') for m in messages if m.get('role') == 'system') or None
+    user_messages = [m.get('content', '') for m in messages if m.get('role') == 'user']
+    return (user_messages[-1] if user_messages else ""), system_prompt
+
+
+def _anthropic_prompt(messages: List[Dict]) -> str:
+    """取出 Anthropic messages 中最后一条用户消息的文本"""
+    for message in reversed(messages):
+        if message.get('role') == 'user':
+            content = message.get('content', '')
+            if isinstance(content, list):
+                return "".join(block.get('text', '') for block in content if block.get('type') == 'text')
+            return content
+    return ""
+
+
+def _anthropic_system(system) -> Optional[str]:
+    """Anthropic 的 system 参数（字符串或文本块列表）转换为文本"""
+    if isinstance(system, list):
+        system = "".join(block.get('text', '') for block in system if block.get('type') == 'text')
+    return system or None
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    """HTTP 请求处理"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def mock(self) -> MockLLMServer:
+        return self.server.mock
+
+    # ---- 基础读写 ----
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send_json(self, status: int, payload, headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self._send_bytes(status, body, "application/json", headers)
+
+    def _send_bytes(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None):
+        self.mock._count_status(status)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, anthropic: bool, message: str, retry_after: Optional[float] = None):
+        headers = {}
+        if retry_after is not None:
+            headers['retry-after'] = str(max(1, math.ceil(retry_after)))
+            headers['retry-after-ms'] = str(int(retry_after * 1000))
+        if anthropic:
+            error_type = "rate_limit_error" if status == 429 else "api_error"
+            payload = {'type': "error", 'error': {'type': error_type, 'message': message}}
+        else:
+            error_type = "rate_limit_exceeded" if status == 429 else "server_error"
+            payload = {'error': {'message': message, 'type': error_type, 'code': error_type}}
+        self._send_json(status, payload, headers)
+
+    def _disconnect(self):
+        self.mock._count_status(0)
+        self.close_connection = True
+        try:
+            self.connection.shutdown(2)
+        except OSError:
+            pass
+
+    def _start_stream(self):
+        self.mock._count_status(200)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+    def _send_event(self, data: Dict, event: Optional[str] = None):
+        prefix = f"event: {event}\n" if event else ""
+        self.wfile.write(f"{prefix}data: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+        self.wfile.flush()
+
+    # ---- 路由 ----
+
+    def _route(self, method: str):
+        path = self.path.split('?')[0].rstrip('/')
+        if path.startswith("/v1/"):
+            path = path[3:]
+        anthropic = path.startswith("/messages")
+        # 统计时去掉路径中的 file / batch ID
+        endpoint = method + " /" + "/".join(
+            segment for segment in path.split('/')[1:]
+            if not segment.startswith(("file-mock-", "batch_mock_", "msgbatch_mock_"))
+        )
+        self.mock._track(endpoint, 1)
+        try:
+            if method == "POST" and path in ("/chat/completions", "/messages"):
+                self._handle_completion(anthropic)
+            elif method == "POST" and path == "/files":
+                self._handle_upload()
+            elif method == "GET" and path.startswith("/files/") and path.endswith("/content"):
+                content = self.mock._files.get(path.split('/')[2])
+                if content is None:
+                    self._send_error(404, False, "File not found")
+                else:
+                    self._send_bytes(200, content, "application/octet-stream")
+            elif method == "POST" and path == "/batches":
+                payload = json.loads(self._read_body() or b"{}")
+                batch = self.mock.create_openai_batch(payload.get('input_file_id'), payload.get('endpoint'),
+                                                      payload.get('completion_window', "24h"))
+                if batch is None:
+                    self._send_error(404, False, "Input file not found")
+                else:
+                    self._send_json(200, batch)
+            elif method == "GET" and path.startswith("/batches/"):
+                batch = self.mock._batches.get(path.split('/')[2])
+                if batch is None:
+                    self._send_error(404, False, "Batch not found")
+                else:
+                    self._send_json(200, self.mock.openai_batch_view(batch))
+            elif method == "POST" and path == "/messages/batches":
+                payload = json.loads(self._read_body() or b"{}")
+                batch = self.mock.create_anthropic_batch(payload.get('requests') or [])
+                self._send_json(200, self.mock.anthropic_batch_view(batch, self.headers.get('Host')))
+            elif method == "GET" and path.startswith("/messages/batches/"):
+                parts = path.split('/')
+                batch = self.mock._batches.get(parts[3])
+                if batch is None:
+                    self._send_error(404, True, "Batch not found")
+                elif len(parts) > 4 and parts[4] == "results":
+                    self._send_bytes(200, batch['_results'], "application/x-jsonl")
+                else:
+                    self._send_json(200, self.mock.anthropic_batch_view(batch, self.headers.get('Host')))
+            elif method == "GET" and path == "/metrics":
+                self._send_json(200, self.mock.stats())
+            else:
+                self._send_error(404, anthropic, f"Unknown endpoint: {method} {self.path}")
+        except (BrokenPipeError, ConnectionResetError):
+            # 客户端提前关闭流式连接
+            self.close_connection = True
+        finally:
+            self.mock._track(endpoint, -1)
+
+    def do_GET(self):
+        self._route("GET")
+
+    def do_POST(self):
+        self._route("POST")
+
+    # ---- 接口实现 ----
+
+    def _handle_upload(self):
+        body = self._read_body()
+        message = BytesParser().parsebytes(
+            f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode('utf-8') + body
+        )
+        content, filename = None, "upload.jsonl"
+        for part in message.get_payload() if message.is_multipart() else []:
+            if part.get_param('name', header='content-disposition') == 'file':
+                content = part.get_payload(decode=True)
+                filename = part.get_filename() or filename
+        if content is None:
+            self._send_error(400, False, "Missing file")
+            return
+        file_id = self.mock._next_id("file-mock-")
+        self.mock._files[file_id] = content
+        self._send_json(200, {
+            'id': file_id, 'object': "file", 'bytes': len(content), 'created_at': int(time.time()),
+            'filename': filename, 'purpose': "batch", 'status': "processed"
+        })
+
+    def _handle_completion(self, anthropic: bool):
+        payload = json.loads(self._read_body() or b"{}")
+        status, retry_after = self.mock._sample(self.mock.faults.decide)
+        if status == 0:
+            self._disconnect()
+            return
+        if status:
+            self._send_error(status, anthropic, f"Mock injected error {status}", retry_after)
+            return
+
+        model = payload.get('model', "mock")
+        if anthropic:
+            prompt, system_prompt = _anthropic_prompt(payload.get('messages') or []), _anthropic_system(payload.get('system'))
+        else:
+            prompt, system_prompt = _openai_prompts(payload.get('messages') or [])
+        text, usage = self.mock.complete(prompt, system_prompt)
+
+        time.sleep(self.mock._sample(self.mock.latency.sample))
+        if not payload.get('stream'):
+            time.sleep(self.mock.latency.generation_time(usage['completion_tokens']))
+            if anthropic:
+                self._send_json(200, self.mock.anthropic_message(model, text, usage))
+            else:
+                self._send_json(200, self.mock.openai_completion(model, text, usage))
+            return
+
+        chunks = _split_chunks(text)
+        chunk_delay = self.mock.latency.generation_time(usage['completion_tokens']) / len(chunks)
+        self._start_stream()
+        if anthropic:
+            self._stream_anthropic(model, chunks, usage, chunk_delay)
+        else:
+            include_usage = (payload.get('stream_options') or {}).get('include_usage', False)
+            self._stream_openai(model, chunks, usage, chunk_delay, include_usage)
+
+    def _stream_openai(self, model: str, chunks: List[str], usage: Dict[str, int], chunk_delay: float,
+                       include_usage: bool):
+        base = {'id': self.mock._next_id("chatcmpl-mock-"), 'object': "chat.completion.chunk",
+                'created': int(time.time()), 'model': model}
+        self._send_event({**base, 'choices': [{'index': 0, 'delta': {'role': "assistant", 'content': ""},
+                                               'finish_reason': None}]})
+        for chunk in chunks:
+            if chunk_delay:
+                time.sleep(chunk_delay)
+            self._send_event({**base, 'choices': [{'index': 0, 'delta': {'content': chunk}, 'finish_reason': None}]})
+        self._send_event({**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': "stop"}]})
+        if include_usage:
+            self._send_event({**base, 'choices': [], 'usage': self.mock.openai_usage(usage)})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _stream_anthropic(self, model: str, chunks: List[str], usage: Dict[str, int], chunk_delay: float):
+        message = self.mock.anthropic_message(model, "", usage)
+        message['content'] = []
+        message['stop_reason'] = None
+        message['usage'] = {**self.mock.anthropic_usage(usage), 'output_tokens': 1}
+        self._send_event({'type': "message_start", 'message': message}, "message_start")
+        self._send_event({'type': "content_block_start", 'index': 0, 'content_block': {'type': "text", 'text': ""}},
+                         "content_block_start")
+        for chunk in chunks:
+            if chunk_delay:
+                time.sleep(chunk_delay)
+            self._send_event({'type': "content_block_delta", 'index': 0,
+                              'delta': {'type': "text_delta", 'text': chunk}}, "content_block_delta")
+        self._send_event({'type': "content_block_stop", 'index': 0}, "content_block_stop")
+        self._send_event({'type': "message_delta", 'delta': {'stop_reason': "end_turn", 'stop_sequence': None},
+                          'usage': {'output_tokens': usage['completion_tokens']}}, "message_delta")
+        self._send_event({'type': "message_stop"}, "message_stop")
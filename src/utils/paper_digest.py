@@ -0,0 +1,185 @@
+"""
+论文摘要缓存
+每篇论文用 LLM 生成一次结构化摘要（数据集、基线、指标、主要结果表、声称的贡献），
+以 JSON 保存在 RAG 索引旁，按论文文本的 SHA-256 失效；
+VerificationAgent 把摘要放入系统提示，作为同一论文所有验证请求共享的前缀（可命中提供商的前缀缓存）
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+from .tracing import traced
+from .usage import BudgetExceededError
+
+
+# 摘要文件格式版本，格式或提示变化时递增使旧摘要失效
+DIGEST_VERSION = 1
+
+# (字段名, 输出标题)
+DIGEST_FIELDS = (
+    ('contributions', 'Claimed contributions'),
+    ('datasets', 'Datasets'),
+    ('baselines', 'Baselines'),
+    ('metrics', 'Metrics'),
+    ('tables', 'Main results / tables'),
+)
+
+# 生成摘要时优先选用的 section 关键词（按顺序）
+DIGEST_SECTION_KEYWORDS = ('abstract', 'introduction', 'experiment', 'evaluation', 'result', 'conclusion')
+
+DIGEST_SYSTEM_PROMPT = "You extract structured facts from academic papers for a fact-checking assistant. Only report what the paper states."
+
+
+def text_hash(paper_text: str) -> str:
+    """论文文本的 SHA-256"""
+    return hashlib.sha256(paper_text.encode('utf-8')).hexdigest()
+
+
+def render_digest(digest: Dict[str, List[str]]) -> str:
+    """
+    把结构化摘要渲染为文本（字段顺序固定，同一摘要总是得到相同的文本，便于前缀缓存）
+
+    Args:
+        digest: 字段名 -> 条目列表
+
+    Returns:
+        摘要文本，没有任何条目时返回空字符串
+    """
+    lines = []
+    for field, title in DIGEST_FIELDS:
+        items = [str(item).strip() for item in digest.get(field) or [] if str(item).strip()]
+        if items:
+            lines.append(f"{title}:")
+            lines.extend(f"- {item}" for item in items)
+    return "\n".join(lines)
+
+
+class PaperDigester:
+    """论文摘要的生成与缓存"""
+
+    def __init__(self, llm_client, cache_dir: Optional[str] = None,
+                 max_input_chars: int = 12000, max_tokens: int = 800):
+        """
+        Args:
+            llm_client: LLM 客户端
+            cache_dir: 摘要保存目录（通常为 rag.index_path），None 表示只在内存中缓存
+            max_input_chars: 送入 LLM 的论文文本最大字符数
+            max_tokens: 摘要响应的最大 token 数
+        """
+        self.llm = llm_client
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_input_chars = max_input_chars
+        self.max_tokens = max_tokens
+        self._memory: Dict[str, Dict] = {}
+
+    def digest_path(self, paper_id: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{paper_id}.digest.json"
+
+    def load(self, paper_id: str, paper_hash: str) -> Optional[Dict[str, List[str]]]:
+        """读取缓存的摘要（文本哈希或格式版本不一致时返回 None）"""
+        data = self._memory.get(paper_id)
+        path = self.digest_path(paper_id)
+        if data is None and path is not None and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"[WARNING] Failed to read paper digest {path}: {e}")
+                return None
+        if data is None or data.get('version') != DIGEST_VERSION or data.get('text_hash') != paper_hash:
+            return None
+        self._memory[paper_id] = data
+        return data['digest']
+
+    def save(self, paper_id: str, paper_hash: str, digest: Dict[str, List[str]]):
+        data = {'version': DIGEST_VERSION, 'text_hash': paper_hash, 'digest': digest}
+        self._memory[paper_id] = data
+        path = self.digest_path(paper_id)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def select_text(self, paper_text: str, paper_sections: Optional[Dict[str, str]] = None) -> str:
+        """
+        选取送入 LLM 的论文文本：优先摘要、引言、实验、结果和结论 section，不足时用论文开头
+
+        Args:
+            paper_text: 论文文本
+            paper_sections: 论文的section字典
+
+        Returns:
+            不超过 max_input_chars 的文本
+        """
+        if not paper_sections:
+            return paper_text[:self.max_input_chars]
+        selected = []
+        for keyword in DIGEST_SECTION_KEYWORDS:
+            for name in paper_sections:
+                if keyword in name.lower() and name not in selected:
+                    selected.append(name)
+        if not selected:
+            return paper_text[:self.max_input_chars]
+        # 每个 section 平分字符预算，避免长的实验 section 挤掉结论
+        per_section = self.max_input_chars // len(selected)
+        parts = [f"## {name}\n{paper_sections[name][:per_section]}" for name in selected]
+        return "\n\n".join(parts)[:self.max_input_chars]
+
+    def build_prompt(self, paper_text: str, paper_sections: Optional[Dict[str, str]] = None) -> str:
+        fields = "\n".join(f'    "{field}": ["..."],' for field, _ in DIGEST_FIELDS).rstrip(',')
+        return f"""Paper digest request. Read the following excerpts of an academic paper and list the facts a reviewer's claims are most often checked against.
+
+Paper Excerpts:
+{self.select_text(paper_text, paper_sections)}
+
+For each field, give short factual items (at most 8 per field). Under "tables", list the main quantitative results as "setting: method vs. baseline = numbers". Use an empty list when the paper does not say.
+
+Return a JSON object in the following format:
+{{
+{fields}
+}}"""
+
+    def parse_response(self, response: str) -> Dict[str, List[str]]:
+        """解析 LLM 响应为 字段名 -> 条目列表（缺失的字段为空列表）"""
+        text = response.strip()
+        if "```" in text:
+            text = text.split("```json")[-1] if "```json" in text else text.split("```")[1]
+            text = text.split("```")[0]
+        data = json.loads(text[text.find('{'):text.rfind('}') + 1])
+        digest = {}
+        for field, _ in DIGEST_FIELDS:
+            value = data.get(field) or []
+            digest[field] = [value] if isinstance(value, str) else [str(item) for item in value]
+        return digest
+
+    @traced("agent.paper_digest", context={'agent': 'digest'})
+    def get(self, paper_id: str, paper_text: str, paper_sections: Optional[Dict[str, str]] = None) -> str:
+        """
+        获取论文摘要文本（命中缓存时不调用 LLM）
+
+        Args:
+            paper_id: 论文 ID
+            paper_text: 论文文本
+            paper_sections: 论文的section字典
+
+        Returns:
+            摘要文本，生成失败时返回空字符串
+        """
+        paper_hash = text_hash(paper_text)
+        digest = self.load(paper_id, paper_hash)
+        if digest is None:
+            print(f"[INFO] Generating paper digest for {paper_id}...")
+            try:
+                response = self.llm.call(self.build_prompt(paper_text, paper_sections), DIGEST_SYSTEM_PROMPT,
+                                         max_tokens=self.max_tokens, expect_json='object')
+                digest = self.parse_response(response)
+            except BudgetExceededError:
+                raise
+            except Exception as e:
+                print(f"[WARNING] Failed to generate paper digest for {paper_id}: {e}")
+                return ""
+            self.save(paper_id, paper_hash, digest)
+        return render_digest(digest)
@@ -10,6 +10,7 @@ RAG (Retrieval-Augmented Generation) 工具
 from typing import List, Dict, Tuple, Optional
 import re
 from collections import Counter
+from .tracing import traced
 
 
 class SimpleRAG:
@@ -107,6 +108,7 @@ class SimpleRAG:
         # 归一化到 0-1
         return min(base_score, 1.0)
     
+    @traced("rag.simple.retrieve")
     def retrieve_relevant_chunks(self, paper_text: str, query: str, top_k: int = 5, 
                                   target_section: str = None, paper_sections: Dict[str, str] = None) -> List[Tuple[str, float]]:
         """
@@ -5,6 +5,8 @@
 
 from typing import List, Tuple, Optional, Dict, Union
 from sentence_transformers import CrossEncoder
+from .hierarchical_rag import HierarchicalRAG
+from .tracing import get_tracer, traced
 
 
 class RerankingRAG:
@@ -24,7 +26,7 @@ class RerankingRAG:
                  use_reranking: bool = True):
         """
         Args:
-            base_rag: 基础 RAG 实例（SimpleRAG, EmbeddingRAG, 或 HybridRAG）
+            base_rag: 基础 RAG 实例（SimpleRAG, EmbeddingRAG, HybridRAG 或 HierarchicalRAG）
             reranker_model: Cross-Encoder 模型名称
             initial_top_k: 初步检索返回的候选数量（重排序前）
             use_reranking: 是否启用重排序（如果为False，直接使用基础RAG的结果）
@@ -45,6 +47,7 @@ class RerankingRAG:
         else:
             self.reranker = None
     
+    @traced("rag.reranking.retrieve")
     def retrieve_relevant_chunks(self, 
                                 paper_text: Optional[str] = None,
                                 query: str = "",
@@ -55,7 +58,7 @@ class RerankingRAG:
         检索相关文本块（带重排序）
         
         Args:
-            paper_text: 论文文本（SimpleRAG 和 HybridRAG 需要，EmbeddingRAG 不需要）
+            paper_text: 论文文本（SimpleRAG 和 HybridRAG 需要，EmbeddingRAG / HierarchicalRAG 不需要）
             query: 查询文本
             top_k: 返回前 k 个最相关的块
             target_section: 目标section名称（如果指定，只在该section中检索）
@@ -77,8 +80,8 @@ class RerankingRAG:
                     paper_text, query, top_k=self.initial_top_k,
                     target_section=target_section, paper_sections=paper_sections
                 )
-            elif isinstance(self.base_rag, EmbeddingRAG):
-                # Embedding RAG: 不需要 paper_text（已构建索引）
+            elif isinstance(self.base_rag, (EmbeddingRAG, HierarchicalRAG)):
+                # Embedding / Hierarchical RAG: 不需要 paper_text（已构建索引）
                 candidates = self.base_rag.retrieve_relevant_chunks(
                     query, top_k=self.initial_top_k, target_section=target_section
                 )
@@ -107,7 +110,8 @@ class RerankingRAG:
         
         # 计算重排序分数
         try:
-            rerank_scores = self.reranker.predict(pairs)
+            with get_tracer().span("rag.reranking.rerank", num_pairs=len(pairs)):
+                rerank_scores = self.reranker.predict(pairs)
         except Exception as e:
             print(f"[WARNING] Reranking failed: {e}, using original scores")
             return candidates[:top_k]
@@ -137,7 +141,7 @@ class RerankingRAG:
         获取与查询相关的上下文（合并多个块）
         
         Args:
-            paper_text: 论文文本（SimpleRAG 和 HybridRAG 需要，EmbeddingRAG 不需要）
+            paper_text: 论文文本（SimpleRAG 和 HybridRAG 需要，EmbeddingRAG / HierarchicalRAG 不需要）
             query: 查询文本
             top_k: 返回前 k 个最相关的块
             target_section: 目标section名称
@@ -170,7 +174,7 @@ class RerankingRAG:
         from ..utils.embedding_rag import EmbeddingRAG
         from ..utils.hybrid_rag import HybridRAG
         
-        if isinstance(self.base_rag, (EmbeddingRAG, HybridRAG)):
+        if isinstance(self.base_rag, (EmbeddingRAG, HybridRAG, HierarchicalRAG)):
             self.base_rag.build_index(paper_text, save_path, paper_sections)
     
     def load_index(self, load_path: str):
@@ -178,7 +182,7 @@ class RerankingRAG:
         from ..utils.embedding_rag import EmbeddingRAG
         from ..utils.hybrid_rag import HybridRAG
         
-        if isinstance(self.base_rag, (EmbeddingRAG, HybridRAG)):
+        if isinstance(self.base_rag, (EmbeddingRAG, HybridRAG, HierarchicalRAG)):
             self.base_rag.load_index(load_path)
     
     def is_built(self) -> bool:
@@ -186,7 +190,7 @@ class RerankingRAG:
         from ..utils.embedding_rag import EmbeddingRAG
         from ..utils.hybrid_rag import HybridRAG
         
-        if isinstance(self.base_rag, (EmbeddingRAG, HybridRAG)):
+        if isinstance(self.base_rag, (EmbeddingRAG, HybridRAG, HierarchicalRAG)):
             return self.base_rag.is_built()
         return True  # SimpleRAG 不需要构建索引
 
@@ -0,0 +1,255 @@
+"""
+LLM 请求调度器
+为每个提供商提供令牌桶限流（请求/分钟、token/分钟）、
+带抖动的指数退避重试（遵守 Retry-After）以及基于 429 的自适应并发控制
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional, Tuple
+
+
+class TokenBucket:
+    """线程安全的令牌桶，按分钟速率补充"""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        """
+        Args:
+            rate_per_minute: 每分钟补充的令牌数
+            capacity: 桶容量（突发上限），默认等于每分钟速率
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self, amount: float = 1.0):
+        """
+        获取令牌，不足时阻塞等待
+
+        Args:
+            amount: 需要的令牌数（超过容量时按容量计算，避免永久阻塞）
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait_time = (amount - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    def try_acquire(self, amount: float = 1.0) -> Optional[float]:
+        """
+        非阻塞地获取令牌
+
+        Returns:
+            获取成功返回 None，否则返回需要等待的秒数
+        """
+        amount = min(amount, self.capacity)
+        with self.lock:
+            self._refill()
+            if self.tokens >= amount:
+                self.tokens -= amount
+                return None
+            return (amount - self.tokens) / self.rate
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    自适应并发限制（AIMD）
+    遇到 429 时并发上限减半，连续成功后逐步加一；
+    只有并发发出的请求（LLMClient.batch_call）会受限，逐条串行调用时并发数始终为 1
+    """
+
+    def __init__(self, max_concurrency: int = 8, min_concurrency: int = 1,
+                 increase_after: int = 10):
+        """
+        Args:
+            max_concurrency: 并发上限
+            min_concurrency: 并发下限
+            increase_after: 连续成功多少次后将并发上限加一
+        """
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.increase_after = increase_after
+        self.limit = self.max_concurrency
+        self.active = 0
+        self.successes = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify()
+
+    def on_success(self):
+        with self.condition:
+            self.successes += 1
+            if self.successes >= self.increase_after and self.limit < self.max_concurrency:
+                self.limit += 1
+                self.successes = 0
+                self.condition.notify()
+
+    def on_rate_limited(self):
+        with self.condition:
+            self.successes = 0
+            new_limit = max(self.min_concurrency, self.limit // 2)
+            if new_limit < self.limit:
+                print(f"[Scheduler] Rate limited, reducing concurrency {self.limit} -> {new_limit}")
+            self.limit = new_limit
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    从响应头中解析 Retry-After（秒数或 HTTP 日期），同时支持 retry-after-ms
+
+    Args:
+        headers: 响应头（dict 或 httpx.Headers）
+
+    Returns:
+        需要等待的秒数，无法解析时返回 None
+    """
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000.0)
+        except (TypeError, ValueError):
+            pass
+
+    retry_after = headers.get('retry-after')
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """单个提供商的请求调度器"""
+
+    def __init__(self,
+                 requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None,
+                 max_concurrency: int = 8,
+                 min_concurrency: int = 1,
+                 max_retries: int = 5,
+                 base_delay: float = 1.0,
+                 max_delay: float = 60.0):
+        """
+        Args:
+            requests_per_minute: 每分钟请求数上限（None 表示不限制）
+            tokens_per_minute: 每分钟 token 数上限（None 表示不限制）
+            max_concurrency: 最大并发请求数
+            min_concurrency: 自适应降级时的最小并发数
+            max_retries: 可重试错误的最大重试次数
+            base_delay: 指数退避的初始等待时间（秒）
+            max_delay: 单次退避的最长等待时间（秒）
+        """
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.concurrency = AdaptiveConcurrencyLimiter(max_concurrency, min_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        计算第 attempt 次重试前的等待时间（full jitter 指数退避）
+
+        如果服务端给出了 Retry-After，则至少等待该时间
+        """
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def run(self, fn: Callable[[], object], estimated_tokens: int = 0,
+            classify_error: Optional[Callable[[Exception], Tuple[bool, bool, Optional[float]]]] = None):
+        """
+        在限流和重试策略下执行请求
+
+        Args:
+            fn: 实际发起请求的无参函数
+            estimated_tokens: 本次请求预估消耗的 token 数（用于 token/分钟 限流）
+            classify_error: 错误分类函数，返回 (是否可重试, 是否为限流错误, Retry-After 秒数)
+
+        Returns:
+            fn 的返回值
+        """
+        attempt = 0
+        while True:
+            if self.request_bucket:
+                self.request_bucket.acquire(1)
+            if self.token_bucket and estimated_tokens:
+                self.token_bucket.acquire(estimated_tokens)
+
+            self.concurrency.acquire()
+            try:
+                result = fn()
+            except Exception as e:
+                retryable, rate_limited, retry_after = (
+                    classify_error(e) if classify_error else (False, False, None)
+                )
+                if rate_limited:
+                    self.concurrency.on_rate_limited()
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt, retry_after)
+                print(f"[Scheduler] Request failed ({e.__class__.__name__}), "
+                      f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                attempt += 1
+            else:
+                self.concurrency.on_success()
+                return result
+            finally:
+                self.concurrency.release()
+
+            time.sleep(delay)
+
+
+_schedulers: Dict[Tuple, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(provider: str, **kwargs) -> RequestScheduler:
+    """
+    获取共享的调度器（同一进程内提供商和限流配置相同的 LLMClient 共享同一份限流状态，
+    配置不同的客户端使用各自的调度器）
+
+    Args:
+        provider: 提供商名称
+        **kwargs: 传给 RequestScheduler 的参数
+
+    Returns:
+        RequestScheduler 实例
+    """
+    key = (provider, tuple(sorted(kwargs.items())))
+    with _schedulers_lock:
+        if key not in _schedulers:
+            _schedulers[key] = RequestScheduler(**kwargs)
+        return _schedulers[key]
@@ -0,0 +1,406 @@
+"""
+流程级指标与追踪
+记录各阶段耗时、LLM 延迟与 token 用量、Embedding 编码、索引构建/加载、缓存命中和检索延迟，
+以 JSONL 输出，可选导出到 OpenTelemetry
+"""
+
+import contextvars
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+
+# 当前上下文属性（paper_id / stage / agent 等）和当前 span，跨函数调用自动继承
+_context_attributes: contextvars.ContextVar[Dict] = contextvars.ContextVar("trace_context", default={})
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("trace_span", default=None)
+_span_ids = itertools.count(1)
+
+
+class Span:
+    """一次计时操作"""
+
+    __slots__ = ("name", "span_id", "parent", "attributes", "start_time", "start_perf",
+                 "duration", "status", "error", "exporter_data")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict):
+        self.name = name
+        self.span_id = f"{os.getpid()}-{next(_span_ids)}"
+        self.parent = parent
+        self.attributes = attributes
+        self.start_time = time.time()
+        self.start_perf = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.exporter_data: Dict = {}
+
+    def set(self, key: str, value):
+        """设置属性"""
+        self.attributes[key] = value
+
+    def add(self, key: str, value: float):
+        """累加数值属性（如多次重试的 token 用量）"""
+        self.attributes[key] = self.attributes.get(key, 0) + value
+
+    def to_record(self) -> Dict:
+        return {
+            "type": "span",
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "start": self.start_time,
+            "duration_ms": self.duration * 1000 if self.duration is not None else None,
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes
+        }
+
+
+class _NullSpan:
+    """追踪关闭时使用的空 span"""
+
+    def set(self, key: str, value):
+        pass
+
+    def add(self, key: str, value: float):
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class JSONLExporter:
+    """把 span 和事件逐行追加到 JSONL 文件"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 输出文件路径（追加写）
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def on_start(self, span: Span):
+        pass
+
+    def on_end(self, span: Span):
+        self._write(span.to_record())
+
+    def on_event(self, record: Dict, span: Optional[Span]):
+        self._write(record)
+
+    def _write(self, record: Dict):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class OpenTelemetryExporter:
+    """
+    导出到 OpenTelemetry（需要安装 opentelemetry-api / opentelemetry-sdk）
+
+    未指定 endpoint 时使用进程中已配置的全局 TracerProvider；
+    指定 endpoint 时创建带 OTLP exporter 的 TracerProvider（需要 opentelemetry-exporter-otlp）。
+    """
+
+    def __init__(self, service_name: str = "evw-pipeline", endpoint: Optional[str] = None):
+        from opentelemetry import trace
+
+        self._trace = trace
+        if endpoint:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+            self._provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+            self._provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+            self._tracer = self._provider.get_tracer("evw")
+        else:
+            self._provider = None
+            self._tracer = trace.get_tracer("evw")
+
+    @staticmethod
+    def _attributes(attributes: Dict) -> Dict:
+        # OpenTelemetry 只接受基本类型属性
+        return {key: value if isinstance(value, (str, bool, int, float)) else str(value)
+                for key, value in attributes.items() if value is not None}
+
+    def on_start(self, span: Span):
+        context = None
+        if span.parent is not None and "otel" in span.parent.exporter_data:
+            context = self._trace.set_span_in_context(span.parent.exporter_data["otel"])
+        span.exporter_data["otel"] = self._tracer.start_span(
+            span.name, context=context, start_time=int(span.start_time * 1e9)
+        )
+
+    def on_end(self, span: Span):
+        otel_span = span.exporter_data.pop("otel", None)
+        if otel_span is None:
+            return
+        otel_span.set_attributes(self._attributes(span.attributes))
+        if span.status == "error":
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=int((span.start_time + span.duration) * 1e9))
+
+    def on_event(self, record: Dict, span: Optional[Span]):
+        if span is not None and "otel" in span.exporter_data:
+            span.exporter_data["otel"].add_event(record["name"], self._attributes(record["attributes"]))
+
+    def close(self):
+        if self._provider is not None:
+            self._provider.shutdown()
+
+
+class Tracer:
+    """
+    追踪器
+
+    没有 exporter 时 span 和事件都是空操作，只保留上下文属性绑定，对未开启追踪的运行几乎没有开销。
+    """
+
+    def __init__(self, exporters: Optional[List] = None):
+        self.exporters = list(exporters or [])
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    @contextmanager
+    def context(self, **attributes):
+        """
+        绑定上下文属性（如 paper_id、stage、agent），其中创建的 span 和事件都会带上这些属性
+
+        追踪关闭时同样绑定，token 用量统计按这些属性分组。
+        """
+        merged = dict(_context_attributes.get())
+        merged.update({key: value for key, value in attributes.items() if value is not None})
+        token = _context_attributes.set(merged)
+        try:
+            yield
+        finally:
+            _context_attributes.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        记录一次计时操作
+
+        Args:
+            name: span 名称（如 "pipeline.step2"、"llm.call"、"rag.retrieve"）
+            **attributes: 初始属性
+
+        Yields:
+            Span（追踪关闭时为空 span），可在执行过程中 set/add 属性
+        """
+        if not self.enabled:
+            yield NULL_SPAN
+            return
+        span = Span(name, _current_span.get(), {**_context_attributes.get(), **attributes})
+        token = _current_span.set(span)
+        for exporter in self.exporters:
+            exporter.on_start(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = f"{e.__class__.__name__}: {e}"
+            raise
+        finally:
+            span.duration = time.perf_counter() - span.start_perf
+            _current_span.reset(token)
+            for exporter in self.exporters:
+                exporter.on_end(span)
+
+    def event(self, name: str, **attributes):
+        """
+        记录一个瞬时事件（如缓存命中/未命中）
+
+        Args:
+            name: 事件名称（如 "cache.rag_index"）
+            **attributes: 事件属性（缓存事件使用 hit=True/False）
+        """
+        if not self.enabled:
+            return
+        span = _current_span.get()
+        record = {
+            "type": "event",
+            "name": name,
+            "span_id": span.span_id if span else None,
+            "time": time.time(),
+            "attributes": {**_context_attributes.get(), **attributes}
+        }
+        for exporter in self.exporters:
+            exporter.on_event(record, span)
+
+    def current_context(self) -> Dict:
+        """当前绑定的上下文属性"""
+        return _context_attributes.get()
+
+    def current_span(self):
+        """当前 span（没有时返回空 span）"""
+        return _current_span.get() or NULL_SPAN
+
+    def add_exporter(self, exporter):
+        self.exporters.append(exporter)
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+        self.exporters = []
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """获取进程级追踪器"""
+    return _tracer
+
+
+def configure_tracing(config: Optional[Dict]) -> Tracer:
+    """
+    根据配置开启追踪
+
+    Args:
+        config: tracing 配置（enabled, jsonl_path, otel, otel_endpoint, service_name）
+
+    Returns:
+        进程级追踪器
+    """
+    config = config or {}
+    if not config.get('enabled', False) or _tracer.enabled:
+        return _tracer
+
+    jsonl_path = config.get('jsonl_path')
+    if jsonl_path:
+        jsonl_path = jsonl_path.format(timestamp=time.strftime("%Y%m%d-%H%M%S"), pid=os.getpid())
+        _tracer.add_exporter(JSONLExporter(jsonl_path))
+        print(f"[Tracing] Writing traces to {jsonl_path}")
+
+    if config.get('otel', False):
+        try:
+            _tracer.add_exporter(OpenTelemetryExporter(
+                service_name=config.get('service_name', 'evw-pipeline'),
+                endpoint=config.get('otel_endpoint')
+            ))
+            print("[Tracing] OpenTelemetry exporter enabled")
+        except ImportError as e:
+            print(f"[WARNING] OpenTelemetry not installed ({e}), skipping OTel exporter")
+
+    return _tracer
+
+
+def traced(name: str, context: Optional[Dict] = None, **static_attributes):
+    """
+    把整个函数调用记录为一个 span 的装饰器
+
+    Args:
+        name: span 名称
+        context: 调用期间绑定的上下文属性（如 {'agent': 'verification'}），内部的 span 也会带上
+        **static_attributes: span 的固定属性
+    """
+    context = context or {}
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _tracer.context(**context), _tracer.span(name, **static_attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def trace_stage(stage: str):
+    """
+    流程阶段装饰器：绑定 stage / paper_id 上下文并记录阶段耗时
+
+    被装饰方法的第一个参数为 paper_id（字符串）或 paper_ids（列表）。
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, papers, *args, **kwargs):
+            if isinstance(papers, str):
+                context, attributes = {'stage': stage, 'paper_id': papers}, {}
+            else:
+                context, attributes = {'stage': stage}, {'num_papers': len(papers)}
+            with _tracer.context(**context), _tracer.span(f"pipeline.{stage}", **attributes):
+                return func(self, papers, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def read_trace(paths: Iterable[str]) -> Iterable[Dict]:
+    """逐条读取 JSONL 追踪文件"""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+
+def summarize_trace(records: Iterable[Dict]) -> Dict:
+    """
+    汇总追踪记录
+
+    Args:
+        records: span / 事件记录
+
+    Returns:
+        {'spans': {name: {count, errors, total_s, mean_ms, p50_ms, p95_ms, max_ms}},
+         'tokens': {prompt_tokens, completion_tokens, cached_tokens},
+         'caches': {name: {hits, misses, hit_rate}}}
+    """
+    durations: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    tokens = {'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0}
+    caches: Dict[str, Dict] = {}
+
+    for record in records:
+        attributes = record.get('attributes', {})
+        if record.get('type') == 'span':
+            name = record['name']
+            durations.setdefault(name, []).append(record.get('duration_ms') or 0.0)
+            if record.get('status') == 'error':
+                errors[name] = errors.get(name, 0) + 1
+            if name == 'llm.request':
+                for key in tokens:
+                    tokens[key] += attributes.get(key, 0) or 0
+        elif record.get('type') == 'event' and 'hit' in attributes:
+            cache = caches.setdefault(record['name'], {'hits': 0, 'misses': 0})
+            cache['hits' if attributes['hit'] else 'misses'] += 1
+
+    def percentile(values: List[float], q: float) -> float:
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    spans = {}
+    for name, values in durations.items():
+        values.sort()
+        spans[name] = {
+            'count': len(values),
+            'errors': errors.get(name, 0),
+            'total_s': sum(values) / 1000,
+            'mean_ms': sum(values) / len(values),
+            'p50_ms': percentile(values, 0.5),
+            'p95_ms': percentile(values, 0.95),
+            'max_ms': values[-1]
+        }
+    for cache in caches.values():
+        total = cache['hits'] + cache['misses']
+        cache['hit_rate'] = cache['hits'] / total if total else None
+
+    return {'spans': spans, 'tokens': tokens, 'caches': caches}
@@ -0,0 +1,236 @@
+"""
+LLM token 用量与费用统计
+按 agent / 论文 / 阶段汇总每次调用的 prompt、completion 和缓存命中 token，
+按模型价格表计算费用，并支持费用 / token 预算（超出时暂停或中止）
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+from .tracing import get_tracer
+
+
+# 汇总维度：tracing 上下文属性名
+USAGE_DIMENSIONS = ('agent', 'paper_id', 'stage')
+
+BUDGET_ACTIONS = ('pause', 'abort')
+
+
+class BudgetExceededError(RuntimeError):
+    """费用或 token 超出预算"""
+
+    def __init__(self, message: str, action: str = 'abort'):
+        super().__init__(message)
+        self.action = action
+
+
+class PriceTable:
+    """
+    模型价格表（美元 / 百万 token）
+
+    每个模型包含 input（未命中缓存的输入）、cached_input（缓存命中的输入，缺省等于 input）
+    和 output；模型名按精确匹配，其次按最长前缀匹配（如 "gpt-4o-2024-08-06" 使用 "gpt-4o" 的价格）。
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Dict]] = None, batch_discount: float = 0.5):
+        """
+        Args:
+            prices: 模型价格，key 为模型名
+            batch_discount: 离线批处理相对在线价格的折扣系数
+        """
+        self.prices = {model: dict(price) for model, price in (prices or {}).items()}
+        self.batch_discount = batch_discount
+        self._unknown_models = set()
+
+    def lookup(self, model: str) -> Optional[Dict]:
+        """查找模型价格，没有配置时返回 None"""
+        if model in self.prices:
+            return self.prices[model]
+        matches = [name for name in self.prices if model.startswith(name)]
+        if matches:
+            return self.prices[max(matches, key=len)]
+        return None
+
+    def cost(self, model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0,
+             batch: bool = False) -> float:
+        """
+        计算一次调用的费用
+
+        Args:
+            model: 模型名
+            prompt_tokens: 输入 token 数（包含缓存命中部分）
+            completion_tokens: 输出 token 数
+            cached_tokens: 缓存命中的输入 token 数
+            batch: 是否为离线批处理请求
+
+        Returns:
+            美元费用，模型没有配置价格时为 0
+        """
+        price = self.lookup(model)
+        if price is None:
+            if model not in self._unknown_models:
+                self._unknown_models.add(model)
+                print(f"[WARNING] No price configured for model {model}, cost counted as 0")
+            return 0.0
+        input_price = price.get('input', 0.0)
+        cached_price = price.get('cached_input', input_price)
+        cost = ((prompt_tokens - cached_tokens) * input_price
+                + cached_tokens * cached_price
+                + completion_tokens * price.get('output', 0.0)) / 1e6
+        return cost * self.batch_discount if batch else cost
+
+
+def _empty_bucket() -> Dict:
+    return {'calls': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cached_tokens': 0,
+            'estimated_calls': 0, 'cost': 0.0}
+
+
+class UsageTracker:
+    """
+    线程安全的用量统计
+
+    预算动作：
+    - abort: 超出后下一次请求前抛出 BudgetExceededError，立即停止
+    - pause: 正在处理的论文继续完成，由流程在论文之间检查 should_pause() 并停止，
+             已完成论文的结果都已保存，提高预算后对剩余论文重新运行即可继续
+    """
+
+    def __init__(self, price_table: Optional[PriceTable] = None, max_cost: Optional[float] = None,
+                 max_tokens: Optional[int] = None, on_exceed: str = 'pause'):
+        """
+        Args:
+            price_table: 价格表（None 表示只统计 token）
+            max_cost: 费用上限（美元），None 表示不限制
+            max_tokens: token 上限（prompt + completion），None 表示不限制
+            on_exceed: 超出预算时的动作，"pause" 或 "abort"
+        """
+        if on_exceed not in BUDGET_ACTIONS:
+            raise ValueError(f"不支持的预算动作: {on_exceed}。支持: {', '.join(BUDGET_ACTIONS)}")
+        self.price_table = price_table or PriceTable()
+        self.max_cost = max_cost
+        self.max_tokens = max_tokens
+        self.on_exceed = on_exceed
+        self.total = _empty_bucket()
+        self.by_model: Dict[str, Dict] = {}
+        self.by_dimension: Dict[str, Dict[str, Dict]] = {name: {} for name in USAGE_DIMENSIONS}
+        self._lock = threading.Lock()
+        self._warned = False
+
+    @classmethod
+    def from_config(cls, pricing: Optional[Dict] = None, budget: Optional[Dict] = None) -> "UsageTracker":
+        """
+        根据 llm.pricing / llm.budget 配置创建
+
+        Args:
+            pricing: {'models': {model: {input, cached_input, output}}, 'batch_discount': 0.5}
+            budget: {'max_cost': ..., 'max_tokens': ..., 'on_exceed': 'pause' | 'abort'}
+        """
+        pricing = pricing or {}
+        budget = budget or {}
+        return cls(
+            price_table=PriceTable(pricing.get('models'), pricing.get('batch_discount', 0.5)),
+            max_cost=budget.get('max_cost'),
+            max_tokens=budget.get('max_tokens'),
+            on_exceed=budget.get('on_exceed', 'pause')
+        )
+
+    def record(self, model: str, usage: Dict[str, int], batch: bool = False, estimated: bool = False,
+               attributes: Optional[Dict] = None) -> float:
+        """
+        记录一次调用的用量
+
+        Args:
+            model: 模型名
+            usage: extract_usage 的输出（prompt_tokens, completion_tokens, cached_tokens）
+            batch: 是否为离线批处理请求（按批处理折扣计费）
+            estimated: 用量是否为估算值（如提前关闭的流没有返回 usage）
+            attributes: 分组属性，默认取当前 tracing 上下文（agent / paper_id / stage）
+
+        Returns:
+            本次调用的费用
+        """
+        prompt_tokens = usage.get('prompt_tokens', 0)
+        completion_tokens = usage.get('completion_tokens', 0)
+        cached_tokens = usage.get('cached_tokens', 0)
+        cost = self.price_table.cost(model, prompt_tokens, completion_tokens, cached_tokens, batch)
+        if attributes is None:
+            attributes = get_tracer().current_context()
+
+        with self._lock:
+            buckets = [self.total, self.by_model.setdefault(model, _empty_bucket())]
+            for name in USAGE_DIMENSIONS:
+                buckets.append(self.by_dimension[name].setdefault(str(attributes.get(name, 'unknown')), _empty_bucket()))
+            for bucket in buckets:
+                bucket['calls'] += 1
+                bucket['prompt_tokens'] += prompt_tokens
+                bucket['completion_tokens'] += completion_tokens
+                bucket['cached_tokens'] += cached_tokens
+                bucket['estimated_calls'] += int(estimated)
+                bucket['cost'] += cost
+            exceeded = self._exceeded_reason()
+            warn = exceeded is not None and not self._warned
+            self._warned = self._warned or warn
+
+        span = get_tracer().current_span()
+        span.set('cost', cost)
+        if warn:
+            print(f"[WARNING] Budget exceeded: {exceeded} (action: {self.on_exceed})")
+        return cost
+
+    def _exceeded_reason(self) -> Optional[str]:
+        if self.max_cost is not None and self.total['cost'] >= self.max_cost:
+            return f"cost ${self.total['cost']:.4f} >= ${self.max_cost:.4f}"
+        tokens = self.total['prompt_tokens'] + self.total['completion_tokens']
+        if self.max_tokens is not None and tokens >= self.max_tokens:
+            return f"{tokens} tokens >= {self.max_tokens}"
+        return None
+
+    def budget_exceeded(self) -> Optional[str]:
+        """超出预算时返回原因，否则返回 None"""
+        with self._lock:
+            return self._exceeded_reason()
+
+    def check_request(self):
+        """每次请求前调用：on_exceed 为 abort 且已超出预算时抛出 BudgetExceededError"""
+        if self.on_exceed != 'abort':
+            return
+        reason = self.budget_exceeded()
+        if reason:
+            raise BudgetExceededError(f"预算已用尽，中止请求: {reason}", action='abort')
+
+    def should_pause(self) -> bool:
+        """工作单元（论文 / 批处理任务）之间调用：已超出预算时返回 True"""
+        return self.budget_exceeded() is not None
+
+    def summary(self) -> Dict:
+        """用量汇总（total / by_model / by_agent / by_paper_id / by_stage）"""
+        with self._lock:
+            result = {
+                'total': dict(self.total),
+                'by_model': {key: dict(value) for key, value in self.by_model.items()}
+            }
+            for name, buckets in self.by_dimension.items():
+                result[f'by_{name}'] = {key: dict(value) for key, value in buckets.items()}
+            result['budget'] = {'max_cost': self.max_cost, 'max_tokens': self.max_tokens,
+                                'on_exceed': self.on_exceed, 'exceeded': self._exceeded_reason()}
+        return result
+
+    def save(self, path: str):
+        """保存用量汇总为 JSON 文件"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+
+    def print_summary(self, dimensions=('stage', 'agent')):
+        """打印用量汇总"""
+        summary = self.summary()
+        total = summary['total']
+        print(f"[Usage] {total['calls']} calls, prompt={total['prompt_tokens']} "
+              f"(cached={total['cached_tokens']}), completion={total['completion_tokens']}, "
+              f"cost=${total['cost']:.4f}")
+        for name in dimensions:
+            for key, bucket in sorted(summary[f'by_{name}'].items()):
+                print(f"  {name}={key}: {bucket['calls']} calls, prompt={bucket['prompt_tokens']}, "
+                      f"completion={bucket['completion_tokens']}, cost=${bucket['cost']:.4f}")
@@ -11,6 +11,7 @@ import yaml
 import time
 from pathlib import Path
 from typing import Dict, List, Tuple
+from src.data.reviews import Review, load_review_file
 from src.utils.llm_client import LLMClient
 
 # Set UTF-8 encoding for Windows
@@ -45,12 +46,12 @@ def load_config() -> Dict:
     return config
 
 
-def summarize_reviews_with_deepseek(reviews: List[Dict], llm_client: LLMClient) -> str:
+def summarize_reviews_with_deepseek(reviews: List[Review], llm_client: LLMClient) -> str:
     """
     Use DeepSeek to summarize reviews and get accept/reject decision
     
     Args:
-        reviews: List of review dictionaries
+        reviews: List of normalized Review records
         llm_client: LLMClient instance
         
     Returns:
@@ -59,11 +60,9 @@ def summarize_reviews_with_deepseek(reviews: List[Dict], llm_client: LLMClient)
     # Combine all reviews
     review_texts = []
     for i, review in enumerate(reviews, 1):
-        review_content = review.get('content', {})
-        review_text = review_content.get('review', '')
-        rating = review_content.get('rating', 'N/A')
+        rating = f"{review.rating:g}" if review.rating is not None else 'N/A'
         
-        review_texts.append(f"Review {i} (Rating: {rating}):\n{review_text}\n")
+        review_texts.append(f"Review {i} (Rating: {rating}):\n{review.text}\n")
     
     combined_reviews = "\n".join(review_texts)
     
@@ -164,8 +163,7 @@ def main():
             print(f"  Skipping: No reviews found")
             continue
         
-        with open(reviews_path, 'r', encoding='utf-8') as f:
-            reviews = json.load(f)
+        reviews = load_review_file(reviews_path)
         
         if not reviews:
             print(f"  Skipping: Empty reviews")
@@ -10,6 +10,7 @@ import yaml
 import time
 from pathlib import Path
 from typing import Dict, List
+from src.data.reviews import Review, load_review_file
 from src.utils.llm_client import LLMClient
 
 # Set UTF-8 encoding for Windows
@@ -44,12 +45,12 @@ def load_config() -> Dict:
     return config
 
 
-def summarize_reviews_improved(reviews: List[Dict], llm_client: LLMClient, method: str = "default") -> str:
+def summarize_reviews_improved(reviews: List[Review], llm_client: LLMClient, method: str = "default") -> str:
     """
     Use DeepSeek to summarize reviews with improved prompts
     
     Args:
-        reviews: List of review dictionaries
+        reviews: List of normalized Review records
         llm_client: LLMClient instance
         method: "default", "detailed", or "rating_focused"
         
@@ -61,18 +62,12 @@ def summarize_reviews_improved(reviews: List[Dict], llm_client: LLMClient, metho
     ratings = []
     
     for i, review in enumerate(reviews, 1):
-        review_content = review.get('content', {})
-        review_text = review_content.get('review', '')
-        rating = review_content.get('rating', 'N/A')
+        rating = 'N/A'
+        if review.rating is not None:
+            rating = f"{review.rating:g}"
+            ratings.append(review.rating)
         
-        if rating != 'N/A':
-            try:
-                rating_num = float(rating)
-                ratings.append(rating_num)
-            except:
-                pass
-        
-        review_texts.append(f"=== Review {i} (Rating: {rating}) ===\n{review_text}\n")
+        review_texts.append(f"=== Review {i} (Rating: {rating}) ===\n{review.text}\n")
     
     combined_reviews = "\n".join(review_texts)
     
@@ -230,8 +225,7 @@ def main():
                 print("Skipped (no reviews)")
                 continue
             
-            with open(reviews_path, 'r', encoding='utf-8') as f:
-                reviews = json.load(f)
+            reviews = load_review_file(reviews_path)
             
             if not reviews:
                 print("Skipped (empty)")
@@ -0,0 +1,50 @@
+"""
+单元测试共用 fixtures
+
+运行：pytest tests/（只依赖 numpy / PyYAML，不访问网络、不调用 LLM）
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks.fixtures import make_corpus
+
+
+@pytest.fixture(scope="session")
+def corpus():
+    """(claims_by_paper, verifications_by_paper)，与基准使用同一份合成语料生成器"""
+    return make_corpus(num_papers=40, seed=1)
+
+
+@pytest.fixture(scope="session")
+def weights(corpus):
+    from src.agents.weighting_agent import WeightingAgent
+    claims_by_paper, verifications_by_paper = corpus
+    agent = WeightingAgent(alpha=0.5, beta=0.5)
+    return {
+        paper_id: agent.process_all_reviewers(claims, verifications_by_paper[paper_id])
+        for paper_id, claims in claims_by_paper.items()
+    }
+
+
+@pytest.fixture(scope="session")
+def reviews(corpus):
+    """每篇论文的规范化评审，评分按论文和 reviewer 位置确定性生成（部分论文没有评分）"""
+    from src.data.reviews import normalize_reviews
+    claims_by_paper, _ = corpus
+    reviews_by_paper = {}
+    for paper_idx, (paper_id, claims) in enumerate(claims_by_paper.items()):
+        reviewer_ids = sorted({claim['id'].split('-')[0] for claim in claims})
+        raw = [
+            {'reviewer_id': reviewer_id, 'content': f"Review by {reviewer_id}.",
+             'rating': None if paper_idx % 7 == 0 else 1 + (paper_idx + idx * 3) % 10}
+            for idx, reviewer_id in enumerate(reviewer_ids)
+        ]
+        reviews_by_paper[paper_id] = normalize_reviews(raw)
+    return reviews_by_paper
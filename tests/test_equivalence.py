@@ -0,0 +1,111 @@
+"""向量化实现与逐篇实现的数值一致性：ClaimTable / process_corpus、CorpusFrame / 评分方法注册表"""
+
+import numpy as np
+import pytest
+
+from src.agents.weighting_agent import WeightingAgent
+from src.data.claim_table import ClaimTable
+from src.data.feature_store import FeatureStore, compute_features
+from src.scoring import SCORERS, CorpusFrame, evaluate_scorers, get_scorers
+
+
+def test_claim_table_shapes(corpus):
+    claims_by_paper, verifications_by_paper = corpus
+    table = ClaimTable.from_corpus(claims_by_paper, verifications_by_paper)
+    assert table.paper_ids == list(claims_by_paper)
+    assert table.num_claims == sum(len(claims) for claims in claims_by_paper.values())
+    assert table.num_groups == len({
+        (paper_id, claim['id'].split('-')[0])
+        for paper_id, claims in claims_by_paper.items() for claim in claims
+    })
+    assert int(table.is_false.sum()) == sum(
+        verification['verification_result'] == 'False'
+        for verifications in verifications_by_paper.values() for verification in verifications.values()
+    )
+
+
+@pytest.mark.parametrize("alpha, beta", [(0.5, 0.5), (0.3, 0.9), (1.0, 0.0)])
+def test_process_corpus_matches_process_all_reviewers(corpus, alpha, beta):
+    claims_by_paper, verifications_by_paper = corpus
+    agent = WeightingAgent(alpha=alpha, beta=beta)
+    vectorized = agent.process_corpus(ClaimTable.from_corpus(claims_by_paper, verifications_by_paper))
+
+    assert vectorized.keys() == claims_by_paper.keys()
+    for paper_id, claims in claims_by_paper.items():
+        expected = agent.process_all_reviewers(claims, verifications_by_paper[paper_id])
+        assert vectorized[paper_id].keys() == expected.keys()
+        for reviewer_id, metrics in expected.items():
+            assert vectorized[paper_id][reviewer_id] == pytest.approx(metrics, abs=1e-12)
+
+
+def test_weight_grid_matches_process_corpus(corpus):
+    claims_by_paper, verifications_by_paper = corpus
+    table = ClaimTable.from_corpus(claims_by_paper, verifications_by_paper)
+    agent = WeightingAgent()
+    grid = agent.weight_grid(agent.compute_group_metrics(table), [0.2, 0.7], [0.4, 0.5])
+    assert grid.shape == (2, 2, table.num_groups)
+
+    weights = WeightingAgent(alpha=0.7, beta=0.4).process_corpus(table)
+    expected = [weights[paper_id][reviewer_id]['weight'] for paper_id, reviewer_id in table.group_keys]
+    np.testing.assert_allclose(grid[1, 0], expected, atol=1e-12)
+
+
+# ---------- 评分方法注册表 ----------
+
+@pytest.fixture(scope="module")
+def frame(corpus, weights, reviews):
+    claims_by_paper, verifications_by_paper = corpus
+    # 末尾加一篇没有任何结果的论文，各方法应给出默认分或 NaN
+    paper_ids = list(claims_by_paper) + ["empty"]
+    return CorpusFrame.from_corpus(paper_ids, claims_by_paper, verifications_by_paper, weights, reviews)
+
+
+@pytest.fixture(scope="module")
+def feature_frame(tmp_path_factory, corpus, weights, reviews):
+    claims_by_paper, verifications_by_paper = corpus
+    store = FeatureStore(str(tmp_path_factory.mktemp("features") / "features.db"))
+    try:
+        for paper_id, claims in list(claims_by_paper.items()) + [("empty", [])]:
+            paper, reviewers = compute_features(
+                claims, verifications_by_paper.get(paper_id, {}), weights.get(paper_id, {}),
+                reviews.get(paper_id, [])
+            )
+            store.put(paper_id, "test", None, paper, reviewers)
+        papers = store.papers()
+    finally:
+        store.close()
+    # papers() 按 paper_id 排序
+    return CorpusFrame.from_features(papers)
+
+
+def test_get_scorers():
+    assert [method.name for method in get_scorers()] == list(SCORERS)
+    assert [method.name for method in get_scorers(["ensemble", "original"])] == ["ensemble", "original"]
+    with pytest.raises(ValueError):
+        get_scorers(["original", "no_such_method"])
+
+
+@pytest.mark.parametrize("name", list(SCORERS))
+def test_from_features_matches_from_corpus(name, frame, feature_frame):
+    method = SCORERS[name]
+    expected = dict(zip(frame.paper_ids, method.score(frame)))
+    scores = method.score(feature_frame)
+    assert len(scores) == len(expected)
+    for paper_id, score in zip(feature_frame.paper_ids, scores):
+        np.testing.assert_allclose(score, expected[paper_id], atol=1e-12, err_msg=paper_id)
+
+
+def test_evaluate_scorers(frame):
+    ground_truth = {paper_id: "Accepted" if idx % 2 else "Rejected" for idx, paper_id in enumerate(frame.paper_ids)}
+    rows = evaluate_scorers(frame, ground_truth, names=["original", "advanced"], thresholds=[0.3, 0.5, 0.7])
+    assert [row['method'] for row in rows] == ["original", "advanced"]
+    for row, method in zip(rows, get_scorers(["original", "advanced"])):
+        scores = method.score(frame)
+        labeled = ~np.isnan(scores)
+        assert row['num_papers'] + row['abstained'] == len(frame.paper_ids)
+        assert row['num_papers'] == int(labeled.sum())
+        assert row['threshold'] in (0.3, 0.5, 0.7)
+
+        y_true = np.array([ground_truth[paper_id] == "Accepted" for paper_id in frame.paper_ids])[labeled]
+        accuracies = [np.mean((scores[labeled] >= threshold) == y_true) for threshold in (0.3, 0.5, 0.7)]
+        assert row['accuracy'] == pytest.approx(max(accuracies))
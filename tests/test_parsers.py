@@ -0,0 +1,227 @@
+"""流式 JSON 扫描、Retry-After 解析、请求调度和评审规范化"""
+
+import time
+from email.utils import formatdate
+
+import pytest
+
+from src.data.reviews import Review, normalize_review, normalize_reviews, parse_score
+from src.utils import scheduler
+from src.utils.json_stream import IncrementalJSONScanner
+from src.utils.scheduler import RequestScheduler, parse_retry_after
+
+
+# ---------- IncrementalJSONScanner ----------
+
+def feed_chunks(scanner, text, size=3):
+    for start in range(0, len(text), size):
+        result = scanner.feed(text[start:start + size])
+        if result is not None:
+            return result, start + size
+    return None, len(text)
+
+
+def test_scanner_returns_first_object_across_chunks():
+    text = 'Here you go:\n```json\n{"claims": [{"id": "R1-C1", "statement": "a {b} \\"c\\""}]}\n```\ntrailing'
+    result, consumed = feed_chunks(IncrementalJSONScanner(), text)
+    assert result == '{"claims": [{"id": "R1-C1", "statement": "a {b} \\"c\\""}]}'
+    # 完整对象出现后立即返回，不需要等到流结束
+    assert consumed < len(text)
+
+
+def test_scanner_skips_candidates_missing_required_keys():
+    scanner = IncrementalJSONScanner(required_keys=["verification_result"])
+    result, _ = feed_chunks(scanner, 'e.g. {"x": 1} then {"verification_result": "True", "confidence": 0.9}')
+    assert result == '{"verification_result": "True", "confidence": 0.9}'
+    # 已有结果后继续 feed 不会改变结果
+    assert scanner.feed('{"verification_result": "False"}') == result
+
+
+def test_scanner_array_requires_keys_on_every_item():
+    scanner = IncrementalJSONScanner(expect="array", required_keys=["id"])
+    assert scanner.feed('[{"id": 1}, {"name": 2}] ') is None
+    assert scanner.feed('[{"id": 1}, {"id": 2}]') == '[{"id": 1}, {"id": 2}]'
+
+
+def test_scanner_incomplete_and_invalid_input():
+    scanner = IncrementalJSONScanner()
+    assert scanner.feed('{"a": [1, 2') is None
+    assert scanner.result is None
+    with pytest.raises(ValueError):
+        IncrementalJSONScanner(expect="string")
+
+
+# ---------- parse_retry_after ----------
+
+@pytest.mark.parametrize("headers, expected", [
+    (None, None),
+    ({}, None),
+    ({'retry-after': "7"}, 7.0),
+    ({'retry-after': "1.5"}, 1.5),
+    ({'retry-after': "-3"}, 0.0),
+    ({'retry-after-ms': "250"}, 0.25),
+    ({'retry-after-ms': "250", 'retry-after': "7"}, 0.25),
+    ({'retry-after-ms': "soon", 'retry-after': "7"}, 7.0),
+    ({'retry-after': "not a date"}, None),
+])
+def test_parse_retry_after(headers, expected):
+    assert parse_retry_after(headers) == expected
+
+
+def test_parse_retry_after_http_date():
+    headers = {'retry-after': formatdate(time.time() + 30, usegmt=True)}
+    assert 28.0 <= parse_retry_after(headers) <= 30.0
+    assert parse_retry_after({'retry-after': formatdate(time.time() - 30, usegmt=True)}) == 0.0
+
+
+# ---------- RequestScheduler ----------
+
+class FakeClock:
+    """替换 scheduler 模块中的 time：sleep 只推进时钟并记录等待时间"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class RateLimited(Exception):
+    pass
+
+
+def classify(error):
+    if isinstance(error, RateLimited):
+        return True, True, 2.0
+    return False, False, None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(scheduler, "time", fake)
+    return fake
+
+
+def failing(failures, exc=RateLimited):
+    calls = []
+
+    def fn():
+        calls.append(len(calls))
+        if len(calls) <= failures:
+            raise exc("boom")
+        return "ok"
+    return fn, calls
+
+
+def test_run_retries_rate_limited_requests(clock):
+    sched = RequestScheduler(max_concurrency=8, max_retries=5, base_delay=0.0)
+    fn, calls = failing(2)
+    assert sched.run(fn, classify_error=classify) == "ok"
+    assert len(calls) == 3
+    # base_delay 为 0 时等待时间等于 Retry-After
+    assert clock.sleeps == [2.0, 2.0]
+    # 每次 429 并发上限减半
+    assert sched.concurrency.limit == 2
+    assert sched.concurrency.active == 0
+
+
+def test_run_raises_non_retryable_immediately(clock):
+    sched = RequestScheduler(max_retries=5)
+    fn, calls = failing(1, exc=KeyError)
+    with pytest.raises(KeyError):
+        sched.run(fn, classify_error=classify)
+    assert len(calls) == 1
+    assert clock.sleeps == []
+    assert sched.concurrency.active == 0
+
+
+def test_run_gives_up_after_max_retries(clock):
+    sched = RequestScheduler(max_retries=2, base_delay=0.0)
+    fn, calls = failing(10)
+    with pytest.raises(RateLimited):
+        sched.run(fn, classify_error=classify)
+    assert len(calls) == 3
+    assert len(clock.sleeps) == 2
+
+
+def test_run_throttles_requests_per_minute(clock):
+    sched = RequestScheduler(requests_per_minute=2)
+    for _ in range(3):
+        assert sched.run(lambda: "ok") == "ok"
+    # 桶容量为 2，第三个请求需要等待补充一个令牌（30 秒）
+    assert clock.now == pytest.approx(30.0)
+
+
+def test_run_throttles_tokens_per_minute(clock):
+    sched = RequestScheduler(tokens_per_minute=600)
+    sched.run(lambda: "ok", estimated_tokens=600)
+    sched.run(lambda: "ok", estimated_tokens=300)
+    assert clock.now == pytest.approx(30.0)
+
+
+# ---------- 评审规范化 ----------
+
+def test_normalize_parsed_review():
+    review = normalize_review({
+        'reviewer_id': "R7", 'review_id': "abc", 'content': "Full text.",
+        'rating': "8: accept, good paper", 'confidence': 4, 'summary': "Short."
+    }, "R1")
+    assert isinstance(review, Review)
+    assert (review.reviewer_id, review.review_id, review.rating, review.confidence) == ("R7", "abc", 8.0, 4.0)
+    assert review.summary == "Short."
+    # 全文不能由各段拼出时保存在 body 中
+    assert review.text == "Full text."
+
+
+def test_normalize_api_v2_note():
+    note = {
+        'id': "note1",
+        'content': {
+            'summary': {'value': "A summary."},
+            'strengths': {'value': "Clear writing."},
+            'weaknesses': {'value': ["Weak baselines", "No code"]},
+            'rating': {'value': "6: marginally above the acceptance threshold"},
+            'soundness': {'value': "3 good"},
+        }
+    }
+    review = normalize_review(note, "R2")
+    assert (review.reviewer_id, review.review_id, review.rating) == ("R2", "note1", 6.0)
+    assert review.soundness is None
+    assert review.weaknesses == "Weak baselines\nNo code"
+    assert review.body == ''
+    assert review.text == "Summary: A summary.\n\nStrengths:\nClear writing.\n\nWeaknesses:\nWeak baselines\nNo code"
+
+
+def test_normalize_api_v1_note():
+    note = {'id': "old", 'content': {'review': "The paper is fine.", 'rating': "5: marginally below"}}
+    review = normalize_review(note, "R3")
+    assert (review.reviewer_id, review.rating) == ("R3", 5.0)
+    assert review.text == "The paper is fine."
+
+
+@pytest.mark.parametrize("value, expected", [
+    (8, 8.0), ("8", 8.0), ("8: accept", 8.0), ({'value': "3: good"}, 3.0),
+    (None, None), (True, None), ("", None), ("N/A", None),
+])
+def test_parse_score(value, expected):
+    assert parse_score(value) == expected
+
+
+def test_normalize_reviews_numbers_by_raw_position():
+    reviews = normalize_reviews([
+        {'content': "First review.", 'rating': 6},
+        {'content': "", 'rating': None},  # 空条目在编号之后丢弃
+        {'content': "Third review."},
+        {'reviewer_id': "R9", 'content': "", 'rating': 3},
+    ])
+    assert [review.reviewer_id for review in reviews] == ["R1", "R3", "R9"]
+    assert normalize_reviews(None) == []
@@ -0,0 +1,183 @@
+"""结果存储、下载清单、会议 notes 存储和语料路径解析"""
+
+import json
+
+import pytest
+
+from src.data.corpus import CorpusResolver, CorpusRoot
+from src.data.manifest import DownloadManifest, sha256_file
+from src.data.results_store import ResultsStore
+
+
+# ---------- ResultsStore ----------
+
+@pytest.fixture
+def results_store(tmp_path):
+    store = ResultsStore(str(tmp_path / "results.db"))
+    yield store
+    store.close()
+
+
+def test_results_store_round_trip(results_store, corpus, weights):
+    claims_by_paper, verifications_by_paper = corpus
+    for paper_id, claims in claims_by_paper.items():
+        results_store.append_claims(paper_id, claims)
+        results_store.append_verifications(paper_id, verifications_by_paper[paper_id].values())
+        results_store.append_weights(paper_id, weights[paper_id])
+
+    paper_id = next(iter(claims_by_paper))
+    assert results_store.load_claims(paper_id) == claims_by_paper[paper_id]
+    assert results_store.load_verifications(paper_id) == verifications_by_paper[paper_id]
+    assert results_store.load_weights(paper_id) == weights[paper_id]
+
+    assert results_store.paper_ids() == sorted(claims_by_paper)
+    assert results_store.scan_claims() == claims_by_paper
+    assert results_store.scan_verifications() == {
+        paper_id: verifications for paper_id, verifications in verifications_by_paper.items() if verifications
+    }
+    assert results_store.scan_weights([paper_id]) == {paper_id: weights[paper_id]}
+
+
+def test_results_store_reads_latest_run(results_store):
+    results_store.append_claims("p1", [{'id': "R1-C1", 'sentiment': "Positive"}])
+    first = results_store.latest_runs("p1")['claims']
+    results_store.append_claims("p1", [{'id': "R2-C1", 'sentiment': "Negative"}])
+
+    assert results_store.latest_runs("p1")['claims'] > first
+    assert results_store.load_claims("p1") == [{'id': "R2-C1", 'sentiment': "Negative"}]
+    assert results_store.scan_claims() == {"p1": [{'id': "R2-C1", 'sentiment': "Negative"}]}
+    assert results_store.has_stage("p1", "claims")
+    assert not results_store.has_stage("p1", "weights")
+    assert results_store.load_weights("p1") == {}
+    assert results_store.load_verifications("missing") == {}
+
+
+# ---------- DownloadManifest ----------
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = DownloadManifest(str(tmp_path / "manifest.db"))
+    yield manifest
+    manifest.close()
+
+
+def test_manifest_is_complete(manifest, tmp_path):
+    pdf_path = tmp_path / "p1.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 test")
+    manifest.update("p1", "pdf", "forum1", status="complete", path=str(pdf_path),
+                    size=pdf_path.stat().st_size, sha256=sha256_file(pdf_path))
+    assert manifest.is_complete("p1", "pdf")
+    assert manifest.is_complete("p1", "pdf", verify=True)
+    assert not manifest.is_complete("p1", "reviews")
+
+    # 大小不变但内容变化：只有 verify=True 时能发现
+    pdf_path.write_bytes(b"%PDF-1.4 TEST")
+    assert manifest.is_complete("p1", "pdf")
+    assert not manifest.is_complete("p1", "pdf", verify=True)
+
+    pdf_path.write_bytes(b"%PDF")
+    assert not manifest.is_complete("p1", "pdf")
+    pdf_path.unlink()
+    assert not manifest.is_complete("p1", "pdf")
+
+
+def test_manifest_partial_and_invalid_entries(manifest, tmp_path):
+    part_path = tmp_path / "p2.pdf.part"
+    part_path.write_bytes(b"1234")
+    manifest.update("p2", "pdf", "forum2", status="partial", path=str(part_path), size=4, total_size=10)
+    assert not manifest.is_complete("p2", "pdf")
+    # 只覆盖给出的字段
+    manifest.update("p2", "pdf", "forum2", error="timeout")
+    assert manifest.get("p2", "pdf")['total_size'] == 10
+    assert manifest.summary() == {'pdf': {'partial': {'count': 1, 'bytes': 4}}}
+
+    with pytest.raises(ValueError):
+        manifest.update("p2", "slides", "forum2")
+    with pytest.raises(ValueError):
+        manifest.update("p2", "pdf", "forum2", status="done")
+
+
+# ---------- VenueNoteStore ----------
+
+def test_venue_store_truncates_uncommitted_lines_on_resume(tmp_path):
+    pytest.importorskip("requests")
+    from src.data.venue_store import VenueNoteStore
+
+    store = VenueNoteStore("ICLR.cc/2024/Conference", root=str(tmp_path))
+    assert store.path.name == "ICLR.cc_2024_Conference"
+    assert store.load_checkpoint() == {'offset': 0, 'count': 0, 'complete': False}
+
+    store.append_page([{'id': "a"}, {'id': "b"}], offset=2)
+    # 模拟写入数据后、写入检查点前中断：文件中多出检查点之外的行
+    with open(store.submissions_path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'id': "c"}) + "\n")
+        f.write('{"id": "d", "trunc')
+
+    # 续传从检查点的 offset 开始，重新写入的页覆盖残留行
+    resumed = VenueNoteStore("ICLR.cc/2024/Conference", root=str(tmp_path))
+    assert resumed.load_checkpoint()['offset'] == 2
+    resumed.append_page([{'id': "c"}, {'id': "d"}], offset=4, complete=True)
+
+    assert [note['id'] for note in resumed.iter_submissions()] == ["a", "b", "c", "d"]
+    assert resumed.load_checkpoint() == {'offset': 4, 'count': 4, 'complete': True}
+
+    resumed.reset()
+    assert list(resumed.iter_submissions()) == []
+
+
+# ---------- CorpusResolver ----------
+
+def touch(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding='utf-8')
+    return path
+
+
+def test_resolver_partitioned_templates(tmp_path):
+    root = tmp_path / "iclr2024"
+    accepted = touch(root / "papers" / "accepted" / "p1.pdf")
+    touch(root / "papers" / "rejected" / "p2.pdf")
+    reviews = touch(root / "reviews" / "p1_reviews.json", "[]")
+    resolver = CorpusResolver(
+        [CorpusRoot(str(root), papers="papers/{status}/{paper_id}.pdf", venue="iclr2024")],
+        index_path=str(tmp_path / "index.json")
+    )
+
+    assert resolver.pdf_path("p1") == accepted
+    assert resolver.reviews_path("p1") == reviews
+    assert resolver.reviews_path("p2") is None
+    assert resolver.metadata("p2")['status'] == "rejected"
+    assert resolver.papers(status="accepted") == ["p1"]
+    assert resolver.papers(venue="iclr2024", require_reviews=True) == ["p1"]
+    assert (tmp_path / "index.json").exists()
+
+    # 根目录配置未变化时直接读取索引文件
+    cached = CorpusResolver(resolver.roots, index_path=str(tmp_path / "index.json"))
+    assert cached.index == resolver.index
+
+
+def test_resolver_root_priority_and_rescan(tmp_path):
+    first = touch(tmp_path / "a" / "papers" / "p1.pdf")
+    touch(tmp_path / "b" / "papers" / "p1.pdf")
+    resolver = CorpusResolver.from_config({
+        'roots': [
+            {'path': str(tmp_path / "a"), 'status': "accepted"},
+            {'path': str(tmp_path / "b"), 'papers': "papers/{paper_id}.pdf", 'venue': "nips"},
+        ]
+    })
+    # 靠前的根目录优先，元数据按字段合并
+    assert resolver.pdf_path("p1") == first
+    assert resolver.metadata("p1")['status'] == "accepted"
+    assert resolver.metadata("p1")['venue'] == "nips"
+
+    # 建立索引之后新增的文件：平铺布局直接拼路径，分区布局重新扫描一次
+    late = touch(tmp_path / "a" / "reviews" / "p3_reviews.json", "[]")
+    assert resolver.reviews_path("p3") == late
+    assert resolver.pdf_path("p4") is None
+
+
+def test_resolver_default_layout(tmp_path):
+    pdf = touch(tmp_path / "raw" / "papers" / "p1.pdf")
+    resolver = CorpusResolver.from_config(None, base_path=str(tmp_path))
+    assert resolver.pdf_path("p1") == pdf
+    assert resolver.papers(require_pdf=True) == ["p1"]